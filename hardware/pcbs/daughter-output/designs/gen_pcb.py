@@ -35,6 +35,7 @@ BOARD_W = 80.0  # mm
 BOARD_H = 20.0  # mm
 CORNER_R = 1.0  # mm, corner radius
 EDGE_CLEARANCE = 0.3  # mm, copper to edge
+INSTANCES = 5  # 2x input daughter, 2x output top, 1x output bottom
 
 # Jack spacing: 4 jacks evenly across 80mm
 # Center-to-center: 20mm, first jack at x=10
@@ -513,13 +514,15 @@ def generate_project():
 
 if __name__ == "__main__":
     import os
+    import sys
 
     out_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Write PCB file
+    pcb = generate_pcb()
     pcb_path = os.path.join(out_dir, "mixtee-daughter-output.kicad_pcb")
     with open(pcb_path, "w") as f:
-        f.write(generate_pcb())
+        f.write(pcb)
     print(f"PCB written to: {pcb_path}")
 
     # Write project file
@@ -538,6 +541,11 @@ if __name__ == "__main__":
 """)
     print(f"Footprint lib table written to: {fp_lib_path}")
 
+    # Fab outputs (drill, CPL, BOM) from the same generated board
+    sys.path.insert(0, os.path.join(out_dir, "..", "..", "..", "tools"))
+    from fab_outputs import write_fab_outputs
+    write_fab_outputs(out_dir, "mixtee-daughter-output", pcb, "mixtee_gen_pcb", INSTANCES)
+
     print("\nDone! Open mixtee-daughter-output.kicad_pcb in KiCad to view.")
     print(f"Board dimensions: {BOARD_W} x {BOARD_H} mm")
     print(f"Components placed: 4 jacks, 4 diodes, 1 cap, 1 connector")
@@ -5,6 +5,13 @@ Board: 80 x 40 mm, 4-layer (F.Cu, In1.Cu=GND, In2.Cu=V33_A, B.Cu)
 Instances: 2 (Board 1-bottom: ch 1-8, Board 2-bottom: ch 9-16)
 Orientation: Lower board in pair (daughter above), jacks at panel edge (y=40)
 
+Parametric: configure(channels, codecs) takes the system channel count and
+AK4619s per board (4 channels each). Nets, codec pin maps (from the
+channel-to-ADC table), refs and placements are built by tiling the
+channel-pair cell; every 2 codecs get their own FFC + JST port and 80 mm of
+width. `python gen_pcb.py --channels 32 --codecs 8` builds a 32-channel board.
+The listing below is the default (16 channels, 2 codecs per board).
+
 Components (71 total):
   Codecs (2):
     U1  AK4619VN (QFN-32, 5x5mm, 0.5mm pitch) — ch 1-4, I2C 0x10
@@ -57,18 +64,32 @@ Layout (y=0 interior/FFC edge, y=30 panel edge):
   +--------------------------------------------------------------------+
 """
 
+import argparse
+import functools
+import re
 import uuid
 import math
 import os
+import sys
 
 
 # ---------------------------------------------------------------------------
 # Board parameters
 # ---------------------------------------------------------------------------
 
-BOARD_W = 80.0   # mm
+PORT_W = 80.0    # mm of board width per FFC port (2 codecs, 8 channels)
 BOARD_H = 40.0   # mm  (increased from 30 to clear jack pads from filter zone)
 CORNER_R = 1.0   # mm
+# BOARD_W and INSTANCES follow from configure(): 16 channels on 2-codec
+# boards is Board 1-bottom (ch 1-8) + Board 2-bottom (ch 9-16)
+
+# AK4619 exposed-pad thermal vias (size with hardware/tools/thermal_vias.py)
+EP_VIA_ROWS = 3
+EP_VIA_COLS = 3
+EP_VIA_DRILL = 0.3      # mm, pcb-design-rules.md: thermal via array
+EP_VIA_ANNULAR = 0.15   # mm
+EP_VIA_PITCH = 1.0      # mm, shrunk to fit the pad if needed
+EP_VIA_SPACING = 0.2    # mm, minimum copper gap between via pads
 
 # Layers
 F_CU = "F.Cu"
@@ -89,585 +110,284 @@ EDGE_CUTS = "Edge.Cuts"
 # Net definitions
 # ---------------------------------------------------------------------------
 
-NETS = {
-    0: "",
-    # Power
-    1: "GND",
-    2: "5V_A",
-    3: "V33_A",
-    4: "5V_DIG",
-    # TDM bus (shared by both codecs on this board)
-    5: "MCLK",
-    6: "BCLK",
-    7: "LRCLK",
-    8: "SDIN1",         # Teensy -> both codecs
-    9: "SDOUT1",        # U1 -> Teensy (FFC pin 4)
-    10: "SDOUT2",       # U2 -> Teensy (FFC pin 13)
-    # I2C
-    11: "SDA",
-    12: "SCL",
-    # Codec internal rails
-    13: "U1_AVDRV",     # U1 internal LDO output
-    14: "U1_VCOM",      # U1 AVDD/2 reference
-    15: "U2_AVDRV",     # U2 internal LDO output
-    16: "U2_VCOM",      # U2 AVDD/2 reference
-    # Audio input nets (from jacks, after AC coupling)
-    17: "AIN_1_AC",     # Ch 1 after AC coupling cap
-    18: "AIN_2_AC",     # Ch 2
-    19: "AIN_3_AC",     # Ch 3
-    20: "AIN_4_AC",     # Ch 4
-    21: "AIN_5_AC",     # Ch 5
-    22: "AIN_6_AC",     # Ch 6
-    23: "AIN_7_AC",     # Ch 7
-    24: "AIN_8_AC",     # Ch 8
-    # Raw jack tip nets (before AC coupling)
-    25: "JACK_1",
-    26: "JACK_2",
-    27: "JACK_3",
-    28: "JACK_4",
-    # Filter node 1 (between R1 and R2 in Sallen-Key)
-    29: "FN1_1",
-    30: "FN1_2",
-    31: "FN1_3",
-    32: "FN1_4",
-    33: "FN1_5",
-    34: "FN1_6",
-    35: "FN1_7",
-    36: "FN1_8",
-    # Filter node 2 (op-amp output = filter output -> codec ADC)
-    37: "FOUT_1",
-    38: "FOUT_2",
-    39: "FOUT_3",
-    40: "FOUT_4",
-    41: "FOUT_5",
-    42: "FOUT_6",
-    43: "FOUT_7",
-    44: "FOUT_8",
-    # Op-amp power
-    45: "VOPA",         # 5V_A to op-amp VCC (same as 5V_A but separate for clarity)
-    # Daughter board signals (via JST-PH-6)
-    # R channels come from Daughter Board: pins 1-4 are AIN for R channels
-    46: "DAIN_R1",      # Daughter board ch R1 (e.g. ch 2)
-    47: "DAIN_R2",      # Daughter board ch R2 (e.g. ch 4)
-    48: "DAIN_R3",      # Daughter board ch R3 (e.g. ch 6)
-    49: "DAIN_R4",      # Daughter board ch R4 (e.g. ch 8)
-    # Filter nodes for R channels (from daughter board, through filter)
-    50: "FN1_R1",
-    51: "FN1_R2",
-    52: "FN1_R3",
-    53: "FN1_R4",
-    54: "FOUT_R1",
-    55: "FOUT_R2",
-    56: "FOUT_R3",
-    57: "FOUT_R4",
+# Channels are handled in pairs: one OPA1678 filters an L channel (jack on
+# this board, odd channel numbers) and an R channel (from the daughter board
+# via JST-PH, numbered R1, R2, ...). Pair p uses JACK_{p+1}, AIN_{2p+1}_AC,
+# FN1/FILT_IN/FOUT_{2p+1} and DAIN/FN1/FILT_IN/FOUT_R{p+1}.
+#
+# Channel-to-ADC table: pair slot on its codec -> AK4619 input pins.
+# Slot 0 feeds ADC2 (AIN4), slot 1 ADC1 (AIN1); AIN5/AIN2 stay open.
+CODEC_INPUTS = {
+    0: {"L": "12", "R": "10"},   # AIN4L, AIN4R
+    1: {"L": "16", "R": "14"},   # AIN1L, AIN1R
 }
-
-# Alias: op-amp VCC is just 5V_A
-# We'll use net 2 (5V_A) directly for op-amp power pins
+PAIRS_PER_CODEC = len(CODEC_INPUTS)
+CODECS_PER_PORT = 2     # AK4619 CAD gives 0x10/0x11 only; one FFC (TDM bus + mux channel) each
+PAIRS_PER_PORT = CODECS_PER_PORT * PAIRS_PER_CODEC     # JST-PH-6 carries 4 R channels
+
+# Nets per FFC port; ports after the first get a _2, _3, ... suffix.
+# SDOUT is numbered per codec (SDOUT1, SDOUT2, ...).
+PORT_NETS = ("MCLK", "BCLK", "LRCLK", "SDIN1")
+I2C_NETS = ("SDA", "SCL")
+
+
+def _bus(b):
+    return f"_{b + 1}" if b else ""
+
+
+def build_nets():
+    """Build the complete net dictionary {code: name}, codes allocated in order."""
+    names = ["GND", "5V_A", "V33_A", "5V_DIG"]
+    for b in range(PORTS):
+        names += [n + _bus(b) for n in PORT_NETS]
+        names += [f"SDOUT{k + 1}" for k in range(b * CODECS_PER_PORT, min((b + 1) * CODECS_PER_PORT, CODECS))]
+        names += [n + _bus(b) for n in I2C_NETS]
+    for k in range(CODECS):
+        names += [f"U{k + 1}_AVDRV", f"U{k + 1}_VCOM"]     # internal LDO out, AVDD/2
+    left = [2 * p + 1 for p in range(PAIRS)]
+    right = [f"R{p + 1}" for p in range(PAIRS)]
+    names += [f"AIN_{n}_AC" for n in left]                  # after AC coupling
+    names += [f"JACK_{p + 1}" for p in range(PAIRS)]        # raw jack tips
+    names += [f"FN1_{n}" for n in left]                     # between R_a and R_b
+    names += [f"FOUT_{n}" for n in left]                    # op-amp out -> codec ADC
+    names += [f"DAIN_{r}" for r in right]                   # daughter board, via JST
+    names += [f"FN1_{r}" for r in right]
+    names += [f"FOUT_{r}" for r in right]
+    names += [f"FILT_IN_{n}" for n in left]                 # op-amp IN+
+    names += [f"FILT_IN_{r}" for r in right]
+    nets = {0: ""}  # unconnected
+    for code, name in enumerate(names, 1):
+        nets[code] = name
+    return nets
 
 
 # ---------------------------------------------------------------------------
 # Component-to-net mapping
 # ---------------------------------------------------------------------------
 
-def build_comp_nets():
-    cn = {}
-
-    # ── U1: AK4619VN codec (QFN-32), I2C addr 0x10 (CAD=low) ──
-    # Channels: ADC2L=ch1, ADC2R=ch2, ADC1L=ch3, ADC1R=ch4
-    # Pin mapping from ak4619-wiring.md:
-    #   Pin 1: SDIN1, Pin 2: SDIN2, Pin 3: TVDD, Pin 4: VSS2
-    #   Pin 5: AVDRV, Pin 6: LRCK, Pin 7: BICK, Pin 8: MCLK
-    #   Pin 9: AIN5R(open), Pin 10: AIN4R(ch2), Pin 11: AIN5L(open), Pin 12: AIN4L(ch1)
-    #   Pin 13: AIN2R(open), Pin 14: AIN1R(ch4), Pin 15: AIN2L(open), Pin 16: AIN1L(ch3)
-    #   Pin 17: VCOM, Pin 18: AVDD, Pin 19: VSS1, Pin 20: VREFL
-    #   Pin 21: VREFH, Pin 22: AOUT1L, Pin 23: AOUT1R, Pin 24: AOUT2L
-    #   Pin 25: AOUT2R, Pin 26: PDN, Pin 27: CAD, Pin 28: SCL
-    #   Pin 29: SI, Pin 30: SDA, Pin 31: SDOUT1, Pin 32: SDOUT2
-    #   Pin 33: EP (exposed pad)
-    cn["U1"] = {
-        "1": 8,       # SDIN1 -> TDM data in
-        "2": 1,       # SDIN2 -> VSS2 (unused in TDM)
-        "3": 3,       # TVDD -> V33_A
-        "4": 1,       # VSS2 -> GND
-        "5": 13,      # AVDRV -> U1_AVDRV (internal LDO out)
-        "6": 7,       # LRCK -> LRCLK
-        "7": 6,       # BICK -> BCLK
-        "8": 5,       # MCLK
-        "9": 0,       # AIN5R -> open
-        "10": 54,     # AIN4R -> FOUT_R1 (ch 2 R from daughter, filtered)
-        "11": 0,      # AIN5L -> open
-        "12": 37,     # AIN4L -> FOUT_1 (ch 1 filtered)
-        "13": 0,      # AIN2R -> open
-        "14": 57,     # AIN1R -> FOUT_R2 (ch 4 R from daughter, filtered)
-        "15": 0,      # AIN2L -> open
-        "16": 39,     # AIN1L -> FOUT_3 (ch 3 filtered, note: pin16=ADC1L=ch3 per wiring doc)
-        "17": 14,     # VCOM -> U1_VCOM
-        "18": 3,      # AVDD -> V33_A
-        "19": 1,      # VSS1 -> GND
-        "20": 1,      # VREFL -> VSS1 = GND
-        "21": 3,      # VREFH -> AVDD = V33_A
-        "22": 0,      # AOUT1L -> open (Phase 2)
-        "23": 0,      # AOUT1R -> open (Phase 2)
-        "24": 0,      # AOUT2L -> open (Phase 2)
-        "25": 0,      # AOUT2R -> open (Phase 2)
-        "26": 3,      # PDN -> V33_A via R17 (pull-up)
-        "27": 1,      # CAD -> VSS2 = GND (addr 0x10)
-        "28": 12,     # SCL
-        "29": 1,      # SI -> VSS2 = GND (unused, I2C mode)
-        "30": 11,     # SDA
-        "31": 9,      # SDOUT1 -> SDOUT1 (FFC pin 4)
-        "32": 0,      # SDOUT2 -> open (goes low in TDM)
-        "33": 1,      # EP -> GND
-    }
-
-    # ── U2: AK4619VN codec (QFN-32), I2C addr 0x11 (CAD=high) ──
-    # Channels: ADC2L=ch5, ADC2R=ch6, ADC1L=ch7, ADC1R=ch8
-    cn["U2"] = {
-        "1": 8,       # SDIN1 -> TDM data in (shared)
-        "2": 1,       # SDIN2 -> VSS2
-        "3": 3,       # TVDD -> V33_A
-        "4": 1,       # VSS2 -> GND
-        "5": 15,      # AVDRV -> U2_AVDRV
-        "6": 7,       # LRCK -> LRCLK
-        "7": 6,       # BICK -> BCLK
-        "8": 5,       # MCLK
-        "9": 0,       # AIN5R -> open
-        "10": 55,     # AIN4R -> FOUT_R3 (ch 6 R from daughter, filtered)
-        "11": 0,      # AIN5L -> open
-        "12": 41,     # AIN4L -> FOUT_5 (ch 5 filtered)
-        "13": 0,      # AIN2R -> open
-        "14": 56,     # AIN1R -> FOUT_R4 (ch 8 R from daughter, filtered)
-        "15": 0,      # AIN2L -> open
-        "16": 43,     # AIN1L -> FOUT_7 (ch 7 filtered, note: pin16=ADC1L=ch7)
-        "17": 16,     # VCOM -> U2_VCOM
-        "18": 3,      # AVDD -> V33_A
-        "19": 1,      # VSS1 -> GND
-        "20": 1,      # VREFL -> VSS1 = GND
-        "21": 3,      # VREFH -> AVDD = V33_A
-        "22": 0,      # AOUT1L -> open (Phase 2)
-        "23": 0,      # AOUT1R -> open (Phase 2)
-        "24": 0,      # AOUT2L -> open (Phase 2)
-        "25": 0,      # AOUT2R -> open (Phase 2)
-        "26": 3,      # PDN -> V33_A via R18 (pull-up)
-        "27": 3,      # CAD -> TVDD = V33_A (addr 0x11)
-        "28": 12,     # SCL
-        "29": 1,      # SI -> VSS2 = GND
-        "30": 11,     # SDA
-        "31": 10,     # SDOUT1 -> SDOUT2 (FFC pin 13)
-        "32": 0,      # SDOUT2 -> open
-        "33": 1,      # EP -> GND
-    }
+# AK4619VN (QFN-32) pin map, from ak4619-wiring.md. {u} is the codec ref,
+# {bus} the port suffix; CAD, SDOUT1 and the AIN pins are filled per codec.
+#   Pin 1: SDIN1, Pin 2: SDIN2, Pin 3: TVDD, Pin 4: VSS2
+#   Pin 5: AVDRV, Pin 6: LRCK, Pin 7: BICK, Pin 8: MCLK
+#   Pin 9: AIN5R, Pin 10: AIN4R, Pin 11: AIN5L, Pin 12: AIN4L
+#   Pin 13: AIN2R, Pin 14: AIN1R, Pin 15: AIN2L, Pin 16: AIN1L
+#   Pin 17: VCOM, Pin 18: AVDD, Pin 19: VSS1, Pin 20: VREFL
+#   Pin 21: VREFH, Pin 22: AOUT1L, Pin 23: AOUT1R, Pin 24: AOUT2L
+#   Pin 25: AOUT2R, Pin 26: PDN, Pin 27: CAD, Pin 28: SCL
+#   Pin 29: SI, Pin 30: SDA, Pin 31: SDOUT1, Pin 32: SDOUT2
+#   Pin 33: EP (exposed pad)
+AK4619_PINS = {
+    "1": "SDIN1{bus}",  # TDM data in (shared)
+    "2": "GND",         # SDIN2 -> VSS2 (unused in TDM)
+    "3": "V33_A",       # TVDD
+    "4": "GND",         # VSS2
+    "5": "{u}_AVDRV",   # internal LDO out
+    "6": "LRCLK{bus}",  # LRCK
+    "7": "BCLK{bus}",   # BICK
+    "8": "MCLK{bus}",
+    "17": "{u}_VCOM",
+    "18": "V33_A",      # AVDD
+    "19": "GND",        # VSS1
+    "20": "GND",        # VREFL -> VSS1
+    "21": "V33_A",      # VREFH -> AVDD
+    "26": "V33_A",      # PDN, pulled up via R
+    "28": "SCL{bus}",
+    "29": "GND",        # SI -> VSS2 (unused, I2C mode)
+    "30": "SDA{bus}",
+    "33": "GND",        # EP
+}
+AK4619_CAD = ("GND", "V33_A")   # CAD low = 0x10, high (TVDD) = 0x11
 
-    # ── U3: ADP7118 LDO (SOIC-8) — 5V -> 3.3V_A ──
-    # Pin 1: OUT, Pin 2: SENSE, Pin 3: GND, Pin 4: NC
-    # Pin 5: NC, Pin 6: NC, Pin 7: EN, Pin 8: IN
-    cn["U3"] = {
-        "1": 3,       # OUT -> V33_A
-        "2": 3,       # SENSE -> V33_A (tied to OUT)
-        "3": 1,       # GND
-        "4": 0,       # NC
-        "5": 0,       # NC
-        "6": 0,       # NC
-        "7": 2,       # EN -> 5V_A (always enabled)
-        "8": 2,       # IN -> 5V_A
-    }
+# ---------------------------------------------------------------------------
+# Channel-pair cell
+# ---------------------------------------------------------------------------
 
-    # ── U4: OPA1678 dual op-amp (SOIC-8) — Sallen-Key ch 1 (A) & ch 2 R (B) ──
-    # Pin 1: OUT_A, Pin 2: IN-_A, Pin 3: IN+_A, Pin 4: V-
-    # Pin 5: IN+_B, Pin 6: IN-_B, Pin 7: OUT_B, Pin 8: V+
-    # Ch 1: Sallen-Key LPF. IN+ = FN1_1 (between R1 and R2), OUT = FOUT_1
-    # IN- tied to OUT (unity gain follower config for Sallen-Key)
-    # Ch R1: IN+ = FN1_R1, OUT = FOUT_R1
-    cn["U4"] = {
-        "1": 37,      # OUT_A -> FOUT_1 (ch 1 filter output)
-        "2": 37,      # IN-_A -> FOUT_1 (tied to output, unity gain)
-        "3": 29,      # IN+_A -> FN1_1 (filter node)
-        "4": 1,       # V- -> GND
-        "5": 50,      # IN+_B -> FN1_R1 (R channel filter node)
-        "6": 54,      # IN-_B -> FOUT_R1 (tied to output)
-        "7": 54,      # OUT_B -> FOUT_R1
-        "8": 2,       # V+ -> 5V_A
+# One OPA1678 with an L channel (jack, ESD, AC coupling, Sallen-Key) and an
+# R channel Sallen-Key, defined once with x relative to the jack bushing and
+# pads on cell-local nets. Each pair stamps it with a translation, its refs
+# and a local -> board net map (build_cells()).
+#
+# Sallen-Key unity gain, per channel:
+#   in -[R_a]-> FN1 -[R_b]-> FILT_IN -> op-amp IN+
+#   C_a: FN1 -> GND; C_b: FILT_IN -> FOUT (op-amp OUT, IN- tied to OUT)
+
+PAIR_PITCH = 20.0   # mm, jack to jack
+JACK_X0 = 10.0      # first jack bushing
+OPAMP_X_MIN = 8.0   # keeps the first L filter column (op-amp x - 6) on the board
+
+# Filter column top to bottom: (role, func, y, value, pad 1, pad 2)
+FILTER_COLUMN = (
+    ("ra", "r0603", 14.5, "1k", "IN_{s}", "FN1_{s}"),
+    ("ca", "c0603", 16, "6.8nF", "FN1_{s}", "GND"),
+    ("rb", "r0603", 19, "1k", "FN1_{s}", "FILT_IN_{s}"),
+    ("cb", "c0603", 20.5, "3.3nF", "FILT_IN_{s}", "FOUT_{s}"),
+)
+CELL_ROLES = ("jack", "esd", "ac", "opamp") + tuple(
+    f"{role}_{s}" for s in "LR" for role, *_ in FILTER_COLUMN)
+
+
+def cell_shape(x):
+    """(op-amp dx, R column dx) for the pair whose jack is at x: op-amp 6 mm
+    left of the jack but not below OPAMP_X_MIN, R column 2 mm right of the
+    jack tip but at least 6 mm right of the op-amp."""
+    op = max(x - 6, OPAMP_X_MIN) - x
+    return op, max(2.0, op + 6)
+
+
+@functools.lru_cache(maxsize=None)
+def channel_cell(op_dx=-6.0, r_dx=2.0):
+    """{role: {"func", "x", "y", "rot", "val", "pads": {pad: local net}}},
+    x relative to the jack. The L filter column sits 6 mm left of the op-amp."""
+    cell = {
+        "jack": {"func": "112bpc", "x": 0, "y": 40, "rot": 90,
+                 "pads": {"T": "JACK", "S": "GND"}},
+        # ESD: Schottky clamp, K = 5V_A, A = signal
+        "esd": {"func": "sod323", "x": -3, "y": 13, "rot": 0,
+                "pads": {"1": "5V_A", "2": "JACK"}},
+        "ac": {"func": "c0805_10u", "x": 3, "y": 12, "rot": 90,
+               "pads": {"1": "JACK", "2": "IN_L"}},
+        # OPA1678 (SOIC-8): A = L channel, B = R channel
+        #   Pin 1: OUT_A, Pin 2: IN-_A, Pin 3: IN+_A, Pin 4: V-
+        #   Pin 5: IN+_B, Pin 6: IN-_B, Pin 7: OUT_B, Pin 8: V+
+        "opamp": {"func": "soic8", "x": op_dx, "y": 17, "rot": 0, "val": "OPA1678",
+                  "pads": {"1": "FOUT_L", "2": "FOUT_L", "3": "FILT_IN_L", "4": "GND",
+                           "5": "FILT_IN_R", "6": "FOUT_R", "7": "FOUT_R", "8": "5V_A"}},
     }
-
-    # ── U5: OPA1678 dual op-amp (SOIC-8) — Sallen-Key ch 3 (A) & ch 4 R (B) ──
-    cn["U5"] = {
-        "1": 39,      # OUT_A -> FOUT_3
-        "2": 39,      # IN-_A -> FOUT_3
-        "3": 31,      # IN+_A -> FN1_3
-        "4": 1,       # V- -> GND
-        "5": 51,      # IN+_B -> FN1_R2
-        "6": 57,      # IN-_B -> FOUT_R2
-        "7": 57,      # OUT_B -> FOUT_R2
-        "8": 2,       # V+ -> 5V_A
+    for s, x in (("L", op_dx - 6), ("R", r_dx)):
+        for role, func, y, val, a, b in FILTER_COLUMN:
+            cell[f"{role}_{s}"] = {"func": func, "x": x, "y": y, "rot": 0, "val": val,
+                                   "pads": {"1": a.format(s=s), "2": b.format(s=s)}}
+    return cell
+
+
+def build_cells():
+    """One stamp per channel pair: {"x": jack x, "shape": cell_shape(x),
+    "refs": {role: ref}, "nets": {local net: board net code}}."""
+    ref = refs()
+    net = {name: code for code, name in NETS.items()}
+    cells = []
+    for p in range(PAIRS):
+        x = JACK_X0 + PAIR_PITCH * p
+        a, b = 2 * p + 1, f"R{p + 1}"
+        roles = {"jack": ref["jack"][p], "esd": ref["esd_l"][p], "ac": ref["ac"][p],
+                 "opamp": ref["opamp"][p]}
+        for s, parts in (("L", ref["filt_l"][p]), ("R", ref["filt_r"][p])):
+            roles.update({f"{role}_{s}": r for (role, *_), r in zip(FILTER_COLUMN, parts)})
+        names = {"GND": "GND", "5V_A": "5V_A", "JACK": f"JACK_{p + 1}",
+                 "IN_L": f"AIN_{a}_AC", "IN_R": f"DAIN_{b}"}
+        for s, ch in (("L", a), ("R", b)):
+            names.update({f"{n}_{s}": f"{n}_{ch}" for n in ("FN1", "FILT_IN", "FOUT")})
+        cells.append({"x": x, "shape": cell_shape(x), "refs": roles,
+                      "nets": {local: net[name] for local, name in names.items()}})
+    return cells
+
+
+def refs():
+    """Reference designators by role, numbered as on the 8-channel board."""
+    P, K = PAIRS, CODECS
+    c_filt = P + 1                      # after the AC-coupling caps
+    c_dec = 5 * P + 1                   # after the four filter-cap banks
+    c_ldo = c_dec + 4 * K
+    return {
+        "codec": [f"U{k + 1}" for k in range(K)],
+        "ldo": f"U{K + 1}",
+        "opamp": [f"U{K + 2 + p}" for p in range(P)],
+        "jack": [f"J{p + 1}" for p in range(P)],
+        "ffc": [f"J{P + 2 * b + 1}" for b in range(PORTS)],
+        "jst": [f"J{P + 2 * b + 2}" for b in range(PORTS)],
+        "esd_l": [f"D{p + 1}" for p in range(P)],
+        "esd_r": [f"D{P + p + 1}" for p in range(P)],
+        "ac": [f"C{p + 1}" for p in range(P)],
+        # per pair: L (R_a, C_a, R_b, C_b), R (R_a, C_a, R_b, C_b)
+        "filt_l": [(f"R{2 * p + 1}", f"C{c_filt + p}", f"R{2 * p + 2}", f"C{c_filt + P + p}")
+                   for p in range(P)],
+        "filt_r": [(f"R{2 * P + 2 * p + 1}", f"C{c_filt + 2 * P + p}",
+                    f"R{2 * P + 2 * p + 2}", f"C{c_filt + 3 * P + p}") for p in range(P)],
+        "dec_100n": [(f"C{c_dec + 2 * k}", f"C{c_dec + 2 * k + 1}") for k in range(K)],
+        "dec_2u2": [(f"C{c_dec + 2 * K + 2 * k}", f"C{c_dec + 2 * K + 2 * k + 1}") for k in range(K)],
+        "ldo_caps": [f"C{c_ldo + i}" for i in range(3)],
+        "dig_caps": [f"C{c_ldo + 3 + b}" for b in range(PORTS)],
+        "pdn": [f"R{4 * P + k + 1}" for k in range(K)],
     }
 
-    # ── U6: OPA1678 dual op-amp (SOIC-8) — Sallen-Key ch 5 (A) & ch 6 R (B) ──
-    cn["U6"] = {
-        "1": 41,      # OUT_A -> FOUT_5
-        "2": 41,      # IN-_A -> FOUT_5
-        "3": 33,      # IN+_A -> FN1_5
-        "4": 1,       # V- -> GND
-        "5": 52,      # IN+_B -> FN1_R3
-        "6": 55,      # IN-_B -> FOUT_R3
-        "7": 55,      # OUT_B -> FOUT_R3
-        "8": 2,       # V+ -> 5V_A
-    }
 
-    # ── U7: OPA1678 dual op-amp (SOIC-8) — Sallen-Key ch 7 (A) & ch 8 R (B) ──
-    cn["U7"] = {
-        "1": 43,      # OUT_A -> FOUT_7
-        "2": 43,      # IN-_A -> FOUT_7
-        "3": 35,      # IN+_A -> FN1_7
-        "4": 1,       # V- -> GND
-        "5": 53,      # IN+_B -> FN1_R4
-        "6": 56,      # IN-_B -> FOUT_R4
-        "7": 56,      # OUT_B -> FOUT_R4
-        "8": 2,       # V+ -> 5V_A
-    }
-
-    # ── J1-J4: Switchcraft 112BPC TS jacks (L channels) ──
-    # Pad T = tip (signal), Pad S = sleeve (ground)
-    cn["J1"] = {"T": 25, "S": 1}   # JACK_1, GND
-    cn["J2"] = {"T": 26, "S": 1}   # JACK_2, GND
-    cn["J3"] = {"T": 27, "S": 1}   # JACK_3, GND
-    cn["J4"] = {"T": 28, "S": 1}   # JACK_4, GND
-
-    # ── J5: FFC 16-pin ZIF (Main Board interconnect) ──
-    # Pinout from pcb-architecture.md:
-    cn["J5"] = {
-        "1": 5,       # MCLK
-        "2": 6,       # BCLK
-        "3": 7,       # LRCLK
-        "4": 9,       # SDOUT1 (U1 codec -> Teensy)
-        "5": 8,       # SDIN1 (Teensy -> codecs)
-        "6": 11,      # SDA
-        "7": 12,      # SCL
-        "8": 4,       # 5V_DIG
-        "9": 2,       # 5V_A (raw, LDO input)
-        "10": 1,      # GND
-        "11": 1,      # GND
-        "12": 1,      # GND
-        "13": 10,     # SDOUT2 (U2 codec -> Teensy)
-        "14": 0,      # spare
-        "15": 0,      # spare
-        "16": 0,      # spare
-    }
+def build_comp_nets():
+    """Build {ref: {pad: net_code}} for all components."""
+    net = {name: code for code, name in NETS.items()}
+    ref = refs()
+    cn = {}
 
-    # ── J6: JST-PH 6-pin (to Daughter Board) ──
-    # Carries 4 R-channel audio signals + power
-    cn["J6"] = {
-        "1": 46,      # DAIN_R1 (ch 2 R)
-        "2": 47,      # DAIN_R2 (ch 4 R)
-        "3": 48,      # DAIN_R3 (ch 6 R)
-        "4": 49,      # DAIN_R4 (ch 8 R)
-        "5": 2,       # 5V_A
-        "6": 1,       # GND
+    # ── Codecs: AK4619VN, pin map + channel-to-ADC table ──
+    for k, u in enumerate(ref["codec"]):
+        bus = _bus(k // CODECS_PER_PORT)
+        pins = {pin: 0 for pin in map(str, range(1, 34))}  # AIN/AOUT/SDOUT2 open
+        pins.update({pin: net[name.format(u=u, bus=bus)] for pin, name in AK4619_PINS.items()})
+        pins["27"] = net[AK4619_CAD[k % CODECS_PER_PORT]]
+        pins["31"] = net[f"SDOUT{k + 1}"]
+        for slot, inputs in CODEC_INPUTS.items():
+            p = k * PAIRS_PER_CODEC + slot
+            if p < PAIRS:
+                pins[inputs["L"]] = net[f"FOUT_{2 * p + 1}"]
+                pins[inputs["R"]] = net[f"FOUT_R{p + 1}"]
+        cn[u] = pins
+
+    # ── LDO: ADP7118 (SOIC-8) — 5V -> 3.3V_A ──
+    # Pin 1: OUT, Pin 2: SENSE, Pin 3: GND, Pin 4-6: NC, Pin 7: EN, Pin 8: IN
+    cn[ref["ldo"]] = {
+        "1": net["V33_A"], "2": net["V33_A"], "3": net["GND"],
+        "4": 0, "5": 0, "6": 0,
+        "7": net["5V_A"],       # EN -> 5V_A (always enabled)
+        "8": net["5V_A"],
     }
 
-    # ── D1-D4: ESD diodes for L channel jacks ──
-    # Schottky clamp to 5V_A rail. Cathode to 5V_A, Anode to signal
-    cn["D1"] = {"1": 2, "2": 25}   # K=5V_A, A=JACK_1
-    cn["D2"] = {"1": 2, "2": 26}   # K=5V_A, A=JACK_2
-    cn["D3"] = {"1": 2, "2": 27}   # K=5V_A, A=JACK_3
-    cn["D4"] = {"1": 2, "2": 28}   # K=5V_A, A=JACK_4
-
-    # ── D5-D8: ESD diodes for R channels (from daughter board) ──
-    cn["D5"] = {"1": 2, "2": 46}   # K=5V_A, A=DAIN_R1
-    cn["D6"] = {"1": 2, "2": 47}   # K=5V_A, A=DAIN_R2
-    cn["D7"] = {"1": 2, "2": 48}   # K=5V_A, A=DAIN_R3
-    cn["D8"] = {"1": 2, "2": 49}   # K=5V_A, A=DAIN_R4
-
-    # ── C1-C4: AC coupling caps (10uF 0805) for L channels ──
-    # Series between jack tip and filter input
-    cn["C1"] = {"1": 25, "2": 17}   # JACK_1 -> AIN_1_AC
-    cn["C2"] = {"1": 26, "2": 19}   # JACK_2 -> AIN_3_AC
-    cn["C3"] = {"1": 27, "2": 21}   # JACK_3 -> AIN_5_AC
-    cn["C4"] = {"1": 28, "2": 23}   # JACK_4 -> AIN_7_AC
-
-    # ── Sallen-Key filter passives ──
-    # Each channel: AIN_x_AC -> R_a -> FN1_x -> R_b -> op-amp IN+
-    # With C_a from FN1 to GND, and C_b from op-amp IN+ to OUT (feedback)
-    # Actually for Sallen-Key unity-gain:
-    #   IN -> R1 -> node1 -> R2 -> IN+(opamp)
-    #   C1 from node1 to GND
-    #   C2 from IN+(opamp) to OUT(opamp)
-    # R1,R2 = 1k; C1 = 6.8nF, C2 = 3.3nF for ~22kHz Butterworth
-
-    # Ch 1 (L): AIN_1_AC -> R1 -> FN1_1 -> R2 -> FN1_1 side of opamp
-    # Wait, let me reconsider. Standard Sallen-Key unity gain:
-    #   Vin -> R1 -> A -> R2 -> B -> (op-amp non-inv input)
-    #   C1: A to GND
-    #   C2: B to op-amp output
-    # So: FN1 = node A (between R1 and R2), and B = op-amp IN+ directly
-    # Actually we need a separate net for node B. But the plan says 2R+2C per ch.
-    # Let me use FN1 for node A and the op-amp IN+ net is effectively node B.
-    # Since C2 goes from B to OUT, and IN- is tied to OUT (unity gain),
-    # C2 connects from op-amp IN+ to op-amp OUT.
-
-    # For the L channels (ch 1,3,5,7 on this board):
-    # Ch 1: AIN_1_AC -[R1]-> FN1_1 -[R2]-> U4 pin3 (IN+_A)
-    #        C_a: FN1_1 to GND; C_b: U4 pin3 to U4 pin1 (OUT_A = FOUT_1)
-    # Ch 3: AIN_3_AC -[R3]-> FN1_3 -[R4]-> U5 pin3
-    # Ch 5: AIN_5_AC -[R5]-> FN1_5 -[R6]-> U6 pin3
-    # Ch 7: AIN_7_AC -[R7]-> FN1_7 -[R8]-> U7 pin3
-
-    # For C_b: it connects op-amp IN+ to OUT. Since both are already defined
-    # as separate nets (FN1 for IN+, FOUT for OUT), C_b bridges them.
-    # But wait: the op-amp IN+ IS the node after R2, which is a new node.
-    # Let me redefine: FN1 = between R1 and R2, and op-amp IN+ has its
-    # own net. But we already mapped op-amp IN+ to FN1_x... That's wrong.
-    # FN1 should be between R1 and R2, and the op-amp IN+ is a DIFFERENT
-    # node that R2 connects to.
-
-    # Actually looking at the plan: "FN1_*, FN2_*" are listed as audio nets.
-    # The plan uses FN1 for the node between the two resistors, and FOUT
-    # for the filter output. The op-amp IN+ connects to a node after R2
-    # which is the same node where C2 connects. Let's call this the op-amp
-    # input node = same as what we feed to op-amp IN+.
-
-    # I already mapped op-amp IN+ (e.g. U4 pin3) to FN1_1. So FN1_1 IS
-    # the op-amp IN+ node. Then R1 goes from AIN_AC to some intermediate
-    # node, and R2 goes from that node to FN1_1 (op-amp IN+).
-    # That intermediate node needs its own net. Let's reuse: the "between
-    # R1 and R2" node can be called FN2_x, and FN1_x is the op-amp input.
-
-    # Actually let me simplify. The standard Sallen-Key has:
-    #   Vin --R1-- A --R2-- B -- (op-amp +)
-    #                |            |
-    #               C1           C2 -- (op-amp out)
-    #                |
-    #               GND
-    # Node A = between R1 and R2 (with C1 to GND)
-    # Node B = op-amp non-inv input (with C2 to output)
-    # In our mapping: A needs its own net, B = FN1_x (op-amp IN+)
-    # But we only have 2 filter nodes budgeted per channel.
-
-    # Let me reassign: use intermediate nets for node A.
-    # We have enough net numbers. Let me add FN2 nets for node A.
-    # Actually, I realize I was overcomplicating this. Looking at the plan
-    # more carefully, FN1 = node A, FOUT = filter output. The connection
-    # from R2 to op-amp IN+ is direct - the op-amp IN+ net IS the same
-    # net going into the op-amp. Let me use a simpler model:
-    #   AIN_AC -[R_a]-> FN1 (node A, C_a here to GND)
-    #   FN1 -[R_b]-> op-amp IN+ = let's give this net FN2
-    #   C_b: FN2 to FOUT
-    # This means I need FN2 nets. But FN2 isn't in my net list...
-    # The op-amp IN+ was mapped to FN1, which is wrong for Sallen-Key.
-
-    # OK let me fix the nets and op-amp mappings. I'll remap:
-    # - FN1_x = node between R1 and R2 (node A)
-    # - Op-amp IN+ = a new net (we can just use the pin connection directly)
-    # Since I have 57 nets already and need 8 more for the B nodes,
-    # that's fine but getting complex. A simpler approach:
-    # Just wire it correctly. The op-amp IN+ for ch1 is NOT FN1_1.
-    # FN1_1 is between the two resistors. Let me fix.
-
-    # I'll keep the current net numbering but fix the meanings.
-    # FN1_x = node A (between R1 and R2 + C_a to GND)
-    # FOUT_x = op-amp output (also C_b connects here)
-    # We need a node B between R2, C_b, and op-amp IN+.
-    # But since C_b goes to FOUT and R2 comes from FN1,
-    # node B is ONLY connected to: R2 output, C_b, op-amp IN+
-    # This is effectively the op-amp non-inv input net.
-
-    # For simplicity, since Sallen-Key unity-gain has IN- = OUT,
-    # C_b from node_B to FOUT creates the feedback. The op-amp
-    # just buffers node_B filtered by C_b.
-    # In practice for PCB routing, having a separate "node B" net
-    # is correct but adds complexity. Many implementations just
-    # treat R2->opamp_IN+ as a short trace with C_b nearby.
-
-    # Let me just make the op-amp IN+ be its own net per channel.
-    # I don't need to name them all - I can reuse the FN1 concept.
-
-    # FINAL DECISION: Keep it simple.
-    # FN1_x connects: R_a pad2, R_b pad1, C_a pad1 (C_a pad2 = GND)
-    # Op-amp IN+ gets its own implicit net = FOUT is op-amp output.
-    # The C_b cap bridges op-amp IN+ to FOUT.
-    # The op-amp IN+ net only touches: R_b pad2, C_b pad1, op-amp IN+ pin.
-    # Since this net is very local, I'll just assign the op-amp IN+ pin
-    # the FN1 net and have R_b be from AIN_AC directly to FN1, making
-    # R_a + C_a + R_b one combined filter section.
-
-    # Actually, I think the cleanest approach for the PCB is:
-    # Single-R + single-C per op-amp section (1st order), giving 2nd order
-    # total across two op-amp sections. But the plan says "2R + 2C per channel"
-    # with dual op-amps (each OPA1678 handles 2 channels).
-
-    # Let me just do: proper 2nd order Sallen-Key.
-    # Net assignments per L channel (using ch1 as example):
-    #   AIN_1_AC --[R1]--> FN1_1 --[R2]--> (op-amp IN+)
-    #   C5: FN1_1 to GND
-    #   C6: (op-amp IN+) to FOUT_1 (= op-amp OUT)
-    # The op-amp IN+ node needs a net. I'll encode it in the FOUT net
-    # directly since C_b ties it to the output anyway and in- = out.
-    # Wait no, that shorts R2 output to op-amp output via C_b at DC!
-    # C_b is a capacitor so no DC short. The op-amp IN+ is a distinct node.
-
-    # I need 8 more nets for the L+R channel op-amp input nodes.
-    # OR I can note that in Sallen-Key, the cap C2 goes from the
-    # op-amp input to the op-amp output, so we DO need a separate net.
-    # Let me just have R2 connect to FN1 as well (merge nodes A and B)
-    # and skip C_b... No, that changes the filter topology.
-
-    # PRAGMATIC SOLUTION: In the PCB, R_b pad2 and C_b pad1 and op-amp IN+
-    # are all on the same tiny net. I'll just assign the op-amp IN+ pin
-    # directly in the component nets, creating implicit local nets.
-    # These are effectively "opamp input" nets per channel section.
-
-    # Renumber: let FN1_x be between R1+R2 (node A with C_a to GND).
-    # FOUT_x is op-amp output. And I'll NOT have a named net for the
-    # op-amp IN+ / C_b / R2 output junction — instead I'll just connect
-    # them by assigning the same net code to all three pads.
-
-    # I need to pick net codes for these. Let me extend the net list.
-    # ... actually this is already handled by the FN1 nets if I
-    # restructure slightly. Let me just be explicit:
-
-    # For ch1 L:
-    #   R1: pad1=AIN_1_AC(17), pad2=FN1_1(29)    [R1 = series input]
-    #   R2: pad1=FN1_1(29), pad2=29               [WAIT - R2 output needs different net]
-
-    # OK I'm going in circles. Let me just add the needed nets.
-    # I'll use nets 58-65 for "op-amp input" nodes.
-    # But first, let me reconsider: do I even need all those filter
-    # nodes as separate nets for PCB routing? FreeRouter needs unique
-    # net names for each electrical node. So yes.
-
-    # For now, let me merge nodes A and B into one net (FN1).
-    # This means R1 and R2 are in series from AIN_AC to FN1,
-    # and both C_a (to GND) and C_b (to FOUT) hang off FN1.
-    # This IS actually a valid 2nd-order MFB (multiple feedback)
-    # topology variant, not Sallen-Key. But for the PCB layout
-    # it routes essentially the same. The exact component values
-    # would differ but the physical layout is identical.
-
-    # FINAL ANSWER: Use a single filter node FN1 per channel.
-    # R_a: AIN_AC -> FN1, R_b: FN1 -> op-amp IN+ (= FN1, same net)
-    # Wait that makes R_b a 0-ohm jumper since both ends are FN1.
-    # That doesn't work either.
-
-    # Let me step back and use the CORRECT Sallen-Key topology with
-    # proper separate nets. I'll extend the net dictionary.
-
-    # Ch 1 L Sallen-Key:
-    #   AIN_1_AC -[R1]-> FN1_1 -[R2]-> FILT_IN_1 -> opamp IN+
-    #   C_a: FN1_1 -> GND
-    #   C_b: FILT_IN_1 -> FOUT_1 (opamp OUT)
-
-    # I'll hardcode: reassign op-amp pin3 from FN1 to a new FILT_IN net.
-    # The plan's net count is ~57. I need 8 more = 65 total. Fine.
-
-    # -- end of deliberation, implementing clean version --
-
-    # Fix: reassign op-amp IN+ pins to proper filter input nets
-    # Re-patch U4-U7 after adding new nets (done below in net extension)
-
-    # L channel filter resistors (R1-R8): 1k each
-    # Ch 1: R1(AIN_1_AC->FN1_1), R2(FN1_1->filtIN_1)
-    cn["R1"] = {"1": 17, "2": 29}    # AIN_1_AC -> FN1_1
-    cn["R2"] = {"1": 29, "2": 58}    # FN1_1 -> FILT_IN_1 (net 58)
-
-    cn["R3"] = {"1": 19, "2": 31}    # AIN_3_AC -> FN1_3
-    cn["R4"] = {"1": 31, "2": 59}    # FN1_3 -> FILT_IN_3
-
-    cn["R5"] = {"1": 21, "2": 33}    # AIN_5_AC -> FN1_5
-    cn["R6"] = {"1": 33, "2": 60}    # FN1_5 -> FILT_IN_5
-
-    cn["R7"] = {"1": 23, "2": 35}    # AIN_7_AC -> FN1_7
-    cn["R8"] = {"1": 35, "2": 61}    # FN1_7 -> FILT_IN_7
-
-    # R channel filter resistors (R9-R16): 1k each
-    # R channels come from daughter board via JST
-    cn["R9"]  = {"1": 46, "2": 50}   # DAIN_R1 -> FN1_R1
-    cn["R10"] = {"1": 50, "2": 62}   # FN1_R1 -> FILT_IN_R1
-
-    cn["R11"] = {"1": 47, "2": 51}   # DAIN_R2 -> FN1_R2
-    cn["R12"] = {"1": 51, "2": 63}   # FN1_R2 -> FILT_IN_R2
-
-    cn["R13"] = {"1": 48, "2": 52}   # DAIN_R3 -> FN1_R3
-    cn["R14"] = {"1": 52, "2": 64}   # FN1_R3 -> FILT_IN_R3
-
-    cn["R15"] = {"1": 49, "2": 53}   # DAIN_R4 -> FN1_R4
-    cn["R16"] = {"1": 53, "2": 65}   # FN1_R4 -> FILT_IN_R4
-
-    # L channel filter caps
-    # C_a (6.8nF): FN1 -> GND
-    cn["C5"]  = {"1": 29, "2": 1}    # FN1_1 -> GND
-    cn["C6"]  = {"1": 31, "2": 1}    # FN1_3 -> GND
-    cn["C7"]  = {"1": 33, "2": 1}    # FN1_5 -> GND
-    cn["C8"]  = {"1": 35, "2": 1}    # FN1_7 -> GND
-
-    # C_b (3.3nF): FILT_IN -> FOUT (op-amp IN+ to OUT, feedback)
-    cn["C9"]  = {"1": 58, "2": 37}   # FILT_IN_1 -> FOUT_1
-    cn["C10"] = {"1": 59, "2": 39}   # FILT_IN_3 -> FOUT_3
-    cn["C11"] = {"1": 60, "2": 41}   # FILT_IN_5 -> FOUT_5
-    cn["C12"] = {"1": 61, "2": 43}   # FILT_IN_7 -> FOUT_7
-
-    # R channel filter caps
-    # C_a (6.8nF): FN1_R -> GND
-    cn["C13"] = {"1": 50, "2": 1}    # FN1_R1 -> GND
-    cn["C14"] = {"1": 51, "2": 1}    # FN1_R2 -> GND
-    cn["C15"] = {"1": 52, "2": 1}    # FN1_R3 -> GND
-    cn["C16"] = {"1": 53, "2": 1}    # FN1_R4 -> GND
-
-    # C_b (3.3nF): FILT_IN_R -> FOUT_R
-    cn["C17"] = {"1": 62, "2": 54}   # FILT_IN_R1 -> FOUT_R1
-    cn["C18"] = {"1": 63, "2": 57}   # FILT_IN_R2 -> FOUT_R2
-    cn["C19"] = {"1": 64, "2": 55}   # FILT_IN_R3 -> FOUT_R3
-    cn["C20"] = {"1": 65, "2": 56}   # FILT_IN_R4 -> FOUT_R4
-
-    # Codec decoupling: 100nF ceramic close to AVDD and TVDD
-    cn["C21"] = {"1": 3, "2": 1}     # U1 AVDD decoupling: V33_A -> GND
-    cn["C22"] = {"1": 3, "2": 1}     # U1 TVDD decoupling: V33_A -> GND
-    cn["C23"] = {"1": 3, "2": 1}     # U2 AVDD decoupling: V33_A -> GND
-    cn["C24"] = {"1": 3, "2": 1}     # U2 TVDD decoupling: V33_A -> GND
-
-    # Codec decoupling: 2.2uF for AVDRV and VCOM
-    cn["C25"] = {"1": 13, "2": 1}    # U1 AVDRV: U1_AVDRV -> GND
-    cn["C26"] = {"1": 14, "2": 1}    # U1 VCOM: U1_VCOM -> GND
-    cn["C27"] = {"1": 15, "2": 1}    # U2 AVDRV: U2_AVDRV -> GND
-    cn["C28"] = {"1": 16, "2": 1}    # U2 VCOM: U2_VCOM -> GND
-
-    # LDO decoupling
-    cn["C29"] = {"1": 2, "2": 1}     # LDO input: 5V_A -> GND (100nF)
-    cn["C30"] = {"1": 3, "2": 1}     # LDO output: V33_A -> GND (1uF)
-    cn["C31"] = {"1": 3, "2": 1}     # LDO output bulk: V33_A -> GND (10uF)
-    cn["C32"] = {"1": 4, "2": 1}     # 5V_DIG local: 5V_DIG -> GND (100nF)
-
-    # PDN pull-up resistors
-    cn["R17"] = {"1": 3, "2": 3}     # V33_A to U1 PDN (both sides V33_A since PDN pin=V33_A)
-    cn["R18"] = {"1": 3, "2": 3}     # V33_A to U2 PDN
-
-    # Fix: update op-amp IN+ pins to use FILT_IN nets instead of FN1
-    cn["U4"]["3"] = 58     # IN+_A -> FILT_IN_1
-    cn["U4"]["5"] = 62     # IN+_B -> FILT_IN_R1
-    cn["U5"]["3"] = 59     # IN+_A -> FILT_IN_3
-    cn["U5"]["5"] = 63     # IN+_B -> FILT_IN_R2
-    cn["U6"]["3"] = 60     # IN+_A -> FILT_IN_5
-    cn["U6"]["5"] = 64     # IN+_B -> FILT_IN_R3
-    cn["U7"]["3"] = 61     # IN+_A -> FILT_IN_7
-    cn["U7"]["5"] = 65     # IN+_B -> FILT_IN_R4
+    # ── Channel pairs: stamped cells, plus the R-channel ESD by each JST ──
+    for p, stamp in enumerate(CELLS):
+        for role, part in channel_cell(*stamp["shape"]).items():
+            cn[stamp["refs"][role]] = {pad: stamp["nets"][n] for pad, n in part["pads"].items()}
+        cn[ref["esd_r"][p]] = {"1": net["5V_A"], "2": net[f"DAIN_R{p + 1}"]}
+
+    # ── Ports: FFC 16-pin ZIF (Main Board) + JST-PH 6-pin (Daughter Board) ──
+    # FFC pinout from pcb-architecture.md; pins 14-16 spare
+    for b in range(PORTS):
+        bus = _bus(b)
+        k0 = b * CODECS_PER_PORT
+        sdout = [net.get(f"SDOUT{k + 1}", 0) for k in (k0, k0 + 1)]
+        cn[ref["ffc"][b]] = {
+            "1": net["MCLK" + bus], "2": net["BCLK" + bus], "3": net["LRCLK" + bus],
+            "4": sdout[0],                  # first codec -> Teensy
+            "5": net["SDIN1" + bus],        # Teensy -> codecs
+            "6": net["SDA" + bus], "7": net["SCL" + bus],
+            "8": net["5V_DIG"],
+            "9": net["5V_A"],               # raw, LDO input
+            "10": net["GND"], "11": net["GND"], "12": net["GND"],
+            "13": sdout[1],                 # second codec -> Teensy
+            "14": 0, "15": 0, "16": 0,
+        }
+        # JST pins 1-4: R channels of this port, 5: 5V_A, 6: GND
+        jst = {str(i + 1): 0 for i in range(PAIRS_PER_PORT)}
+        for i, p in enumerate(range(b * PAIRS_PER_PORT, min((b + 1) * PAIRS_PER_PORT, PAIRS))):
+            jst[str(i + 1)] = net[f"DAIN_R{p + 1}"]
+        jst.update({"5": net["5V_A"], "6": net["GND"]})
+        cn[ref["jst"][b]] = jst
+
+    # ── Decoupling ──
+    for k, u in enumerate(ref["codec"]):
+        for c in ref["dec_100n"][k]:                        # AVDD, TVDD: 100nF
+            cn[c] = {"1": net["V33_A"], "2": net["GND"]}
+        avdrv, vcom = ref["dec_2u2"][k]                     # 2.2uF
+        cn[avdrv] = {"1": net[f"{u}_AVDRV"], "2": net["GND"]}
+        cn[vcom] = {"1": net[f"{u}_VCOM"], "2": net["GND"]}
+        cn[ref["pdn"][k]] = {"1": net["V33_A"], "2": net["V33_A"]}  # PDN pull-up (PDN pin = V33_A)
+    c_in, c_out, c_bulk = ref["ldo_caps"]
+    cn[c_in] = {"1": net["5V_A"], "2": net["GND"]}         # LDO input, 100nF
+    cn[c_out] = {"1": net["V33_A"], "2": net["GND"]}       # LDO output, 1uF
+    cn[c_bulk] = {"1": net["V33_A"], "2": net["GND"]}      # LDO output bulk, 10uF
+    for c in ref["dig_caps"]:
+        cn[c] = {"1": net["5V_DIG"], "2": net["GND"]}      # 5V_DIG local, 100nF per FFC
 
     return cn
 
 
-# Extend NETS with the op-amp input filter nodes
-NETS.update({
-    58: "FILT_IN_1",
-    59: "FILT_IN_3",
-    60: "FILT_IN_5",
-    61: "FILT_IN_7",
-    62: "FILT_IN_R1",
-    63: "FILT_IN_R2",
-    64: "FILT_IN_R3",
-    65: "FILT_IN_R4",
-})
-
-COMP_NETS = build_comp_nets()
-
-
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -785,11 +505,37 @@ def _fp_wrapper(lib_name, ref, value, x, y, rotation, pad_lines, silk="",
 # Footprint generators
 # ---------------------------------------------------------------------------
 
+def thermal_via_array(ep_size, net_code, rows=EP_VIA_ROWS, cols=EP_VIA_COLS,
+                      drill=EP_VIA_DRILL, pitch=EP_VIA_PITCH, name="33"):
+    """rows x cols plated vias centred in a square exposed pad, as pads named
+    like the EP so they join its net. The pitch shrinks to keep the array
+    inside the pad; vias connect solidly to the planes (zone_connect 2)."""
+    size = round(drill + 2 * EP_VIA_ANNULAR, 3)
+    span = max(rows, cols) - 1
+    if span:
+        pitch = min(pitch, (ep_size - size) / span)
+        if pitch < size + EP_VIA_SPACING:
+            raise ValueError(f"{rows}x{cols} vias of {drill} mm do not fit a {ep_size} mm pad")
+    net_name = NETS.get(net_code, "")
+    pads = []
+    for vr in range(rows):
+        for vc in range(cols):
+            vx = round((vc - (cols - 1) / 2) * pitch, 4)
+            vy = round((vr - (rows - 1) / 2) * pitch, 4)
+            pads.append(
+                f'    (pad "{name}" thru_hole circle (at {vx} {vy}) '
+                f'(size {size} {size}) (drill {drill}) (layers "*.Cu" "*.Mask") '
+                f'(net {net_code} "{net_name}") (zone_connect 2) (uuid "{gen_uuid()}"))'
+            )
+    return pads
+
+
 def fp_qfn32(ref, x, y, rotation, nets):
     """QFN-32 (AK4619VN). 5x5mm body, 0.5mm pitch, 32 pins + exposed pad.
     Pad-to-pad span: 5.0mm body, pads extend 0.5mm beyond body edge.
     Pad size: 0.8mm x 0.25mm (length x width along pad row).
-    Exposed pad: 3.45mm x 3.45mm with 3x3 thermal via array."""
+    Exposed pad: 3.45mm x 3.45mm with an EP_VIA_ROWS x EP_VIA_COLS thermal
+    via array."""
     pads = []
 
     # QFN-32: 8 pins per side, 0.5mm pitch
@@ -850,17 +596,8 @@ def fp_qfn32(ref, x, y, rotation, nets):
         f'(net {ep_net} "{NETS.get(ep_net, "")}") (uuid "{gen_uuid()}"))'
     )
 
-    # Thermal vias in exposed pad (3x3 array, 0.3mm drill, 0.6mm pad)
-    via_pitch = 1.0
-    for vr in range(-1, 2):
-        for vc in range(-1, 2):
-            vx = vc * via_pitch
-            vy = vr * via_pitch
-            pads.append(
-                f'    (pad "33" thru_hole circle (at {vx} {vy}) '
-                f'(size 0.6 0.6) (drill 0.3) (layers "*.Cu" "*.Mask") '
-                f'(net {ep_net} "{NETS.get(ep_net, "")}") (uuid "{gen_uuid()}"))'
-            )
+    # Thermal vias in exposed pad
+    pads += thermal_via_array(ep_size, ep_net)
 
     silk = _silk_rect(-2.7, -2.7, 2.7, 2.7)
     # Pin 1 marker
@@ -1041,128 +778,226 @@ def fp_112bpc(ref, x, y, rotation, nets):
   )"""
 
 
+def footprint(ref, info, nets):
+    """Footprint text for a PLACEMENTS entry."""
+    func_name = info["func"]
+    x, y, rot = info["x"], info["y"], info["rot"]
+    val = info.get("val", "")
+
+    if func_name == "qfn32":
+        return fp_qfn32(ref, x, y, rot, nets)
+    elif func_name == "soic8":
+        return fp_soic8(ref, x, y, rot, nets, val)
+    elif func_name == "sod323":
+        return fp_sod323(ref, x, y, rot, nets)
+    elif func_name == "c0603":
+        return fp_c0603(ref, x, y, rot, nets, val or "100nF")
+    elif func_name in ("c0805", "c0805_10u"):
+        v = "10uF" if "10u" in func_name else (val or "10uF")
+        return fp_c0805(ref, x, y, rot, nets, v)
+    elif func_name == "r0603":
+        return fp_r0603(ref, x, y, rot, nets, val or "1k")
+    elif func_name == "ffc_16pin":
+        return fp_ffc_16pin(ref, x, y, rot, nets)
+    elif func_name == "jst_ph_6":
+        return fp_jst_ph_6(ref, x, y, rot, nets)
+    elif func_name == "112bpc":
+        return fp_112bpc(ref, x, y, rot, nets)
+    raise ValueError(f"{ref}: unknown footprint {func_name!r}")
+
+
+# ---------------------------------------------------------------------------
+# Cell templates
+# ---------------------------------------------------------------------------
+
+# A cell part's footprint is generated once per cell shape with placeholder
+# net codes, then split into literal text and slots: the footprint (at x y),
+# the reference, uuids and nets. Stamping a pair only fills the slots.
+
+CELL_NET0 = 1 << 20     # placeholder net codes (cell-local net index + this)
+
+_SLOT_RE = re.compile(
+    r'\(property "Reference" "(?P<ref>[^"]*)"'
+    r'|\(uuid "(?P<uuid>[0-9a-f-]{36})"\)'
+    r'|(?P<net>\(net (?P<code>\d+) ""\))'
+    r'|\(at (?P<at>-?[\d.]+ -?[\d.]+)'
+)
+
+
+@functools.lru_cache(maxsize=None)
+def cell_template(shape, role):
+    """Compiled footprint of one cell part: [str | ("at", x, y) | ("ref",) |
+    ("uuid", i) | ("net", local net)]."""
+    part = channel_cell(*shape)[role]
+    local = sorted(set(part["pads"].values()))
+    nets = {pad: CELL_NET0 + local.index(n) for pad, n in part["pads"].items()}
+    text = footprint(role, part, nets)
+
+    out, pos, n_uuid, placed = [], 0, 0, False
+    for m in _SLOT_RE.finditer(text):
+        if m.group("ref") is not None:
+            span, slot = m.span("ref"), ("ref",)
+        elif m.group("uuid"):
+            span, slot = m.span("uuid"), ("uuid", n_uuid)
+            n_uuid += 1
+        elif m.group("net") and int(m.group("code")) >= CELL_NET0:
+            span, slot = m.span("net"), ("net", local[int(m.group("code")) - CELL_NET0])
+        elif not placed:                # the footprint's own position; pads stay local
+            x, y = m.group("at").split()
+            span, slot = m.span("at"), ("at", float(x), float(y))
+            placed = True
+        else:
+            continue
+        out += [text[pos:span[0]], slot]
+        pos = span[1]
+    out.append(text[pos:])
+    return out
+
+
+def stamp_footprint(stamp, role):
+    """Footprint text of one part of a stamped channel pair (see build_cells)."""
+    base = gen_uuid()[:24]              # unique per stamp; slot index fills the rest
+    out = []
+    for chunk in cell_template(stamp["shape"], role):
+        if isinstance(chunk, str):
+            out.append(chunk)
+        elif chunk[0] == "at":
+            out.append(f"{chunk[1] + stamp['x']:g} {chunk[2]:g}")
+        elif chunk[0] == "ref":
+            out.append(stamp["refs"][role])
+        elif chunk[0] == "uuid":
+            out.append(f"{base}{chunk[1]:012x}")
+        else:
+            code = stamp["nets"][chunk[1]]
+            out.append(f'(net {code} "{NETS[code]}")')
+    return "".join(out)
+
+
 # ---------------------------------------------------------------------------
 # Component placement
 # ---------------------------------------------------------------------------
 
-# All coordinates are (x, y) on the 80x30mm board
-# y=0 is interior edge (FFC/JST connectors), y=30 is panel edge (jacks)
+# All coordinates are (x, y) on the board, y=0 interior edge (FFC/JST
+# connectors), y=40 panel edge (jacks). Each FFC port owns PORT_W of width;
+# channel pairs tile left to right at PAIR_PITCH, codecs at 2 * PAIR_PITCH.
+
+CODEC_X0 = 20.0     # first codec, centred over its two jacks
+
+
+def build_placements():
+    """Build {ref: {"func", "x", "y", "rot"[, "val"]}}, zone by zone.
+
+    Channel-pair parts also carry "cell" (index into CELLS) and "role", so
+    generate_pcb() can stamp them from the cell template.
+    """
+    ref = refs()
+    pl = {}
+
+    def put(r, func, x, y, rot=0, val=None):
+        pl[r] = {"func": func, "x": x, "y": y, "rot": rot}
+        if val:
+            pl[r]["val"] = val
+
+    def put_cells(*roles):
+        for k, stamp in enumerate(CELLS):
+            cell = channel_cell(*stamp["shape"])
+            for role in roles:
+                part, r = cell[role], stamp["refs"][role]
+                put(r, part["func"], stamp["x"] + part["x"], part["y"], part["rot"], part.get("val"))
+                pl[r].update(cell=k, role=role)
 
-PLACEMENTS = {
     # ═══════════════════════════════════════════════════════════════════
     # ZONE A (y=0-5): Connectors + LDO
     # Board is lower board in pair; daughter sits above (y=0 interior)
     # ═══════════════════════════════════════════════════════════════════
-    "U3":  {"func": "soic8",     "x": 6,  "y": 3,   "rot": 0,  "val": "ADP7118"},
-    "J5":  {"func": "ffc_16pin", "x": 30, "y": 2,   "rot": 0},
-    "J6":  {"func": "jst_ph_6",  "x": 65, "y": 2,   "rot": 0},
-    # LDO decoupling (C29 at y=6.5 clears U3 pin 4, C31 shifted to x=16)
-    "C29": {"func": "c0603",     "x": 2,  "y": 6.5, "rot": 0,  "val": "100nF"},
-    "C30": {"func": "c0805",     "x": 12, "y": 2,   "rot": 0,  "val": "1uF"},
-    "C31": {"func": "c0805",     "x": 16, "y": 2,   "rot": 0,  "val": "10uF"},
-    "C32": {"func": "c0603",     "x": 42, "y": 2,   "rot": 0,  "val": "100nF"},
+    put(ref["ldo"], "soic8", 6, 3, val="ADP7118")
+    for b in range(PORTS):
+        put(ref["ffc"][b], "ffc_16pin", b * PORT_W + 30, 2)
+        put(ref["jst"][b], "jst_ph_6", b * PORT_W + 65, 2)
+    # LDO decoupling (C_in at y=6.5 clears LDO pin 4, bulk shifted to x=16)
+    c_in, c_out, c_bulk = ref["ldo_caps"]
+    put(c_in, "c0603", 2, 6.5, val="100nF")
+    put(c_out, "c0805", 12, 2, val="1uF")
+    put(c_bulk, "c0805", 16, 2, val="10uF")
+    for b in range(PORTS):
+        put(ref["dig_caps"][b], "c0603", b * PORT_W + 42, 2, val="100nF")
 
     # ═══════════════════════════════════════════════════════════════════
     # ZONE B (y=4-12): Codecs + decoupling
     # U1 at (20,7): QFN pads x=16.85..23.15, y=3.85..10.15
-    # U2 at (60,7): QFN pads x=56.85..63.15, y=3.85..10.15
     # ═══════════════════════════════════════════════════════════════════
-    "U1":  {"func": "qfn32",     "x": 20, "y": 7,   "rot": 0},
-    "U2":  {"func": "qfn32",     "x": 60, "y": 7,   "rot": 0},
-    # PDN pull-ups (moved left to 0.875mm gap from QFN pin 32)
-    "R17": {"func": "r0603",     "x": 16, "y": 4,   "rot": 0,  "val": "10k"},
-    "R18": {"func": "r0603",     "x": 56, "y": 4,   "rot": 0,  "val": "10k"},
-    # U1 decoupling (C22 moved to y=6 to clear R17)
-    "C21": {"func": "c0603",     "x": 25, "y": 9,   "rot": 0,  "val": "100nF"},
-    "C22": {"func": "c0603",     "x": 15, "y": 6,   "rot": 0,  "val": "100nF"},
-    "C25": {"func": "c0805",     "x": 16, "y": 10,  "rot": 0,  "val": "2.2uF"},
-    "C26": {"func": "c0805",     "x": 25, "y": 7,   "rot": 0,  "val": "2.2uF"},
-    # U2 decoupling (mirrored)
-    "C23": {"func": "c0603",     "x": 65, "y": 9,   "rot": 0,  "val": "100nF"},
-    "C24": {"func": "c0603",     "x": 55, "y": 6,   "rot": 0,  "val": "100nF"},
-    "C27": {"func": "c0805",     "x": 56, "y": 10,  "rot": 0,  "val": "2.2uF"},
-    "C28": {"func": "c0805",     "x": 65, "y": 7,   "rot": 0,  "val": "2.2uF"},
+    xs = [CODEC_X0 + 2 * PAIR_PITCH * k for k in range(CODECS)]
+    for u, x in zip(ref["codec"], xs):
+        put(u, "qfn32", x, 7)
+    # PDN pull-ups (0.875mm gap from QFN pin 32)
+    for r, x in zip(ref["pdn"], xs):
+        put(r, "r0603", x - 4, 4, val="10k")
+    # AVDD 100nF right, TVDD 100nF left (y=6 clears the PDN pull-up),
+    # AVDRV 2.2uF lower left, VCOM 2.2uF right
+    for (avdd, tvdd), (avdrv, vcom), x in zip(ref["dec_100n"], ref["dec_2u2"], xs):
+        put(avdd, "c0603", x + 5, 9, val="100nF")
+        put(tvdd, "c0603", x - 5, 6, val="100nF")
+        put(avdrv, "c0805", x - 4, 10, val="2.2uF")
+        put(vcom, "c0805", x + 5, 7, val="2.2uF")
 
     # ═══════════════════════════════════════════════════════════════════
     # ZONE C (y=11-16): ESD diodes + AC coupling
     # 40mm board: jack tips at y=22.22, sleeves at y=28.57
     # ═══════════════════════════════════════════════════════════════════
     # L-channel ESD (offset from jack x-positions)
-    "D1":  {"func": "sod323",    "x": 7,  "y": 13,  "rot": 0},
-    "D2":  {"func": "sod323",    "x": 27, "y": 13,  "rot": 0},
-    "D3":  {"func": "sod323",    "x": 47, "y": 13,  "rot": 0},
-    "D4":  {"func": "sod323",    "x": 67, "y": 13,  "rot": 0},
-    # R-channel ESD (vertical column at x=77, clear of passive cols)
-    "D5":  {"func": "sod323",    "x": 77, "y": 4,   "rot": 0},
-    "D6":  {"func": "sod323",    "x": 77, "y": 6,   "rot": 0},
-    "D7":  {"func": "sod323",    "x": 77, "y": 8,   "rot": 0},
-    "D8":  {"func": "sod323",    "x": 77, "y": 10,  "rot": 0},
+    put_cells("esd")
+    # R-channel ESD (vertical column beside each JST, clear of passive cols)
+    for p, d in enumerate(ref["esd_r"]):
+        put(d, "sod323", (p // PAIRS_PER_PORT) * PORT_W + 77, 4 + 2 * (p % PAIRS_PER_PORT))
     # AC coupling caps (10uF 0805, rot=90, between ESD and filter zones)
-    "C1":  {"func": "c0805_10u", "x": 13, "y": 12,  "rot": 90},
-    "C2":  {"func": "c0805_10u", "x": 33, "y": 12,  "rot": 90},
-    "C3":  {"func": "c0805_10u", "x": 53, "y": 12,  "rot": 90},
-    "C4":  {"func": "c0805_10u", "x": 73, "y": 12,  "rot": 90},
+    put_cells("ac")
 
     # ═══════════════════════════════════════════════════════════════════
     # ZONE D (y=14-22): Op-amps + filter passives
-    # Jacks at y=40: tips at (10/30/50/70, 22.22), sleeves at y=28.57
-    # Op-amps at y=17, passive cols at opamp_x ± 6
+    # Jacks at y=40: tips at (jack x, 22.22), sleeves at y=28.57
+    # Op-amps at y=17, filter columns either side (channel_cell, cell_shape)
     # All passive-to-opamp clearances verified ≥ 1.3mm
-    # R-channel cols shifted +2mm from jack-tip x (x=32/52/72)
     # ═══════════════════════════════════════════════════════════════════
-    "J1":  {"func": "112bpc",    "x": 10, "y": 40,  "rot": 90},
-    "J2":  {"func": "112bpc",    "x": 30, "y": 40,  "rot": 90},
-    "J3":  {"func": "112bpc",    "x": 50, "y": 40,  "rot": 90},
-    "J4":  {"func": "112bpc",    "x": 70, "y": 40,  "rot": 90},
-
-    "U4":  {"func": "soic8",     "x": 8,  "y": 17,  "rot": 0,  "val": "OPA1678"},
-    "U5":  {"func": "soic8",     "x": 24, "y": 17,  "rot": 0,  "val": "OPA1678"},
-    "U6":  {"func": "soic8",     "x": 44, "y": 17,  "rot": 0,  "val": "OPA1678"},
-    "U7":  {"func": "soic8",     "x": 64, "y": 17,  "rot": 0,  "val": "OPA1678"},
-
-    # Filter passives: columns at opamp_x ± 6
-    # Each column: R_a(y=14.5), C_a(y=16), R_b(y=19), C_b(y=20.5)
-
-    # U4 group: ch1 L (col x=2) + ch2 R (col x=14)
-    "R1":  {"func": "r0603",     "x": 2,  "y": 14.5, "rot": 0, "val": "1k"},
-    "C5":  {"func": "c0603",     "x": 2,  "y": 16,   "rot": 0, "val": "6.8nF"},
-    "R2":  {"func": "r0603",     "x": 2,  "y": 19,   "rot": 0, "val": "1k"},
-    "C9":  {"func": "c0603",     "x": 2,  "y": 20.5, "rot": 0, "val": "3.3nF"},
-    "R9":  {"func": "r0603",     "x": 14, "y": 14.5, "rot": 0, "val": "1k"},
-    "C13": {"func": "c0603",     "x": 14, "y": 16,   "rot": 0, "val": "6.8nF"},
-    "R10": {"func": "r0603",     "x": 14, "y": 19,   "rot": 0, "val": "1k"},
-    "C17": {"func": "c0603",     "x": 14, "y": 20.5, "rot": 0, "val": "3.3nF"},
-
-    # U5 group: ch3 L (col x=18) + ch4 R (col x=32, shifted from 30)
-    "R3":  {"func": "r0603",     "x": 18, "y": 14.5, "rot": 0, "val": "1k"},
-    "C6":  {"func": "c0603",     "x": 18, "y": 16,   "rot": 0, "val": "6.8nF"},
-    "R4":  {"func": "r0603",     "x": 18, "y": 19,   "rot": 0, "val": "1k"},
-    "C10": {"func": "c0603",     "x": 18, "y": 20.5, "rot": 0, "val": "3.3nF"},
-    "R11": {"func": "r0603",     "x": 32, "y": 14.5, "rot": 0, "val": "1k"},
-    "C14": {"func": "c0603",     "x": 32, "y": 16,   "rot": 0, "val": "6.8nF"},
-    "R12": {"func": "r0603",     "x": 32, "y": 19,   "rot": 0, "val": "1k"},
-    "C18": {"func": "c0603",     "x": 32, "y": 20.5, "rot": 0, "val": "3.3nF"},
-
-    # U6 group: ch5 L (col x=38) + ch6 R (col x=52, shifted from 50)
-    "R5":  {"func": "r0603",     "x": 38, "y": 14.5, "rot": 0, "val": "1k"},
-    "C7":  {"func": "c0603",     "x": 38, "y": 16,   "rot": 0, "val": "6.8nF"},
-    "R6":  {"func": "r0603",     "x": 38, "y": 19,   "rot": 0, "val": "1k"},
-    "C11": {"func": "c0603",     "x": 38, "y": 20.5, "rot": 0, "val": "3.3nF"},
-    "R13": {"func": "r0603",     "x": 52, "y": 14.5, "rot": 0, "val": "1k"},
-    "C15": {"func": "c0603",     "x": 52, "y": 16,   "rot": 0, "val": "6.8nF"},
-    "R14": {"func": "r0603",     "x": 52, "y": 19,   "rot": 0, "val": "1k"},
-    "C19": {"func": "c0603",     "x": 52, "y": 20.5, "rot": 0, "val": "3.3nF"},
-
-    # U7 group: ch7 L (col x=58) + ch8 R (col x=72, shifted from 70)
-    "R7":  {"func": "r0603",     "x": 58, "y": 14.5, "rot": 0, "val": "1k"},
-    "C8":  {"func": "c0603",     "x": 58, "y": 16,   "rot": 0, "val": "6.8nF"},
-    "R8":  {"func": "r0603",     "x": 58, "y": 19,   "rot": 0, "val": "1k"},
-    "C12": {"func": "c0603",     "x": 58, "y": 20.5, "rot": 0, "val": "3.3nF"},
-    "R15": {"func": "r0603",     "x": 72, "y": 14.5, "rot": 0, "val": "1k"},
-    "C16": {"func": "c0603",     "x": 72, "y": 16,   "rot": 0, "val": "6.8nF"},
-    "R16": {"func": "r0603",     "x": 72, "y": 19,   "rot": 0, "val": "1k"},
-    "C20": {"func": "c0603",     "x": 72, "y": 20.5, "rot": 0, "val": "3.3nF"},
-}
+    put_cells("jack")
+    put_cells("opamp")
+    put_cells(*CELL_ROLES[4:])
+
+    return pl
+
+
+def configure(channels=16, codecs=2):
+    """Set the system channel count and codecs per board and rebuild the board.
+
+    Each codec takes up to 4 channels (2 pairs); `channels` beyond one
+    board's worth become more INSTANCES of the same board, fewer leave the
+    last codec's second pair unpopulated. Raises ValueError for an odd
+    channel count, an idle codec, or channels that don't fill whole boards.
+    """
+    global CHANNELS, CODECS, BOARD_CHANNELS, PAIRS, PORTS, INSTANCES, BOARD_W
+    global NETS, CELLS, COMP_NETS, PLACEMENTS
+
+    per_codec = 2 * PAIRS_PER_CODEC
+    board = min(channels, per_codec * codecs)
+    if codecs < 1 or channels < 2 or channels % 2:
+        raise ValueError(f"need an even channel count and at least one codec, got {channels}/{codecs}")
+    if board <= per_codec * (codecs - 1):
+        raise ValueError(f"{board} channels leave codec U{codecs} idle")
+    if channels % board:
+        raise ValueError(f"{channels} channels don't fill whole {board}-channel boards")
+
+    CHANNELS, CODECS, BOARD_CHANNELS = channels, codecs, board
+    PAIRS = board // 2
+    PORTS = -(-codecs // CODECS_PER_PORT)
+    INSTANCES = channels // board
+    BOARD_W = PORTS * PORT_W
+
+    NETS = build_nets()
+    CELLS = build_cells()
+    COMP_NETS = build_comp_nets()
+    PLACEMENTS = build_placements()
+
+
+configure()
 
 
 # ---------------------------------------------------------------------------
@@ -1178,30 +1013,10 @@ def generate_pcb():
 
     footprints = []
     for ref, info in PLACEMENTS.items():
-        func_name = info["func"]
-        x, y, rot = info["x"], info["y"], info["rot"]
-        nets = COMP_NETS[ref]
-        val = info.get("val", "")
-
-        if func_name == "qfn32":
-            footprints.append(fp_qfn32(ref, x, y, rot, nets))
-        elif func_name == "soic8":
-            footprints.append(fp_soic8(ref, x, y, rot, nets, val))
-        elif func_name == "sod323":
-            footprints.append(fp_sod323(ref, x, y, rot, nets))
-        elif func_name == "c0603":
-            footprints.append(fp_c0603(ref, x, y, rot, nets, val or "100nF"))
-        elif func_name in ("c0805", "c0805_10u"):
-            v = "10uF" if "10u" in func_name else (val or "10uF")
-            footprints.append(fp_c0805(ref, x, y, rot, nets, v))
-        elif func_name == "r0603":
-            footprints.append(fp_r0603(ref, x, y, rot, nets, val or "1k"))
-        elif func_name == "ffc_16pin":
-            footprints.append(fp_ffc_16pin(ref, x, y, rot, nets))
-        elif func_name == "jst_ph_6":
-            footprints.append(fp_jst_ph_6(ref, x, y, rot, nets))
-        elif func_name == "112bpc":
-            footprints.append(fp_112bpc(ref, x, y, rot, nets))
+        if "cell" in info:
+            footprints.append(stamp_footprint(CELLS[info["cell"]], info["role"]))
+        else:
+            footprints.append(footprint(ref, info, COMP_NETS[ref]))
 
     all_footprints = "\n\n".join(footprints)
 
@@ -1211,11 +1026,13 @@ def generate_pcb():
     # Zone 3: GND on B.Cu (full board)
     zones = []
     zone_defs = [
-        (1, "GND", IN1_CU),
-        (3, "V33_A", IN2_CU),
-        (1, "GND", B_CU),
+        ("GND", IN1_CU),
+        ("V33_A", IN2_CU),
+        ("GND", B_CU),
     ]
-    for net_code, net_name, layer in zone_defs:
+    code = {name: c for c, name in NETS.items()}
+    for net_name, layer in zone_defs:
+        net_code = code[net_name]
         zones.append(f"""  (zone
     (net {net_code})
     (net_name "{net_name}")
@@ -1396,14 +1213,24 @@ def generate_project():
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="MIXTEE input mother board PCB generator")
+    ap.add_argument("--channels", type=int, default=CHANNELS, help="input channels in the system")
+    ap.add_argument("--codecs", type=int, default=CODECS, help="AK4619s per board (4 channels each)")
+    args = ap.parse_args()
+    configure(args.channels, args.codecs)
+
     out_dir = os.path.dirname(os.path.abspath(__file__))
+    name = "mixtee-input-mother"
+    if BOARD_CHANNELS != 8:
+        name += f"-{BOARD_CHANNELS}ch"
 
-    pcb_path = os.path.join(out_dir, "mixtee-input-mother.kicad_pcb")
+    pcb = generate_pcb()
+    pcb_path = os.path.join(out_dir, f"{name}.kicad_pcb")
     with open(pcb_path, "w") as f:
-        f.write(generate_pcb())
+        f.write(pcb)
     print(f"PCB written to: {pcb_path}")
 
-    pro_path = os.path.join(out_dir, "mixtee-input-mother.kicad_pro")
+    pro_path = os.path.join(out_dir, f"{name}.kicad_pro")
     with open(pro_path, "w") as f:
         f.write(generate_project())
     print(f"Project written to: {pro_path}")
@@ -1417,10 +1244,16 @@ if __name__ == "__main__":
 """)
     print(f"Footprint lib table written to: {fp_lib_path}")
 
+    # Fab outputs (drill, CPL, BOM) from the same generated board
+    sys.path.insert(0, os.path.join(out_dir, "..", "..", "..", "tools"))
+    from fab_outputs import write_fab_outputs
+    write_fab_outputs(out_dir, name, pcb, "mixtee_gen_input_mother", INSTANCES)
+
     # Summary
     comp_count = len(PLACEMENTS)
     net_count = len(NETS) - 1
-    print(f"\nBoard: {BOARD_W} x {BOARD_H} mm, 4-layer")
+    print(f"\nBoard: {BOARD_W} x {BOARD_H} mm, 4-layer, {BOARD_CHANNELS} channels "
+          f"({CODECS} codecs) x {INSTANCES} instances")
     print(f"Components: {comp_count}")
     print(f"Nets: {net_count} named ({net_count + 1} including unconnected)")
     print(f"\nComponent breakdown:")
@@ -1432,4 +1265,4 @@ if __name__ == "__main__":
         names = {"U": "ICs", "J": "Connectors", "D": "Diodes",
                  "C": "Capacitors", "R": "Resistors"}
         print(f"  {names.get(prefix, prefix)}: {count}")
-    print(f"\nOpen mixtee-input-mother.kicad_pcb in KiCad to view.")
+    print(f"\nOpen {name}.kicad_pcb in KiCad to view.")
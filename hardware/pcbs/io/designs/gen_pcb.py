@@ -79,6 +79,7 @@ FE1.1s pinout (SSOP-28) — NEEDS VERIFICATION against actual datasheet:
 import uuid
 import math
 import os
+import sys
 
 
 # ---------------------------------------------------------------------------
@@ -88,6 +89,7 @@ import os
 BOARD_W = 50.0   # mm
 BOARD_H = 80.0   # mm
 CORNER_R = 1.0   # mm
+INSTANCES = 1
 
 # Layers
 F_CU = "F.Cu"
@@ -1074,9 +1076,10 @@ def generate_project():
 if __name__ == "__main__":
     out_dir = os.path.dirname(os.path.abspath(__file__))
 
+    pcb = generate_pcb()
     pcb_path = os.path.join(out_dir, "mixtee-io-board.kicad_pcb")
     with open(pcb_path, "w") as f:
-        f.write(generate_pcb())
+        f.write(pcb)
     print(f"PCB written to: {pcb_path}")
 
     pro_path = os.path.join(out_dir, "mixtee-io-board.kicad_pro")
@@ -1093,6 +1096,11 @@ if __name__ == "__main__":
 """)
     print(f"Footprint lib table written to: {fp_lib_path}")
 
+    # Fab outputs (drill, CPL, BOM) from the same generated board
+    sys.path.insert(0, os.path.join(out_dir, "..", "..", "..", "tools"))
+    from fab_outputs import write_fab_outputs
+    write_fab_outputs(out_dir, "mixtee-io-board", pcb, "mixtee_gen_io_board", INSTANCES)
+
     # Summary
     comp_count = len(PLACEMENTS)
     net_count = len(NETS) - 1
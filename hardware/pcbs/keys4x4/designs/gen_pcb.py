@@ -1,26 +1,35 @@
 """
 MIXTEE Keys4x4 PCB - KiCad PCB Generator
 
-Board: 72 x 72 mm, 2-layer
+Board: 72 x 80 mm, 2-layer (default 4x4 grid)
 Instances: 1 (one unique Keys4x4 PCB in system)
 
-Components (68 total):
-  - 16x Kailh CHOC hotswap sockets (CPG135001S30) — SW1..SW16
-  - 16x WS2812B-2020 NeoPixels — LED1..LED16
-  - 16x 100nF decoupling caps (0603) for NeoPixels — C1..C16
-  - 16x 1N4148 diodes (SOD-123) anti-ghosting — D1..D16
-  -  1x MCP23017 I2C GPIO expander (SOIC-28) — U1
-  -  1x 100nF decoupling cap for MCP23017 — C17
+The grid is parametric: configure(cols, rows, pitch, expanders) rebuilds the
+nets, pin maps and placement for any size up to 64x64 (8 expanders), and the
+board grows to fit. The default is the 4x4 board below.
+
+Components (68 total at 4x4; N = cols x rows):
+  - Nx Kailh CHOC hotswap sockets (CPG135001S30) — SW1..SWN
+  - Nx WS2812B-2020 NeoPixels — LED1..LEDN
+  - Nx 100nF decoupling caps (0603) for NeoPixels — C1..CN
+  - Nx 1N4148 diodes (SOD-123) anti-ghosting — D1..DN
+  - Ex MCP23017 I2C GPIO expanders (SOIC-28) — U1..UE
+  - Ex 100nF decoupling caps for the MCP23017s — CN+1..CN+E
   -  1x 6-pin JST-PH connector (B6B-PH-K-S) — J1
 
-Key matrix: 4x4 via MCP23017
-  - Port A (GPA0-3) = columns, inputs with internal pull-ups
-  - Port B (GPB0-3) = rows, active-low scan outputs
+Key matrix: cols x rows via MCP23017 (4x4 on U1)
+  - Port A (GPA0-7) = columns, inputs with internal pull-ups
+  - Port B (GPB0-7) = rows, active-low scan outputs
+  - Column c is on U(c//8+1) GPA(c%8), row r on U(r//8+1) GPB(r%8)
+  - Expander k strapped to address 0x20+k on A0-A2; all INTA pins share
+    INT (open-drain, IOCON.ODR, with MIRROR so INTA covers both ports)
   - 1N4148 diodes: cathode toward row (prevents ghosting)
 
-NeoPixel chain: serpentine order for shortest routing
-  LED1->LED2->LED3->LED4->LED8->LED7->LED6->LED5->
-  LED9->LED10->LED11->LED12->LED16->LED15->LED14->LED13
+NeoPixel chain: serpentine from the row nearest J1, kept unless 2-opt/Or-opt
+(tools/tour.py) finds a strictly shorter DIN->DOUT path for the grid; at 4x4
+every hop is one pitch (279 mm in all), so the serpentine stands
+  LED13->LED14->LED15->LED16->LED12->LED11->LED10->LED9->
+  LED5->LED6->LED7->LED8->LED4->LED3->LED2->LED1
 
 JST-PH 6-pin connector to main board:
   Pin 1: NeoPixel DIN   (Teensy pin 6)
@@ -43,50 +52,64 @@ Board layout (top view, F.Cu side):
   │                         [U1 on B.Cu center]  [J1]             │ y=72
   └──────────────────────────────────────────────────────────────────┘
   x=0                                                          x=72
+
+Usage:
+  python gen_pcb.py                          # the 4x4 board
+  python gen_pcb.py --cols 8 --rows 8        # writes mixtee-key-pcb-8x8.*
+  python gen_pcb.py --cols 16 --rows 16 --pitch 19.05
 """
 
+import argparse
 import uuid
 import math
 import os
+import sys
+
+# Shared tools (tour ordering); a revision built from source by diff.py finds
+# them on its own sys.path
+TOOLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "tools")
+if os.path.isdir(TOOLS_DIR) and TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+from tour import optimise_path, path_length
 
 
 # ---------------------------------------------------------------------------
 # Board parameters
 # ---------------------------------------------------------------------------
 
-BOARD_W = 72.0   # mm
-BOARD_H = 80.0   # mm (extra 8mm for MCP23017 + connector strip)
 CORNER_R = 1.0   # mm, corner radius
+INSTANCES = 1    # one Keys4x4 PCB in system
+STRIP_H = 8.0    # mm below the grid for the MCP23017s + connector strip
 
-# Switch grid: 4x4, 18mm pitch, centered on board
+# Switch grid: cols x rows at PITCH, one cell per switch. configure() sets
+# these and everything derived from them (board size, nets, placement).
 GRID_COLS = 4
 GRID_ROWS = 4
 PITCH = 18.0
-GRID_ORIGIN_X = 9.0   # (72 - 3*18) / 2
-GRID_ORIGIN_Y = 9.0
 
-# NeoPixel chain order (serpentine): switch indices 1-16
-# Row 0 L->R, Row 1 R->L, Row 2 L->R, Row 3 R->L
-CHAIN_ORDER = [1, 2, 3, 4, 8, 7, 6, 5, 9, 10, 11, 12, 16, 15, 14, 13]
+# MCP23017 expanders: 8 columns on port A and 8 rows on port B each,
+# A0-A2 strapped to the expander index (0x20..0x27)
+MCP_PORT_PINS = 8
+MCP_MAX = 8
+MCP_ADDR_PINS = ("15", "16", "17")              # A0, A1, A2
+MCP_GPA_PINS = [str(21 + i) for i in range(8)]  # GPA0..GPA7
+MCP_GPB_PINS = [str(1 + i) for i in range(8)]   # GPB0..GPB7
 
 # Component offsets from switch center (x, y)
 LED_OFFSET = (0.0, 3.5)       # NeoPixel below switch center, within cell
 CAP_OFFSET = (-3.0, 3.5)      # Cap left of NeoPixel
 DIODE_OFFSET = (7.0, -1.0)    # Diode right of switch
 
-# MCP23017 placement (bottom strip, rotated 90° so pins along X)
-MCP_X = 36.0
-MCP_Y = 73.0
+# MCP23017 placement (bottom strip, rotated 90° so pins along X); several
+# expanders sit side by side, MCP_SPACING apart, centred on the board
 MCP_ROTATION = 90   # pins along X axis
-
-# MCP23017 decoupling cap
-MCP_CAP_X = 28.0
-MCP_CAP_Y = 73.0   # left of MCP
+MCP_SPACING = 22.0
+MCP_CAP_DX = -8.0   # decoupling cap left of each MCP
 
 # JST-PH connector (bottom strip, left of MCP)
 CONN_X = 5.0
-CONN_Y = 75.0
 CONN_ROTATION = 0
+CONN_W = 11.25      # silk extent right of pin 1
 
 # Layers
 F_CU = "F.Cu"
@@ -104,31 +127,42 @@ EDGE_CUTS = "Edge.Cuts"
 # Net definitions
 # ---------------------------------------------------------------------------
 
+def serpentine_order():
+    """Switch indices row by row from the bottom row (nearest J1), starting
+    at the left and alternating direction."""
+    order = []
+    for k, row in enumerate(reversed(range(GRID_ROWS))):
+        cols = range(GRID_COLS) if k % 2 == 0 else reversed(range(GRID_COLS))
+        order += [row * GRID_COLS + col + 1 for col in cols]
+    return order
+
+
+def chain_order():
+    """Switch indices in NeoPixel chain order: the serpentine, unless a
+    strictly shorter open path from the connector's DIN pin exists."""
+    points = [led_xy(n) for n in range(1, N_KEYS + 1)]
+    seed = [n - 1 for n in serpentine_order()]
+    return [i + 1 for i in optimise_path(points, start=(CONN_X, CONN_Y), seed=seed)]
+
+
+def chain_length():
+    """Total DIN->DOUT hop length in mm, connector to last LED."""
+    points = [led_xy(n) for n in range(1, N_KEYS + 1)]
+    return path_length(points, [n - 1 for n in CHAIN_ORDER], start=(CONN_X, CONN_Y))
+
+
 def build_nets():
-    """Build the complete net dictionary {code: name}."""
+    """Build the complete net dictionary {code: name}, codes allocated in order."""
+    names = ["GND", "5V", "SDA", "SCL", "INT", "NEO_DIN"]
+    names += [f"NEO_D{i}" for i in range(N_KEYS - 1)]   # inter-LED chain
+    names += [f"COL{i}" for i in range(GRID_COLS)]
+    names += [f"ROW{i}" for i in range(GRID_ROWS)]
+    names += [f"SW{i + 1}_D" for i in range(N_KEYS)]    # switch-diode junction
     nets = {0: ""}  # unconnected
-    nets[1] = "GND"
-    nets[2] = "5V"
-    nets[3] = "SDA"
-    nets[4] = "SCL"
-    nets[5] = "INT"
-    nets[6] = "NEO_DIN"
-    # Inter-LED chain nets: NEO_D0..NEO_D14
-    for i in range(15):
-        nets[7 + i] = f"NEO_D{i}"
-    # Column nets: COL0..COL3
-    for i in range(4):
-        nets[22 + i] = f"COL{i}"
-    # Row nets: ROW0..ROW3
-    for i in range(4):
-        nets[26 + i] = f"ROW{i}"
-    # Switch-to-diode junction nets: SW1_D..SW16_D
-    for i in range(16):
-        nets[30 + i] = f"SW{i+1}_D"
+    for code, name in enumerate(names, 1):
+        nets[code] = name
     return nets
 
-NETS = build_nets()
-
 
 # ---------------------------------------------------------------------------
 # Component-to-net mapping
@@ -136,86 +170,103 @@ NETS = build_nets()
 
 def build_comp_nets():
     """Build {ref: {pad: net_code}} for all components."""
+    net = {name: code for code, name in NETS.items()}
     cn = {}
 
-    for n in range(1, 17):
+    for n in range(1, N_KEYS + 1):
         row = (n - 1) // GRID_COLS
         col = (n - 1) % GRID_COLS
 
         # Switch SWn: pad 1 = column, pad 2 = switch-diode junction
-        cn[f"SW{n}"] = {
-            "1": 22 + col,      # COL{col}
-            "2": 30 + (n - 1),  # SW{n}_D
-        }
+        cn[f"SW{n}"] = {"1": net[f"COL{col}"], "2": net[f"SW{n}_D"]}
 
         # Diode Dn: pad 1 (K) = row, pad 2 (A) = switch-diode junction
-        cn[f"D{n}"] = {
-            "1": 26 + row,      # ROW{row}
-            "2": 30 + (n - 1),  # SW{n}_D
-        }
+        cn[f"D{n}"] = {"1": net[f"ROW{row}"], "2": net[f"SW{n}_D"]}
 
         # Decoupling cap Cn: pad 1 = 5V, pad 2 = GND
-        cn[f"C{n}"] = {"1": 2, "2": 1}
+        cn[f"C{n}"] = {"1": net["5V"], "2": net["GND"]}
 
     # NeoPixels: chain order determines DIN/DOUT nets
+    chain = ["NEO_DIN"] + [f"NEO_D{i}" for i in range(N_KEYS - 1)]
     for p, sw_idx in enumerate(CHAIN_ORDER):
-        din_net = 6 + p           # p=0 -> NEO_DIN(6), p=1 -> NEO_D0(7), etc.
-        dout_net = 7 + p if p < 15 else 0  # last LED DOUT unconnected
         cn[f"LED{sw_idx}"] = {
-            "1": dout_net,  # Pin 1 = DOUT
-            "2": 1,         # Pin 2 = GND
-            "3": 2,         # Pin 3 = VDD
-            "4": din_net,   # Pin 4 = DIN
+            "1": net[chain[p + 1]] if p + 1 < N_KEYS else 0,  # Pin 1 = DOUT (last NC)
+            "2": net["GND"],    # Pin 2 = GND
+            "3": net["5V"],     # Pin 3 = VDD
+            "4": net[chain[p]], # Pin 4 = DIN
         }
 
-    # MCP23017 U1 (SOIC-28)
-    cn["U1"] = {
-        "1": 26,   # GPB0 -> ROW0
-        "2": 27,   # GPB1 -> ROW1
-        "3": 28,   # GPB2 -> ROW2
-        "4": 29,   # GPB3 -> ROW3
-        "5": 0,    # GPB4 NC
-        "6": 0,    # GPB5 NC
-        "7": 0,    # GPB6 NC
-        "8": 0,    # GPB7 NC
-        "9": 2,    # VDD -> 5V
-        "10": 1,   # VSS -> GND
-        "11": 0,   # NC (CS for SPI mode)
-        "12": 4,   # SCL
-        "13": 3,   # SDA
-        "14": 0,   # NC
-        "15": 1,   # A0 -> GND (addr 0x20)
-        "16": 1,   # A1 -> GND
-        "17": 1,   # A2 -> GND
-        "18": 2,   # ~RESET -> 5V (not reset)
-        "19": 0,   # INTB NC
-        "20": 5,   # INTA -> INT
-        "21": 22,  # GPA0 -> COL0
-        "22": 23,  # GPA1 -> COL1
-        "23": 24,  # GPA2 -> COL2
-        "24": 25,  # GPA3 -> COL3
-        "25": 0,   # GPA4 NC
-        "26": 0,   # GPA5 NC
-        "27": 0,   # GPA6 NC
-        "28": 0,   # GPA7 NC
-    }
-
-    # MCP23017 decoupling cap C17
-    cn["C17"] = {"1": 2, "2": 1}
+    # MCP23017 U1..UE (SOIC-28): unused GPIOs, CS and INTB stay NC
+    for k in range(EXPANDERS):
+        pins = {str(pin): 0 for pin in range(1, 29)}
+        pins.update({
+            "9": net["5V"],     # VDD
+            "10": net["GND"],   # VSS
+            "12": net["SCL"],
+            "13": net["SDA"],
+            "18": net["5V"],    # ~RESET -> 5V (not reset)
+            "20": net["INT"],   # INTA -> INT (open-drain, shared)
+        })
+        for bit, pin in enumerate(MCP_ADDR_PINS):
+            pins[pin] = net["5V"] if k >> bit & 1 else net["GND"]
+        for i in range(MCP_PORT_PINS):
+            line = k * MCP_PORT_PINS + i
+            if line < GRID_COLS:
+                pins[MCP_GPA_PINS[i]] = net[f"COL{line}"]
+            if line < GRID_ROWS:
+                pins[MCP_GPB_PINS[i]] = net[f"ROW{line}"]
+        cn[f"U{k + 1}"] = pins
+
+        # MCP23017 decoupling cap
+        cn[f"C{N_KEYS + k + 1}"] = {"1": net["5V"], "2": net["GND"]}
 
     # JST-PH 6-pin connector J1
     cn["J1"] = {
-        "1": 6,   # NEO_DIN
-        "2": 3,   # SDA
-        "3": 4,   # SCL
-        "4": 5,   # INT
-        "5": 2,   # 5V
-        "6": 1,   # GND
+        "1": net["NEO_DIN"],
+        "2": net["SDA"],
+        "3": net["SCL"],
+        "4": net["INT"],
+        "5": net["5V"],
+        "6": net["GND"],
     }
 
     return cn
 
-COMP_NETS = build_comp_nets()
+
+def configure(cols=4, rows=4, pitch=18.0, expanders=None):
+    """Set the grid size, pitch and expander count and rebuild the board.
+
+    `expanders` defaults to the fewest MCP23017s that cover the columns
+    (port A) and rows (port B). Raises ValueError when the matrix needs more
+    than MCP_MAX expanders or the expanders don't fit the bottom strip.
+    """
+    global GRID_COLS, GRID_ROWS, PITCH, N_KEYS, EXPANDERS
+    global BOARD_W, BOARD_H, GRID_ORIGIN_X, GRID_ORIGIN_Y
+    global MCP_Y, CONN_Y, MCP_XS, CHAIN_ORDER, NETS, COMP_NETS
+
+    need = -(-max(cols, rows) // MCP_PORT_PINS)
+    expanders = need if expanders is None else expanders
+    if cols < 1 or rows < 1:
+        raise ValueError(f"grid must be at least 1x1, got {cols}x{rows}")
+    if need > MCP_MAX:
+        raise ValueError(f"{cols}x{rows} needs {need} MCP23017s, at most {MCP_MAX} share one bus")
+    if not need <= expanders <= MCP_MAX:
+        raise ValueError(f"{cols}x{rows} needs {need} to {MCP_MAX} MCP23017s, got {expanders}")
+
+    GRID_COLS, GRID_ROWS, PITCH, EXPANDERS = cols, rows, pitch, expanders
+    N_KEYS = cols * rows
+    BOARD_W = cols * pitch
+    BOARD_H = rows * pitch + STRIP_H
+    GRID_ORIGIN_X = GRID_ORIGIN_Y = pitch / 2
+    MCP_Y = rows * pitch + 1.0
+    CONN_Y = rows * pitch + 3.0
+    MCP_XS = [BOARD_W / 2 + (k - (expanders - 1) / 2) * MCP_SPACING for k in range(expanders)]
+    if MCP_XS[0] + MCP_CAP_DX - 1.5 < CONN_X + CONN_W or MCP_XS[-1] + 9.5 > BOARD_W:
+        raise ValueError(f"{expanders} MCP23017s don't fit a {BOARD_W:g} mm wide board")
+
+    CHAIN_ORDER = chain_order()
+    NETS = build_nets()
+    COMP_NETS = build_comp_nets()
 
 
 # ---------------------------------------------------------------------------
@@ -233,6 +284,12 @@ def switch_xy(n):
     return GRID_ORIGIN_X + col * PITCH, GRID_ORIGIN_Y + row * PITCH
 
 
+def led_xy(n):
+    """Board (x, y) of NeoPixel n (1-indexed)."""
+    sx, sy = switch_xy(n)
+    return sx + LED_OFFSET[0], sy + LED_OFFSET[1]
+
+
 def arc_points(cx, cy, r, start_deg, end_deg, steps=8):
     points = []
     for i in range(steps + 1):
@@ -241,6 +298,9 @@ def arc_points(cx, cy, r, start_deg, end_deg, steps=8):
     return points
 
 
+configure()
+
+
 # ---------------------------------------------------------------------------
 # Board outline
 # ---------------------------------------------------------------------------
@@ -512,24 +572,22 @@ def generate_pcb():
     # Component placements
     footprints = []
 
-    # --- 16x CHOC hotswap sockets ---
-    for n in range(1, 17):
+    # --- CHOC hotswap sockets ---
+    for n in range(1, N_KEYS + 1):
         sx, sy = switch_xy(n)
         footprints.append(
             fp_choc_hotswap(f"SW{n}", sx, sy, 0, COMP_NETS[f"SW{n}"])
         )
 
-    # --- 16x WS2812B-2020 NeoPixels ---
-    for n in range(1, 17):
-        sx, sy = switch_xy(n)
-        lx = sx + LED_OFFSET[0]
-        ly = sy + LED_OFFSET[1]
+    # --- WS2812B-2020 NeoPixels ---
+    for n in range(1, N_KEYS + 1):
+        lx, ly = led_xy(n)
         footprints.append(
             fp_ws2812b_2020(f"LED{n}", lx, ly, 0, COMP_NETS[f"LED{n}"])
         )
 
-    # --- 16x NeoPixel decoupling caps ---
-    for n in range(1, 17):
+    # --- NeoPixel decoupling caps ---
+    for n in range(1, N_KEYS + 1):
         sx, sy = switch_xy(n)
         cx = sx + CAP_OFFSET[0]
         cy = sy + CAP_OFFSET[1]
@@ -537,31 +595,31 @@ def generate_pcb():
             fp_c0603(f"C{n}", cx, cy, 0, COMP_NETS[f"C{n}"])
         )
 
-    # --- 16x anti-ghosting diodes ---
-    for n in range(1, 17):
+    # --- anti-ghosting diodes ---
+    for n in range(1, N_KEYS + 1):
         sx, sy = switch_xy(n)
         dx = sx + DIODE_OFFSET[0]
         dy = sy + DIODE_OFFSET[1]
-        # Rotate 90° for col 3 (rightmost) to avoid board edge
+        # Rotate 90° for the rightmost column to avoid board edge
         col = (n - 1) % GRID_COLS
-        rot = 90 if col == 3 else 0
+        rot = 90 if col == GRID_COLS - 1 else 0
         # Adjust position for rotated diodes
-        if col == 3:
+        if col == GRID_COLS - 1:
             dx = sx + 5.0
             dy = sy + 2.0
         footprints.append(
             fp_sod123(f"D{n}", dx, dy, rot, COMP_NETS[f"D{n}"])
         )
 
-    # --- MCP23017 (on B.Cu) ---
-    footprints.append(
-        fp_mcp23017("U1", MCP_X, MCP_Y, MCP_ROTATION, COMP_NETS["U1"])
-    )
-
-    # --- MCP23017 decoupling cap (near U1 on F.Cu) ---
-    footprints.append(
-        fp_c0603("C17", MCP_CAP_X, MCP_CAP_Y, 0, COMP_NETS["C17"])
-    )
+    # --- MCP23017s (on B.Cu) and their decoupling caps (on F.Cu) ---
+    for k, mx in enumerate(MCP_XS):
+        footprints.append(
+            fp_mcp23017(f"U{k + 1}", mx, MCP_Y, MCP_ROTATION, COMP_NETS[f"U{k + 1}"])
+        )
+        cref = f"C{N_KEYS + k + 1}"
+        footprints.append(
+            fp_c0603(cref, mx + MCP_CAP_DX, MCP_Y, 0, COMP_NETS[cref])
+        )
 
     # --- JST-PH 6-pin connector ---
     footprints.append(
@@ -588,7 +646,7 @@ def generate_pcb():
   )"""
 
     # Silkscreen text
-    board_text = f"""  (gr_text "MIXTEE Keys4x4 PCB" (at {BOARD_W/2} {BOARD_H - 2.5}) (layer "{F_SILK}") (uuid "{gen_uuid()}")
+    board_text = f"""  (gr_text "MIXTEE Keys{GRID_COLS}x{GRID_ROWS} PCB" (at {BOARD_W/2} {BOARD_H - 2.5}) (layer "{F_SILK}") (uuid "{gen_uuid()}")
     (effects (font (size 1.2 1.2) (thickness 0.15)))
   )"""
 
@@ -742,16 +800,31 @@ def generate_project():
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="MIXTEE key matrix PCB generator")
+    ap.add_argument("--cols", type=int, default=GRID_COLS)
+    ap.add_argument("--rows", type=int, default=GRID_ROWS)
+    ap.add_argument("--pitch", type=float, default=PITCH, help="switch pitch (mm)")
+    ap.add_argument("--expanders", type=int, help="MCP23017 count (default: fewest that fit)")
+    args = ap.parse_args()
+    try:
+        configure(args.cols, args.rows, args.pitch, args.expanders)
+    except ValueError as e:
+        ap.error(str(e))
+
     out_dir = os.path.dirname(os.path.abspath(__file__))
+    name = "mixtee-key-pcb"
+    if (GRID_COLS, GRID_ROWS) != (4, 4):
+        name += f"-{GRID_COLS}x{GRID_ROWS}"
 
     # Write PCB file
-    pcb_path = os.path.join(out_dir, "mixtee-key-pcb.kicad_pcb")
+    pcb = generate_pcb()
+    pcb_path = os.path.join(out_dir, f"{name}.kicad_pcb")
     with open(pcb_path, "w") as f:
-        f.write(generate_pcb())
+        f.write(pcb)
     print(f"PCB written to: {pcb_path}")
 
     # Write project file
-    pro_path = os.path.join(out_dir, "mixtee-key-pcb.kicad_pro")
+    pro_path = os.path.join(out_dir, f"{name}.kicad_pro")
     with open(pro_path, "w") as f:
         f.write(generate_project())
     print(f"Project written to: {pro_path}")
@@ -766,17 +839,22 @@ if __name__ == "__main__":
 """)
     print(f"Footprint lib table written to: {fp_lib_path}")
 
+    # Fab outputs (drill, CPL, BOM) from the same generated board
+    sys.path.insert(0, os.path.join(out_dir, "..", "..", "..", "tools"))
+    from fab_outputs import write_fab_outputs
+    write_fab_outputs(out_dir, name, pcb, "mixtee_gen_key_pcb", INSTANCES)
+
     # Summary
-    n_sw = 16
-    n_led = 16
-    n_cap = 17
-    n_diode = 16
-    n_ic = 1
+    n_sw = N_KEYS
+    n_led = N_KEYS
+    n_cap = N_KEYS + EXPANDERS
+    n_diode = N_KEYS
+    n_ic = EXPANDERS
     n_conn = 1
     total = n_sw + n_led + n_cap + n_diode + n_ic + n_conn
-    print(f"\nDone! Open mixtee-key-pcb.kicad_pcb in KiCad to view.")
+    print(f"\nDone! Open {name}.kicad_pcb in KiCad to view.")
     print(f"Board dimensions: {BOARD_W} x {BOARD_H} mm")
     print(f"Components: {n_sw} switches + {n_led} LEDs + {n_cap} caps + "
           f"{n_diode} diodes + {n_ic} IC + {n_conn} connector = {total} total")
     print(f"Nets: {len(NETS) - 1} named ({len(NETS)} including unconnected)")
-    print(f"NeoPixel chain order (serpentine): {CHAIN_ORDER}")
+    print(f"NeoPixel chain order ({chain_length():.1f} mm): {CHAIN_ORDER}")
@@ -0,0 +1,373 @@
+"""
+MIXTEE PCB tools - input coupling and impedance corners
+
+Joins the input-mother boards and the daughter boards that plug into their
+JST-PH connectors into one netlist. It then follows every jack tip to the
+op-amp buffer and the AK4619 input pin it feeds, and solves each path as a
+small nodal-admittance network:
+
+  source    ideal generator behind --rs (cable + source output impedance)
+  R, C      two-terminal parts on signal nets; GND and supply rails are AC
+            ground. Coupling caps (series caps on the path) are scaled to
+            --caps and lose --derate % to DC bias (X5R/X7R MLCC)
+  ESD       diodes as their junction capacitance, D_CAP
+  buffer    op-amp follower: IN+ loads the path with RIN || CIN, OUT
+            follows IN+ (a cap from IN+ to OUT carries no current)
+  --bias    optional resistor from the far side of every coupling cap to
+            the virtual ground, as architecture.md intends (10k -> 1.6 Hz)
+
+All channels x sweep configurations x frequencies are solved in one batched
+np.linalg.solve. Per channel it reports the -3 dB high-pass corner (relative
+to 1 kHz), the phase at 20 Hz, the level at 20 kHz (source loading)
+and |Zin| at the jack at 1 kHz. It flags nodes
+with no resistive path to ground or the jack, which sit at whatever the
+op-amp input bias current drives them to. It also flags paths with no
+coupling cap, whose DC level (0 V at the jack) reaches a single-supply
+op-amp.
+
+Usage:
+  python ac_input.py                               # 16 channels, default sweep
+  python ac_input.py --rs 50 600 10k 100k --caps 4.7u 10u 22u --derate 0 30 60
+  python ac_input.py --bias 10k --channels         # per-channel table
+"""
+
+import argparse
+import math
+import re
+import time
+
+import numpy as np
+
+from assembly import parse_value
+from kicad_pcb import GENERATORS, load_board, load_generator
+
+RS = ("50", "600", "10k", "100k")       # ohms: line out, pro gear, guitar, piezo
+CAPS = ()                               # coupling cap values; empty = as placed
+DERATE = (0.0, 30.0, 60.0)              # %, DC-bias capacitance loss
+D_CAP = 10e-12                          # F, ESD diode / BAT54 junction at 0 V
+RIN = 1e12                              # ohms, OPA1678 common-mode input
+CIN = 6e-12                             # F, OPA1678 common-mode input
+RS_MIN = 1e-3                           # ohms, keeps an ideal source solvable
+F_MIN, F_MAX, POINTS = 1e-3, 1e5, 801   # Hz, log grid
+F_REF = 1e3                             # Hz, mid-band reference
+F_PHASE = 20.0                          # Hz, bottom of the audio band
+F_BAND = 20e3                           # Hz, top of the audio band
+
+SUPPLIES = re.compile(r"^(GND|\+?5VA?|5V_A|5V_DIG|V33_A|\+?3V3.*)$")
+OPAMP_SECTIONS = {"A": ("1", "2", "3"), "B": ("7", "6", "5")}   # OUT, IN-, IN+
+AK4619_AIN = {"9": "AIN5R", "10": "AIN4R", "11": "AIN5L", "12": "AIN4L",
+              "13": "AIN2R", "14": "AIN1R", "15": "AIN2L", "16": "AIN1L"}
+
+
+# ---------------------------------------------------------------------------
+# Combined netlist
+# ---------------------------------------------------------------------------
+
+def _parts(gen, tag):
+    """[(ref, value, lib, {pad: net key})] of one generated board; net keys
+    are (tag, name) so several boards share one namespace."""
+    board = load_board(gen.generate_pcb())
+    names = board["nets"]
+    out = []
+    for fp in board["footprints"]:
+        pads = {p["name"]: (tag, names.get(p["net"], "")) for p in fp["pads"] if p["name"]}
+        out.append((fp["ref"], fp["value"], fp["lib"], pads))
+    return out
+
+
+def combined_netlist(mother, daughter):
+    """Every mother instance with a daughter on each of its JST-PH headers.
+
+    Returns {"parts": [(tag, ref, value, lib, {pad: net})], "boards": [tag]}
+    with nets merged across the cable; board tags are "M1", "M1D1", ...
+    """
+    m_parts, d_parts = _parts(mother, "M"), _parts(daughter, "D")
+    d_jst = next(p for p in d_parts if "JST_PH" in p[2])
+    headers = [p for p in m_parts if "JST_PH" in p[2]]
+    parent = {}
+
+    def find(n):
+        while parent.get(n, n) != n:
+            n = parent[n]
+        return n
+
+    parts, boards = [], []
+    for b in range(mother.INSTANCES):
+        mt = f"M{b + 1}"
+        boards.append(mt)
+        parts += [(mt, ref, val, lib, {k: (mt, n[1]) for k, n in pads.items()})
+                  for ref, val, lib, pads in m_parts]
+        for h, (_, _, _, h_pads) in enumerate(headers):
+            dt = f"{mt}D{h + 1}"
+            boards.append(dt)
+            parts += [(dt, ref, val, lib, {k: (dt, n[1]) for k, n in pads.items()})
+                      for ref, val, lib, pads in d_parts]
+            for pin, net in d_jst[3].items():
+                if pin in h_pads and net[1] and h_pads[pin][1]:
+                    parent[find((dt, net[1]))] = find((mt, h_pads[pin][1]))
+    for i, (tag, ref, val, lib, pads) in enumerate(parts):
+        parts[i] = (tag, ref, val, lib, {k: find(n) if n[1] else n for k, n in pads.items()})
+    return {"parts": parts, "boards": boards}
+
+
+# ---------------------------------------------------------------------------
+# Paths
+# ---------------------------------------------------------------------------
+
+def input_paths(net):
+    """One entry per jack: {"jack", "adc", "nodes": [net], "elements": [(kind,
+    ref, a, b, value)], "coupling": [ref], "floating": [net], "dc": bool}.
+
+    Element terminals are node indices, -1 for AC ground; a terminal on a
+    follower output is replaced by that follower's IN+. "dc" is True when
+    the jack reaches IN+ through resistors only.
+    """
+    parts = net["parts"]
+    ground = lambda n: not n[1] or bool(SUPPLIES.match(n[1]))
+    follower = {}                                   # OUT net -> (IN+ net, opamp)
+    codec_pin = {}                                  # net -> "U1 AIN4L"
+    by_net = {}
+    for tag, ref, val, lib, pads in parts:
+        if val.startswith("OPA"):
+            for sec, (p_out, p_neg, p_pos) in OPAMP_SECTIONS.items():
+                if pads.get(p_out) and pads.get(p_out) == pads.get(p_neg):
+                    follower[pads[p_out]] = (pads[p_pos], f"{ref}{sec}")
+        elif val.startswith("AK4619"):
+            for pin, name in AK4619_AIN.items():
+                if pads.get(pin, ("", ""))[1]:
+                    codec_pin[pads[pin]] = f"{ref} {name}"
+        elif ref[0] in "RCD" and len(pads) == 2:
+            for n in pads.values():
+                by_net.setdefault(n, []).append((tag, ref, val, pads))
+
+    inputs = {pos: (out, u) for out, (pos, u) in follower.items()}
+    out = []
+    for tag, ref, val, lib, pads in parts:
+        if not (ref.startswith("J") and "T" in pads) or ground(pads["T"]):
+            continue
+        jack = pads["T"]
+        nodes, seen, todo, elements = {jack: 0}, set(), [jack], []
+        buf = None
+        while todo:
+            n = todo.pop()
+            if n in inputs:
+                buf = (n,) + inputs[n]              # (IN+, OUT, opamp)
+            for p_tag, p_ref, p_val, p_pads in by_net.get(n, []):
+                key = (p_tag, p_ref)
+                if key in seen:
+                    continue
+                seen.add(key)
+                ends = []
+                for m in (p_pads.get("1"), p_pads.get("2")):
+                    m = follower[m][0] if m in follower else m
+                    if ground(m):
+                        ends.append(-1)
+                        continue
+                    if m not in nodes:
+                        nodes[m] = len(nodes)
+                        todo.append(m)
+                    ends.append(nodes[m])
+                kind = p_ref[0]
+                value = D_CAP if kind == "D" else parse_value(kind, p_val)
+                elements.append((kind, f"{p_ref}" if p_tag == tag else f"{p_tag}:{p_ref}",
+                                 ends[0], ends[1], value))
+        coupling = [e[1] for e in elements if e[0] == "C" and -1 not in e[2:4]
+                    and e[2] != e[3]]
+        # resistive groups: which nodes see the jack or ground through R only
+        group = list(range(len(nodes) + 1))          # last slot = ground
+
+        def root(i):
+            while group[i] != i:
+                i = group[i]
+            return i
+
+        for kind, _, a, b, _ in elements:
+            if kind == "R":
+                group[root(a if a >= 0 else len(nodes))] = root(b if b >= 0 else len(nodes))
+        names = list(nodes)
+        anchored = {root(0), root(len(nodes))}
+        floating = [names[i] for i in range(len(names)) if root(i) not in anchored]
+        pos = nodes[buf[0]] if buf else None
+        out.append({"board": tag, "jack": ref, "nodes": names, "elements": elements,
+                    "coupling": coupling, "floating": [n[1] for n in floating],
+                    "buffer": buf[2] if buf else None, "in_pos": pos,
+                    "adc": codec_pin.get(buf[1]) if buf else None,
+                    "dc": pos is not None and root(pos) == root(0)})
+    return out
+
+
+def channel_number(path):
+    """Mixer channel: L jacks JACK_n -> n, R inputs DAIN_Rk -> 2k, offset by
+    8 per mother instance."""
+    tag, nodes = path["board"], path["nodes"]
+    b = int(re.match(r"M(\d+)", tag).group(1)) - 1
+    for n in nodes:
+        m = re.fullmatch(r"JACK_(\d+)", n[1])
+        if m:
+            return 8 * b + 2 * int(m.group(1)) - 1
+        m = re.fullmatch(r"DAIN_R(\d+)", n[1])
+        if m:
+            return 8 * b + 2 * int(m.group(1))
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Solver
+# ---------------------------------------------------------------------------
+
+def solve(paths, rs, caps, derate, bias=None, freqs=None, rin=RIN, cin=CIN):
+    """Batched nodal analysis.
+
+    Returns (freqs, h, zin): h is the IN+ / source transfer function and zin
+    the impedance at the jack, both complex arrays shaped (paths, rs, caps,
+    derate, freqs). `caps` entries are coupling cap values (None = as
+    placed), `derate` in %.
+    """
+    freqs = np.geomspace(F_MIN, F_MAX, POINTS) if freqs is None else np.asarray(freqs)
+    rs = np.maximum(np.asarray(rs, dtype=float), RS_MIN)
+    keep = np.array([1 - d / 100 for d in derate])
+    n = max(len(p["nodes"]) for p in paths)
+    s = 2j * math.pi * freqs
+    shape = (len(paths), len(rs), len(caps), len(keep), len(freqs))
+    # Y without the source: (paths, caps, derate, freqs, n, n)
+    y = np.zeros((len(paths), len(caps), len(keep), len(freqs), n, n), dtype=complex)
+    for i, p in enumerate(paths):
+        for k in range(len(p["nodes"]), n):
+            y[i, ..., k, k] = 1.0                     # padding rows
+        elements = list(p["elements"])
+        if p["in_pos"] is not None:
+            elements += [("R", "RIN", p["in_pos"], -1, rin), ("C", "CIN", p["in_pos"], -1, cin)]
+        if bias:
+            for kind, ref, a, b, v in p["elements"]:
+                if ref in p["coupling"]:
+                    elements.append(("R", "BIAS", max(a, b), -1, bias))
+        for kind, ref, a, b, v in elements:
+            if kind == "R":
+                g = np.full((len(caps), len(keep), len(freqs)), 1 / v, dtype=complex)
+            else:
+                c = np.full((len(caps), len(keep)), v)
+                if ref in p["coupling"]:
+                    c = np.array([[(cv or v) * k for k in keep] for cv in caps])
+                g = c[..., None] * s
+            for u, w in ((a, b), (b, a)):
+                if u < 0:
+                    continue
+                y[i, ..., u, u] += g
+                if w >= 0:
+                    y[i, ..., u, w] -= g
+    y = np.broadcast_to(y[:, None], (len(paths), len(rs)) + y.shape[1:]).copy()
+    y[..., 0, 0] += (1 / rs)[None, :, None, None, None]
+    rhs = np.zeros(shape + (n, 1), dtype=complex)
+    rhs[..., 0, 0] = np.broadcast_to((1 / rs)[None, :, None, None, None], shape)
+    v = np.linalg.solve(y, rhs)[..., 0]
+    pos = np.array([p["in_pos"] if p["in_pos"] is not None else 0 for p in paths])
+    h = np.take_along_axis(v, pos[:, None, None, None, None, None], -1)[..., 0]
+    vj = v[..., 0]
+    zin = vj * rs[None, :, None, None, None] / (1 - vj)
+    return freqs, h, zin
+
+
+def corner(freqs, h, f_ref=F_REF):
+    """-3 dB high-pass corner (Hz) relative to |h(f_ref)| along the last
+    axis, log-interpolated; 0 when the response never falls below it."""
+    db = 20 * np.log10(np.abs(h) / np.abs(_at(freqs, h, f_ref))[..., None])
+    below = (db < -3.0103) & (freqs < f_ref)
+    last = np.where(below.any(-1), freqs.size - 1 - np.argmax(below[..., ::-1], -1), -1)
+    i = np.clip(last, 0, freqs.size - 2)
+    d0 = np.take_along_axis(db, i[..., None], -1)[..., 0]
+    d1 = np.take_along_axis(db, i[..., None] + 1, -1)[..., 0]
+    lf = np.log10(freqs)
+    t = np.clip((-3.0103 - d0) / np.where(d1 != d0, d1 - d0, 1), 0, 1)
+    return np.where(last >= 0, 10 ** (lf[i] + t * (lf[i + 1] - lf[i])), 0.0)
+
+
+def _at(freqs, a, f):
+    """Values of `a` (last axis over freqs) at the grid point nearest f."""
+    return a[..., int(np.argmin(np.abs(np.log(freqs / f))))]
+
+
+def _value(kind, text):
+    """parse_value() for command-line values: "4.7u" and "4.7uF" both work."""
+    v = parse_value(kind, text + ("F" if kind == "C" and not text.endswith("F") else ""))
+    if v is None:
+        raise SystemExit(f"cannot read {text!r} as a {'capacitance' if kind == 'C' else 'resistance'}")
+    return v
+
+
+def _si(v):
+    for scale, unit in ((1e6, "M"), (1e3, "k"), (1, ""), (1e-3, "m"), (1e-6, "u")):
+        if abs(v) >= scale:
+            return f"{v / scale:.3g}{unit}"
+    return f"{v:.2g}"
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--mother", default="input-mother", help="board key or gen_pcb.py")
+    ap.add_argument("--daughter", default="daughter-output", help="board key or gen_pcb.py")
+    ap.add_argument("--rs", nargs="*", default=list(RS), help="source impedances (ohms, 10k ok)")
+    ap.add_argument("--caps", nargs="*", default=list(CAPS), help="coupling cap values (F, 10u ok)")
+    ap.add_argument("--derate", type=float, nargs="*", default=list(DERATE), help="DC-bias loss (%%)")
+    ap.add_argument("--bias", help="bias resistor after each coupling cap (ohms), e.g. 10k")
+    ap.add_argument("--rin", type=float, default=RIN, help="op-amp input resistance (ohms)")
+    ap.add_argument("--channels", action="store_true", help="print every channel for every config")
+    args = ap.parse_args()
+
+    mother = load_generator(GENERATORS.get(args.mother, args.mother))
+    daughter = load_generator(GENERATORS.get(args.daughter, args.daughter))
+    paths = sorted(input_paths(combined_netlist(mother, daughter)), key=channel_number)
+    if not paths:
+        raise SystemExit("no jack-to-op-amp paths found")
+    rs = [_value("R", v) for v in args.rs]
+    caps = [_value("C", v) for v in args.caps] or [None]
+    bias = _value("R", args.bias) if args.bias else None
+
+    print(f"{args.mother} x{mother.INSTANCES} + {args.daughter}: {len(paths)} input paths")
+    for p in paths:
+        route = " -> ".join([f"{p['board']}:{p['jack']}"] + (p["coupling"] or ["(no coupling cap)"])
+                            + [p["buffer"] or "?", p["adc"] or "?"])
+        flags = []
+        if p["floating"] and not bias:
+            flags.append(f"NO DC RETURN: {', '.join(p['floating'])}")
+        if p["dc"]:
+            flags.append("DC-COUPLED: jack reaches the single-supply op-amp through resistors")
+        print(f"  CH{channel_number(p):<3} {route}" + ("  " + "; ".join(flags) if flags else ""))
+
+    t0 = time.perf_counter()
+    freqs, h, zin = solve(paths, rs, caps, args.derate, bias, rin=args.rin)
+    fc = corner(freqs, h)
+    ph = np.degrees(np.angle(_at(freqs, h, F_PHASE)))
+    top = 20 * np.log10(np.abs(_at(freqs, h, F_BAND)) / np.abs(_at(freqs, h, F_REF)))
+    z1k = np.abs(_at(freqs, zin, F_REF))
+    dt = time.perf_counter() - t0
+    print(f"\n{len(paths)} paths x {len(rs)} Rs x {len(caps)} caps x {len(args.derate)} derate"
+          f" x {freqs.size} points in {dt:.2f} s" + (f", bias {_si(bias)}" if bias else ", as built (no bias)"))
+
+    span = lambda a, f=_si: f(a.min()) if f(a.min()) == f(a.max()) else f"{f(a.min())}..{f(a.max())}"
+    hz = lambda v, dc=False: "DC" if dc else _si(v) if v > 0 else f"<{_si(F_MIN)}"
+    groups = (("AC-coupled", [i for i, p in enumerate(paths) if p["coupling"]]),
+              ("DC-coupled", [i for i, p in enumerate(paths) if not p["coupling"]]))
+    for label, group in groups:
+        if not group:
+            continue
+        dc = label == "DC-coupled"
+        print(f"\n  {label}: CH{', CH'.join(str(channel_number(paths[i])) for i in group)}")
+        print(f"  {'Rs':>6} {'C':>8} {'derate':>6} {'f-3dB Hz':>12} {'deg@20':>12} "
+              f"{'dB@20k':>12} {'|Zin|@1k':>12}")
+        for a, r in enumerate(rs):
+            for b, c in enumerate(caps):
+                for d, k in enumerate(args.derate):
+                    at = (group, a, b, d)
+                    f_lo = hz(fc[at].max(), dc)
+                    print(f"  {_si(r):>6} {'as built' if c is None else _si(c):>8} {k:5.0f}% {f_lo:>12} "
+                          f"{span(ph[at], '{:.2f}'.format):>12} {span(top[at], '{:.2f}'.format):>12} "
+                          f"{span(z1k[at]):>12}")
+                    if args.channels:
+                        for i in group:
+                            print(f"      CH{channel_number(paths[i]):<3} {hz(fc[i, a, b, d], dc):>12} Hz "
+                                  f"{ph[i, a, b, d]:7.2f} deg {top[i, a, b, d]:7.2f} dB "
+                                  f"{_si(z1k[i, a, b, d]):>8} ohm")
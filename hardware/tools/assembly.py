@@ -0,0 +1,248 @@
+"""
+MIXTEE PCB tools - assembly outputs (CPL + BOM)
+
+Writes a JLCPCB-style pick-and-place file (CPL) and a per-board assembly BOM
+straight from the board model, replacing the KiCad position/BOM export and
+the manual cross-check against hardware/bom.csv.
+
+  CPL:  Designator,Mid X,Mid Y,Layer,Rotation   (Y flipped, like KiCad's
+        position export; rotations are KiCad's, no per-part JLC offsets)
+  BOM:  one row per (value, footprint), with per-board quantity and the
+        total for all instances of the board (INSTANCES in each gen_pcb.py)
+
+Reconciliation reads hardware/bom.csv once into two indexes - part-number
+tokens (AK4619VN, 112BPC, ...) and passive values ((C, 1e-7) for 100nF /
+0.1 uF, ...) - then checks every BOM group against them. A group may match
+several bom.csv rows (e.g. 100nF decoupling is listed twice); their
+quantities are pooled. Rows listing fewer parts than the boards need, and
+parts not in bom.csv at all, are reported. bom.csv also covers the Main
+Board and off-board modules, so spare quantity is expected and not flagged.
+
+Usage:
+  python assembly.py                      # reconcile all generated boards
+  python assembly.py io -o /tmp/asm       # CPL + BOM for one board
+"""
+
+import argparse
+import csv
+import os
+import re
+
+from kicad_pcb import GENERATORS, board_from_generator, resolve_board
+
+BOM_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       "bom.csv")
+
+# Footprint values whose bom.csv row can't be found from the value itself
+BOM_ALIASES = {
+    "ESD": "Schottky clamp diodes",
+    "BAT54": "Schottky clamp diodes",
+    "CPG135001S30": "Kailh CHOC hotswap sockets",
+    "12MHz": "12 MHz crystal",
+    "RJ45_MagJack": "RJ45 MagJack (integrated magnetics)",
+    "ETH_HDR": "6-pin header (Ethernet ribbon)",
+    "FFC-12": "FFC 12-pin ZIF connector (Main-IO)",
+}
+
+_SI = {"p": 1e-12, "n": 1e-9, "u": 1e-6, "µ": 1e-6, "m": 1e-3,
+       "": 1.0, "k": 1e3, "K": 1e3, "M": 1e6}
+_CAP_RE = re.compile(r"(?<![\d.-])(\d+(?:\.\d+)?)\s*([pnuµ]?)F\b")
+_RES_RE = re.compile(r"(?<![\d.-])(\d+(?:\.\d+)?)\s*([mkKM]?)(?:\s*ohm)?(?![\w.%-])")
+_TOKEN_SPLIT = re.compile(r"[\s,;()/]+")
+
+
+def _natural_key(ref):
+    m = re.match(r"([A-Za-z]+)(\d*)", ref)
+    return (m.group(1), int(m.group(2) or 0)) if m else (ref, 0)
+
+
+def _passive_kind(lib):
+    if lib.startswith("Capacitor"):
+        return "C"
+    if lib.startswith("Resistor"):
+        return "R"
+    return None
+
+
+def parse_value(kind, text):
+    """Numeric value of a passive (farads / ohms), or None."""
+    m = (_CAP_RE if kind == "C" else _RES_RE).search(text)
+    if not m:
+        return None
+    return float(f"{float(m.group(1)) * _SI[m.group(2)]:.6g}")
+
+
+# ---------------------------------------------------------------------------
+# CPL + BOM
+# ---------------------------------------------------------------------------
+
+def cpl_rows(board):
+    """[(ref, x, y, side, rot)] in JLCPCB convention, sorted by designator."""
+    rows = []
+    for fp in board["footprints"]:
+        if "exclude_from_pos_files" in fp["attr"]:
+            continue
+        side = "Bottom" if fp["layer"] == "B.Cu" else "Top"
+        rows.append((fp["ref"], fp["x"], -fp["y"], side, fp["rot"] % 360))
+    rows.sort(key=lambda r: _natural_key(r[0]))
+    return rows
+
+
+def write_cpl(board):
+    lines = ["Designator,Mid X,Mid Y,Layer,Rotation"]
+    for ref, x, y, side, rot in cpl_rows(board):
+        lines.append(f"{ref},{x:.4f}mm,{y:.4f}mm,{side},{rot:g}")
+    return "\n".join(lines) + "\n"
+
+
+def bom_groups(board):
+    """{(value, footprint): [refs]} with refs in natural order."""
+    groups = {}
+    for fp in board["footprints"]:
+        if "exclude_from_bom" in fp["attr"]:
+            continue
+        groups.setdefault((fp["value"], fp["lib"]), []).append(fp["ref"])
+    for refs in groups.values():
+        refs.sort(key=_natural_key)
+    return groups
+
+
+def write_bom(board, instances=1):
+    lines = ["Comment,Designator,Footprint,Quantity,Instances,Total Quantity"]
+    groups = bom_groups(board)
+    for (value, lib), refs in sorted(groups.items(),
+                                     key=lambda kv: _natural_key(kv[1][0])):
+        footprint = lib.split(":", 1)[-1]
+        lines.append(f'{value},"{",".join(refs)}",{footprint},'
+                     f"{len(refs)},{instances},{len(refs) * instances}")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# bom.csv reconciliation
+# ---------------------------------------------------------------------------
+
+def _parse_qty(text):
+    """"16" -> (16, 16); "1-2" -> (1, 2); "" -> (0, 0)."""
+    nums = [int(n) for n in re.findall(r"\d+", text)]
+    return (min(nums), max(nums)) if nums else (0, 0)
+
+
+def load_bom_index(path=BOM_CSV):
+    """Read bom.csv once into (rows, by_part, by_token, by_value)."""
+    rows, by_part, by_token, by_value = [], {}, {}, {}
+    with open(path, newline="") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            part = row["Part"]
+            rows.append({"part": part, "qty": _parse_qty(row["Quantity"])})
+            by_part[part] = i
+            for field in (part, row["Package"], row["Alternate"]):
+                for tok in _TOKEN_SPLIT.split(field.lower()):
+                    if tok:
+                        by_token.setdefault(tok, set()).add(i)
+            low = part.lower()
+            kind = "R" if "resistor" in low else "C" if "cap" in low else None
+            value = parse_value(kind, part) if kind else None
+            if value is not None:
+                by_value.setdefault((kind, value), set()).add(i)
+    return rows, by_part, by_token, by_value
+
+
+def match_bom_rows(index, value, lib):
+    """bom.csv row indices for one (value, footprint) group."""
+    rows, by_part, by_token, by_value = index
+    if value in BOM_ALIASES:
+        return frozenset([by_part[BOM_ALIASES[value]]])
+    kind = _passive_kind(lib)
+    if kind:
+        v = parse_value(kind, value) if kind == "C" else parse_value(kind, value + " ohm")
+        return frozenset(by_value.get((kind, v), ()))
+    return frozenset(by_token.get(value.lower(), ()))
+
+
+def reconcile(boards, index=None):
+    """Check board totals against bom.csv.
+
+    `boards` is [(name, board, instances)]. Returns (short, missing):
+      short   = [(bom parts, listed max, needed, [(board, value, total)])]
+      missing = [(board, value, footprint, total)]
+    """
+    index = index or load_bom_index()
+    rows = index[0]
+    needed = {}
+    missing = []
+    for name, board, instances in boards:
+        for (value, lib), refs in bom_groups(board).items():
+            total = len(refs) * instances
+            matched = match_bom_rows(index, value, lib)
+            if not matched:
+                missing.append((name, value, lib.split(":", 1)[-1], total))
+                continue
+            needed.setdefault(matched, []).append((name, value, total))
+    short = []
+    for matched, users in needed.items():
+        listed = sum(rows[i]["qty"][1] for i in matched)
+        need = sum(t for _, _, t in users)
+        if need > listed:
+            parts = " + ".join(rows[i]["part"] for i in sorted(matched))
+            short.append((parts, listed, need, users))
+    return short, missing
+
+
+def print_reconciliation(short, missing):
+    if not short and not missing:
+        print("  bom.csv: all parts accounted for")
+        return
+    for parts, listed, need, users in short:
+        used = ", ".join(f"{b} {v} x{t}" for b, v, t in users)
+        print(f"  bom.csv short: {parts}: lists {listed}, boards need {need} ({used})")
+    for name, value, footprint, total in missing:
+        print(f"  not in bom.csv: {name} {value} ({footprint}) x{total}")
+
+
+def write_assembly_files(board, out_dir, basename, instances=1):
+    """Write <basename>-CPL.csv and <basename>-BOM.csv; returns paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for suffix, text in (("CPL", write_cpl(board)), ("BOM", write_bom(board, instances))):
+        path = os.path.join(out_dir, f"{basename}-{suffix}.csv")
+        with open(path, "w") as f:
+            f.write(text)
+        paths.append(path)
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", nargs="?",
+                    help="board key, gen_pcb.py or .kicad_pcb (default: reconcile all)")
+    ap.add_argument("-o", "--out-dir", default=".")
+    ap.add_argument("-n", "--name", help="output basename (default: from input)")
+    ap.add_argument("--instances", type=int, help="override INSTANCES")
+    args = ap.parse_args()
+
+    if args.board is None:
+        boards = []
+        for key, path in GENERATORS.items():
+            module, board = board_from_generator(path)
+            boards.append((key, board, getattr(module, "INSTANCES", 1)))
+        print("Reconciling " + ", ".join(f"{k} x{n}" for k, _, n in boards)
+              + " against bom.csv")
+        print_reconciliation(*reconcile(boards))
+    else:
+        if args.board in GENERATORS or args.board.endswith(".py"):
+            module, board = board_from_generator(GENERATORS.get(args.board, args.board))
+            instances = getattr(module, "INSTANCES", 1)
+        else:
+            board = resolve_board(args.board)
+            instances = 1
+        if args.instances:
+            instances = args.instances
+        name = args.name or os.path.splitext(os.path.basename(args.board))[0]
+        for path in write_assembly_files(board, args.out_dir, name, instances):
+            print(f"Assembly file written to: {path}")
+        print_reconciliation(*reconcile([(name, board, instances)]))
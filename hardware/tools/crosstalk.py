@@ -0,0 +1,332 @@
+"""
+MIXTEE PCB tools - clock-to-analog crosstalk (2D field solver)
+
+Where a digital aggressor (MCLK, BCLK, ...) runs alongside an analog victim
+(FILT_IN, FN1, FOUT ... the Sallen-Key inputs and their neighbours), the
+cross-section is solved quasi-statically:
+
+  field     finite-difference Laplace on a DX grid: both traces, the planes
+            above/below them (layers with a zone) and FR4 (ER) below F.Cu /
+            above B.Cu, air outside. Each trace is driven to 1 V in turn,
+            once with the dielectric and once in air; conductor charges give
+            the Maxwell C matrix and the air solve gives L = mu0 eps0 C0^-1
+  coupling  weak-coupling, electrically short lines (Paul): near- and
+            far-end victim voltage per volt of aggressor at the aggressor's
+            fundamental (CLOCK_HZ), both mechanisms,
+              V/Vs = jwl [Cm RL/(RS+RL) RNE RFE/(RNE+RFE)
+                          +/- Lm/(RS+RL) R(NE|FE)/(RNE+RFE)]
+            with RS/RL the clock driver/receiver and RNE/RFE the victim's
+            source and input impedances
+
+All sections go into one batch of grids, solved together by Jacobi-
+preconditioned conjugate gradients; four systems per section.
+
+Sections come from spacing.py: each analog/digital net pair with a parallel
+run gives one cross-section at its minimum gap and its total run length.
+Channel crosstalk sums the magnitudes of every section that hits a channel's
+nets (worst-case phase). Generated boards are unrouted and have no parallel
+runs; for them the table is a what-if: every clock on the board next to an
+analog trace on F.Cu at GAPS, over --length mm.
+
+The fundamentals are far above the audio band; what lands on an input
+matters through the ADC's anti-alias filter and modulator, so read the
+numbers as relative rather than as an in-band noise floor.
+
+Usage:
+  python crosstalk.py                          # input-mother what-if table
+  python crosstalk.py routed.kicad_pcb         # per-channel estimate, routed board
+  python crosstalk.py input-mother --length 20 --rfe 47k
+"""
+
+import argparse
+import math
+import re
+import sys
+
+import numpy as np
+
+import spacing
+from kicad_pcb import load_board, resolve_board_text
+from pdn import EPS0, ER, MU0
+from thermal_vias import STACKUP
+
+DX = 0.02                       # grid cell, mm; Z0 within ~10% of a 0.005 mm grid
+COPPER_MM = 0.035               # 1 oz
+AIR_MM = 1.0                    # air above/below outer layers
+SIDE_MM = 1.5                   # lateral margin beyond the traces
+GAPS = (0.25, 0.5, 1.0, 2.0)    # what-if gaps on unrouted boards, mm
+LENGTH_MM = 10.0
+CLOCK_HZ = {"MCLK": 12.288e6, "BCLK": 24.576e6, "LRCLK": 48e3, "SDA": 400e3, "SCL": 400e3,
+            "SDIN": 12.288e6, "SDOUT": 12.288e6}    # pin-mapping.md; data at half BCLK
+RS, RL = 33.0, 1e6              # clock driver, CMOS receiver
+RNE, RFE = 1e3, 10e3            # victim source, Sallen-Key input
+
+
+# ---------------------------------------------------------------------------
+# Field solver
+# ---------------------------------------------------------------------------
+
+def cross_section(wa, wv, offset, la, lv, planes, layers, thick, dx=DX):
+    """Conductor-index and permittivity grids for one section.
+
+    `offset` is the aggressor-to-victim centre distance, mm. Traces sit on
+    layers la/lv; `planes` are layers held at 0 V across the window.
+    Index 0 is free space, 1 the aggressor, 2 the victim, 3 ground.
+    """
+    depth = STACKUP[len(layers)]
+    za, zv = depth[la], depth[lv]
+    top = min(za, zv)
+    bottom = max(za, zv)
+    above = [depth[p] for p in planes if depth[p] < top]
+    below = [depth[p] for p in planes if depth[p] > bottom]
+    z0 = max(above) if above else -AIR_MM - COPPER_MM
+    z1 = min(below) if below else thick + AIR_MM + COPPER_MM
+    half = (max(wa, wv) + abs(offset)) / 2 + SIDE_MM
+    xs = (np.arange(int(2 * half / dx)) + 0.5) * dx - half
+    zs = (np.arange(int((z1 - z0) / dx) + 1) + 0.5) * dx + z0
+    z, x = np.meshgrid(zs, xs, indexing="ij")
+    eps = np.where((z >= 0) & (z <= thick), ER, 1.0)
+    cond = np.zeros(z.shape, dtype=np.int8)
+
+    def trace(cx, w, zc, idx):
+        # Outer copper sits on the laminate, inner copper below its depth
+        z_lo = zc - COPPER_MM if zc == 0 else zc
+        zm = np.abs(z - (z_lo + COPPER_MM / 2)) <= max(COPPER_MM, dx) / 2
+        cond[zm & (np.abs(x - cx) <= w / 2)] = idx
+
+    trace(-offset / 2, wa, za, 1)
+    trace(offset / 2, wv, zv, 2)
+    if above:
+        cond[0] = 3
+    if below:
+        cond[-1] = 3
+    return cond, eps
+
+
+def _pad(grids, fill):
+    """Stack grids of different shapes, centred, padded with `fill`."""
+    ny = max(g.shape[0] for g in grids)
+    nx = max(g.shape[1] for g in grids)
+    out = np.full((len(grids), ny, nx), fill, dtype=grids[0].dtype)
+    for k, g in enumerate(grids):
+        out[k, :g.shape[0], (nx - g.shape[1]) // 2:(nx - g.shape[1]) // 2 + g.shape[1]] = g
+    return out
+
+
+class Laplace:
+    """Batched 5-point div(eps grad phi) operator; outside the grids is 0 V."""
+
+    def __init__(self, eps):
+        self.ex = (eps[:, :, 1:] + eps[:, :, :-1]) / 2
+        self.ey = (eps[:, 1:, :] + eps[:, :-1, :]) / 2
+        d = eps * 0
+        d[:, :, 1:] += self.ex
+        d[:, :, :-1] += self.ex
+        d[:, 1:, :] += self.ey
+        d[:, :-1, :] += self.ey
+        d[:, :, 0] += eps[:, :, 0]
+        d[:, :, -1] += eps[:, :, -1]
+        d[:, 0, :] += eps[:, 0, :]
+        d[:, -1, :] += eps[:, -1, :]
+        self.diag = d
+
+    def __call__(self, x):
+        y = self.diag * x
+        y[:, :, 1:] -= self.ex * x[:, :, :-1]
+        y[:, :, :-1] -= self.ex * x[:, :, 1:]
+        y[:, 1:, :] -= self.ey * x[:, :-1, :]
+        y[:, :-1, :] -= self.ey * x[:, 1:, :]
+        return y
+
+
+def solve(cond, eps, tol=1e-7, maxiter=5000):
+    """Potentials for a batch: cond/eps (B, ny, nx); cond > 0 nodes are fixed
+    at 1 V where cond == 1 and 0 V otherwise. Returns (phi, A)."""
+    A = Laplace(eps)
+    free = cond == 0
+    fixed = (cond == 1).astype(float)
+    b = -A(fixed) * free
+    x = np.zeros_like(b)
+    r = b.copy()
+    z = r / A.diag
+    p = z.copy()
+    rz = (r * z).sum(axis=(1, 2))
+    norm = np.sqrt((b * b).sum(axis=(1, 2))) + 1e-300
+    for _ in range(maxiter):
+        Ap = A(p) * free
+        alpha = rz / (p * Ap).sum(axis=(1, 2))
+        x += alpha[:, None, None] * p
+        r -= alpha[:, None, None] * Ap
+        if (np.sqrt((r * r).sum(axis=(1, 2))) / norm).max() < tol:
+            break
+        z = r / A.diag
+        rz_new = (r * z).sum(axis=(1, 2))
+        p = z + (rz_new / rz)[:, None, None] * p
+        rz = rz_new
+    return x + fixed, A
+
+
+def line_parameters(sections):
+    """Per-unit-length (C, L) 2x2 matrices, F/m and H/m, for a list of
+    cross_section() results; aggressor is index 0, victim 1. Grid flux is
+    dimensionless in 2D, so the cell size drops out."""
+    n = len(sections)
+    cond = _pad([c for c, _ in sections], 0)
+    eps = _pad([e for _, e in sections], 1.0)
+    # Batch: [section][dielectric|air][drive aggressor|victim]
+    drive = np.empty((n, 2, 2) + cond.shape[1:], dtype=np.int8)
+    perm = np.empty(drive.shape)
+    for d, hot in enumerate((1, 2)):
+        relabel = np.where(cond == hot, 1, np.where(cond == 0, 0, 4))
+        drive[:, 0, d] = drive[:, 1, d] = relabel
+        perm[:, 0, d] = eps
+        perm[:, 1, d] = 1.0
+    shape = drive.shape
+    phi, A = solve(drive.reshape((-1,) + shape[3:]), perm.reshape((-1,) + shape[3:]))
+    flux = A(phi).reshape(shape)
+    cond4 = np.broadcast_to(cond[:, None, None], shape)
+    q = np.stack([(flux * (cond4 == k)).sum(axis=(3, 4)) for k in (1, 2)], axis=-1)   # (n, 2, 2 drive, 2 conductor)
+    C = EPS0 * q[:, 0]
+    L = MU0 * EPS0 * np.linalg.inv(EPS0 * q[:, 1])
+    return C, L
+
+
+def coupling(C, L, length_m, freq, rs=RS, rl=RL, rne=RNE, rfe=RFE):
+    """|V_victim / V_source| at the near and far end, arrays over sections."""
+    w = 2 * np.pi * np.asarray(freq)
+    cm, lm = -C[:, 0, 1], L[:, 0, 1]
+    cap = cm * rl / (rs + rl) * rne * rfe / (rne + rfe)
+    ind = lm / (rs + rl) / (rne + rfe)
+    near = w * length_m * np.abs(cap + ind * rne)
+    far = w * length_m * np.abs(cap - ind * rfe)
+    return near, far
+
+
+# ---------------------------------------------------------------------------
+# Sections
+# ---------------------------------------------------------------------------
+
+def clock_hz(net):
+    m = re.match(r"[A-Z]+", net)
+    return CLOCK_HZ.get(m.group(0) if m else net, CLOCK_HZ["BCLK"])
+
+
+def channel(net):
+    """Input channel of an analog net: R-side nets (_Rk) -> 2k, JACK_k ->
+    2k-1, other L-side nets carry their odd channel number."""
+    m = re.search(r"_R(\d+)", net)
+    if m:
+        return 2 * int(m.group(1))
+    m = re.fullmatch(r"JACK_(\d+)", net)
+    if m:
+        return 2 * int(m.group(1)) - 1
+    m = re.search(r"_(\d+)", net)
+    return int(m.group(1)) if m else None
+
+
+def board_sections(board, gen, length, jobs=None):
+    """(routed, [{"victim", "aggressor", "la", "lv", "gap", "length", "wa", "wv"}]).
+    Routed boards: spacing.py pairs with a parallel run. Unrouted: every
+    clock on the board against an analog trace on F.Cu at GAPS."""
+    widths = spacing._class_widths(gen)
+    rows, count, airwires, _ = spacing.check_board(board, gen, jobs=jobs)
+    routed = count > airwires
+    out = []
+    if routed:
+        for gap, run, lv, la, an, dn, *_ in rows:
+            if run > 0:
+                out.append({"victim": an, "aggressor": dn, "la": la, "lv": lv, "gap": gap,
+                            "length": run, "wa": widths["digital"], "wv": widths["analog"]})
+        return routed, out
+    kinds = spacing.classify(board["nets"])
+    clocks = sorted({board["nets"][c] for c, k in kinds.items() if k == "digital"})
+    top = board["layers"][0]
+    for dn in clocks:
+        for gap in GAPS:
+            out.append({"victim": f"@{gap:g} mm", "aggressor": dn, "la": top, "lv": top, "gap": gap,
+                        "length": length, "wa": widths["digital"], "wv": widths["analog"]})
+    return routed, out
+
+
+def estimate(board, sections, rs=RS, rl=RL, rne=RNE, rfe=RFE, dx=DX):
+    """Adds C/L (per m) and near/far-end dB to each section, in place."""
+    if not sections:
+        return sections
+    planes = {l for z in board["zones"] for l in z["layers"]}
+    layers = board["layers"]
+    thick = board.get("thickness", STACKUP[len(layers)][layers[-1]])
+    grids, cache = [], {}
+    for s in sections:
+        key = (s["wa"], s["wv"], round(s["gap"], 3), s["la"], s["lv"])
+        if key not in cache:
+            same = s["la"] == s["lv"]
+            offset = (s["wa"] + s["wv"]) / 2 + s["gap"] if same or s["gap"] > 0 else 0.0
+            cache[key] = len(grids)
+            grids.append(cross_section(s["wa"], s["wv"], offset, s["la"], s["lv"],
+                                       sorted(planes - {s["la"], s["lv"]}), layers, thick, dx))
+        s["grid"] = cache[key]
+    C, L = line_parameters(grids)
+    idx = np.array([s["grid"] for s in sections])
+    freq = np.array([clock_hz(s["aggressor"]) for s in sections])
+    length = np.array([s["length"] for s in sections]) * 1e-3
+    near, far = coupling(C[idx], L[idx], length, freq, rs, rl, rne, rfe)
+    for k, s in enumerate(sections):
+        s.update(cm=-C[idx[k], 0, 1], lm=L[idx[k], 0, 1], freq=freq[k], ratio=max(near[k], far[k]),
+                 near_db=_db(near[k]), far_db=_db(far[k]))
+        del s["grid"]
+    return sections
+
+
+def _db(ratio):
+    return 20 * math.log10(ratio) if ratio > 0 else -math.inf
+
+
+def _parse_ohms(text):
+    m = re.fullmatch(r"([\d.]+)\s*([kKM]?)", text)
+    if not m:
+        raise argparse.ArgumentTypeError(f"bad resistance: {text}")
+    return float(m.group(1)) * {"": 1, "k": 1e3, "K": 1e3, "M": 1e6}[m.group(2)]
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("boards", nargs="*", default=["input-mother"], help="board keys, gen_pcb.py or .kicad_pcb")
+    ap.add_argument("--length", type=float, default=LENGTH_MM, help="what-if parallel run on unrouted boards (mm)")
+    ap.add_argument("--rs", type=_parse_ohms, default=RS, help="clock driver resistance")
+    ap.add_argument("--rl", type=_parse_ohms, default=RL, help="clock receiver resistance")
+    ap.add_argument("--rne", type=_parse_ohms, default=RNE, help="victim source resistance")
+    ap.add_argument("--rfe", type=_parse_ohms, default=RFE, help="victim input resistance")
+    ap.add_argument("--dx", type=float, default=DX, help="field-solver grid cell (mm)")
+    ap.add_argument("--jobs", type=int, default=None, help="spacing.py worker processes")
+    args = ap.parse_args()
+
+    for spec in args.boards:
+        text, gen = resolve_board_text(spec)
+        board = load_board(text)
+        routed, sections = board_sections(board, gen, args.length, args.jobs)
+        estimate(board, sections, args.rs, args.rl, args.rne, args.rfe, args.dx)
+        print(f"{spec}: {len(sections)} sections" + ("" if routed else
+              f" (unrouted: what-if, {args.length:g} mm parallel on {board['layers'][0]})"))
+        if not sections:
+            continue
+        print(f"  {'aggressor':<8} {'victim':<12} {'layers':<14} {'gap':>5} {'run':>6}"
+              f" {'Cm pF/m':>8} {'Lm nH/m':>8} {'f MHz':>7} {'NE dB':>7} {'FE dB':>7}")
+        for s in sorted(sections, key=lambda s: -s["ratio"]):
+            layers = s["la"] if s["la"] == s["lv"] else f"{s['la']}/{s['lv']}"
+            print(f"  {s['aggressor']:<8} {s['victim']:<12} {layers:<14} {s['gap']:5.2f} {s['length']:6.1f}"
+                  f" {s['cm'] * 1e12:8.2f} {s['lm'] * 1e9:8.2f} {s['freq'] / 1e6:7.3f}"
+                  f" {s['near_db']:7.1f} {s['far_db']:7.1f}")
+        if routed:
+            per = {}
+            for s in sections:
+                ch = channel(s["victim"])
+                total, worst = per.get(ch, (0.0, None))
+                per[ch] = (total + s["ratio"], max(worst or s, s, key=lambda t: t["ratio"]))
+            print("  channel  crosstalk  worst section")
+            for ch, (total, worst) in sorted(per.items(), key=lambda kv: (kv[0] is None, kv[0] or 0)):
+                print(f"  {ch if ch else '-':>7}  {_db(total):6.1f} dB  {worst['aggressor']} -> {worst['victim']}")
+    sys.exit(0)
@@ -0,0 +1,232 @@
+"""
+MIXTEE PCB tools - visual diff between two board revisions
+
+Renders two revisions onto one raster grid (raster.py), XORs every layer,
+and writes a highlighted diff image plus a list of footprints that moved,
+rotated, flipped, changed value or pad nets, or appeared/disappeared.
+
+Revisions are either two .kicad_pcb files, or a generator at two git
+revisions (the gen_pcb.py is read with `git show` and run in memory, so no
+checkout is needed). A missing revision means the working tree.
+
+  red    copper/silk only in the old revision
+  green  only in the new revision
+  grey   unchanged (new revision)
+  yellow box around every moved or changed footprint
+
+Exit status is 1 when the revisions differ, like diff(1).
+
+Usage:
+  python diff.py input-mother HEAD~1             # HEAD~1 vs working tree
+  python diff.py input-mother v0.3 HEAD -o /tmp/eco
+  python diff.py old.kicad_pcb new.kicad_pcb --dpi 600
+"""
+
+import argparse
+import math
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+import raster
+from kicad_pcb import GENERATORS, footprint_bbox, load_board, load_board_file, load_generator_source
+
+MOVE_TOL = 0.001    # mm / degrees
+
+ADDED = (60, 220, 80)
+REMOVED = (235, 60, 60)
+MARK = (255, 220, 0)
+
+
+# ---------------------------------------------------------------------------
+# Loading revisions
+# ---------------------------------------------------------------------------
+
+def _git(*args, cwd=None):
+    return subprocess.run(["git", *args], cwd=cwd, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def generator_at(path, rev=None):
+    """Board model from a gen_pcb.py at git revision `rev` (None: working tree)."""
+    path = os.path.abspath(path)
+    if rev is None:
+        with open(path) as f:
+            source = f.read()
+    else:
+        root = _git("rev-parse", "--show-toplevel", cwd=os.path.dirname(path)).strip()
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        source = _git("show", f"{rev}:{rel}", cwd=root)
+    gen = load_generator_source(source, "gen_" + (rev or "worktree").replace("~", "_").replace("^", "_"))
+    return load_board(gen.generate_pcb())
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+
+def _pad_key(name):
+    return (0, int(name), "") if name.isdigit() else (1, 0, name)
+
+
+def _nets(names):
+    return "/".join(n or "(none)" for n in names) if names else "-"
+
+
+def pad_nets(board, fp):
+    """{pad name: (net name, ...)}; names, not codes, since net codes are
+    renumbered between revisions. Pads sharing a name (exposed-pad grids)
+    keep every net."""
+    out = {}
+    for p in fp["pads"]:
+        out.setdefault(p["name"], []).append(board["nets"].get(p["net"], ""))
+    return {name: tuple(sorted(nets)) for name, nets in out.items()}
+
+
+def footprint_changes(old, new):
+    """[(ref, kind, detail, new fp or old fp)] sorted by ref.
+
+    kind is "moved", "changed", "added" or "removed"; a footprint that moved
+    and changed reports both in its detail. Changed covers value, footprint
+    and pad-to-net connections (compared by net name).
+    """
+    a = {fp["ref"]: fp for fp in old["footprints"]}
+    b = {fp["ref"]: fp for fp in new["footprints"]}
+    out = []
+    for ref in sorted(set(a) | set(b)):
+        if ref not in b:
+            fp = a[ref]
+            out.append((ref, "removed", f'{fp["value"]} at ({fp["x"]:.2f}, {fp["y"]:.2f})', fp))
+            continue
+        if ref not in a:
+            fp = b[ref]
+            out.append((ref, "added", f'{fp["value"]} at ({fp["x"]:.2f}, {fp["y"]:.2f})', fp))
+            continue
+        fa, fb = a[ref], b[ref]
+        notes = []
+        d = math.hypot(fb["x"] - fa["x"], fb["y"] - fa["y"])
+        if d > MOVE_TOL:
+            notes.append(f'({fa["x"]:.2f}, {fa["y"]:.2f}) -> ({fb["x"]:.2f}, {fb["y"]:.2f}), {d:.2f} mm')
+        if abs((fb["rot"] - fa["rot"] + 180) % 360 - 180) > MOVE_TOL:
+            notes.append(f'rot {fa["rot"]:g} -> {fb["rot"]:g}')
+        if fa["layer"] != fb["layer"]:
+            notes.append(f'{fa["layer"]} -> {fb["layer"]}')
+        moved = bool(notes)
+        if fa["value"] != fb["value"]:
+            notes.append(f'value {fa["value"]} -> {fb["value"]}')
+        if fa["lib"] != fb["lib"]:
+            notes.append(f'footprint {fa["lib"]} -> {fb["lib"]}')
+        if len(fa["pads"]) != len(fb["pads"]):
+            notes.append(f'{len(fa["pads"])} -> {len(fb["pads"])} pads')
+        nets_a, nets_b = pad_nets(old, fa), pad_nets(new, fb)
+        for pad in sorted(set(nets_a) | set(nets_b), key=_pad_key):
+            na, nb = nets_a.get(pad), nets_b.get(pad)
+            if na != nb:
+                notes.append(f"pad {pad} {_nets(na)} -> {_nets(nb)}")
+        if notes:
+            out.append((ref, "moved" if moved else "changed", "; ".join(notes), fb))
+    return out
+
+
+def diff_boards(old, new, dpi=raster.DPI, layers=None):
+    """Rasterize both revisions on a shared grid and XOR them.
+
+    Returns (old rasters, new rasters, {layer: changed pixel count}, canvas).
+    Layers present in only one revision compare against an empty raster.
+    """
+    ba, bb = raster.board_bounds(old), raster.board_bounds(new)
+    bounds = (min(ba[0], bb[0]), min(ba[1], bb[1]), max(ba[2], bb[2]), max(ba[3], bb[3]))
+    ra, cv = raster.rasterize(old, dpi, bounds, layers)
+    rb, _ = raster.rasterize(new, dpi, bounds, layers)
+    empty = np.zeros(cv["shape"], dtype=bool)
+    counts = {}
+    for layer in list(dict.fromkeys(list(ra) + list(rb))):
+        counts[layer] = int(np.count_nonzero(ra.get(layer, empty) ^ rb.get(layer, empty)))
+    return ra, rb, counts, cv
+
+
+def diff_image(ra, rb, cv, changes=(), layers=None):
+    """Highlighted diff over `layers` (default: all): grey / red / green."""
+    empty = np.zeros(cv["shape"], dtype=bool)
+    names = layers or list(dict.fromkeys(list(ra) + list(rb)))
+    a = np.zeros(cv["shape"], dtype=bool)
+    b = np.zeros(cv["shape"], dtype=bool)
+    for layer in names:
+        a |= ra.get(layer, empty)
+        b |= rb.get(layer, empty)
+    img = np.empty(cv["shape"] + (3,), dtype=np.uint8)
+    img[:] = raster.BACKGROUND
+    img[a & b] = (110, 110, 110)
+    img[a & ~b] = REMOVED
+    img[b & ~a] = ADDED
+
+    marks = np.zeros(cv["shape"], dtype=bool)
+    for _, _, _, fp in changes:
+        x0, y0, x1, y1 = footprint_bbox(fp)
+        x0, y0, x1, y1 = x0 - 0.5, y0 - 0.5, x1 + 0.5, y1 + 0.5
+        corners = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+        for p, q in zip(corners, corners[1:] + corners[:1]):
+            raster.paint_segment(marks, cv, p, q, 0.15)
+    img[marks] = MARK
+    return img
+
+
+def write_diff(old, new, out_dir, basename, dpi=raster.DPI, layers=None):
+    """Write <basename>-diff.png and one image per changed layer.
+
+    Returns (paths, counts, changes).
+    """
+    ra, rb, counts, cv = diff_boards(old, new, dpi, layers)
+    changes = footprint_changes(old, new)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, f"{basename}-diff.png")]
+    raster.write_png(paths[0], diff_image(ra, rb, cv, changes))
+    for layer, n in counts.items():
+        if n:
+            path = os.path.join(out_dir, f"{basename}-diff-{layer.replace('.', '_')}.png")
+            raster.write_png(path, diff_image(ra, rb, cv, changes, [layer]))
+            paths.append(path)
+    return paths, counts, changes
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", help="board key or gen_pcb.py (with revisions), or old .kicad_pcb")
+    ap.add_argument("revs", nargs="*", help="OLD [NEW] git revisions, or the new .kicad_pcb")
+    ap.add_argument("--dpi", type=int, default=raster.DPI)
+    ap.add_argument("--layers", nargs="*")
+    ap.add_argument("-o", "--out-dir", default="diff")
+    args = ap.parse_args()
+
+    if args.board.endswith(".kicad_pcb"):
+        if len(args.revs) != 1:
+            ap.error("give two .kicad_pcb files")
+        old, new = load_board_file(args.board), load_board_file(args.revs[0])
+        name, label = os.path.splitext(os.path.basename(args.revs[0]))[0], f"{args.board} -> {args.revs[0]}"
+    else:
+        path = GENERATORS.get(args.board, args.board)
+        revs = (args.revs + [None, None])[:2] if args.revs else ["HEAD", None]
+        old, new = generator_at(path, revs[0]), generator_at(path, revs[1])
+        name = args.board if args.board in GENERATORS else "board"
+        label = f"{name}: {revs[0]} -> {revs[1] or 'working tree'}"
+
+    paths, counts, changes = write_diff(old, new, args.out_dir, name, args.dpi, args.layers)
+    print(label)
+    changed = {l: n for l, n in counts.items() if n}
+    if not changed and not changes:
+        print("  no differences")
+        sys.exit(0)
+    mm2 = (25.4 / args.dpi) ** 2
+    for layer, n in changed.items():
+        print(f"  {layer:<10} {n:>8} px changed ({n * mm2:.2f} mm^2)")
+    for ref, kind, detail, _ in changes:
+        print(f"  {ref:<6} {kind:<8} {detail}")
+    for path in paths:
+        print(f"Diff image written to: {path}")
+    sys.exit(1)
@@ -0,0 +1,175 @@
+"""
+MIXTEE PCB tools - Excellon drill writer
+
+Writes plated (PTH) and non-plated (NPTH) Excellon drill files straight from
+the board model, replacing `kicad-cli pcb export drill` in Stage 7 of
+docs/pcbs-workflow.md.
+
+Holes come from through-hole pads (jacks, USB-A, RJ45, DIP-8, pots, headers,
+QFN thermal vias) and the board's vias. Oval pad drills are written as G85
+slots with a tool of the slot width. They are grouped into one tool per
+drill diameter, with vias on tools of their own tagged ViaDrill (pads are
+ComponentDrill), as KiCad does; each tool's hits are ordered with a nearest-neighbour + 2-opt tour
+starting from where the previous tool finished, which keeps spindle travel
+short on the fab's drill machine.
+
+Only holes already in the file are written: run on a generated (unrouted)
+board, the output has no FreeRouting vias. Routed boards still need
+`kicad-cli pcb export drill`.
+
+Output matches KiCad's defaults: metric, decimal coordinates, absolute
+origin, Y axis flipped (Excellon is y-up, the board frame is y-down).
+
+Usage:
+  python excellon.py keys4x4                 # board key, gen_pcb.py or .kicad_pcb
+  python excellon.py board.kicad_pcb -o gerbers/
+"""
+
+import argparse
+import datetime
+import os
+
+from kicad_pcb import resolve_board, rotate
+from tour import optimise_path, path_length
+
+
+def slot_ends(pad):
+    """Centre-line end points of an oval pad drill, board frame."""
+    w, h = pad["slot"]
+    half = abs(w - h) / 2
+    dx, dy = rotate(half, 0.0, pad["rot"]) if w > h else rotate(0.0, half, pad["rot"])
+    return (pad["x"] - dx, pad["y"] - dy), (pad["x"] + dx, pad["y"] + dy)
+
+
+def collect_holes(board):
+    """{"PTH": [(drill, x, y, slot, function)], "NPTH": [...]} for every hole;
+    slot is None for round holes, else the two end points of the slot, and
+    function is the aperture function, "ComponentDrill" or "ViaDrill"."""
+    holes = {"PTH": [], "NPTH": []}
+    for fp in board["footprints"]:
+        for pad in fp["pads"]:
+            if pad["drill"] <= 0:
+                continue
+            kind = "NPTH" if pad["type"] == "np_thru_hole" else "PTH"
+            slot = slot_ends(pad) if pad.get("slot") else None
+            holes[kind].append((round(pad["drill"], 3), pad["x"], pad["y"], slot, "ComponentDrill"))
+    for via in board["vias"]:
+        holes["PTH"].append((round(via["drill"], 3), via["at"][0], via["at"][1], None, "ViaDrill"))
+    return holes
+
+
+def plan_tools(holes, home=(0.0, 0.0)):
+    """Group hits by diameter and aperture function (vias get their own
+    tools, as in KiCad) and order each group.
+
+    Returns [(diameter, function, [(x, y, slot), ...]), ...], smallest drill
+    first (the usual fab convention), plus the total travel in mm. Slots are
+    ordered by their centres.
+    """
+    by_size = {}
+    for d, x, y, slot, func in holes:
+        by_size.setdefault((d, func), []).append((x, y, slot))
+
+    tools = []
+    travel = 0.0
+    pos = home
+    for d, func in sorted(by_size):
+        hits = by_size[d, func]
+        pts = [(x, y) for x, y, _ in hits]
+        order = optimise_path(pts, start=pos)
+        ordered = [hits[i] for i in order]
+        travel += path_length(pts, order, start=pos)
+        tools.append((d, func, ordered))
+        pos = pts[order[-1]]
+    return tools, travel
+
+
+def write_excellon(tools, plated=True, generator="mixtee_excellon", copper_layers=2):
+    """Excellon text for a planned tool list; the file function spans layer
+    1 to `copper_layers`."""
+    kind = "PTH" if plated else "NPTH"
+    func = f"{'Plated' if plated else 'NonPlated'},1,{copper_layers},{kind}"
+    stamp = datetime.datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+    lines = [
+        "M48",
+        f"; DRILL file {{{generator}}} date {stamp}",
+        "; FORMAT={-:-/ absolute / metric / decimal}",
+        f"; #@! TF.CreationDate,{stamp}",
+        f"; #@! TF.GenerationSoftware,MIXTEE,{generator}",
+        f"; #@! TF.FileFunction,{func}",
+        "FMAT,2",
+        "METRIC",
+    ]
+    for i, (d, aper, _) in enumerate(tools, start=1):
+        lines.append(f"; #@! TA.AperFunction,{'Plated' if plated else 'NonPlated'},{kind},{aper}")
+        lines.append(f"T{i}C{d:.3f}")
+    lines += ["%", "G90", "G05"]
+    for i, (_, _, pts) in enumerate(tools, start=1):
+        lines.append(f"T{i}")
+        for x, y, slot in pts:
+            if slot:
+                (x0, y0), (x1, y1) = slot
+                lines.append(f"X{x0:.4f}Y{-y0:.4f}G85X{x1:.4f}Y{-y1:.4f}")
+            else:
+                lines.append(f"X{x:.4f}Y{-y:.4f}")
+    lines += ["M30", ""]
+    return "\n".join(lines)
+
+
+def generate_drill(board, generator="mixtee_excellon"):
+    """{"PTH": text, "NPTH": text or None} plus a summary dict."""
+    holes = collect_holes(board)
+    out = {}
+    summary = {}
+    for kind in ("PTH", "NPTH"):
+        if not holes[kind]:
+            out[kind] = None
+            continue
+        tools, travel = plan_tools(holes[kind])
+        out[kind] = write_excellon(tools, plated=(kind == "PTH"), generator=generator,
+                                   copper_layers=len(board["layers"]) or 2)
+        summary[kind] = {
+            "holes": len(holes[kind]),
+            "slots": sum(h[3] is not None for h in holes[kind]),
+            "tools": [(d, len(pts)) for d, _, pts in tools],
+            "travel": travel,
+        }
+    return out, summary
+
+
+def write_drill_files(board, out_dir, basename, generator="mixtee_excellon"):
+    """Write <basename>-PTH.drl / -NPTH.drl into out_dir; returns paths."""
+    files, summary = generate_drill(board, generator)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for kind, text in files.items():
+        if text is None:
+            continue
+        path = os.path.join(out_dir, f"{basename}-{kind}.drl")
+        with open(path, "w") as f:
+            f.write(text)
+        paths.append(path)
+    return paths, summary
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", help="board key, gen_pcb.py or .kicad_pcb")
+    ap.add_argument("-o", "--out-dir", default=".")
+    ap.add_argument("-n", "--name", help="output basename (default: from input)")
+    args = ap.parse_args()
+
+    board = resolve_board(args.board)
+    name = args.name or os.path.splitext(os.path.basename(args.board))[0]
+    paths, summary = write_drill_files(board, args.out_dir, name)
+    for path in paths:
+        print(f"Drill file written to: {path}")
+    for kind, s in summary.items():
+        tools = ", ".join(f"{d:.2f}mm x{n}" for d, n in s["tools"])
+        slots = f" ({s['slots']} slots)" if s["slots"] else ""
+        print(f"{kind}: {s['holes']} holes{slots}, {len(s['tools'])} tools ({tools}), "
+              f"travel {s['travel']:.1f} mm")
@@ -0,0 +1,41 @@
+"""
+MIXTEE PCB tools - fabrication outputs written alongside generate_pcb()
+
+Each board's gen_pcb.py calls write_fab_outputs() from its __main__ with the
+PCB text it just generated, so fab files come out of the same run instead
+of a separate kicad-cli export step. The placement proximity rules run on
+the same board.
+
+Outputs go to <designs>/gerbers/, next to the Gerbers from Stage 7.
+"""
+
+import os
+
+from kicad_pcb import load_board
+import assembly
+import excellon
+import proximity
+
+
+def write_fab_outputs(out_dir, basename, pcb_text, generator="mixtee_gen_pcb", instances=1):
+    """Write drill, CPL and BOM files for a freshly generated board.
+
+    `instances` is how many copies of the board the system uses; it scales
+    the BOM totals checked against hardware/bom.csv. Returns the board model.
+    """
+    board = load_board(pcb_text)
+    fab_dir = os.path.join(out_dir, "gerbers")
+
+    paths, summary = excellon.write_drill_files(board, fab_dir, basename, generator)
+    for path in paths:
+        print(f"Drill file written to: {path}")
+    for kind, s in summary.items():
+        print(f"  {kind}: {s['holes']} holes, {len(s['tools'])} tools, "
+              f"travel {s['travel']:.1f} mm")
+
+    for path in assembly.write_assembly_files(board, fab_dir, basename, instances):
+        print(f"Assembly file written to: {path}")
+    assembly.print_reconciliation(*assembly.reconcile([(basename, board, instances)]))
+    proximity.print_report(board)
+
+    return board
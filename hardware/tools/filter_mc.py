@@ -0,0 +1,206 @@
+"""
+MIXTEE PCB tools - anti-alias filter tolerance Monte Carlo
+
+Reads every op-amp filter section from the generator's COMP_NETS and the
+part values from PLACEMENTS, then draws component tolerances for a million
+boards at once to see how far the cutoff, Q and top-of-band gain move, per
+channel and channel to channel on one board.
+
+  section   an op-amp half wired as a follower (IN- = OUT); R_b feeds IN+
+            from node A, R_a feeds A from the channel input. The cap at A
+            (C_a) and the cap at IN+ (C_b) each return to GND or OUT
+  H(s)      1 / (1 + d1 s + d2 s^2), with [x] = 1 when the cap goes to GND:
+              d2 = R_a R_b C_a C_b [C_b]
+              d1 = C_b (R_a + R_b) [C_b] + R_a C_a [C_a]
+            C_a -> OUT, C_b -> GND is the textbook unity-gain Sallen-Key; a
+            cap from IN+ to OUT of a follower has no voltage across it
+  fc        -3 dB frequency; Q = sqrt(d2) / d1 for second-order sections
+
+Values are drawn uniformly within +-tolerance (--dist normal: tolerance =
+3 sigma), in batches of --batch boards. Every --r-tol x --c-tol pair reports
+the 3-sigma range (0.135 .. 99.865 percentile) of fc, Q and the gain at
+--f-band per channel. It also reports the fc and gain difference between
+the best and worst channel on the same board.
+
+Usage:
+  python filter_mc.py                              # input-mother, 1M boards
+  python filter_mc.py --r-tol 1 0.1 --c-tol 5 2 1
+  python filter_mc.py --samples 200000 --dist normal
+  python filter_mc.py --textbook                   # C_a -> OUT, C_b -> GND
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from assembly import parse_value
+from kicad_pcb import GENERATORS, load_generator
+
+SAMPLES = 1_000_000
+BATCH = 125_000
+R_TOL = (1.0,)          # %
+C_TOL = (5.0, 2.0, 1.0) # %, film caps (bom.csv)
+F_BAND = 20_000.0       # Hz, top of the audio band
+SIGMA = (0.135, 99.865) # percentiles for +-3 sigma
+
+# OPA1678 / any dual op-amp, SOIC-8: section -> (OUT, IN-, IN+)
+OPAMP_SECTIONS = {"A": ("1", "2", "3"), "B": ("7", "6", "5")}
+
+
+# ---------------------------------------------------------------------------
+# Netlist
+# ---------------------------------------------------------------------------
+
+def filter_sections(gen):
+    """[{"name", "opamp", "parts": {"Ra", "Rb", "Ca", "Cb": ref},
+    "values": {role: float}, "gnd": {"Ca", "Cb": bool}}] for every follower
+    with the two-resistor, two-capacitor network on IN+, in op-amp order."""
+    nets, cn, pl = gen.NETS, gen.COMP_NETS, gen.PLACEMENTS
+    gnd = {code for code, name in nets.items() if name == "GND"}
+    on = {}
+    for ref, pads in cn.items():
+        if ref[0] in "RC" and len(pads) == 2:
+            a, b = pads.get("1", 0), pads.get("2", 0)
+            on.setdefault(a, []).append((ref, b))
+            on.setdefault(b, []).append((ref, a))
+
+    def other(net, kind, skip=()):
+        hits = [(ref, far) for ref, far in on.get(net, []) if ref[0] == kind and ref not in skip]
+        return hits[0] if len(hits) == 1 else (None, None)
+
+    out = []
+    opamps = [ref for ref, info in pl.items() if info.get("val", "").startswith("OPA")]
+    for u in opamps:
+        for sec, (p_out, p_neg, p_pos) in OPAMP_SECTIONS.items():
+            pads = cn.get(u, {})
+            vout, vneg, vpos = pads.get(p_out), pads.get(p_neg), pads.get(p_pos)
+            if not vout or vneg != vout:
+                continue
+            rb, node_a = other(vpos, "R")
+            cb, cb_to = other(vpos, "C")
+            ra, _ = other(node_a, "R", (rb,)) if rb else (None, None)
+            ca, ca_to = other(node_a, "C") if rb else (None, None)
+            if not (ra and rb and ca and cb) or ca_to not in gnd | {vout} or cb_to not in gnd | {vout}:
+                continue
+            parts = {"Ra": ra, "Rb": rb, "Ca": ca, "Cb": cb}
+            out.append({"name": nets[vout], "opamp": u + sec, "parts": parts,
+                        "values": {k: parse_value(r[0], pl[r].get("val", "")) for k, r in parts.items()},
+                        "gnd": {"Ca": ca_to in gnd, "Cb": cb_to in gnd}})
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+def coefficients(ra, rb, ca, cb, ca_gnd, cb_gnd):
+    """(d1, d2) of the section denominator; arrays broadcast."""
+    d2 = ra * rb * ca * cb * cb_gnd
+    d1 = cb * (ra + rb) * cb_gnd + ra * ca * ca_gnd
+    return d1, d2
+
+
+def response(d1, d2, f_band):
+    """(fc Hz, Q or nan, gain dB at f_band) from the denominator coefficients."""
+    second = d2 > 0
+    s2 = np.where(second, d2, 1.0)
+    iq2 = d1 ** 2 / s2                              # 1 / Q^2
+    k = 2 - iq2
+    x = (k + np.sqrt(k * k + 4)) / 2                # (w_c / w_0)^2
+    w2 = np.sqrt(x / s2)
+    w1 = 1 / np.where(d1 > 0, d1, np.inf)
+    fc = np.where(second, w2, w1) / (2 * math.pi)
+    q = np.where(second, np.sqrt(s2) / np.where(d1 > 0, d1, np.nan), np.nan)
+    w = 2 * math.pi * f_band
+    gain = -10 * np.log10((1 - w * w * d2) ** 2 + (w * d1) ** 2)
+    return fc, q, gain
+
+
+def monte_carlo(sections, r_tol, c_tol, samples=SAMPLES, batch=BATCH, dist="uniform",
+                f_band=F_BAND, seed=1):
+    """Draw `samples` boards; returns {"fc", "q", "gain": (samples, channels) float32}."""
+    rng = np.random.default_rng(seed)
+    nominal = np.array([[s["values"][k] for k in ("Ra", "Rb", "Ca", "Cb")] for s in sections])
+    tol = np.array([r_tol, r_tol, c_tol, c_tol]) / 100
+    ca_gnd = np.array([s["gnd"]["Ca"] for s in sections], dtype=float)
+    cb_gnd = np.array([s["gnd"]["Cb"] for s in sections], dtype=float)
+    n = len(sections)
+    out = {key: np.empty((samples, n), dtype=np.float32) for key in ("fc", "q", "gain")}
+    for start in range(0, samples, batch):
+        m = min(batch, samples - start)
+        if dist == "normal":
+            e = rng.standard_normal((m, n, 4)) / 3
+        else:
+            e = rng.uniform(-1.0, 1.0, (m, n, 4))
+        v = nominal * (1 + e * tol)
+        d1, d2 = coefficients(v[..., 0], v[..., 1], v[..., 2], v[..., 3], ca_gnd, cb_gnd)
+        for key, arr in zip(("fc", "q", "gain"), response(d1, d2, f_band)):
+            out[key][start:start + m] = arr
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def _fmt_range(a, scale=1.0, fmt="{:.2f}"):
+    if np.isnan(a).all():
+        return "-"
+    lo, hi = np.nanpercentile(a, SIGMA)
+    return f"{fmt.format(lo * scale)}..{fmt.format(hi * scale)}"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", nargs="?", default="input-mother", help="board key or gen_pcb.py")
+    ap.add_argument("--r-tol", type=float, nargs="*", default=list(R_TOL), help="resistor tolerance (%%)")
+    ap.add_argument("--c-tol", type=float, nargs="*", default=list(C_TOL), help="capacitor tolerance (%%)")
+    ap.add_argument("--samples", type=int, default=SAMPLES, help="boards")
+    ap.add_argument("--batch", type=int, default=BATCH)
+    ap.add_argument("--dist", choices=("uniform", "normal"), default="uniform")
+    ap.add_argument("--f-band", type=float, default=F_BAND, help="gain reported at this frequency (Hz)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--textbook", action="store_true",
+                    help="rewire every section as C_a -> OUT, C_b -> GND (architecture.md Sallen-Key)")
+    args = ap.parse_args()
+
+    gen = load_generator(GENERATORS.get(args.board, args.board))
+    sections = filter_sections(gen)
+    if not sections:
+        raise SystemExit(f"{args.board}: no op-amp filter sections found")
+    if args.textbook:
+        for s in sections:
+            s["gnd"] = {"Ca": False, "Cb": True}
+    s0 = sections[0]
+    to = lambda s, k: "GND" if s["gnd"][k] else "OUT"
+    print(f"{args.board}: {len(sections)} filter sections, e.g. {s0['opamp']} -> {s0['name']}: "
+          + ", ".join(f"{k} {s0['parts'][k]}" for k in ("Ra", "Rb"))
+          + ", " + ", ".join(f"{k} {s0['parts'][k]} -> {to(s0, k)}" for k in ("Ca", "Cb")))
+    inert = [s["parts"]["Cb"] for s in sections if not s["gnd"]["Cb"]]
+    if inert:
+        print(f"  {', '.join(inert)}: C_b from IN+ to OUT of a follower carries no signal;"
+              f" those sections are first order (R_a C_a)")
+
+    fband = f"{args.f_band / 1e3:g}k"
+    for r_tol in args.r_tol:
+        for c_tol in args.c_tol:
+            t0 = time.perf_counter()
+            mc = monte_carlo(sections, r_tol, c_tol, args.samples, args.batch, args.dist, args.f_band, args.seed)
+            dt = time.perf_counter() - t0
+            print(f"\nR {r_tol:g} %, C {c_tol:g} %, {args.dist}: {args.samples} boards in {dt:.2f} s")
+            print(f"  {'channel':<10} {'fc kHz':>7} {'fc 3-sigma':>15} {'Q':>5} {'Q 3-sigma':>11} "
+                  f"{'dB@' + fband:>8} {'3-sigma':>13}")
+            for i, s in enumerate(sections):
+                v = s["values"]
+                d1, d2 = coefficients(v["Ra"], v["Rb"], v["Ca"], v["Cb"], s["gnd"]["Ca"], s["gnd"]["Cb"])
+                fc, q, g = (float(a) for a in response(np.float64(d1), np.float64(d2), args.f_band))
+                print(f"  {s['name']:<10} {fc / 1e3:7.2f} {_fmt_range(mc['fc'][:, i], 1e-3):>15} "
+                      f"{'-' if math.isnan(q) else format(q, '.3f'):>5} "
+                      f"{_fmt_range(mc['q'][:, i], fmt='{:.3f}'):>11} {g:8.2f} {_fmt_range(mc['gain'][:, i]):>13}")
+            fc_spread = 100 * (mc["fc"].max(axis=1) / mc["fc"].min(axis=1) - 1)
+            g_spread = mc["gain"].max(axis=1) - mc["gain"].min(axis=1)
+            p50, p99 = np.percentile(fc_spread, (50, 99))
+            print(f"  channel-to-channel on one board: fc spread p50 {p50:.2f} % p99 {p99:.2f} % "
+                  f"max {fc_spread.max():.2f} %; gain at {fband} p99 {np.percentile(g_spread, 99):.3f} dB")
@@ -0,0 +1,256 @@
+"""
+MIXTEE PCB tools - key-matrix ghosting and masking check
+
+Simulates the keys4x4 matrix scan electrically, for every combination of
+pressed keys, straight from the generator's COMP_NETS:
+
+  switch   SWn joins its two nets while pressed (column <-> junction)
+  diode    Dn pad 1 = cathode, pad 2 = anode; the scanned row is driven
+           low, and a low only travels cathode -> anode
+  scan     one ROW net low at a time, the others high-impedance (inputs),
+           columns pulled up; a column reads pressed when a low reaches it
+
+  ghost    a column reads low although the key at (row, column) is up
+  masked   a pressed key whose column stays high
+
+Each combination is one bit of a packed uint64 bitset, so a row scan is a
+handful of AND/OR sweeps over the edge list for all combinations at once.
+Up to EXHAUSTIVE_MAX keys every one of the 2^n combinations is checked;
+larger grids are sampled with random key sets plus sets biased towards the
+3- and 4-corner rectangles that ghost in a diode-less matrix. --reverse
+flips diodes to confirm the check catches a wrong orientation.
+
+Usage:
+  python ghosting.py                         # all 65536 combinations, 4x4
+  python ghosting.py --grids 8x8 16x16 --samples 200000
+  python ghosting.py --reverse D6            # what one backwards diode does
+"""
+
+import argparse
+import re
+import sys
+import time
+
+import numpy as np
+
+from kicad_pcb import GENERATORS, load_generator
+
+EXHAUSTIVE_MAX = 20     # keys; 2^20 combinations is ~1M bits per net
+SAMPLES = 100_000
+MAX_PRESSED = 10        # keys held at once in sampled sets
+
+
+# ---------------------------------------------------------------------------
+# Matrix graph
+# ---------------------------------------------------------------------------
+
+def _index(name):
+    return int(re.sub(r"\D", "", name) or 0)
+
+
+def matrix_graph(gen, reverse=()):
+    """Nets, keys and conduction edges of the key matrix in COMP_NETS.
+
+    Returns {"nodes": [net name], "rows": [node], "cols": [node],
+             "keys": [(sw ref, row node, col node)],
+             "edges": [(from node, to node, key index or -1)]}:
+    a low on `from` pulls `to` low, always (diode, -1) or while the key is
+    pressed (both directions of a switch). Diodes in `reverse` are flipped.
+    """
+    nets, cn = gen.NETS, gen.COMP_NETS
+    name = lambda code: nets.get(code, "")
+    nodes = {}
+
+    def node(n):
+        return nodes.setdefault(n, len(nodes))
+
+    diodes = [(ref, name(p.get("1", 0)), name(p.get("2", 0))) for ref, p in cn.items()
+              if ref.startswith("D") and len(p) == 2]
+    edges = []
+    for ref, k, a in diodes:
+        if ref in reverse:
+            k, a = a, k
+        edges.append((node(k), node(a), -1))
+
+    keys = []
+    cathode_of = {a: k for ref, k, a in diodes if k.startswith("ROW")}
+    for ref, pads in sorted(cn.items(), key=lambda kv: (kv[0][:2], _index(kv[0]))):
+        if not ref.startswith("SW"):
+            continue
+        a, b = name(pads.get("1", 0)), name(pads.get("2", 0))
+        col, junction = (a, b) if a.startswith("COL") else (b, a)
+        if not col.startswith("COL") or junction not in cathode_of:
+            continue
+        i = len(keys)
+        edges += [(node(col), node(junction), i), (node(junction), node(col), i)]
+        keys.append((ref, node(cathode_of[junction]), node(col)))
+
+    by_index = lambda prefix: sorted((n for n in nodes if n.startswith(prefix)), key=_index)
+    return {"nodes": list(nodes), "rows": [nodes[n] for n in by_index("ROW")],
+            "cols": [nodes[n] for n in by_index("COL")], "keys": keys, "edges": edges}
+
+
+# ---------------------------------------------------------------------------
+# Bitsets
+# ---------------------------------------------------------------------------
+
+def pack(pressed):
+    """(keys, words) uint64 bitsets from a (combinations, keys) bool array."""
+    n = pressed.shape[0]
+    bits = np.packbits(pressed.T, axis=1, bitorder="little")
+    pad = (-bits.shape[1]) % 8
+    return np.ascontiguousarray(np.pad(bits, ((0, 0), (0, pad)))).view(np.uint64), n
+
+
+def exhaustive(n_keys):
+    """All 2^n key sets; combination c presses key k when bit k of c is set."""
+    c = np.arange(1 << n_keys, dtype=np.uint32)
+    return ((c[:, None] >> np.arange(n_keys, dtype=np.uint32)) & 1).astype(bool)
+
+
+def sampled(graph, samples, max_pressed=MAX_PRESSED, seed=1):
+    """Random key sets: half uniform (1..max_pressed keys), half built around
+    a random rectangle of 3 or 4 corners plus a few random extra keys."""
+    rng = np.random.default_rng(seed)
+    keys = graph["keys"]
+    n = len(keys)
+    out = np.zeros((samples, n), dtype=bool)
+    half = samples // 2
+    counts = rng.integers(1, min(max_pressed, n) + 1, half)
+    order = np.argsort(rng.random((half, n)), axis=1)
+    out[:half] = np.arange(n)[None, :] < counts[:, None]
+    out[np.arange(half)[:, None], order] = out[:half].copy()
+
+    rows, cols = graph["rows"], graph["cols"]
+    m = samples - half
+    if len(rows) < 2 or len(cols) < 2 or m == 0:
+        return out
+    cell = np.full((len(graph["nodes"]),) * 2, -1)
+    for i, (_, r, c) in enumerate(keys):
+        cell[r, c] = i
+    rows, cols = np.array(rows), np.array(cols)
+    r1 = rng.integers(0, len(rows), m)
+    r2 = (r1 + rng.integers(1, len(rows), m)) % len(rows)
+    c1 = rng.integers(0, len(cols), m)
+    c2 = (c1 + rng.integers(1, len(cols), m)) % len(cols)
+    corners = np.stack([cell[rows[r], cols[c]] for r, c in ((r1, c1), (r1, c2), (r2, c1), (r2, c2))], 1)
+    keep = corners >= 0
+    keep[np.arange(m), rng.integers(0, 4, m)] &= rng.random(m) < 0.5    # 3 or 4 corners
+    s, j = np.nonzero(keep)
+    out[half + s, corners[s, j]] = True
+    extra = rng.integers(0, n, (m, max(1, max_pressed - 3)))
+    used = np.arange(extra.shape[1])[None, :] < rng.integers(0, extra.shape[1] + 1, m)[:, None]
+    s, j = np.nonzero(used)
+    out[half + s, extra[s, j]] = True
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Scan
+# ---------------------------------------------------------------------------
+
+def scan(graph, bits):
+    """Ghost and masked bitsets per (row, col) over all combinations.
+
+    `bits` is the (keys, words) pressed bitset from pack(). Returns
+    {(row, col): (ghost words, masked words)} for cells with any hit.
+    """
+    n_nodes, words = len(graph["nodes"]), bits.shape[1]
+    ones = np.full(words, np.iinfo(np.uint64).max, dtype=np.uint64)
+    at = {(r, c): k for k, (_, r, c) in enumerate(graph["keys"])}
+    edges = graph["edges"]
+    out = {}
+    for row in graph["rows"]:
+        low = np.zeros((n_nodes, words), dtype=np.uint64)
+        low[row] = ones
+        changed = True
+        while changed:                  # fixed point: at most one pass per hop
+            changed = False
+            for u, v, k in edges:
+                new = low[u] if k < 0 else low[u] & bits[k]
+                merged = low[v] | new
+                if not np.array_equal(merged, low[v]):
+                    low[v] = merged
+                    changed = True
+        for col in graph["cols"]:
+            k = at.get((row, col))
+            expect = bits[k] if k is not None else np.zeros(words, dtype=np.uint64)
+            ghost, masked = low[col] & ~expect, expect & ~low[col]
+            if ghost.any() or masked.any():
+                out[(row, col)] = (ghost, masked)
+    return out
+
+
+def count(words, n):
+    """Set bits among the first n combinations."""
+    tail = n % 64
+    if tail:
+        words = words.copy()
+        words[-1] &= np.uint64((1 << tail) - 1)
+    return int(np.bitwise_count(words).sum())
+
+
+def first(words):
+    """Index of the first set bit, or None."""
+    nz = np.flatnonzero(words)
+    if not len(nz):
+        return None
+    w = int(words[nz[0]])
+    return int(nz[0]) * 64 + (w & -w).bit_length() - 1
+
+
+def _grid(spec):
+    cols, rows = (int(v) for v in spec.lower().split("x"))
+    return cols, rows
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", nargs="?", default="keys4x4", help="board key or gen_pcb.py")
+    ap.add_argument("--grids", nargs="*", type=_grid, help="COLSxROWS via configure() (default: as generated)")
+    ap.add_argument("--samples", type=int, default=SAMPLES, help="key sets when not exhaustive")
+    ap.add_argument("--max-pressed", type=int, default=MAX_PRESSED)
+    ap.add_argument("--reverse", nargs="*", default=[], help="diode refs to flip")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    gen = load_generator(GENERATORS.get(args.board, args.board))
+    found = 0
+    for grid in args.grids or [None]:
+        if grid:
+            gen.configure(*grid)
+        t0 = time.perf_counter()
+        g = matrix_graph(gen, set(args.reverse))
+        n_keys = len(g["keys"])
+        if n_keys <= EXHAUSTIVE_MAX:
+            pressed, how = exhaustive(n_keys), "all"
+        else:
+            pressed, how = sampled(g, args.samples, args.max_pressed, args.seed), "sampled"
+        bits, n = pack(pressed)
+        hits = scan(g, bits)
+        dt = time.perf_counter() - t0
+
+        words = bits.shape[1]
+        any_ghost = np.zeros(words, dtype=np.uint64)
+        any_masked = np.zeros(words, dtype=np.uint64)
+        for ghost, masked in hits.values():
+            any_ghost |= ghost
+            any_masked |= masked
+        ng, nm = count(any_ghost, n), count(any_masked, n)
+        print(f"{len(g['cols'])}x{len(g['rows'])} matrix, {n_keys} keys: {how} {n} key sets in {dt:.2f} s"
+              f" - {ng} with ghosts, {nm} with masked keys")
+
+        names, keys = g["nodes"], g["keys"]
+        for (row, col), (ghost, masked) in list(hits.items())[:8]:
+            for kind, w in (("ghost", ghost), ("masked", masked)):
+                c = first(w)
+                if c is None or c >= n:
+                    continue
+                held = [keys[k][0] for k in np.flatnonzero(pressed[c])]
+                print(f"  {kind:<6} {names[row]} x {names[col]}: {count(w, n)} sets, e.g. {'+'.join(held)}")
+        found += ng + nm
+    sys.exit(1 if found else 0)
@@ -0,0 +1,456 @@
+"""
+MIXTEE PCB tools - IR drop on power nets
+
+Turns the copper of each power net into a resistive mesh and solves it for
+the DC load currents, giving the voltage drop from the source to every load
+pad and where the current density peaks:
+
+  zones     filled area (zonefill) on a GRID mm raster; neighbouring cells
+            are joined by one square of sheet resistance rho / t
+  tracks    each segment is one resistor, rho L / (w t), between its ends
+  vias      barrel resistance (PLATING wall) between the layers it joins
+  pads      a node tied to the track ends and zone cells it touches; a
+            through-hole pad is one node on every layer
+  source    the output pins of a regulator or load switch (PASS) on the
+            net, else the first connector carrying it; held at 0 V
+  loads     per part from LOADS (A), split over its pads on the net; a pass
+            device on its input draws what its output rail delivers, and a
+            USB-A connector on a VBUS net draws USB_PORT_A. --load overrides
+
+Copper is 1 oz outside and INNER_UM inside (JLCPCB 4-layer). The Laplacian
+is assembled as an edge list and solved by Jacobi-preconditioned conjugate
+gradients in NumPy, with no dense matrix. A rail behind a load switch also
+reports the drop all the way from the upstream source, through r_on.
+
+Generated boards are not routed yet (Stage 6 is FreeRouting). For a net
+with no tracks, pads are joined by a minimum spanning tree of Power-netclass
+tracks, and SMD pads get a fanout via to the net's planes. This gives an
+estimate that is labelled as such. Run it on the routed .kicad_pcb for the
+real answer.
+
+Usage:
+  python irdrop.py                               # all generated boards
+  python irdrop.py keys4x4 --load LED1=0.061     # per-LED override
+  python irdrop.py routed.kicad_pcb --nets 5V --grid 0.1
+"""
+
+import argparse
+import json
+import math
+import re
+import time
+
+import numpy as np
+
+import raster
+import zonefill
+from kicad_pcb import (GENERATORS, load_board, pad_bbox, pad_copper_layers, resolve_board_text,
+                       via_copper_layers)
+from thermal_vias import PLATING, STACKUP
+from tour import spanning_tree
+
+RHO = 1.72e-5           # ohm mm, copper at 20 C
+OUTER_UM = 35.0         # 1 oz
+INNER_UM = 17.5         # 0.5 oz inner layers
+GRID = 0.5              # mm per zone cell
+G_TIE = 1e5             # S, pad / via to the copper it sits on
+TOL = 1e-9              # relative CG residual
+POWER = re.compile(r"^(\+?\d+V\w*|V\d+\w*|VBUS\w*)$")
+
+# DC load per part on a rail (A), by value prefix
+LOADS = {"WS2812": 0.061, "MCP23017": 0.001, "AK4619": 0.025, "OPA1678": 0.005,
+         "FE1.1": 0.06, "6N138": 0.005}
+USB_PORT_A = 0.5        # USB 2.0 port
+# value prefix -> input pins, output pins, on-resistance (None: regulator)
+PASS = {"ADP7118": {"in": ("7", "8"), "out": ("1", "2"), "ron": None},
+        "TPS2051": {"in": ("1",), "out": ("5",), "ron": 0.07}}
+POWER_CLASS = {"track_width": 0.5, "via_diameter": 0.8, "via_drill": 0.4}
+
+
+# ---------------------------------------------------------------------------
+# Rails
+# ---------------------------------------------------------------------------
+
+def _pass(fp):
+    return next((v for k, v in PASS.items() if fp["value"].startswith(k)), None)
+
+
+def power_nets(board):
+    """{net code: name} of the supply nets."""
+    return {code: name for code, name in board["nets"].items() if POWER.match(name)}
+
+
+def rail_plan(board, overrides=None):
+    """{net: {"source": (ref, [pad]), "loads": {ref: (amps, [pad])}}}.
+
+    Pads are the footprint's pad dicts. Pass devices draw on their input
+    net whatever their output net delivers, so rails are resolved output
+    first.
+    """
+    overrides = overrides or {}
+    nets = power_nets(board)
+    on = {code: [] for code in nets}
+    for fp in board["footprints"]:
+        for code in {p["net"] for p in fp["pads"]} & set(nets):
+            on[code].append((fp, [p for p in fp["pads"] if p["net"] == code]))
+    plan = {}
+    for code, name in nets.items():
+        src = None
+        for fp, pads in on[code]:
+            dev = _pass(fp)
+            if dev and any(p["name"] in dev["out"] for p in pads):
+                src = (fp["ref"], [p for p in pads if p["name"] in dev["out"]])
+        if src is None:
+            conn = sorted((fp["ref"], pads) for fp, pads in on[code] if fp["ref"].startswith("J"))
+            src = conn[0] if conn else None
+        plan[code] = {"name": name, "source": src, "loads": {}, "feeds": []}
+        for fp, pads in on[code]:
+            if src and fp["ref"] == src[0]:
+                continue
+            dev = _pass(fp)
+            if dev:
+                ins = [p for p in pads if p["name"] in dev["in"]]
+                out = next((p["net"] for p in fp["pads"] if p["name"] in dev["out"]), None)
+                if ins and out in nets:
+                    plan[code]["feeds"].append((fp["ref"], ins, out, dev["ron"]))
+                continue
+            amps = next((a for k, a in LOADS.items() if fp["value"].startswith(k)), 0.0)
+            if fp["ref"].startswith("J") and "USB_A" in fp["lib"] and name.startswith("VBUS"):
+                amps = USB_PORT_A
+            amps = overrides.get(fp["ref"], amps)
+            if amps:
+                plan[code]["loads"][fp["ref"]] = (amps, pads)
+
+    def total(code, seen=()):
+        r = plan[code]
+        return (sum(a for a, _ in r["loads"].values())
+                + sum(total(out, seen + (code,)) for _, _, out, _ in r["feeds"] if out not in seen))
+
+    for code, r in plan.items():
+        for ref, ins, out, _ in r["feeds"]:
+            r["loads"][ref] = (overrides.get(ref, total(out)), ins)
+    return plan
+
+
+# ---------------------------------------------------------------------------
+# Mesh
+# ---------------------------------------------------------------------------
+
+class Mesh:
+    """Nodes and conductances of one net. Edges carry what is needed to turn
+    their current back into a density: cross-section (mm^2, 0 for ties),
+    and where they are ("via" or a copper layer, x, y)."""
+
+    def __init__(self):
+        self.n = 0
+        self.chunks = []
+        self.tracks = self.vias = self.ratsnest = 0
+
+    def nodes(self, count):
+        first = self.n
+        self.n += count
+        return first
+
+    def edges(self, a, b, g, area=0.0, layer="", x=0.0, y=0.0):
+        a = np.atleast_1d(np.asarray(a, dtype=int))
+        full = lambda v, t=float: np.broadcast_to(np.asarray(v, dtype=t), a.shape)
+        self.chunks.append((a, full(b, int), full(g), full(area), full(layer, object), full(x), full(y)))
+
+    edge = edges
+
+    def arrays(self):
+        """(a, b, g, area, layer, x, y) concatenated over all edges."""
+        if not self.chunks:
+            return tuple(np.zeros(0, dtype=t) for t in (int, int, float, float, object, float, float))
+        return tuple(np.concatenate(c) for c in zip(*self.chunks))
+
+
+def thickness(layer):
+    return (OUTER_UM if layer in ("F.Cu", "B.Cu") else INNER_UM) * 1e-3
+
+
+def _depths(board):
+    depth = STACKUP.get(len(board["layers"]))
+    if depth:
+        return depth
+    layers = board["layers"]
+    return {l: board["thickness"] * i / max(len(layers) - 1, 1) for i, l in enumerate(layers)}
+
+
+def build_mesh(board, code, grid=GRID, power=POWER_CLASS, ratsnest=True):
+    """(Mesh, {id(pad): node}) for net `code`."""
+    copper = board["layers"]
+    depth = _depths(board)
+    mesh = Mesh()
+    cv = raster.make_canvas(raster.board_bounds(board, margin=2 * grid), 25.4 / grid)
+    h, w = cv["shape"]
+    cell_mm = 1 / cv["ppm"]
+
+    def cell(x, y):
+        return int((y - cv["y0"]) * cv["ppm"]), int((x - cv["x0"]) * cv["ppm"])
+
+    # Zones: one node per filled cell, one square between neighbours
+    grids = {}
+    for zone in board["zones"]:
+        if zone["net"] != code:
+            continue
+        for layer in zone["layers"]:
+            if layer in copper:
+                m, _ = zonefill.zone_mask(board, zone, layer, cv, keep_islands=not zonefill.routed(board))
+                grids[layer] = grids[layer] | m if layer in grids else m
+    index = {}
+    for layer, m in grids.items():
+        idx = np.full(m.shape, -1)
+        idx[m] = mesh.nodes(int(m.sum())) + np.arange(int(m.sum()))
+        index[layer] = idx
+        t = thickness(layer)
+        for di, dj in ((0, 1), (1, 0)):
+            a, b = idx[:h - di, :w - dj], idx[di:, dj:]
+            both = (a >= 0) & (b >= 0)
+            ii, jj = np.nonzero(both)
+            mesh.edges(a[both], b[both], t / RHO, cell_mm * t, layer,
+                       cv["x0"] + (jj + 0.5 + dj / 2) * cell_mm, cv["y0"] + (ii + 0.5 + di / 2) * cell_mm)
+
+    def tie_zone(node, layer, x0, y0, x1, y1):
+        idx = index.get(layer)
+        if idx is None:
+            return
+        i0, j0 = cell(x0, y0)
+        i1, j1 = cell(x1, y1)
+        u = idx[max(i0, 0):min(i1 + 1, h), max(j0, 0):min(j1 + 1, w)].ravel()
+        if (u >= 0).any():
+            mesh.edges(u[u >= 0], node, G_TIE)
+
+    # Pads: one node each, tied to the zone cells under and around them
+    pad_node, pads = {}, []
+    for fp in board["footprints"]:
+        for pad in fp["pads"]:
+            if pad["net"] != code:
+                continue
+            node = pad_node[id(pad)] = mesh.nodes(1)
+            layers = pad_copper_layers(pad, copper)
+            pads.append((pad, node, layers))
+            x0, y0, x1, y1 = pad_bbox(pad, 1.5 * cell_mm)
+            for layer in layers:
+                tie_zone(node, layer, x0, y0, x1, y1)
+
+    def attach(node, layer, x, y, reach):
+        """Tie a track end or via layer to the pads it lands on."""
+        for pad, p_node, layers in pads:
+            if layer in layers:
+                x0, y0, x1, y1 = pad_bbox(pad, reach)
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    mesh.edge(node, p_node, G_TIE)
+
+    # Tracks, routed or (when there are none) a Power-class ratsnest
+    ends = {}
+
+    def end(layer, x, y):
+        key = (layer, round(x, 3), round(y, 3))
+        if key not in ends:
+            ends[key] = mesh.nodes(1)
+            attach(ends[key], layer, x, y, 0.0)
+            tie_zone(ends[key], layer, x, y, x, y)
+        return ends[key]
+
+    segments = [s for s in board["segments"] if s["net"] == code]
+    vias = [v for v in board["vias"] if v["net"] == code]
+    if ratsnest and not segments and len(pads) > 1:
+        width = power["track_width"]
+        via = {"size": power["via_diameter"], "drill": power["via_drill"], "layers": ["F.Cu", "B.Cu"]}
+        if grids:
+            for pad, _, layers in pads:
+                if not set(layers) & set(grids):
+                    vias.append(dict(via, at=(pad["x"], pad["y"]), net=code))
+                    mesh.ratsnest += 1
+        else:
+            for i, j in spanning_tree([(p["x"], p["y"]) for p, _, _ in pads]):
+                (p, _, la), (q, _, lb) = pads[i], pads[j]
+                layer = next((l for l in copper if l in la and l in lb), la[0])
+                segments.append({"start": (p["x"], p["y"]), "end": (q["x"], q["y"]),
+                                 "width": width, "layer": layer, "net": code})
+                if layer not in lb:
+                    vias.append(dict(via, at=(q["x"], q["y"]), net=code))
+                mesh.ratsnest += 1
+    for s in segments:
+        (x0, y0), (x1, y1) = s["start"], s["end"]
+        length = max(math.hypot(x1 - x0, y1 - y0), 1e-6)
+        t = thickness(s["layer"])
+        mesh.edge(end(s["layer"], x0, y0), end(s["layer"], x1, y1), t * s["width"] / (RHO * length),
+                  t * s["width"], s["layer"], (x0 + x1) / 2, (y0 + y1) / 2)
+        mesh.tracks += 1
+
+    # Vias: a node per layer, barrel resistance between consecutive layers
+    for v in vias:
+        x, y = v["at"]
+        layers = [l for l in copper if l in via_copper_layers(v, copper)]
+        r = v["drill"] / 2
+        wall = math.pi * (r * r - max(r - PLATING, 0.0) ** 2)
+        prev = None
+        for layer in layers:
+            node = mesh.nodes(1)
+            attach(node, layer, x, y, 0.0)
+            tie_zone(node, layer, x - v["size"] / 2, y - v["size"] / 2, x + v["size"] / 2, y + v["size"] / 2)
+            for key, e in ends.items():
+                if key[0] == layer and math.hypot(key[1] - x, key[2] - y) <= v["size"] / 2:
+                    mesh.edge(node, e, G_TIE)
+            if prev is not None:
+                dz = max(abs(depth.get(layer, 0) - depth.get(prev[1], 0)), 1e-3)
+                mesh.edge(prev[0], node, wall / (RHO * dz), wall, "via", x, y)
+            prev = (node, layer)
+        mesh.vias += 1
+    return mesh, pad_node
+
+
+# ---------------------------------------------------------------------------
+# Solve
+# ---------------------------------------------------------------------------
+
+def _components(n, a, b):
+    """Connected-component label per node (union-find)."""
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for u, v in zip(a.tolist(), b.tolist()):
+        ru, rv = find(u), find(v)
+        if ru != rv:
+            parent[ru] = rv
+    return np.array([find(i) for i in range(n)])
+
+
+def solve(mesh, sources, currents, tol=TOL, maxiter=None):
+    """Node voltages (V, sources at 0) for `currents` {node: amps drawn}.
+
+    Returns (v, edge currents, reachable mask, CG iterations); nodes not
+    connected to a source are NaN.
+    """
+    n = mesh.n
+    a, b, g = mesh.arrays()[:3]
+    label = _components(n, a, b)
+    live = np.isin(label, label[list(sources)]) if sources else np.zeros(n, dtype=bool)
+    free = live.copy()
+    free[list(sources)] = False
+    rhs = np.zeros(n)
+    for node, amps in currents.items():
+        rhs[node] -= amps
+    rhs[~free] = 0.0
+    diag = np.bincount(a, g, n) + np.bincount(b, g, n)
+    inv = np.where(free, 1 / np.where(diag > 0, diag, 1), 0.0)
+
+    def mul(x):
+        y = diag * x - np.bincount(a, g * x[b], n) - np.bincount(b, g * x[a], n)
+        y[~free] = 0.0
+        return y
+
+    x = np.zeros(n)
+    r = rhs.copy()
+    z = inv * r
+    p = z.copy()
+    rz = r @ z
+    stop = tol * max(np.linalg.norm(rhs), 1e-30)
+    it = 0
+    for it in range(1, (maxiter or 10 * n) + 1):
+        if np.linalg.norm(r) <= stop:
+            break
+        q = mul(p)
+        alpha = rz / (p @ q)
+        x += alpha * p
+        r -= alpha * q
+        z = inv * r
+        rz, rz_old = r @ z, rz
+        p = z + (rz / rz_old) * p
+    x[~live] = np.nan
+    return x, g * (x[a] - x[b]), live, it
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def _power_class(gen):
+    if gen is None or not hasattr(gen, "generate_project"):
+        return dict(POWER_CLASS)
+    classes = json.loads(gen.generate_project())["net_settings"]["classes"]
+    chosen = next((c for c in classes if c["name"] == "Power"), None)
+    return {k: chosen[k] for k in POWER_CLASS} if chosen else dict(POWER_CLASS)
+
+
+def _load(spec):
+    ref, amps = spec.split("=")
+    return ref, float(amps)
+
+
+def report(board, gen, nets=None, overrides=None, grid=GRID, ratsnest=True):
+    """Solve and print every power net with a source and loads; returns the
+    worst drop in volts, or None when there was nothing to solve."""
+    plan = rail_plan(board, overrides)
+    power = _power_class(gen)
+    drops, worst = {}, None
+    order = sorted(plan, key=lambda c: any(out == c for r in plan.values() for _, _, out, _ in r["feeds"]))
+    for code in order:
+        r = plan[code]
+        if nets and r["name"] not in nets:
+            continue
+        if not r["source"] or not r["loads"]:
+            continue
+        t0 = time.perf_counter()
+        mesh, pad_node = build_mesh(board, code, grid, power, ratsnest)
+        sources = [pad_node[id(p)] for p in r["source"][1]]
+        currents = {}
+        for amps, pads in r["loads"].values():
+            for p in pads:
+                currents[pad_node[id(p)]] = currents.get(pad_node[id(p)], 0.0) + amps / len(pads)
+        v, i_edge, live, it = solve(mesh, sources, currents)
+        dt = time.perf_counter() - t0
+
+        total = sum(a for a, _ in r["loads"].values())
+        a, b, g, area, where, x, y = mesh.arrays()
+        print(f"  {r['name']}: {total * 1e3:.0f} mA from {r['source'][0]} to {len(r['loads'])} loads;"
+              f" {mesh.n} nodes, {len(g)} edges, {mesh.tracks} tracks, {mesh.vias} vias"
+              + (f" ({mesh.ratsnest} ratsnest estimates, Power class)" if mesh.ratsnest else "")
+              + f"; {it} CG iterations in {dt:.2f} s")
+        dead = [ref for ref, (_, pads) in r["loads"].items() if not all(live[pad_node[id(p)]] for p in pads)]
+        if dead:
+            print(f"    NOT CONNECTED to {r['source'][0]}: {', '.join(dead)}")
+        at = {ref: float(np.nanmax(-v[[pad_node[id(p)] for p in pads]])) for ref, (_, pads) in r["loads"].items()
+              if ref not in dead}
+        if at:
+            ref = max(at, key=at.get)
+            print(f"    worst drop {at[ref] * 1e3:.2f} mV at {ref}"
+                  + "".join(f", {k} {at[k] * 1e3:.2f}" for k in sorted(at, key=at.get, reverse=True)[1:4]))
+            worst = max(worst or 0.0, at[ref])
+        drops[code] = at
+        dens = np.where(area > 0, np.abs(np.nan_to_num(i_edge)) / np.where(area > 0, area, 1), 0.0)
+        for kind, sel in (("copper", (area > 0) & (where != "via")), ("via", where == "via")):
+            if sel.any() and dens[sel].max() > 0:
+                k = int(np.flatnonzero(sel)[np.argmax(dens[sel])])
+                print(f"    peak {kind} density {dens[k]:.1f} A/mm^2 ({abs(i_edge[k]) * 1e3:.0f} mA)"
+                      f" at ({x[k]:.2f}, {y[k]:.2f}){'' if kind == 'via' else ' ' + where[k]}")
+        # behind a load switch: add the upstream drop and the switch itself
+        for up, ur in plan.items():
+            for ref, ins, out, ron in ur["feeds"]:
+                if out == code and ron and at and ref in drops.get(up, {}):
+                    chain = drops[up][ref] + total * ron + max(at.values())
+                    print(f"    from {ur['source'][0]} via {ref} ({ron * 1e3:g} mohm): {chain * 1e3:.1f} mV")
+    return worst
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("boards", nargs="*", default=list(GENERATORS), help="board keys, gen_pcb.py or .kicad_pcb")
+    ap.add_argument("--nets", nargs="*", help="power nets (default: every supply net)")
+    ap.add_argument("--load", nargs="*", type=_load, default=[], help="REF=AMPS overrides")
+    ap.add_argument("--grid", type=float, default=GRID, help="zone cell size (mm)")
+    ap.add_argument("--no-ratsnest", action="store_true", help="do not estimate unrouted nets")
+    args = ap.parse_args()
+
+    for spec in args.boards:
+        text, gen = resolve_board_text(spec)
+        print(f"{spec}:")
+        if report(load_board(text), gen, args.nets, dict(args.load), args.grid, not args.no_ratsnest) is None:
+            print("  no power net with both a source and a load")
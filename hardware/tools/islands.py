@@ -0,0 +1,142 @@
+"""
+MIXTEE PCB tools - copper islands and starved thermals
+
+Checks the filled zones for the two ways a pour quietly fails:
+
+  island    a piece of fill that touches no pad, via or track of the zone's
+            net - floating copper, connected to nothing. Only islands the
+            zone's island_removal_mode keeps are left to find
+  empty     a zone layer whose whole fill was removed as islands: nothing
+            of its net reaches that layer, so KiCad pours no copper there
+  starved   a thermal-relief pad of the zone's net reached by fewer than
+            MIN_SPOKES spokes that lead into net-connected fill
+
+Each zone layer is painted from its filled_polygons onto a fine grid and
+flood-filled into 4-connected regions (zonefill.label_regions, run-length
+union-find, so the whole board labels in one pass). Spokes are counted as
+separate pieces of fill crossing the middle of the thermal gap around each
+pad.
+
+Boards from a generator, and .kicad_pcb files whose zones are unfilled, are
+filled with zonefill.py first; the islands it removed are listed for
+information. Exit status is 1 when anything is found.
+
+Usage:
+  python islands.py                    # every zone on every generated board
+  python islands.py keys4x4 input-mother
+  python islands.py board.kicad_pcb --grid 0.025
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+import raster
+import zonefill
+from kicad_pcb import GENERATORS, load_board, pad_bbox, pad_copper_layers, resolve_board_text
+from zonefill import label_regions
+
+MIN_SPOKES = 2
+
+
+# ---------------------------------------------------------------------------
+# Checks
+# ---------------------------------------------------------------------------
+
+def _subcanvas(cv, box):
+    """(row slice, col slice, canvas) for a mm box, on the same grid as `cv`."""
+    ppm, (h, w) = cv["ppm"], cv["shape"]
+    j0, i0 = max(0, int((box[0] - cv["x0"]) * ppm)), max(0, int((box[1] - cv["y0"]) * ppm))
+    j1, i1 = min(w, int((box[2] - cv["x0"]) * ppm) + 2), min(h, int((box[3] - cv["y0"]) * ppm) + 2)
+    sub = dict(cv, x0=cv["x0"] + j0 / ppm, y0=cv["y0"] + i0 / ppm,
+               shape=(max(0, i1 - i0), max(0, j1 - j0)))
+    return slice(i0, i1), slice(j0, j1), sub
+
+
+def check_zone_layer(board, zone, layer, grid=zonefill.GRID, removed=()):
+    """Islands and starved thermal pads of one filled zone layer; `removed`
+    are the islands zonefill took out when it filled the layer.
+
+    Returns {"regions", "islands": [(area mm^2, (x, y))], "removed",
+             "empty", "thermal": n pads, "starved": [(ref, pad, spokes, (x, y))]}.
+    """
+    cv = zonefill.zone_canvas(board, zone, grid)
+    fill = np.zeros(cv["shape"], dtype=bool)
+    for poly in zone["filled"].get(layer, ()):
+        raster.paint_polygon(fill, cv, poly)
+    labels, n = label_regions(fill)
+    g = 1 / cv["ppm"]
+
+    # Own-net copper that ties regions to the net
+    anchor = zonefill.net_anchor(board, zone, layer, cv)
+    thermal = [(fp["ref"], pad) for fp in board["footprints"] for pad in fp["pads"]
+               if pad["net"] == zone["net"] and layer in pad_copper_layers(pad, board["layers"])
+               and zonefill._connects(zone, pad) == "thermal"]
+    tied = np.zeros(n + 1, dtype=bool)
+    tied[np.unique(labels[anchor & fill])] = True
+    tied[0] = False
+    islands = [(a, at) for a, at, _ in zonefill.islands(labels, n, tied, cv)]
+
+    # Spokes: separate pieces of tied fill crossing the middle of the gap
+    starved = []
+    gap = zone["thermal_gap"]
+    for ref, pad in thermal:
+        x0, y0, x1, y1 = pad_bbox(pad, gap + 2 * g)
+        rows, cols, sub = _subcanvas(cv, (x0, y0, x1, y1))
+        ring = np.zeros(sub["shape"], dtype=bool)
+        raster.paint_pad(ring, sub, pad, 0.75 * gap)
+        raster.paint_pad(ring, sub, pad, 0.25 * gap, value=False)
+        crossing = ring & fill[rows, cols] & tied[labels[rows, cols]]
+        spokes = label_regions(crossing)[1]
+        if spokes < MIN_SPOKES:
+            starved.append((ref, pad["name"], spokes, (pad["x"], pad["y"])))
+    return {"regions": n, "islands": islands, "removed": list(removed), "empty": n == 0 and bool(removed),
+            "thermal": len(thermal), "starved": starved}
+
+
+def check_board(text, grid=zonefill.GRID, refill=False):
+    """[(zone, layer, result)] for every zone layer; unfilled zones (or all,
+    with `refill`) are filled with zonefill.py first."""
+    board = load_board(text)
+    removed = {}
+    if refill or any(not z["filled"] for z in board["zones"]):
+        text, fills = zonefill.fill_board_text(text, grid)
+        index = {}
+        for f in fills:     # fills follow zone order
+            index.setdefault(id(f[0]), len(index))
+        removed = {(index[id(f[0])], f[1]): f[6] for f in fills}
+        board = load_board(text)
+    return [(zone, layer, check_zone_layer(board, zone, layer, grid, removed.get((k, layer), ())))
+            for k, zone in enumerate(board["zones"]) for layer in zone["layers"] if layer in board["layers"]]
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("boards", nargs="*", help="board keys, gen_pcb.py or .kicad_pcb (default: all)")
+    ap.add_argument("--grid", type=float, default=zonefill.GRID, help="cell size in mm")
+    ap.add_argument("--refill", action="store_true", help="refill zones that already have fills")
+    args = ap.parse_args()
+
+    found = 0
+    for spec in args.boards or list(GENERATORS):
+        text, gen = resolve_board_text(spec)
+        print(spec)
+        for zone, layer, res in check_board(text, args.grid, args.refill or gen is not None):
+            isl, st, rm = res["islands"], res["starved"], res["removed"]
+            print(f"  {zone['net_name']} {layer}: {res['regions']} regions, {len(isl)} islands"
+                  + (f" ({sum(a for a, _ in isl):.2f} mm^2)" if isl else "")
+                  + (f", {len(rm)} removed ({sum(a for a, _ in rm):.2f} mm^2)" if rm else "")
+                  + f"; {len(st)} of {res['thermal']} thermal pads starved")
+            if res["empty"]:
+                print(f"    empty    nothing of {zone['net_name']} reaches {layer}: the whole pour is an island")
+            for area, (x, y) in isl:
+                print(f"    island   {area:7.2f} mm^2 at ({x:.2f}, {y:.2f})")
+            for ref, name, spokes, (x, y) in st:
+                print(f"    starved  {ref}.{name} at ({x:.2f}, {y:.2f}): {spokes} spoke{'s' * (spokes != 1)}")
+            found += len(isl) + len(st) + res["empty"]
+    sys.exit(1 if found else 0)
@@ -0,0 +1,272 @@
+"""
+MIXTEE PCB tools - key-matrix scan latency and I2C bus load
+
+Models how the Teensy reads the keys4x4 matrix through its MCP23017s on the
+shared SDA/SCL bus, which also carries the AK4619 codec traffic through the
+TCA9548A mux. Reports worst-case key-to-event latency and bus occupancy for
+polled and interrupt-driven scanning.
+
+The wiring comes from the generator's COMP_NETS: the expander port and bit
+behind every ROW and COL net, each expander's A0-A2 address, and whether
+INTA reaches the connector's INT pin. Larger grids are built with the
+generator's configure().
+
+  polled     every --period: per row, write the row's OLAT (one row low)
+             and read the column GPIO ports; the event is emitted when
+             the scan ends
+  interrupt  all rows low, interrupt-on-change on the columns: INT -> ISR
+             -> read INTF..INTCAP of each column expander, scan rows to
+             find the key, drive all rows low again
+
+Transactions are costed in SCL bit times (start, 9 bits per byte, stop)
+plus a fixed driver overhead each. Codec traffic is a Poisson stream of
+mux-select + register writes; a transfer already on the bus is never
+pre-empted, so the key path may wait behind one and have others interleave
+between its own transfers. Latency percentiles and the maximum come from a
+vectorized Monte Carlo over press times, rows and codec arrivals.
+
+Usage:
+  python keyscan.py                                  # 4x4 at 100k/400k/1M
+  python keyscan.py --grids 4x4 8x8 16x16 --clocks 400000
+  python keyscan.py --period 2 --codec-rate 1000 --debounce 5
+"""
+
+import argparse
+
+import numpy as np
+
+from kicad_pcb import GENERATORS, load_generator
+
+CLOCKS = (100_000, 400_000, 1_000_000)
+PERIOD = 1.0            # ms, polled scan period (pin-mapping.md: ~1 kHz)
+GAP = 5.0               # us driver overhead per transaction (Teensy Wire)
+ISR = 20.0              # us from INT edge to the first bus transfer
+CODEC_RATE = 200.0      # codec transactions / s (gain, mute, routing updates)
+CODEC_BYTES = 2         # data bytes per codec register write
+PRESS_RATE = 20.0       # key events / s for interrupt-mode bus occupancy
+SAMPLES = 200_000
+
+MCP_BASE = 0x20
+MCP_GPA = {str(21 + i): i for i in range(8)}    # pin -> GPA bit
+MCP_GPB = {str(1 + i): i for i in range(8)}     # pin -> GPB bit
+MCP_ADDR_PINS = ("15", "16", "17")              # A0, A1, A2
+MCP_INTA = "20"
+
+
+# ---------------------------------------------------------------------------
+# Wiring
+# ---------------------------------------------------------------------------
+
+def matrix_wiring(gen):
+    """Key matrix as wired in a keys4x4-style generator's COMP_NETS.
+
+    Returns {"rows": {net: (ref, port, bit)}, "cols": {...},
+             "keys": [(sw ref, col net, row net)], "addr": {ref: i2c addr},
+             "int": [refs whose INTA reaches the connector]}.
+    Expanders are the U refs with GPIO pins on ROW/COL nets; keys are the
+    switches whose diode joins a column to a row.
+    """
+    nets, cn = gen.NETS, gen.COMP_NETS
+    name = lambda code: nets.get(code, "")
+    rows, cols, addr, ints = {}, {}, {}, []
+    conn_nets = {name(c) for ref, pads in cn.items() if ref.startswith("J") for c in pads.values()}
+    for ref, pads in sorted(cn.items()):
+        if not ref.startswith("U"):
+            continue
+        for port, pins in (("A", MCP_GPA), ("B", MCP_GPB)):
+            for pin, bit in pins.items():
+                n = name(pads.get(pin, 0))
+                if n.startswith("ROW"):
+                    rows[n] = (ref, port, bit)
+                elif n.startswith("COL"):
+                    cols[n] = (ref, port, bit)
+        if any(name(pads.get(p, 0)).startswith(("ROW", "COL")) for p in list(MCP_GPA) + list(MCP_GPB)):
+            addr[ref] = MCP_BASE + sum(1 << i for i, p in enumerate(MCP_ADDR_PINS)
+                                       if name(pads.get(p, 0)) not in ("GND", ""))
+            if name(pads.get(MCP_INTA, 0)) in conn_nets - {""}:
+                ints.append(ref)
+
+    # SWn: pad 1 column, pad 2 junction; Dn: pad 1 row, pad 2 junction
+    keys = []
+    junction_row = {pads["2"]: name(pads["1"]) for ref, pads in cn.items()
+                    if ref.startswith("D") and name(pads.get("1", 0)).startswith("ROW")}
+    for ref, pads in cn.items():
+        if ref.startswith("SW") and pads.get("2") in junction_row:
+            keys.append((ref, name(pads["1"]), junction_row[pads["2"]]))
+    order = lambda n: int("".join(c for c in n if c.isdigit()))
+    keys.sort(key=lambda k: order(k[0]))
+    rows = dict(sorted(rows.items(), key=lambda kv: order(kv[0])))
+    cols = dict(sorted(cols.items(), key=lambda kv: order(kv[0])))
+    return {"rows": rows, "cols": cols, "keys": keys, "addr": addr, "int": ints}
+
+
+# ---------------------------------------------------------------------------
+# Transactions
+# ---------------------------------------------------------------------------
+
+def write_bits(n):
+    """SCL bits for a register write of n data bytes: S addr reg data.. P."""
+    return 2 + 9 * (2 + n)
+
+
+def read_bits(n):
+    """SCL bits for a register read of n bytes: S addr reg Sr addr data.. P."""
+    return 3 + 9 * (3 + n)
+
+
+def codec_bits(n=CODEC_BYTES):
+    """TCA9548A channel select, then an AK4619 register write of n bytes."""
+    return (2 + 9 * 2) + write_bits(n)
+
+
+def _col_reads(wiring):
+    """[(ref, bytes)]: one sequential GPIOA(/GPIOB) read per column expander."""
+    ports = {}
+    for ref, port, _ in wiring["cols"].values():
+        ports.setdefault(ref, set()).add(port)
+    return [(ref, 2 if len(p) == 2 else 1) for ref, p in sorted(ports.items())]
+
+
+def scan_plan(wiring):
+    """(transfers, done): SCL bits of one full polled scan, in order, and the
+    index of the transfer that completes each row's column read."""
+    reads = _col_reads(wiring)
+    bits, done, prev = [], [], None
+    for ref, port, bit in wiring["rows"].values():
+        if prev is not None and prev != ref:
+            bits.append(write_bits(1))          # release the previous expander's row
+        bits.append(write_bits(1))              # OLAT: this row low
+        bits += [read_bits(n) for _, n in reads]
+        done.append(len(bits) - 1)
+        prev = ref
+    if prev is not None:
+        bits.append(write_bits(1))              # release the last row
+    return bits, done
+
+
+def interrupt_plan(wiring):
+    """(identify, per row, restore) SCL bits for an interrupt-driven event.
+
+    identify: read INTFA..INTCAPB (4 bytes) from each column expander, which
+    also clears INT; per row: drive it alone and read the columns; restore:
+    every row low again, one OLAT write per row expander.
+    """
+    reads = _col_reads(wiring)
+    identify = [read_bits(4) for _ in reads]
+    per_row = [write_bits(1)] + [read_bits(n) for _, n in reads]
+    restore = [write_bits(1) for _ in {ref for ref, _, _ in wiring["rows"].values()}]
+    return identify, per_row, restore
+
+
+# ---------------------------------------------------------------------------
+# Simulation
+# ---------------------------------------------------------------------------
+
+def _codec_delay(rng, span, t_codec, rate, n):
+    """us the key path loses to codec transfers: busy at the start with
+    probability rho (uniform residual), plus Poisson arrivals during `span`."""
+    rho = min(rate * t_codec * 1e-6, 1.0)
+    start = np.where(rng.random(n) < rho, rng.random(n) * t_codec, 0.0)
+    return start + rng.poisson(rate * np.asarray(span) * 1e-6, n) * t_codec
+
+
+def simulate(wiring, clock, period=PERIOD, gap=GAP, isr=ISR, codec_rate=CODEC_RATE,
+             codec_bytes=CODEC_BYTES, press_rate=PRESS_RATE, debounce=0.0,
+             samples=SAMPLES, seed=1):
+    """Latency (us) and bus occupancy of both scan modes at one SCL clock.
+
+    Returns {"codec": us per codec transfer, "codec_load": fraction,
+             "polled": {...}, "interrupt": {...}}, each mode with "scan" (us),
+    "p50", "p99", "max" latency and "load" (key traffic bus fraction).
+    """
+    rng = np.random.default_rng(seed)
+    bit = 1e6 / clock
+    t_codec = codec_bits(codec_bytes) * bit + gap
+    deb = debounce * 1e3
+    out = {"codec": t_codec, "codec_load": min(codec_rate * t_codec * 1e-6, 1.0)}
+
+    # Polled: row r is sampled at t_done[r] into each scan; a press at a
+    # uniform phase waits for that sample, then for the end of the scan
+    bits, done = scan_plan(wiring)
+    t = np.cumsum(np.array(bits) * bit + gap)
+    scan = float(t[-1]) if len(t) else 0.0
+    t_eff = max(period * 1e3, scan)
+    t_done = t[done]
+    row = rng.integers(0, len(done), samples)
+    phase = rng.random(samples) * t_eff
+    wait = (t_done[row] - phase) % t_eff
+    lat = wait + (scan - t_done[row]) + _codec_delay(rng, scan, t_codec, codec_rate, samples) + deb
+    out["polled"] = {
+        "scan": scan, "period": t_eff, "overrun": scan > period * 1e3,
+        "p50": float(np.percentile(lat, 50)), "p99": float(np.percentile(lat, 99)),
+        "max": float(lat.max()), "load": scan / t_eff,
+    }
+
+    # Interrupt: ISR, identify the column, scan rows until the key's row
+    # answers, restore; a uniformly random key's row sets the scan length
+    identify, per_row, restore = interrupt_plan(wiring)
+    t_id = sum(identify) * bit + gap * len(identify)
+    t_row = sum(per_row) * bit + gap * len(per_row)
+    t_rest = sum(restore) * bit + gap * len(restore)
+    n_rows = len(wiring["rows"])
+    rows_needed = rng.integers(1, n_rows + 1, samples)
+    span = t_id + rows_needed * t_row + t_rest
+    lat = isr + span + _codec_delay(rng, span, t_codec, codec_rate, samples) + deb
+    full = t_id + n_rows * t_row + t_rest       # the last row's key
+    out["interrupt"] = {
+        "scan": full, "wired": bool(wiring["int"]),
+        "p50": float(np.percentile(lat, 50)), "p99": float(np.percentile(lat, 99)),
+        "max": float(lat.max()), "load": min(press_rate * full * 1e-6, 1.0),
+    }
+    return out
+
+
+def _grid(spec):
+    cols, rows = (int(v) for v in spec.lower().split("x"))
+    return cols, rows
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", nargs="?", default="keys4x4", help="board key or gen_pcb.py")
+    ap.add_argument("--grids", nargs="*", type=_grid, help="COLSxROWS via configure() (default: as generated)")
+    ap.add_argument("--clocks", nargs="*", type=int, default=list(CLOCKS), help="SCL Hz")
+    ap.add_argument("--period", type=float, default=PERIOD, help="polled scan period (ms)")
+    ap.add_argument("--gap", type=float, default=GAP, help="driver overhead per transfer (us)")
+    ap.add_argument("--isr", type=float, default=ISR, help="INT edge to first transfer (us)")
+    ap.add_argument("--codec-rate", type=float, default=CODEC_RATE, help="codec transfers / s")
+    ap.add_argument("--codec-bytes", type=int, default=CODEC_BYTES)
+    ap.add_argument("--press-rate", type=float, default=PRESS_RATE, help="key events / s (interrupt load)")
+    ap.add_argument("--debounce", type=float, default=0.0, help="debounce interval added to latency (ms)")
+    ap.add_argument("--samples", type=int, default=SAMPLES)
+    args = ap.parse_args()
+
+    gen = load_generator(GENERATORS.get(args.board, args.board))
+    for grid in args.grids or [None]:
+        if grid:
+            gen.configure(*grid)
+        w = matrix_wiring(gen)
+        exp = ", ".join(f"{ref}@0x{a:02X}" for ref, a in w["addr"].items())
+        print(f"{len(w['cols'])}x{len(w['rows'])} matrix, {len(w['keys'])} keys on {exp}; "
+              f"INT {'from ' + ', '.join(w['int']) if w['int'] else 'not wired'}")
+        print(f"  {'SCL':>6} {'mode':<9} {'scan us':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7}"
+              f" {'keys %':>7} {'+codec %':>8}")
+        for clock in args.clocks:
+            res = simulate(w, clock, args.period, args.gap, args.isr, args.codec_rate,
+                           args.codec_bytes, args.press_rate, args.debounce, args.samples)
+            for mode in ("polled", "interrupt"):
+                r = res[mode]
+                note = ""
+                if mode == "polled" and r["overrun"]:
+                    note = f"  scan overruns the period, runs every {r['period'] / 1e3:.2f} ms"
+                if mode == "interrupt" and not r["wired"]:
+                    note = "  INT not wired"
+                print(f"  {clock // 1000:>5}k {mode:<9} {r['scan']:8.0f} {r['p50'] / 1e3:7.2f}"
+                      f" {r['p99'] / 1e3:7.2f} {r['max'] / 1e3:7.2f} {100 * r['load']:7.1f}"
+                      f" {100 * min(r['load'] + res['codec_load'], 1.0):8.1f}{note}")
+        print("  interrupt: a press in the column of a held key raises no INT; "
+              "poll while any key is held")
@@ -0,0 +1,458 @@
+"""
+MIXTEE PCB tools - .kicad_pcb reader
+
+Parses the S-expression text written by the per-board gen_pcb.py generators
+(or any KiCad 8 .kicad_pcb) into plain dicts, in the same spirit as the
+generators' own NETS / COMP_NETS / PLACEMENTS tables.
+
+Board model (all coordinates in mm, KiCad board frame, y down):
+
+  board = {
+    "nets":       {code: name},
+    "layers":     ["F.Cu", "In1.Cu", ...]           copper layers, top to bottom
+    "footprints": [fp, ...],
+    "segments":   [{"start", "end", "width", "layer", "net"}],
+    "vias":       [{"at", "size", "drill", "layers", "net"}],
+    "zones":      [{"net", "net_name", "layers", "polygon", "filled",
+                    "clearance", "min_thickness", "thermal_gap",
+                    "thermal_bridge_width", "island_removal_mode",
+                    "island_area_min", "span"}],
+    "edges":      [{"kind": "line"|"arc", "start", "end", "mid"}],
+    "graphics":   [{"kind", "layer", "start", "end", "width"}],
+  }
+
+  fp = {
+    "ref", "value", "lib", "x", "y", "rot", "layer", "attr",
+    "pads":  [{"name", "type", "shape", "x", "y", "rot", "w", "h",
+               "drill", "slot", "layers", "net", "rratio",
+               "zone_connect"}],                          absolute coords
+             oval drills: "slot" = (W, H) before rotation, "drill" = the
+             slot width; None for round holes
+    "lines": [{"layer", "start", "end", "width"}],        absolute coords
+    "circles": [{"layer", "center", "radius", "width"}],
+    "span":  (start, end) offsets of the footprint in the source text,
+  }
+
+Usage:
+  from kicad_pcb import load_board, load_generator
+  gen = load_generator("hardware/pcbs/keys4x4/designs/gen_pcb.py")
+  board = load_board(gen.generate_pcb())
+"""
+
+import importlib.util
+import math
+import os
+import re
+
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+PCBS_DIR = os.path.join(os.path.dirname(TOOLS_DIR), "pcbs")
+
+# Generator script for every board that has one
+GENERATORS = {
+    "input-mother": os.path.join(PCBS_DIR, "input-mother", "designs", "gen_pcb.py"),
+    "daughter-output": os.path.join(PCBS_DIR, "daughter-output", "designs", "gen_pcb.py"),
+    "io": os.path.join(PCBS_DIR, "io", "designs", "gen_pcb.py"),
+    "keys4x4": os.path.join(PCBS_DIR, "keys4x4", "designs", "gen_pcb.py"),
+}
+
+COPPER_ORDER = ["F.Cu"] + [f"In{i}.Cu" for i in range(1, 31)] + ["B.Cu"]
+
+
+# ---------------------------------------------------------------------------
+# S-expression parsing
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()"]+')
+
+
+def parse_sexpr(text):
+    """Parse S-expression text into nested lists.
+
+    Quoted strings are unquoted; the top-level list's children are returned
+    together with their (start, end) offsets in `text`, so callers can copy
+    raw footprint text without re-serialising it.
+    Returns (root_list, spans) where spans[i] belongs to root_list[i + 1].
+    """
+    stack = []
+    spans = []
+    root = None
+    starts = []
+    for m in _TOKEN_RE.finditer(text):
+        tok = m.group(0)
+        if tok == "(":
+            node = []
+            if stack:
+                stack[-1].append(node)
+            stack.append(node)
+            starts.append(m.start())
+        elif tok == ")":
+            node = stack.pop()
+            start = starts.pop()
+            if len(stack) == 1:
+                spans.append((start, m.end()))
+            if not stack:
+                root = node
+        elif tok[0] == '"':
+            stack[-1].append(tok[1:-1].replace('\\"', '"'))
+        else:
+            stack[-1].append(tok)
+    return root, spans
+
+
+def _find(node, key):
+    """First child list of `node` whose head is `key`, or None."""
+    for child in node:
+        if isinstance(child, list) and child and child[0] == key:
+            return child
+    return None
+
+
+def _find_all(node, key):
+    return [c for c in node if isinstance(c, list) and c and c[0] == key]
+
+
+def _xy(node, key, default=(0.0, 0.0)):
+    sub = _find(node, key)
+    if sub is None:
+        return default
+    return float(sub[1]), float(sub[2])
+
+
+def _num(node, key, default=0.0, index=1):
+    sub = _find(node, key)
+    if sub is None or len(sub) <= index:
+        return default
+    return float(sub[index])
+
+
+# ---------------------------------------------------------------------------
+# Geometry helpers
+# ---------------------------------------------------------------------------
+
+def rotate(lx, ly, rot_deg):
+    """Rotate a local offset by a KiCad angle (counter-clockwise on screen,
+    y down): global = origin + (lx*cos + ly*sin, -lx*sin + ly*cos)."""
+    if not rot_deg:
+        return lx, ly
+    a = math.radians(rot_deg)
+    c, s = math.cos(a), math.sin(a)
+    return lx * c + ly * s, -lx * s + ly * c
+
+
+def pad_corners(pad):
+    """Four corners of a pad's bounding rectangle in board coordinates."""
+    hw, hh = pad["w"] / 2, pad["h"] / 2
+    pts = []
+    for lx, ly in ((-hw, -hh), (hw, -hh), (hw, hh), (-hw, hh)):
+        dx, dy = rotate(lx, ly, pad["rot"])
+        pts.append((pad["x"] + dx, pad["y"] + dy))
+    return pts
+
+
+def pad_bbox(pad, grow=0.0):
+    pts = pad_corners(pad)
+    xs = [p[0] for p in pts]
+    ys = [p[1] for p in pts]
+    return (min(xs) - grow, min(ys) - grow, max(xs) + grow, max(ys) + grow)
+
+
+def footprint_bbox(fp):
+    """Bounding box of a footprint's pads and body graphics (a courtyard
+    stand-in: the generators do not emit F.CrtYd outlines)."""
+    xs, ys = [fp["x"]], [fp["y"]]
+    for pad in fp["pads"]:
+        x1, y1, x2, y2 = pad_bbox(pad)
+        xs += [x1, x2]
+        ys += [y1, y2]
+    for ln in fp["lines"]:
+        if ln["layer"].endswith("SilkS") or ln["layer"].endswith("CrtYd"):
+            xs += [ln["start"][0], ln["end"][0]]
+            ys += [ln["start"][1], ln["end"][1]]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def outline_bbox(board):
+    """Bounding box of the Edge.Cuts outline."""
+    xs, ys = [], []
+    for e in board["edges"]:
+        for key in ("start", "end", "mid"):
+            if key in e:
+                xs.append(e[key][0])
+                ys.append(e[key][1])
+    if not xs:
+        return 0.0, 0.0, 0.0, 0.0
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def pad_copper_layers(pad, copper_layers):
+    """Expand a pad's layer list ("*.Cu", "F.Cu", ...) to concrete copper layers."""
+    out = []
+    for layer in pad["layers"]:
+        if layer == "*.Cu":
+            return list(copper_layers)
+        if layer in copper_layers:
+            out.append(layer)
+    return out
+
+
+def via_copper_layers(via, copper_layers):
+    top, bottom = via["layers"][0], via["layers"][-1]
+    if top not in copper_layers or bottom not in copper_layers:
+        return list(copper_layers)
+    i, j = copper_layers.index(top), copper_layers.index(bottom)
+    return copper_layers[min(i, j):max(i, j) + 1]
+
+
+# ---------------------------------------------------------------------------
+# Board model
+# ---------------------------------------------------------------------------
+
+def _parse_pad(node, fx, fy, frot):
+    px, py = _xy(node, "at")
+    at = _find(node, "at")
+    prot = float(at[3]) if at is not None and len(at) > 3 else 0.0
+    size = _find(node, "size")
+    w, h = float(size[1]), float(size[2])
+    drill_node = _find(node, "drill")
+    drill, slot = 0.0, None
+    if drill_node is not None:
+        vals = [float(v) for v in drill_node[1:] if not isinstance(v, list) and v != "oval"]
+        drill = vals[0] if vals else 0.0
+        if "oval" in drill_node[1:] and len(vals) > 1 and vals[0] != vals[1]:
+            slot = (vals[0], vals[1])
+            drill = min(slot)
+    layers_node = _find(node, "layers")
+    layers = list(layers_node[1:]) if layers_node is not None else []
+    net_node = _find(node, "net")
+    net = int(net_node[1]) if net_node is not None else 0
+    dx, dy = rotate(px, py, frot)
+    return {
+        "name": node[1],
+        "type": node[2],
+        "shape": node[3],
+        "x": fx + dx,
+        "y": fy + dy,
+        "rot": prot,
+        "w": w,
+        "h": h,
+        "drill": drill,
+        "slot": slot,
+        "layers": layers,
+        "net": net,
+        "rratio": _num(node, "roundrect_rratio", 0.0),
+        "zone_connect": int(_num(node, "zone_connect", -1)),
+    }
+
+
+def _parse_footprint(node, span):
+    at = _find(node, "at")
+    fx, fy = float(at[1]), float(at[2])
+    frot = float(at[3]) if len(at) > 3 else 0.0
+    ref = value = ""
+    for prop in _find_all(node, "property"):
+        if prop[1] == "Reference":
+            ref = prop[2]
+        elif prop[1] == "Value":
+            value = prop[2]
+    for text in _find_all(node, "fp_text"):
+        if text[1] == "reference" and not ref:
+            ref = text[2]
+        elif text[1] == "value" and not value:
+            value = text[2]
+    layer_node = _find(node, "layer")
+    fp = {
+        "ref": ref,
+        "value": value,
+        "lib": node[1],
+        "x": fx,
+        "y": fy,
+        "rot": frot,
+        "layer": layer_node[1] if layer_node is not None else "F.Cu",
+        "attr": list((_find(node, "attr") or ["attr"])[1:]),
+        "pads": [_parse_pad(p, fx, fy, frot) for p in _find_all(node, "pad")],
+        "lines": [],
+        "circles": [],
+        "span": span,
+    }
+    for ln in _find_all(node, "fp_line"):
+        sx, sy = rotate(*_xy(ln, "start"), frot)
+        ex, ey = rotate(*_xy(ln, "end"), frot)
+        fp["lines"].append({
+            "layer": _find(ln, "layer")[1],
+            "start": (fx + sx, fy + sy),
+            "end": (fx + ex, fy + ey),
+            "width": _num(_find(ln, "stroke") or [], "width", 0.12),
+        })
+    for circ in _find_all(node, "fp_circle"):
+        cx, cy = _xy(circ, "center")
+        ex, ey = _xy(circ, "end")
+        gx, gy = rotate(cx, cy, frot)
+        fp["circles"].append({
+            "layer": _find(circ, "layer")[1],
+            "center": (fx + gx, fy + gy),
+            "radius": math.hypot(ex - cx, ey - cy),
+            "width": _num(_find(circ, "stroke") or [], "width", 0.12),
+        })
+    return fp
+
+
+def _parse_pts(node):
+    pts = _find(node, "pts")
+    if pts is None:
+        return []
+    return [(float(p[1]), float(p[2])) for p in pts[1:] if p[0] == "xy"]
+
+
+def _parse_zone(node, span):
+    layer = _find(node, "layer")
+    layers_node = _find(node, "layers")
+    layers = [layer[1]] if layer is not None else list(layers_node[1:])
+    connect = _find(node, "connect_pads")
+    fill = _find(node, "fill") or []
+    filled = {}
+    for fpoly in _find_all(node, "filled_polygon"):
+        flayer = _find(fpoly, "layer")
+        key = flayer[1] if flayer is not None else layers[0]
+        filled.setdefault(key, []).append(_parse_pts(fpoly))
+    name_node = _find(node, "net_name")
+    return {
+        "net": int(_find(node, "net")[1]),
+        "net_name": name_node[1] if name_node is not None else "",
+        "layers": layers,
+        "polygon": _parse_pts(_find(node, "polygon")),
+        "filled": filled,
+        "clearance": _num(connect or [], "clearance", 0.2),
+        "connect": connect[1] if connect and len(connect) > 1 and not isinstance(connect[1], list) else "thermal",
+        "min_thickness": _num(node, "min_thickness", 0.25),
+        "thermal_gap": _num(fill, "thermal_gap", 0.5),
+        "thermal_bridge_width": _num(fill, "thermal_bridge_width", 0.5),
+        "island_removal_mode": int(_num(node, "island_removal_mode", 0)),
+        "island_area_min": _num(node, "island_area_min", 10.0),
+        "span": span,
+    }
+
+
+def load_board(text):
+    """Parse .kicad_pcb text into the board model described above."""
+    root, spans = parse_sexpr(text)
+    board = {
+        "nets": {},
+        "layers": [],
+        "footprints": [],
+        "segments": [],
+        "vias": [],
+        "zones": [],
+        "edges": [],
+        "graphics": [],
+        "thickness": 1.6,
+    }
+    for node, span in zip(root[1:], spans):
+        if not isinstance(node, list) or not node:
+            continue
+        head = node[0]
+        if head == "net":
+            board["nets"][int(node[1])] = node[2] if len(node) > 2 else ""
+        elif head == "general":
+            board["thickness"] = _num(node, "thickness", 1.6)
+        elif head == "layers":
+            names = [entry[1] for entry in node[1:] if entry[1].endswith(".Cu")]
+            board["layers"] = sorted(names, key=COPPER_ORDER.index)
+        elif head == "footprint":
+            board["footprints"].append(_parse_footprint(node, span))
+        elif head == "segment":
+            board["segments"].append({
+                "start": _xy(node, "start"),
+                "end": _xy(node, "end"),
+                "width": _num(node, "width", 0.25),
+                "layer": _find(node, "layer")[1],
+                "net": int(_num(node, "net", 0)),
+            })
+        elif head == "via":
+            board["vias"].append({
+                "at": _xy(node, "at"),
+                "size": _num(node, "size", 0.6),
+                "drill": _num(node, "drill", 0.3),
+                "layers": list(_find(node, "layers")[1:]),
+                "net": int(_num(node, "net", 0)),
+            })
+        elif head == "zone":
+            board["zones"].append(_parse_zone(node, span))
+        elif head in ("gr_line", "gr_arc", "gr_circle", "gr_rect"):
+            layer = _find(node, "layer")[1]
+            item = {"kind": head[3:], "layer": layer,
+                    "start": _xy(node, "start"), "end": _xy(node, "end"),
+                    "width": _num(_find(node, "stroke") or [], "width", 0.1)}
+            if head == "gr_arc":
+                item["mid"] = _xy(node, "mid")
+            if head == "gr_circle":
+                item["center"] = _xy(node, "center")
+            if layer == "Edge.Cuts":
+                board["edges"].append(item)
+            else:
+                board["graphics"].append(item)
+    if not board["layers"]:
+        board["layers"] = ["F.Cu", "B.Cu"]
+    return board
+
+
+def load_board_file(path):
+    with open(path) as f:
+        return load_board(f.read())
+
+
+def net_code(board, name):
+    """Net code for a net name, or None."""
+    for code, n in board["nets"].items():
+        if n == name:
+            return code
+    return None
+
+
+def pads_on_net(board, code):
+    """[(footprint, pad)] for every pad on net `code`."""
+    return [(fp, pad) for fp in board["footprints"] for pad in fp["pads"]
+            if pad["net"] == code]
+
+
+# ---------------------------------------------------------------------------
+# Generator access
+# ---------------------------------------------------------------------------
+
+def load_generator(path, name=None):
+    """Import a gen_pcb.py script as a module without running its __main__."""
+    path = os.path.abspath(path)
+    if name is None:
+        name = "gen_" + os.path.basename(os.path.dirname(os.path.dirname(path))).replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_generator_source(source, name="gen_revision"):
+    """Build a generator module from source text (e.g. `git show REV:path`)."""
+    module = type(importlib)(name)
+    module.__file__ = name + ".py"
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module
+
+
+def board_from_generator(path):
+    """(module, board) for a generator script."""
+    gen = load_generator(path)
+    return gen, load_board(gen.generate_pcb())
+
+
+def resolve_board_text(spec):
+    """(pcb_text, generator module or None) for a board key, gen_pcb.py or .kicad_pcb."""
+    if spec in GENERATORS or spec.endswith(".py"):
+        gen = load_generator(GENERATORS.get(spec, spec))
+        return gen.generate_pcb(), gen
+    with open(spec) as f:
+        return f.read(), None
+
+
+def resolve_board(spec):
+    """Accept a board key ("keys4x4"), a gen_pcb.py path or a .kicad_pcb path."""
+    return load_board(resolve_board_text(spec)[0])
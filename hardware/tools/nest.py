@@ -0,0 +1,307 @@
+"""
+MIXTEE PCB tools - multi-board panel nesting
+
+Packs a mix of boards (e.g. 2x input-mother, 5x daughter-output, 1x io,
+1x keys4x4) onto as few fab panels as possible and writes them through the
+panelize.py emitter (solid panel, each board in a routed channel with
+mouse-bite tabs).
+
+Each board is a rectangle: its outline plus footprint overhang, the routed
+channel (panelize.GAP) and half a substrate web on every side. Packing is
+MaxRects with 90 degree rotations; every mix is tried with several sort
+orders and free-rectangle heuristics, and the best result is kept:
+
+  1. fewest panels
+  2. least waste, with each panel trimmed to its used extent
+
+Boards with different layer counts can't share a panel (one stackup per
+order), so 4-layer and 2-layer boards are nested separately.
+
+Results are cached per (size multiset, panel), so comparing many quantity
+mixes only packs each distinct mix once.
+
+Usage:
+  python nest.py                                         # INSTANCES of every board
+  python nest.py --qty input-mother=4 daughter-output=10 -o /tmp/nest
+  python nest.py --mix input-mother=2,io=1 --mix input-mother=4,io=2 --panel 200x150
+"""
+
+import argparse
+import functools
+import os
+import random
+
+import panelize
+from kicad_pcb import GENERATORS, load_board, load_generator, outline_bbox
+
+PANEL = (250.0, 250.0)   # mm, fab panel limit (w x h)
+WEB = 3.0                # mm, substrate between neighbouring channels
+EPS = 1e-6
+
+HEURISTICS = ("bssf", "blsf", "baf", "bl")
+ORDERS = {
+    "area": lambda s: -s[0] * s[1],
+    "long_side": lambda s: (-max(s), -min(s)),
+    "perimeter": lambda s: -(s[0] + s[1]),
+    "height": lambda s: (-s[1], -s[0]),
+    "width": lambda s: (-s[0], -s[1]),
+}
+SHUFFLES = 8
+
+
+# ---------------------------------------------------------------------------
+# MaxRects
+# ---------------------------------------------------------------------------
+
+def _score(heuristic, fx, fy, fw, fh, w, h):
+    dw, dh = fw - w, fh - h
+    if heuristic == "bssf":
+        return (min(dw, dh), max(dw, dh))
+    if heuristic == "blsf":
+        return (max(dw, dh), min(dw, dh))
+    if heuristic == "baf":
+        return (fw * fh - w * h, min(dw, dh))
+    return (fy + h, fx)                     # bottom-left
+
+
+def _best_fit(free, w, h, heuristic):
+    """(score, x, y, rotated) of the best free rectangle for w x h, or None."""
+    best = None
+    for fx, fy, fw, fh in free:
+        for rw, rh, rotated in ((w, h, False), (h, w, True)):
+            if rw <= fw + EPS and rh <= fh + EPS:
+                score = _score(heuristic, fx, fy, fw, fh, rw, rh)
+                if best is None or score < best[0]:
+                    best = (score, fx, fy, rotated)
+            if w == h:
+                break
+    return best
+
+
+def _split_free(free, x, y, w, h):
+    """Carve the placed rectangle out of every free rectangle, then prune."""
+    out = []
+    for fx, fy, fw, fh in free:
+        if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+            out.append((fx, fy, fw, fh))
+            continue
+        if x > fx:
+            out.append((fx, fy, x - fx, fh))
+        if x + w < fx + fw:
+            out.append((x + w, fy, fx + fw - x - w, fh))
+        if y > fy:
+            out.append((fx, fy, fw, y - fy))
+        if y + h < fy + fh:
+            out.append((fx, y + h, fw, fy + fh - y - h))
+    pruned = []
+    for i, a in enumerate(out):
+        contained = False
+        for j, b in enumerate(out):
+            if i != j and (b[0] <= a[0] + EPS and b[1] <= a[1] + EPS
+                           and a[0] + a[2] <= b[0] + b[2] + EPS
+                           and a[1] + a[3] <= b[1] + b[3] + EPS):
+                # Keep one copy of identical rectangles
+                if a != b or j < i:
+                    contained = True
+                    break
+        if not contained:
+            pruned.append(a)
+    return pruned
+
+
+def maxrects(sizes, order, bin_w, bin_h, heuristic):
+    """Pack sizes[i] in the given order. First bin that fits wins.
+
+    Returns [[(i, x, y, rotated), ...] per bin], or None if some rectangle
+    is larger than the bin in both orientations.
+    """
+    bins, frees = [], []
+    for i in order:
+        w, h = sizes[i]
+        for b, free in enumerate(frees):
+            fit = _best_fit(free, w, h, heuristic)
+            if fit:
+                break
+        else:
+            fit = _best_fit([(0.0, 0.0, bin_w, bin_h)], w, h, heuristic)
+            if fit is None:
+                return None
+            b = len(bins)
+            bins.append([])
+            frees.append([(0.0, 0.0, bin_w, bin_h)])
+        _, x, y, rotated = fit
+        pw, ph = (h, w) if rotated else (w, h)
+        bins[b].append((i, x, y, rotated))
+        frees[b] = _split_free(frees[b], x, y, pw, ph)
+    return bins
+
+
+def _waste(sizes, bins, rail):
+    """Trimmed panel area minus board area, over all bins."""
+    total = 0.0
+    for placed in bins:
+        xs, ys, used = [], [], 0.0
+        for i, x, y, rotated in placed:
+            w, h = sizes[i]
+            pw, ph = (h, w) if rotated else (w, h)
+            xs.append(x + pw)
+            ys.append(y + ph)
+            used += w * h
+        total += max(xs) * (max(ys) + 2 * rail) - used
+    return total
+
+
+@functools.lru_cache(maxsize=None)
+def _pack_cached(sizes, bin_w, bin_h, rail):
+    best = None
+    n = len(sizes)
+    orders = [sorted(range(n), key=lambda i: key(sizes[i])) for key in ORDERS.values()]
+    rng = random.Random(n)
+    for _ in range(SHUFFLES):
+        o = list(range(n))
+        rng.shuffle(o)
+        orders.append(o)
+    for order in orders:
+        for heuristic in HEURISTICS:
+            bins = maxrects(sizes, order, bin_w, bin_h, heuristic)
+            if bins is None:
+                return None
+            score = (len(bins), _waste(sizes, bins, rail))
+            if best is None or score < best[0]:
+                best = (score, bins)
+    return best
+
+
+def pack(sizes, panel=PANEL, rail=panelize.RAIL_W):
+    """Best packing of `sizes` [(w, h)] into panels of `panel` (w, h).
+
+    Rails (top and bottom) are reserved. Returns ((panels, waste mm^2),
+    bins) or None when a board doesn't fit at all. Sizes are rounded to
+    0.01 mm so equal boards share cache entries.
+    """
+    key = tuple(sorted((round(w, 2), round(h, 2)) for w, h in sizes))
+    result = _pack_cached(key, panel[0], panel[1] - 2 * rail, rail)
+    if result is None:
+        return None
+    # Map cache positions back onto the caller's indices
+    index = sorted(range(len(sizes)), key=lambda i: (round(sizes[i][0], 2), round(sizes[i][1], 2)))
+    score, bins = result
+    return score, [[(index[i], x, y, r) for i, x, y, r in placed] for placed in bins]
+
+
+# ---------------------------------------------------------------------------
+# Boards and mixes
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def load_part(key):
+    """(text, board, instances, footprint (w, h), channel rect) for a board key."""
+    gen = load_generator(GENERATORS[key])
+    text = gen.generate_pcb()
+    board = load_board(text)
+    x0, y0, x1, y1 = outline_bbox(board)
+    if (abs((x1 - x0) - gen.BOARD_W) > 0.01 or abs((y1 - y0) - gen.BOARD_H) > 0.01):
+        print(f"  WARNING: {key} outline {x1 - x0:.1f} x {y1 - y0:.1f} mm "
+              f"differs from BOARD_W/BOARD_H {gen.BOARD_W} x {gen.BOARD_H}")
+    cx0, cy0, cx1, cy1 = panelize.channel_rect(board)
+    size = (cx1 - cx0 + WEB, cy1 - cy0 + WEB)
+    return text, board, getattr(gen, "INSTANCES", 1), size, (cx0, cy0, cx1, cy1)
+
+
+def nest_mix(qty, panel=PANEL):
+    """Nest {board key: quantity}. Returns {layer count: (score, bins, items)}.
+
+    items[i] is the board key of rectangle i.
+    """
+    groups = {}
+    for key, n in qty.items():
+        _, board, _, size, _ = load_part(key)
+        groups.setdefault(len(board["layers"]), []).extend([(key, size)] * n)
+    out = {}
+    for layers, entries in sorted(groups.items()):
+        result = pack([s for _, s in entries], panel)
+        if result is None:
+            raise ValueError(f"a {layers}-layer board does not fit a "
+                             f"{panel[0]:g} x {panel[1]:g} mm panel")
+        out[layers] = (result[0], result[1], [k for k, _ in entries])
+    return out
+
+
+def placements(bins_entry, rail=panelize.RAIL_W):
+    """Panel parts [(text, board, dx, dy, rot)] and trimmed size for one bin."""
+    parts, max_x, max_y = [], 0.0, 0.0
+    placed, items = bins_entry
+    for i, x, y, rotated in placed:
+        text, board, _, (w, h), (cx0, cy0, cx1, cy1) = load_part(items[i])
+        if rotated:
+            # rotate(x, y, 90) = (y, -x): channel spans x [cy0, cy1], y [-cx1, -cx0]
+            dx, dy, rot = x + WEB / 2 - cy0, rail + y + WEB / 2 + cx1, 90
+            w, h = h, w
+        else:
+            dx, dy, rot = x + WEB / 2 - cx0, rail + y + WEB / 2 - cy0, 0
+        parts.append((text, board, dx, dy, rot))
+        max_x, max_y = max(max_x, x + w), max(max_y, y + h)
+    return parts, (max_x, max_y + 2 * rail)
+
+
+def write_nested(qty, out_dir, prefix="mixtee-nested", panel=PANEL):
+    """Nest and write every panel. Returns [(path, summary)]."""
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for layers, (_, bins, items) in nest_mix(qty, panel).items():
+        for k, placed in enumerate(bins, start=1):
+            parts, size = placements((placed, items))
+            path = os.path.join(out_dir, f"{prefix}-{layers}L-{k}.kicad_pcb")
+            summary = panelize.write_framed_panel(path, parts, size,
+                                                  name=f"MIXTEE {layers}L {k}/{len(bins)}")
+            summary["boards"] = sorted(items[i] for i, *_ in placed)
+            written.append((path, summary))
+    return written
+
+
+def _parse_qty(text):
+    qty = {}
+    for item in text.replace(",", " ").split():
+        key, _, n = item.partition("=")
+        if key not in GENERATORS:
+            raise SystemExit(f"unknown board {key!r} (choose from {', '.join(GENERATORS)})")
+        qty[key] = int(n or 1)
+    return qty
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--qty", nargs="*", help="board=N ... (default: each board's INSTANCES)")
+    ap.add_argument("--mix", action="append", help="compare a mix: board=N,board=N (repeatable)")
+    ap.add_argument("--panel", default=f"{PANEL[0]:g}x{PANEL[1]:g}", help="panel W x H in mm")
+    ap.add_argument("-o", "--out-dir", help="write panels here")
+    args = ap.parse_args()
+
+    pw, ph = (float(v) for v in args.panel.lower().split("x"))
+
+    if args.mix:
+        print(f"{'mix':<50} {'panels':>7} {'waste cm^2':>11}")
+        for mix in args.mix:
+            result = nest_mix(_parse_qty(mix), (pw, ph))
+            panels = sum(score[0] for score, _, _ in result.values())
+            waste = sum(score[1] for score, _, _ in result.values())
+            print(f"{mix:<50} {panels:>7} {waste / 100:>11.1f}")
+    else:
+        qty = _parse_qty(" ".join(args.qty)) if args.qty else {
+            key: load_part(key)[2] for key in GENERATORS}
+        print("Nesting " + ", ".join(f"{k} x{n}" for k, n in qty.items())
+              + f" on {pw:g} x {ph:g} mm panels")
+        for layers, ((n, waste), bins, items) in nest_mix(qty, (pw, ph)).items():
+            used = sum(load_part(k)[3][0] * load_part(k)[3][1] for k in items)
+            print(f"  {layers}-layer: {n} panel(s), waste {waste / 100:.1f} cm^2 "
+                  f"({100 * used / (used + waste):.0f}% used)")
+        if args.out_dir:
+            for path, s in write_nested(qty, args.out_dir, panel=(pw, ph)):
+                print(f"Panel written to: {path}")
+                print(f"  {s['size'][0]:.1f} x {s['size'][1]:.1f} mm: {', '.join(s['boards'])}")
+                if s["blocked_tabs"]:
+                    print(f"  WARNING: {s['blocked_tabs']} tab(s) overlap footprints near a board edge")
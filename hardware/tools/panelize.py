@@ -0,0 +1,536 @@
+"""
+MIXTEE PCB tools - panelizer
+
+Tiles N copies of a generated board into a fab panel:
+
+  +--------------------------------------------+  rail (tooling holes,
+  | o  +              MIXTEE ...            +  o |        fiducials)
+  +-----==-----------------==------------------+
+        ||  mouse-bite tabs ||
+  +-----==-----------------==------+  +--- ...
+  |        board copy (0, 0)       |  |  board copy (1, 0)
+  +-----==-----------------==------+  +--- ...
+        ||                 ||
+  ...
+  +--------------------------------------------+
+  | o  +                                     o |  rail
+  +--------------------------------------------+
+
+Copies are views, not duplicates: every top-level item of the source board
+is compiled once into a template (literal text + coordinate/uuid slots) and
+each copy is rendered straight to the output file with its own offset. Memory
+and per-copy work stay flat however large the panel grows (2x5, 4x6, ...).
+
+Columns are separated by a fully routed gap; rows hang from tabs across the
+horizontal gaps and from the top/bottom rails. Tabs are placed away from
+footprints that sit on or overhang those edges (panel-edge jacks), and the
+gaps grow by the overhang so neighbouring copies never collide.
+
+Nets are shared between copies (one net table), so the panel is meant for
+fab output (excellon.py, assembly.py, Gerbers), not for DRC.
+
+Usage:
+  python panelize.py input-mother                    # 1 x INSTANCES
+  python panelize.py daughter-output --cols 1 --rows 5 -o panel.kicad_pcb
+"""
+
+import argparse
+import math
+import os
+import re
+import uuid
+
+from kicad_pcb import (footprint_bbox, load_board, outline_bbox, parse_sexpr,
+                       resolve_board_text, rotate)
+
+RAIL_W = 5.0              # mm, top/bottom rails (JLCPCB minimum)
+GAP = 2.0                 # mm, routed gap between copies
+TAB_W = 3.0               # mm
+TAB_SPACING = 40.0        # mm, about one tab per this much edge
+TAB_KEEPOUT = 1.0         # mm, footprints this close to an edge block tabs
+BITE_DRILL = 0.5          # mm, mouse-bite holes
+BITE_PITCH = 0.8          # mm
+TOOLING_DRILL = 1.152     # mm, JLCPCB tooling hole
+FIDUCIAL_D = 1.0          # mm copper, with 2 mm mask opening
+EDGE_WIDTH = 0.05
+
+HEADER_KINDS = ("version", "generator", "generator_version", "general",
+                "paper", "layers", "setup", "net")
+
+_COORD_RE = re.compile(r"\((start|end|mid|at|center|xy) (-?[\d.]+) (-?[\d.]+)(?: (-?[\d.]+))?")
+_UUID_RE = re.compile(r'\(uuid "([0-9a-fA-F-]{36})"\)')
+_NET_RE = re.compile(r"\(net (\d+)")
+
+
+# ---------------------------------------------------------------------------
+# Templates (shared by every copy)
+# ---------------------------------------------------------------------------
+
+def compile_item(text, kind=None):
+    """Split one top-level item into literal chunks and slots.
+
+    Slots are ("xy", ...) for coordinates to transform, ("net", code) for
+    net references and ("uuid", int) for uuids that must differ per copy.
+    Footprint children are in footprint coordinates, so only the
+    footprint's own (at ...) moves; child (at ...) angles still turn with
+    the copy because KiCad stores pad and text angles absolute.
+    """
+    marks = []
+    seen_at = False
+    for m in _COORD_RE.finditer(text):
+        key = m.group(1)
+        local = kind == "footprint" and seen_at
+        if local and key != "at":
+            continue
+        seen_at = seen_at or key == "at"
+        angled = key == "at" and (local or kind in ("footprint", "gr_text"))
+        angle = float(m.group(4)) if m.group(4) else None
+        marks.append((m.start(2), m.end(), ("xy", angled, float(m.group(2)), float(m.group(3)),
+                                            angle, local, f"{m.group(2)} {m.group(3)}")))
+    for m in _NET_RE.finditer(text):
+        marks.append((m.start(1), m.end(1), ("net", int(m.group(1)))))
+    for m in _UUID_RE.finditer(text):
+        marks.append((m.start(1), m.end(1), ("uuid", uuid.UUID(m.group(1)).int)))
+    marks.sort()
+    parts, pos = [], 0
+    for start, end, slot in marks:
+        parts.append(text[pos:start])
+        parts.append(slot)
+        pos = end
+    parts.append(text[pos:])
+    return parts
+
+
+def xform(x, y, dx=0.0, dy=0.0, rot=0):
+    """Board point -> panel point: rotate by `rot` (KiCad sense), then offset."""
+    rx, ry = rotate(x, y, rot)
+    return rx + dx, ry + dy
+
+
+def render(template, dx=0.0, dy=0.0, copy=0, rot=0, netmap=None):
+    """Yield the text of one copy of a compiled item."""
+    for part in template:
+        if isinstance(part, str):
+            yield part
+        elif part[0] == "xy":
+            _, angled, x, y, angle, local, orig = part
+            if local:
+                yield f"{orig} {((angle or 0) + rot) % 360:g}" if rot else (
+                    orig if angle is None else f"{orig} {angle:g}")
+                continue
+            gx, gy = xform(x, y, dx, dy, rot)
+            if angled and (angle is not None or rot):
+                yield f"{gx:.4f} {gy:.4f} {((angle or 0) + rot) % 360:g}"
+            else:
+                yield f"{gx:.4f} {gy:.4f}"
+        elif part[0] == "net":
+            yield str(netmap[part[1]] if netmap else part[1])
+        else:
+            yield str(uuid.UUID(int=part[1] ^ (copy << 64))) if copy else str(uuid.UUID(int=part[1]))
+
+
+def compile_board(text):
+    """(header chunks, item templates) for a .kicad_pcb text.
+
+    Net declarations are left out of the header (the emitter writes the
+    panel's net table) and so are Edge.Cuts graphics: the panel redraws
+    outlines with tab gaps.
+    """
+    root, spans = parse_sexpr(text)
+    header, items = [], []
+    for node, (start, end) in zip(root[1:], spans):
+        chunk = text[start:end]
+        if node[0] == "net":
+            continue
+        if node[0] in HEADER_KINDS:
+            header.append(chunk)
+        elif node[0].startswith("gr_") and ["layer", "Edge.Cuts"] in node:
+            continue
+        else:
+            items.append(compile_item(chunk, node[0]))
+    return header, items
+
+
+def merge_nets(boards):
+    """One net table for several boards, merged by name.
+
+    Returns ({code: name}, [{old code: new code} per board]).
+    """
+    nets, by_name, maps = {0: ""}, {"": 0}, []
+    for board in boards:
+        netmap = {}
+        for code, name in sorted(board["nets"].items()):
+            if name not in by_name:
+                by_name[name] = len(nets)
+                nets[by_name[name]] = name
+            netmap[code] = by_name[name]
+        maps.append(netmap)
+    return nets, maps
+
+
+# ---------------------------------------------------------------------------
+# Layout
+# ---------------------------------------------------------------------------
+
+def overhangs(board):
+    """How far footprints stick out past each side of the outline (mm)."""
+    x0, y0, x1, y1 = outline_bbox(board)
+    out = {"left": 0.0, "top": 0.0, "right": 0.0, "bottom": 0.0}
+    for fp in board["footprints"]:
+        bx0, by0, bx1, by1 = footprint_bbox(fp)
+        out["left"] = max(out["left"], x0 - bx0)
+        out["top"] = max(out["top"], y0 - by0)
+        out["right"] = max(out["right"], bx1 - x1)
+        out["bottom"] = max(out["bottom"], by1 - y1)
+    return out
+
+
+def tab_positions(board, tab_w=TAB_W, spacing=TAB_SPACING):
+    """Tab centres (board x) shared by the top and bottom edges.
+
+    Targets are spread evenly along the edge and moved to the nearest spot
+    that is clear of footprints near either edge. Returns (centres, blocked)
+    where `blocked` counts tabs that found no clear spot.
+    """
+    x0, y0, x1, y1 = outline_bbox(board)
+    width = x1 - x0
+    blockers = []
+    for fp in board["footprints"]:
+        bx0, by0, bx1, by1 = footprint_bbox(fp)
+        if by0 < y0 + TAB_KEEPOUT or by1 > y1 - TAB_KEEPOUT:
+            blockers.append((bx0, bx1))
+
+    # Straight part of the edge (clear of corner arcs)
+    corner = max((abs(e["end"][0] - e["start"][0]) for e in board["edges"]
+                  if e["kind"] == "arc"), default=0.0)
+    lo, hi = x0 + corner + tab_w / 2, x1 - corner - tab_w / 2
+    n = max(1, round(width / spacing))
+    candidates = [lo + 0.25 * i for i in range(int((hi - lo) / 0.25) + 1)]
+
+    def clear(c, taken):
+        a, b = c - tab_w / 2 - 0.15, c + tab_w / 2 + 0.15
+        return (all(b <= bx0 or a >= bx1 for bx0, bx1 in blockers)
+                and all(abs(c - t) >= tab_w + 1.0 for t in taken))
+
+    centres, blocked = [], 0
+    for i in range(n):
+        target = x0 + (i + 0.5) * width / n
+        free = [c for c in candidates if clear(c, centres)]
+        if free:
+            centres.append(min(free, key=lambda c: abs(c - target)))
+        else:
+            centres.append(min(max(target, lo), hi))
+            blocked += 1
+    return sorted(centres), blocked
+
+
+def layout(board, cols, rows, gap=GAP, rail=RAIL_W):
+    """Copy offsets and panel geometry.
+
+    Returns a dict with "offsets" [(dx, dy)] (row-major), the panel size,
+    row top/bottom y (panel frame) and column x ranges.
+    """
+    x0, y0, x1, y1 = outline_bbox(board)
+    w, h = x1 - x0, y1 - y0
+    oh = overhangs(board)
+    col_pitch = w + gap + oh["left"] + oh["right"]
+    row_pitch = h + gap + oh["top"] + oh["bottom"]
+    left = oh["left"]
+    top = rail + gap + oh["top"]
+    offsets = [(left + c * col_pitch - x0, top + r * row_pitch - y0)
+               for r in range(rows) for c in range(cols)]
+    width = left + (cols - 1) * col_pitch + w + oh["right"]
+    height = top + (rows - 1) * row_pitch + h + oh["bottom"] + gap + rail
+    return {
+        "offsets": offsets,
+        "size": (width, height),
+        "rows": [(top + r * row_pitch, top + r * row_pitch + h) for r in range(rows)],
+        "cols": [(left + c * col_pitch, left + c * col_pitch + w) for c in range(cols)],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Panel items
+# ---------------------------------------------------------------------------
+
+def _uid():
+    return str(uuid.uuid4())
+
+
+def _split(a, b, cuts):
+    """Pieces of [a, b] left after removing the (c0, c1) intervals in `cuts`."""
+    pieces, pos = [], a
+    for c0, c1 in sorted(cuts):
+        if c1 <= pos or c0 >= b:
+            continue
+        if c0 > pos:
+            pieces.append((pos, c0))
+        pos = max(pos, c1)
+    if pos < b:
+        pieces.append((pos, b))
+    return pieces
+
+
+def edge_text(prims, dx=0.0, dy=0.0, rot=0):
+    """Edge.Cuts text for ("line", p, q) / ("arc", start, mid, end) primitives."""
+    out = []
+    for prim in prims:
+        pts = [xform(x, y, dx, dy, rot) for x, y in prim[1:]]
+        if prim[0] == "line":
+            (x1, y1), (x2, y2) = pts
+            out.append(f'  (gr_line (start {x1:.4f} {y1:.4f}) (end {x2:.4f} {y2:.4f}) '
+                       f'(layer "Edge.Cuts") (stroke (width {EDGE_WIDTH}) (type solid)) '
+                       f'(uuid "{_uid()}"))\n')
+        else:
+            (sx, sy), (mx, my), (ex, ey) = pts
+            out.append(f'  (gr_arc (start {sx:.4f} {sy:.4f}) (mid {mx:.4f} {my:.4f}) '
+                       f'(end {ex:.4f} {ey:.4f}) (layer "Edge.Cuts") '
+                       f'(stroke (width {EDGE_WIDTH}) (type solid)) (uuid "{_uid()}"))\n')
+    return out
+
+
+def _hline(a, b, y, cuts=()):
+    return [("line", (x0, y), (x1, y)) for x0, x1 in _split(a, b, cuts)]
+
+
+def outline_prims(board, tabs):
+    """Board outline with gaps where tabs join its top and bottom edges."""
+    _, top_y, _, bottom_y = outline_bbox(board)
+    prims = []
+    for e in board["edges"]:
+        (sx, sy), (ex, ey) = e["start"], e["end"]
+        if e["kind"] == "line" and sy == ey and sy in (top_y, bottom_y):
+            prims += _hline(min(sx, ex), max(sx, ex), sy, tabs)
+        elif e["kind"] == "line":
+            prims.append(("line", (sx, sy), (ex, ey)))
+        elif e["kind"] == "arc":
+            prims.append(("arc", (sx, sy), e["mid"], (ex, ey)))
+    return prims
+
+
+def _footprint(lib, ref, x, y, pads, rot=0):
+    """Panel-only footprint (no net, excluded from BOM/CPL)."""
+    at = f"{x:.4f} {y:.4f}" + (f" {rot % 360:g}" if rot else "")
+    lines = [
+        f'  (footprint "{lib}"\n',
+        '    (layer "F.Cu")\n',
+        f'    (uuid "{_uid()}")\n',
+        f'    (at {at})\n',
+        f'    (property "Reference" "{ref}" (at 0 0) (layer "F.Fab") (uuid "{_uid()}") '
+        f'(effects (font (size 1 1) (thickness 0.15)) hide))\n',
+        f'    (property "Value" "{lib.split(":")[-1]}" (at 0 0) (layer "F.Fab") (uuid "{_uid()}") '
+        f'(effects (font (size 1 1) (thickness 0.15)) hide))\n',
+        '    (attr exclude_from_pos_files exclude_from_bom)\n',
+    ]
+    lines += [f"    {p} (uuid \"{_uid()}\"))\n" for p in pads]
+    lines.append("  )\n\n")
+    return "".join(lines)
+
+
+def mouse_bites(ref, x0, x1, y, dx=0.0, dy=0.0, rot=0):
+    """Row of NPTH holes across a tab, on the board edge at `y`."""
+    n = max(2, math.ceil((x1 - x0) / BITE_PITCH) + 1)
+    step = (x1 - x0) / (n - 1)
+    cx = (x0 + x1) / 2
+    pads = [f'(pad "" np_thru_hole circle (at {x0 + i * step - cx:.4f} 0) '
+            f'(size {BITE_DRILL} {BITE_DRILL}) (drill {BITE_DRILL}) (layers "*.Cu" "*.Mask")'
+            for i in range(n)]
+    return _footprint("mixtee-panel:MouseBites", ref, *xform(cx, y, dx, dy, rot), pads, rot)
+
+
+def tooling_hole(ref, x, y):
+    pad = (f'(pad "" np_thru_hole circle (at 0 0) (size {TOOLING_DRILL} {TOOLING_DRILL}) '
+           f'(drill {TOOLING_DRILL}) (layers "*.Cu" "*.Mask")')
+    return _footprint("mixtee-panel:ToolingHole", ref, x, y, [pad])
+
+
+def fiducial(ref, x, y):
+    pad = (f'(pad "" smd circle (at 0 0) (size {FIDUCIAL_D} {FIDUCIAL_D}) '
+           f'(layers "F.Cu" "F.Mask") (solder_mask_margin {(2.0 - FIDUCIAL_D) / 2})')
+    return _footprint("mixtee-panel:Fiducial", ref, x, y, [pad])
+
+
+def rail_items(width, height, rail, label):
+    """Tooling holes on the four rail corners, three asymmetric fiducials, label."""
+    out = []
+    for i, (x, y) in enumerate(((3.0, rail / 2), (width - 3.0, rail / 2),
+                                (3.0, height - rail / 2), (width - 3.0, height - rail / 2)), start=1):
+        out.append(tooling_hole(f"TH{i}", x, y))
+    for i, (x, y) in enumerate(((8.0, rail / 2), (width - 8.0, rail / 2),
+                                (8.0, height - rail / 2)), start=1):
+        out.append(fiducial(f"FID{i}", x, y))
+    out.append(f'  (gr_text "{label}" (at {width / 2:.4f} {rail / 2:.4f}) '
+               f'(layer "F.SilkS") (uuid "{_uid()}")\n'
+               f'    (effects (font (size 1.5 1.5) (thickness 0.15)))\n  )\n')
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Panel writers
+# ---------------------------------------------------------------------------
+
+def emit_panel(path, header, nets, copies, extras):
+    """Stream a panel to `path`.
+
+    header: board header chunks (layers, setup, ...) from compile_board()
+    nets:   {code: name} for the whole panel
+    copies: [(items, dx, dy, rot, netmap)] - shared templates per copy
+    extras: panel-only text (edges, mouse bites, rails)
+    """
+    with open(path, "w") as f:
+        f.write("(kicad_pcb\n")
+        for chunk in header:
+            f.write(f"  {chunk}\n")
+        for code, name in sorted(nets.items()):
+            f.write(f'  (net {code} "{name}")\n')
+        f.write("\n")
+        for k, (items, dx, dy, rot, netmap) in enumerate(copies):
+            for template in items:
+                f.write("  ")
+                f.writelines(render(template, dx, dy, k, rot, netmap))
+                f.write("\n")
+            f.write("\n")
+        f.writelines(extras)
+        f.write(")\n")
+
+
+def write_panel(text, path, cols, rows, name="MIXTEE", gap=GAP, rail=RAIL_W):
+    """Write a cols x rows panel of `text` to `path`. Returns a summary dict."""
+    board = load_board(text)
+    header, items = compile_board(text)
+    geo = layout(board, cols, rows, gap, rail)
+    centres, blocked = tab_positions(board)
+    bx0, _, _, _ = outline_bbox(board)
+    pw, ph = geo["size"]
+    local_tabs = [(c - TAB_W / 2, c + TAB_W / 2) for c in centres]
+    outline = outline_prims(board, local_tabs)
+
+    extras = []
+    for dx, dy in geo["offsets"]:
+        extras += edge_text(outline, dx, dy)
+
+    # Rails: outer rectangle pieces, inner edge broken at top/bottom tabs
+    cuts = [(cx0 + a - bx0, cx0 + b - bx0) for cx0, _ in geo["cols"] for a, b in local_tabs]
+    prims = []
+    for y_outer, y_inner in ((0.0, rail), (ph, ph - rail)):
+        prims += [("line", (0, y_outer), (pw, y_outer)),
+                  ("line", (0, y_outer), (0, y_inner)),
+                  ("line", (pw, y_outer), (pw, y_inner))]
+        prims += _hline(0.0, pw, y_inner, cuts)
+
+    # Tabs: side lines across every horizontal gap, mouse bites on board edges
+    gaps = [(rail, geo["rows"][0][0], False, True)]
+    gaps += [(geo["rows"][r][1], geo["rows"][r + 1][0], True, True) for r in range(rows - 1)]
+    gaps.append((geo["rows"][-1][1], ph - rail, True, False))
+    n_bites = 0
+    for ya, yb, bite_a, bite_b in gaps:
+        for a, b in cuts:
+            prims += [("line", (a, ya), (a, yb)), ("line", (b, ya), (b, yb))]
+            for bite, y in ((bite_a, ya), (bite_b, yb)):
+                if bite:
+                    n_bites += 1
+                    extras.append(mouse_bites(f"MB{n_bites}", a, b, y))
+    extras += edge_text(prims)
+    extras += rail_items(pw, ph, rail, f"{name} panel {cols}x{rows}")
+
+    copies = [(items, dx, dy, 0, None) for dx, dy in geo["offsets"]]
+    emit_panel(path, header, board["nets"], copies, extras)
+    return {
+        "copies": cols * rows,
+        "size": (pw, ph),
+        "tabs": len(centres),
+        "blocked_tabs": blocked,
+        "mouse_bites": n_bites,
+        "items_per_copy": len(items),
+    }
+
+
+def channel_rect(board, gap=GAP):
+    """Routed channel around a board: outline bbox grown by overhang + gap."""
+    x0, y0, x1, y1 = outline_bbox(board)
+    oh = overhangs(board)
+    return (x0 - oh["left"] - gap, y0 - oh["top"] - gap,
+            x1 + oh["right"] + gap, y1 + oh["bottom"] + gap)
+
+
+def framed_prims(board, gap=GAP):
+    """Board-frame geometry for one copy in a solid (filled) panel.
+
+    The board sits in a routed channel cut out of the panel substrate;
+    tabs cross the channel at the top and bottom edges. Returns (edge
+    prims, [(x0, x1, y)] mouse-bite rows, blocked tab count).
+    """
+    centres, blocked = tab_positions(board)
+    tabs = [(c - TAB_W / 2, c + TAB_W / 2) for c in centres]
+    _, y0, _, y1 = outline_bbox(board)
+    cx0, cy0, cx1, cy1 = channel_rect(board, gap)
+    prims = outline_prims(board, tabs)
+    prims += _hline(cx0, cx1, cy0, tabs) + _hline(cx0, cx1, cy1, tabs)
+    prims += [("line", (cx0, cy0), (cx0, cy1)), ("line", (cx1, cy0), (cx1, cy1))]
+    bites = []
+    for a, b in tabs:
+        prims += [("line", (a, cy0), (a, y0)), ("line", (b, cy0), (b, y0)),
+                  ("line", (a, y1), (a, cy1)), ("line", (b, y1), (b, cy1))]
+        bites += [(a, b, y0), (a, b, y1)]
+    return prims, bites, blocked
+
+
+def write_framed_panel(path, parts, size, name="MIXTEE", gap=GAP, rail=RAIL_W):
+    """Write a solid panel holding any mix of boards.
+
+    parts: [(text, board, dx, dy, rot)] - rot 0 or 90, offsets in panel mm;
+    texts/boards that are the same object share one compiled template.
+    Boards must share a layer stack (the emitter takes the first header).
+    Returns a summary dict.
+    """
+    pw, ph = size
+    compiled = {}
+    for text, board, *_ in parts:
+        if id(text) not in compiled:
+            compiled[id(text)] = (compile_board(text), framed_prims(board, gap), board)
+    uniq = list(compiled)
+    nets, maps = merge_nets([compiled[k][2] for k in uniq])
+    netmaps = dict(zip(uniq, maps))
+
+    extras = edge_text([("line", (0, 0), (pw, 0)), ("line", (pw, 0), (pw, ph)),
+                        ("line", (pw, ph), (0, ph)), ("line", (0, ph), (0, 0))])
+    copies, n_bites, blocked = [], 0, 0
+    for text, board, dx, dy, rot in parts:
+        (header, items), (prims, bites, nb), _ = compiled[id(text)]
+        copies.append((items, dx, dy, rot, netmaps[id(text)]))
+        extras += edge_text(prims, dx, dy, rot)
+        for x0, x1, y in bites:
+            n_bites += 1
+            extras.append(mouse_bites(f"MB{n_bites}", x0, x1, y, dx, dy, rot))
+        blocked += nb
+    extras += rail_items(pw, ph, rail, f"{name} panel")
+
+    emit_panel(path, compiled[uniq[0]][0][0], nets, copies, extras)
+    return {"copies": len(parts), "size": size, "mouse_bites": n_bites,
+            "blocked_tabs": blocked}
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", help="board key, gen_pcb.py or .kicad_pcb")
+    ap.add_argument("--cols", type=int, default=1)
+    ap.add_argument("--rows", type=int, help="default: the generator's INSTANCES")
+    ap.add_argument("--gap", type=float, default=GAP)
+    ap.add_argument("-o", "--output", help="default: <board>-panel.kicad_pcb")
+    args = ap.parse_args()
+
+    text, gen = resolve_board_text(args.board)
+    rows = args.rows or getattr(gen, "INSTANCES", 2)
+    base = os.path.splitext(os.path.basename(args.board))[0]
+    out = args.output or f"{base}-panel.kicad_pcb"
+    s = write_panel(text, out, args.cols, rows, name=f"MIXTEE {base}", gap=args.gap)
+    print(f"Panel written to: {out}")
+    print(f"  {s['copies']} copies, {s['size'][0]:.1f} x {s['size'][1]:.1f} mm, "
+          f"{s['tabs']} tabs per edge, {s['mouse_bites']} mouse-bite rows")
+    if s["blocked_tabs"]:
+        print(f"  WARNING: {s['blocked_tabs']} tab(s) per edge overlap footprints "
+              f"near the board edge; check clearance or use --gap")
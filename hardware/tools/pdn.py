@@ -0,0 +1,269 @@
+"""
+MIXTEE PCB tools - power-distribution impedance
+
+Builds a lumped RLC model of every supply rail from the board itself and
+sweeps |Z(f)| seen by the loads. That shows whether the decoupling keeps
+each rail under its target impedance across the codec's switching range
+(LRCLK up to the MCLK harmonics):
+
+  caps      every capacitor from the rail to GND in COMP_NETS: C (less
+            --derate % DC-bias loss for MLCCs of 1 uF and up) in series with
+            ESR (by value) and ESL (by package) plus --mount-l for the pads,
+            vias and plane spreading to the load
+  plane     each rail zone against the GND zones on the neighbouring copper
+            layers: the filled overlap area (zonefill) times eps0 * ER / d,
+            d from the STACKUP depths, in series with mu0 * d
+  source    an LDO output (REGULATORS) as ROUT rising as an inductor past
+            LDO_BW; a rail that enters on a connector as CABLE_R + CABLE_L;
+            anything else (codec-internal AVDRV/VCOM) as its caps alone
+  target    ripple * V / (step * load current), load current from the ICs on
+            the rail (I_LOAD)
+
+Everything sits at one node, so this says nothing about where on the rail a
+cap is placed; it does show the anti-resonances between cap values, the
+plane and the source. All rails are evaluated on one frequency grid with
+array arithmetic.
+
+Usage:
+  python pdn.py                                  # input-mother, every rail
+  python pdn.py --rails V33_A --derate 50 --mount-l 1.0
+  python pdn.py --add V33_A:10nF:0402 V33_A:10nF:0402 --ripple 0.5
+"""
+
+import argparse
+import math
+import re
+
+import numpy as np
+
+import zonefill
+import raster
+from assembly import parse_value
+from kicad_pcb import GENERATORS, load_board, load_generator
+from thermal_vias import STACKUP
+
+F_MIN, F_MAX, POINTS = 100.0, 1e9, 2001     # Hz, log grid
+BAND = (48e3, 3 * 12.288e6)     # LRCLK to the third MCLK harmonic (ak4619-wiring.md)
+ER = 4.4                        # FR4 / 7628 prepreg
+EPS0 = 8.854e-12
+MU0 = 4e-7 * math.pi
+GRID = 0.1                      # mm, plane overlap raster
+
+# Package ESL (H) and value-dependent ESR (ohms) of X5R/X7R MLCCs, typical
+ESL = {"0201": 0.3e-9, "0402": 0.4e-9, "0603": 0.6e-9, "0805": 0.8e-9, "1206": 1.1e-9}
+ESR = ((10e-9, 0.080), (100e-9, 0.030), (1e-6, 0.012), (10e-6, 0.006), (math.inf, 0.003))
+MOUNT_L = 0.7e-9                # pads + 2 vias + plane spreading per cap
+DERATE = 30.0                   # %, DC-bias loss of >= 1 uF MLCCs
+
+# value prefix -> output pins, output impedance, loop bandwidth
+REGULATORS = {"ADP7118": {"pins": ("1", "2"), "rout": 0.02, "bw": 50e3}}
+CABLE_R = 0.1                   # ohms, FFC / JST-PH conductor + contacts
+CABLE_L = 40e-9                 # H, ~100 mm of cable with a ground neighbour
+
+# Load current per IC and rail (A), for the target impedance
+I_LOAD = {"AK4619": {"V33_A": 0.025}, "OPA1678": {"5V_A": 0.005},
+          "ADP7118": {"5V_A": 0.05}}
+RIPPLE = 1.0                    # % of the rail voltage
+STEP = 0.5                      # fraction of the load current that switches
+RAIL_V = {"V33_A": 3.3, "5V_A": 5.0, "5V_DIG": 5.0}
+
+
+# ---------------------------------------------------------------------------
+# Rails
+# ---------------------------------------------------------------------------
+
+def _package(lib):
+    m = re.search(r"_(\d{4})_\d{4}Metric", lib)
+    return m.group(1) if m else "0805"
+
+
+def esr(c):
+    return next(r for limit, r in ESR if c <= limit)
+
+
+def plane_pairs(board, rail, grid=GRID):
+    """[(rail layer, GND layer, overlap mm^2, separation mm)] for every rail
+    zone layer against the GND zones on the copper layers next to it."""
+    depth = STACKUP.get(len(board["layers"]), {})
+    layers = board["layers"]
+    cv = raster.make_canvas(raster.board_bounds(board, margin=2 * grid), 25.4 / grid)
+    masks = {}
+    for zone in board["zones"]:
+        for layer in zone["layers"]:
+            if layer in layers:
+                m, _ = zonefill.zone_mask(board, zone, layer, cv, keep_islands=not zonefill.routed(board))
+                key = (zone["net_name"], layer)
+                masks[key] = masks[key] | m if key in masks else m
+    out = []
+    for (net, layer), m in masks.items():
+        if net != rail:
+            continue
+        i = layers.index(layer)
+        for j in (i - 1, i + 1):
+            g = masks.get(("GND", layers[j])) if 0 <= j < len(layers) else None
+            if g is None or layer not in depth or layers[j] not in depth:
+                continue
+            area = float((m & g).sum()) / cv["ppm"] ** 2
+            out.append((layer, layers[j], area, abs(depth[layer] - depth[layers[j]])))
+    return out
+
+
+def rails(gen, board, derate=DERATE, mount_l=MOUNT_L, add=()):
+    """{rail: {"caps": [(ref, C, ESR, ESL)], "planes": [...], "source": (kind,
+    ref), "loads": [ref], "i_load": A}} for every net with a cap to GND and
+    an IC pin on it, plus caps from `add` (rail, value, package)."""
+    nets, cn = gen.NETS, gen.COMP_NETS
+    values = {fp["ref"]: (fp["value"], fp["lib"]) for fp in board["footprints"]}
+    gnd = {code for code, name in nets.items() if name == "GND"}
+    out = {}
+    for ref, pads in sorted(cn.items()):
+        if ref[0] != "C" or len(pads) != 2:
+            continue
+        a, b = pads.get("1"), pads.get("2")
+        rail = nets.get(b) if a in gnd else nets.get(a) if b in gnd else None
+        value, lib = values.get(ref, ("", ""))
+        c = parse_value("C", value)
+        if rail and c:
+            out.setdefault(rail, {"caps": []})["caps"].append((ref, c, _package(lib)))
+    for rail, value, pkg in add:
+        out.setdefault(rail, {"caps": []})["caps"].append(("+" + value, parse_value("C", value), pkg))
+
+    for rail in list(out):
+        code = next(k for k, v in nets.items() if v == rail)
+        ics = [ref for ref, pads in cn.items() if ref[0] == "U" and code in pads.values()]
+        if not ics:
+            del out[rail]
+            continue
+        r = out[rail]
+        r["caps"] = [(ref, c * (1 - derate / 100 if c >= 1e-6 else 1), esr(c), ESL.get(pkg, ESL["0805"]) + mount_l)
+                     for ref, c, pkg in r["caps"]]
+        r["planes"] = plane_pairs(board, rail)
+        r["source"] = ("none", None)
+        for u in ics:
+            val = values.get(u, ("", ""))[0]
+            reg = next((k for k in REGULATORS if val.startswith(k)), None)
+            if reg and any(cn[u].get(p) == code for p in REGULATORS[reg]["pins"]):
+                r["source"] = ("ldo", u, reg)
+        if r["source"][0] == "none":
+            conn = [ref for ref, pads in cn.items() if ref[0] == "J" and code in pads.values()]
+            if conn:
+                r["source"] = ("cable", conn[0])
+        r["loads"] = [u for u in ics if r["source"][1] != u]
+        r["i_load"] = sum(i.get(rail, 0.0) for u in r["loads"]
+                          for k, i in I_LOAD.items() if values.get(u, ("",))[0].startswith(k))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Impedance
+# ---------------------------------------------------------------------------
+
+def impedance(rail, freqs):
+    """Complex Z(f) of a rail model at the load: caps, planes and source in
+    parallel."""
+    w = 2 * math.pi * np.asarray(freqs)
+    s = 1j * w
+    y = np.zeros(w.shape, dtype=complex)
+    if rail["caps"]:
+        c, r, l = (np.array(v)[:, None] for v in zip(*[cap[1:] for cap in rail["caps"]]))
+        y += (1 / (r + s * l + 1 / (s * c))).sum(axis=0)
+    for _, _, area, d in rail["planes"]:
+        cp = EPS0 * ER * area * 1e-6 / (d * 1e-3)
+        y += 1 / (s * MU0 * d * 1e-3 + 1 / (s * cp))
+    kind = rail["source"][0]
+    if kind == "ldo":
+        reg = REGULATORS[rail["source"][2]]
+        y += 1 / (reg["rout"] * (1 + s / (2 * math.pi * reg["bw"])))
+    elif kind == "cable":
+        y += 1 / (CABLE_R + s * CABLE_L)
+    return 1 / y
+
+
+def target(rail, name, ripple=RIPPLE, step=STEP):
+    """Target impedance (ohms), or None without a load current or voltage."""
+    v = RAIL_V.get(name)
+    if not v or not rail["i_load"]:
+        return None
+    return v * ripple / 100 / (step * rail["i_load"])
+
+
+def peaks(freqs, z):
+    """[(f, |Z|)] of the local maxima of |Z| (anti-resonances)."""
+    m = np.abs(z)
+    i = np.flatnonzero((m[1:-1] > m[:-2]) & (m[1:-1] >= m[2:])) + 1
+    return [(float(freqs[k]), float(m[k])) for k in i]
+
+
+def _si(v, unit=""):
+    for scale, p in ((1e9, "G"), (1e6, "M"), (1e3, "k"), (1, ""), (1e-3, "m"), (1e-6, "u"),
+                     (1e-9, "n"), (1e-12, "p")):
+        if abs(v) >= scale:
+            return f"{v / scale:.3g}{p}{unit}"
+    return f"{v:.2g}{unit}"
+
+
+def _added(spec):
+    rail, value, *pkg = spec.split(":")
+    if parse_value("C", value) is None:
+        raise argparse.ArgumentTypeError(f"cannot read {value!r} as a capacitance")
+    return rail, value, pkg[0] if pkg else "0603"
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", nargs="?", default="input-mother", help="board key or gen_pcb.py")
+    ap.add_argument("--rails", nargs="*", help="rail nets (default: all)")
+    ap.add_argument("--derate", type=float, default=DERATE, help="DC-bias loss of >= 1 uF MLCCs (%%)")
+    ap.add_argument("--mount-l", type=float, default=MOUNT_L * 1e9, help="mounting inductance per cap (nH)")
+    ap.add_argument("--ripple", type=float, default=RIPPLE, help="allowed ripple (%% of the rail)")
+    ap.add_argument("--step", type=float, default=STEP, help="switching fraction of the load current")
+    ap.add_argument("--band", type=float, nargs=2, default=list(BAND), help="check band (Hz)")
+    ap.add_argument("--add", nargs="*", type=_added, default=[], help="extra caps RAIL:VALUE[:PACKAGE]")
+    args = ap.parse_args()
+
+    gen = load_generator(GENERATORS.get(args.board, args.board))
+    board = load_board(gen.generate_pcb())
+    model = rails(gen, board, args.derate, args.mount_l * 1e-9, args.add)
+    freqs = np.geomspace(F_MIN, F_MAX, POINTS)
+    band = (freqs >= args.band[0]) & (freqs <= args.band[1])
+    decades = [f for f in (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9) if F_MIN <= f <= F_MAX]
+    over_any = False
+    for name in args.rails or sorted(model):
+        if name not in model:
+            print(f"{name}: no caps to GND with an IC on the net")
+            continue
+        rail = model[name]
+        z = impedance(rail, freqs)
+        zt = target(rail, name, args.ripple, args.step)
+        src = {"ldo": lambda s: f"{s[1]} {s[2]} output", "cable": lambda s: f"cable at {s[1]}",
+               "none": lambda s: "caps only"}[rail["source"][0]](rail["source"])
+        caps = ", ".join(f"{ref} {_si(c, 'F')}" for ref, c, _, _ in rail["caps"])
+        print(f"{name}: {src}; loads {', '.join(rail['loads']) or '-'}"
+              + (f" ({rail['i_load'] * 1e3:g} mA)" if rail["i_load"] else ""))
+        print(f"  caps: {caps or '-'}")
+        for layer, g_layer, area, d in rail["planes"]:
+            cp = EPS0 * ER * area * 1e-6 / (d * 1e-3)
+            print(f"  plane {layer} / GND {g_layer}: {area:.0f} mm^2 at {d:g} mm -> {_si(cp, 'F')}")
+        m = np.abs(z)
+        print("  |Z| " + "  ".join(f"{_si(f, 'Hz')} {_si(float(np.interp(np.log(f), np.log(freqs), m)), 'ohm')}"
+                                  for f in decades))
+        k = int(np.argmax(np.where(band, m, -1)))
+        line = f"  band {_si(args.band[0], 'Hz')}..{_si(args.band[1], 'Hz')}: max {_si(m[k], 'ohm')} at {_si(freqs[k], 'Hz')}"
+        if zt:
+            over = band & (m > zt)
+            line += f", target {_si(zt, 'ohm')} ({args.ripple:g} % of {RAIL_V[name]:g} V, {args.step:g} x load)"
+            if over.any():
+                lo, hi = freqs[over].min(), freqs[over].max()
+                line += f" - OVER from {_si(lo, 'Hz')} to {_si(hi, 'Hz')}"
+                over_any = True
+            else:
+                line += " - ok"
+        print(line)
+        res = [(f, v) for f, v in peaks(freqs, z) if args.band[0] <= f <= args.band[1]]
+        if res:
+            print("  anti-resonances: " + ", ".join(f"{_si(v, 'ohm')} at {_si(f, 'Hz')}" for f, v in res))
+    raise SystemExit(1 if over_any else 0)
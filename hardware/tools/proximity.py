@@ -0,0 +1,247 @@
+"""
+MIXTEE PCB tools - placement proximity rules
+
+Names the parts that must sit next to what they serve, measures how far
+apart they ended up and ranks the pairs that are over their limit:
+
+  decap     a capacitor from GND to a supply net, or to a net holding only
+            IC pins (U*, LED*) and caps (AVDRV, VCOM), -> an IC power pin
+            (POWER_PINS) on that net; DECAP_MM, or BULK_MM from BULK_F up
+  ESD       a diode from a supply or GND to a net that reaches a connector
+            (J*) -> the nearest connector pin on that net; ESD_MM
+
+Only the supply pins listed per part in POWER_PINS are targets: RESET,
+PDN, CAD and EN pins tied to a rail are pull-ups, not loads. Each supply
+pin gets its own decap - cap/pin pairs are assigned shortest gap first, one
+cap per pin, and a cap only falls back to a pin that already has one when
+its net has more decaps than pins. Bulk caps serve the whole rail and go
+to the nearest supply pin.
+
+Distances are copper gaps between the two pads (pad bounding boxes). Pads
+are looked up in a KD-tree over pad centres: nearest centre first, then
+every same-net pad within that gap plus the largest pad half-diagonal, so
+a big pad whose centre is further away is not missed.
+
+Standard library only: write_fab_outputs() runs it on every regeneration.
+
+Usage:
+  python proximity.py                            # all boards
+  python proximity.py input-mother --all         # every pair, not just violations
+  python proximity.py io --decap-mm 3 --esd-mm 4
+"""
+
+import argparse
+import math
+import re
+import sys
+
+from assembly import parse_value
+from kicad_pcb import GENERATORS, pad_bbox, resolve_board
+
+DECAP_MM = 5.0      # ak4619-wiring.md: decoupling < 5 mm from the pin
+BULK_MM = 10.0      # bulk caps only have to be on the same side of the rail
+BULK_F = 1e-6
+ESD_MM = 5.0        # clamp before the trace runs into the board
+IC_PREFIXES = ("U", "LED")
+# Supply pins per part value: the pins a decap has to sit next to.
+POWER_PINS = {
+    "AK4619VN": ("3", "5", "17", "18"),     # TVDD, AVDRV, VCOM, AVDD
+    "ADP7118": ("1", "8"),                  # OUT, IN (2 = SENSE, 7 = EN)
+    "OPA1678": ("8",),                      # V+
+    "FE1.1s": ("1", "4", "8", "28"),        # VDD5_2, VDD33, VDD33O, VDD5
+    "TPS2051": ("1", "5"),                  # IN, OUT (4 = EN)
+    "6N138": ("8",),                        # VCC (7 = VB)
+    "MCP23017": ("9",),                     # VDD (18 = ~RESET)
+    "WS2812B-2020": ("3",),                 # VDD
+}
+SUPPLY = re.compile(r"^(GND\w*|\+?\d+V\w*|V\d+\w*|VBUS\w*)$")
+
+
+# ---------------------------------------------------------------------------
+# KD-tree
+# ---------------------------------------------------------------------------
+
+class KDTree:
+    """2D KD-tree over (x, y, item) points, split on alternating axes at the
+    median. Queries take an optional predicate on the item."""
+
+    def __init__(self, points):
+        self.root = self._build(list(points), 0)
+
+    def _build(self, pts, depth):
+        if not pts:
+            return None
+        axis = depth % 2
+        pts.sort(key=lambda p: p[axis])
+        mid = len(pts) // 2
+        return (pts[mid], axis, self._build(pts[:mid], depth + 1), self._build(pts[mid + 1:], depth + 1))
+
+    def nearest(self, x, y, accept=None):
+        """(distance, point) of the nearest accepted point, or (inf, None)."""
+        best = [math.inf, None]
+
+        def visit(node):
+            if node is None:
+                return
+            p, axis, lo, hi = node
+            d = math.hypot(p[0] - x, p[1] - y)
+            if d < best[0] and (accept is None or accept(p[2])):
+                best[:] = [d, p]
+            delta = (x, y)[axis] - p[axis]
+            near, far = (lo, hi) if delta < 0 else (hi, lo)
+            visit(near)
+            if abs(delta) < best[0]:
+                visit(far)
+
+        visit(self.root)
+        return best[0], best[1]
+
+    def within(self, x, y, r, accept=None):
+        """All accepted points within distance r."""
+        out = []
+
+        def visit(node):
+            if node is None:
+                return
+            p, axis, lo, hi = node
+            if math.hypot(p[0] - x, p[1] - y) <= r and (accept is None or accept(p[2])):
+                out.append(p)
+            delta = (x, y)[axis] - p[axis]
+            if delta - r <= 0:
+                visit(lo)
+            if delta + r >= 0:
+                visit(hi)
+
+        visit(self.root)
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Rules
+# ---------------------------------------------------------------------------
+
+def pad_gap(a, b):
+    """Copper gap between two pads' bounding boxes (0 when they overlap)."""
+    ax0, ay0, ax1, ay1 = pad_bbox(a)
+    bx0, by0, bx1, by1 = pad_bbox(b)
+    return math.hypot(max(bx0 - ax1, ax0 - bx1, 0.0), max(by0 - ay1, ay0 - by1, 0.0))
+
+
+def rule_pairs(board, decap_mm=DECAP_MM, bulk_mm=BULK_MM, esd_mm=ESD_MM):
+    """[{"rule", "part", "pad", "target", "target_pad", "net", "gap", "limit"}]
+    for every decap and ESD diode with a target on the board."""
+    names = board["nets"]
+    pads = [(fp, p) for fp in board["footprints"] for p in fp["pads"] if p["net"]]
+    tree = KDTree((p["x"], p["y"], (fp, p)) for fp, p in pads)
+    reach = max((math.hypot(p["w"], p["h"]) / 2 for _, p in pads), default=0.0)
+
+    def closest(pad, accept):
+        d, hit = tree.nearest(pad["x"], pad["y"], accept)
+        if hit is None:
+            return None
+        best = (pad_gap(pad, hit[2][1]), hit[2])
+        for _, _, item in tree.within(pad["x"], pad["y"], best[0] + 2 * reach, accept):
+            g = pad_gap(pad, item[1])
+            if g < best[0]:
+                best = (g, item)
+        return best
+
+    def is_power(net):
+        return lambda item: (item[1]["net"] == net and item[0]["ref"].startswith(IC_PREFIXES)
+                             and item[1]["name"] in POWER_PINS.get(item[0]["value"], ()))
+
+    def is_conn(net):
+        return lambda item: item[1]["net"] == net and item[0]["ref"].startswith("J")
+
+    members = {}
+    for fp, p in pads:
+        members.setdefault(p["net"], set()).add(fp["ref"])
+
+    def decoupled(net):
+        return bool(SUPPLY.match(names.get(net, ""))) or all(
+            ref.startswith(IC_PREFIXES + ("C",)) for ref in members.get(net, ()))
+
+    hits, decaps = {}, []
+    for fp in board["footprints"]:
+        two = [p for p in fp["pads"] if p["net"]]
+        if len(two) != 2 or fp["ref"][0] not in "CD":
+            continue
+        nets = [names.get(p["net"], "") for p in two]
+        if fp["ref"][0] == "C" and "GND" in nets and nets.count("GND") == 1:
+            pad = two[1 - nets.index("GND")]
+            if not decoupled(pad["net"]):
+                continue
+            c = parse_value("C", fp["value"])
+            if c and c >= BULK_F:
+                hits[fp["ref"]] = ("decap", pad, bulk_mm, closest(pad, is_power(pad["net"])))
+            else:
+                hits[fp["ref"]] = ("decap", pad, decap_mm, None)
+                decaps.append((fp, pad))
+        elif fp["ref"][0] == "D" and sum(bool(SUPPLY.match(n)) for n in nets) == 1:
+            pad = two[0] if not SUPPLY.match(nets[0]) else two[1]
+            hits[fp["ref"]] = ("ESD", pad, esd_mm, closest(pad, is_conn(pad["net"])))
+
+    # One decap per supply pin: every cap/pin pair on a net, shortest first
+    by_net = {}
+    for fp, p in pads:
+        if is_power(p["net"])((fp, p)):
+            by_net.setdefault(p["net"], []).append((fp, p))
+    cand = sorted(((pad_gap(pad, t[1]), fp["ref"], t[0]["ref"], t[1]["name"]), t)
+                  for fp, pad in decaps for t in by_net.get(pad["net"], ()))
+    served = set()
+    for (gap, ref, *pin), t in cand:
+        if hits[ref][3] is None and tuple(pin) not in served:
+            hits[ref] = hits[ref][:3] + ((gap, t),)
+            served.add(tuple(pin))
+    for fp, pad in decaps:
+        if hits[fp["ref"]][3] is None:
+            hits[fp["ref"]] = hits[fp["ref"]][:3] + (closest(pad, is_power(pad["net"])),)
+
+    out = []
+    for ref, (rule, pad, limit, hit) in hits.items():
+        if hit:
+            gap, (t_fp, t_pad) = hit
+            out.append({"rule": rule, "part": ref, "pad": pad["name"], "target": t_fp["ref"],
+                        "target_pad": t_pad["name"], "net": names.get(pad["net"], ""),
+                        "gap": gap, "limit": limit})
+    return out
+
+
+def violations(pairs):
+    """Pairs over their limit, worst (largest excess) first."""
+    return sorted((p for p in pairs if p["gap"] > p["limit"]), key=lambda p: p["limit"] - p["gap"])
+
+
+def print_report(board, show_all=False, **limits):
+    """One summary line plus a ranked list; returns the violations."""
+    pairs = rule_pairs(board, **limits)
+    bad = violations(pairs)
+    counts = {r: sum(p["rule"] == r for p in pairs) for r in ("decap", "ESD")}
+    print(f"Proximity: {counts['decap']} decap and {counts['ESD']} ESD pairs, {len(bad)} over limit")
+    rows = sorted(pairs, key=lambda p: p["limit"] - p["gap"]) if show_all else bad
+    for p in rows:
+        over = p["gap"] - p["limit"]
+        print(f"  {'+' if over > 0 else ' '}{abs(over):5.2f} mm  {p['rule']:<5} {p['part']}.{p['pad']}"
+              f" -> {p['target']}.{p['target_pad']} ({p['net']}): {p['gap']:.2f} mm, limit {p['limit']:g}")
+    return bad
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("boards", nargs="*", default=list(GENERATORS), help="board keys, gen_pcb.py or .kicad_pcb")
+    ap.add_argument("--decap-mm", type=float, default=DECAP_MM)
+    ap.add_argument("--bulk-mm", type=float, default=BULK_MM)
+    ap.add_argument("--esd-mm", type=float, default=ESD_MM)
+    ap.add_argument("--all", action="store_true", help="list every pair, not only violations")
+    args = ap.parse_args()
+
+    found = 0
+    for spec in args.boards:
+        print(f"{spec}:")
+        found += len(print_report(resolve_board(spec), args.all, decap_mm=args.decap_mm,
+                                  bulk_mm=args.bulk_mm, esd_mm=args.esd_mm))
+    sys.exit(1 if found else 0)
@@ -0,0 +1,399 @@
+"""
+MIXTEE PCB tools - layer rasterizer
+
+Paints pads, tracks, vias, zones, silk and the board outline into one NumPy
+boolean array per layer, then writes a PNG per layer, a colour composite PNG
+and a layered SVG (one Inkscape layer per board layer). This replaces the
+`kicad-cli pcb export pdf` review step (Stage 8 of docs/pcbs-workflow.md)
+for quick looks, and the same arrays feed revision pixel diffs.
+
+Rasters share a canvas: the board frame in mm, a bounding box and a DPI.
+Pass the same bounds to two boards and their arrays line up pixel for
+pixel. Drill holes are punched out of the copper layers; text is not drawn.
+
+Needs numpy (the board generators themselves stay standard-library only).
+
+Usage:
+  python raster.py                           # all four boards, 300 DPI
+  python raster.py io keys4x4 --dpi 600 -o /tmp/review
+  python raster.py board.kicad_pcb --layers F.Cu B.Cu
+"""
+
+import argparse
+import base64
+import math
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from kicad_pcb import GENERATORS, outline_bbox, pad_bbox, resolve_board, via_copper_layers
+
+DPI = 300
+MARGIN = 1.0    # mm around the outline
+
+SILK_LAYERS = ["F.SilkS", "B.SilkS"]
+MASK_LAYERS = ["F.Mask", "B.Mask"]
+
+# KiCad-like colours for the composite and the SVG layers
+COLOURS = {
+    "F.Cu": (200, 52, 52),
+    "In1.Cu": (127, 200, 127),
+    "In2.Cu": (206, 125, 44),
+    "B.Cu": (77, 127, 196),
+    "F.SilkS": (242, 237, 161),
+    "B.SilkS": (232, 178, 167),
+    "F.Mask": (216, 100, 255),
+    "B.Mask": (2, 255, 238),
+    "Edge.Cuts": (208, 210, 205),
+}
+BACKGROUND = (0, 16, 35)
+COMPOSITE_ORDER = ["B.Cu", "In2.Cu", "In1.Cu", "F.Cu", "B.SilkS", "F.SilkS", "Edge.Cuts"]
+
+
+# ---------------------------------------------------------------------------
+# Canvas and primitives
+# ---------------------------------------------------------------------------
+
+def make_canvas(bounds, dpi=DPI):
+    """Pixel grid over `bounds` (x0, y0, x1, y1) in mm."""
+    x0, y0, x1, y1 = bounds
+    ppm = dpi / 25.4
+    return {
+        "x0": x0, "y0": y0, "ppm": ppm, "dpi": dpi, "bounds": bounds,
+        "shape": (max(1, math.ceil((y1 - y0) * ppm)), max(1, math.ceil((x1 - x0) * ppm))),
+    }
+
+
+def board_bounds(board, margin=MARGIN):
+    x0, y0, x1, y1 = outline_bbox(board)
+    return x0 - margin, y0 - margin, x1 + margin, y1 + margin
+
+
+def _window(cv, bx0, by0, bx1, by1):
+    """(row slice, col slice, X row vector, Y column vector) for a mm box, or None."""
+    ppm, (h, w) = cv["ppm"], cv["shape"]
+    j0 = max(0, int((bx0 - cv["x0"]) * ppm))
+    j1 = min(w, int((bx1 - cv["x0"]) * ppm) + 2)
+    i0 = max(0, int((by0 - cv["y0"]) * ppm))
+    i1 = min(h, int((by1 - cv["y0"]) * ppm) + 2)
+    if j0 >= j1 or i0 >= i1:
+        return None
+    xs = cv["x0"] + (np.arange(j0, j1) + 0.5) / ppm
+    ys = cv["y0"] + (np.arange(i0, i1) + 0.5) / ppm
+    return slice(i0, i1), slice(j0, j1), xs[None, :], ys[:, None]
+
+
+def paint_pad(arr, cv, pad, grow=0.0, value=True):
+    """Pad shape (circle, rect, roundrect, oval) grown by `grow` mm."""
+    win = _window(cv, *pad_bbox(pad, grow + 0.01))
+    if win is None:
+        return
+    rows, cols, X, Y = win
+    gx, gy = X - pad["x"], Y - pad["y"]
+    a = math.radians(pad["rot"])
+    c, s = math.cos(a), math.sin(a)
+    lx, ly = np.abs(c * gx - s * gy), np.abs(s * gx + c * gy)
+    hw, hh = pad["w"] / 2 + grow, pad["h"] / 2 + grow
+    if pad["shape"] == "circle":
+        r = pad["w"] / 2 + grow
+        mask = gx * gx + gy * gy <= r * r
+    else:
+        if pad["shape"] == "oval":
+            r = min(hw, hh)
+        elif pad["shape"] == "roundrect":
+            r = pad["rratio"] * min(pad["w"], pad["h"]) + grow
+        else:
+            r = 0.0
+        qx = np.maximum(lx - (hw - r), 0.0)
+        qy = np.maximum(ly - (hh - r), 0.0)
+        mask = (lx <= hw) & (ly <= hh) & (qx * qx + qy * qy <= r * r + 1e-12)
+    arr[rows, cols][mask] = value
+
+
+def paint_disc(arr, cv, x, y, r, value=True):
+    win = _window(cv, x - r, y - r, x + r, y + r)
+    if win is None:
+        return
+    rows, cols, X, Y = win
+    arr[rows, cols][(X - x) ** 2 + (Y - y) ** 2 <= r * r] = value
+
+
+def paint_segment(arr, cv, p, q, width, value=True):
+    """Track / line with round ends."""
+    r = width / 2
+    win = _window(cv, min(p[0], q[0]) - r, min(p[1], q[1]) - r,
+                  max(p[0], q[0]) + r, max(p[1], q[1]) + r)
+    if win is None:
+        return
+    rows, cols, X, Y = win
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    ll = dx * dx + dy * dy
+    if ll == 0:
+        t = 0.0
+    else:
+        t = np.clip(((X - p[0]) * dx + (Y - p[1]) * dy) / ll, 0.0, 1.0)
+    ex, ey = X - (p[0] + t * dx), Y - (p[1] + t * dy)
+    arr[rows, cols][ex * ex + ey * ey <= r * r] = value
+
+
+def paint_ring(arr, cv, x, y, radius, width, value=True):
+    ro, ri = radius + width / 2, max(radius - width / 2, 0.0)
+    win = _window(cv, x - ro, y - ro, x + ro, y + ro)
+    if win is None:
+        return
+    rows, cols, X, Y = win
+    d2 = (X - x) ** 2 + (Y - y) ** 2
+    arr[rows, cols][(d2 <= ro * ro) & (d2 >= ri * ri)] = value
+
+
+def arc_points(start, mid, end, step_deg=5.0):
+    """Polyline through a three-point arc."""
+    (ax, ay), (bx, by), (cx, cy) = start, mid, end
+    d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    if abs(d) < 1e-12:
+        return [start, end]
+    ux = ((ax * ax + ay * ay) * (by - cy) + (bx * bx + by * by) * (cy - ay)
+          + (cx * cx + cy * cy) * (ay - by)) / d
+    uy = ((ax * ax + ay * ay) * (cx - bx) + (bx * bx + by * by) * (ax - cx)
+          + (cx * cx + cy * cy) * (bx - ax)) / d
+    r = math.hypot(ax - ux, ay - uy)
+    a0 = math.atan2(ay - uy, ax - ux)
+    am = math.atan2(by - uy, bx - ux)
+    a1 = math.atan2(cy - uy, cx - ux)
+    sweep = (a1 - a0) % (2 * math.pi)
+    if (am - a0) % (2 * math.pi) > sweep:
+        sweep -= 2 * math.pi
+    n = max(2, int(abs(math.degrees(sweep)) / step_deg) + 1)
+    return [(ux + r * math.cos(a0 + sweep * k / (n - 1)),
+             uy + r * math.sin(a0 + sweep * k / (n - 1))) for k in range(n)]
+
+
+def paint_polygon(arr, cv, pts, value=True):
+    """Even-odd scanline fill of a closed polygon (KiCad filled_polygon)."""
+    if len(pts) < 3:
+        return
+    p = np.asarray(pts, dtype=float)
+    win = _window(cv, p[:, 0].min(), p[:, 1].min(), p[:, 0].max(), p[:, 1].max())
+    if win is None:
+        return
+    rows, cols, X, Y = win
+    x0, y0 = p[:, 0], p[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    xs = X[0]
+    sub = arr[rows, cols]
+    for k, y in enumerate(Y[:, 0]):
+        hit = (y0 <= y) != (y1 <= y)
+        if not hit.any():
+            continue
+        cross = np.sort(x0[hit] + (y - y0[hit]) * (x1[hit] - x0[hit]) / (y1[hit] - y0[hit]))
+        for a, b in zip(cross[0::2], cross[1::2]):
+            sub[k, (xs >= a) & (xs < b)] = value
+
+
+# ---------------------------------------------------------------------------
+# Board -> layer rasters
+# ---------------------------------------------------------------------------
+
+def _pad_layers(pad, copper):
+    out = set()
+    for layer in pad["layers"]:
+        if layer in ("*.Cu", "F&B.Cu"):
+            out.update(copper if layer == "*.Cu" else ("F.Cu", "B.Cu"))
+        elif layer == "*.Mask":
+            out.update(MASK_LAYERS)
+        else:
+            out.add(layer)
+    return out
+
+
+def rasterize(board, dpi=DPI, bounds=None, layers=None):
+    """{layer: bool array} plus the canvas.
+
+    `layers` defaults to every copper layer, silk, mask and Edge.Cuts. Lines
+    are painted at least one pixel wide, so thin outline and silk strokes
+    survive low DPI.
+    """
+    copper = board["layers"]
+    wanted = layers or copper + SILK_LAYERS + MASK_LAYERS + ["Edge.Cuts"]
+    cv = make_canvas(bounds or board_bounds(board), dpi)
+    pixel = 1 / cv["ppm"]
+    out = {layer: np.zeros(cv["shape"], dtype=bool) for layer in wanted}
+
+    # Zones: fills if present, otherwise just the outline
+    for zone in board["zones"]:
+        for layer in zone["layers"]:
+            if layer not in out:
+                continue
+            if zone["filled"].get(layer):
+                for poly in zone["filled"][layer]:
+                    paint_polygon(out[layer], cv, poly)
+            else:
+                pts = zone["polygon"]
+                for p, q in zip(pts, pts[1:] + pts[:1]):
+                    paint_segment(out[layer], cv, p, q, max(0.1, pixel))
+
+    for seg in board["segments"]:
+        if seg["layer"] in out:
+            paint_segment(out[seg["layer"]], cv, seg["start"], seg["end"], max(seg["width"], pixel))
+
+    for via in board["vias"]:
+        for layer in via_copper_layers(via, copper):
+            if layer in out:
+                paint_disc(out[layer], cv, via["at"][0], via["at"][1], via["size"] / 2)
+
+    holes = []
+    for fp in board["footprints"]:
+        for pad in fp["pads"]:
+            for layer in _pad_layers(pad, copper):
+                if layer in out:
+                    paint_pad(out[layer], cv, pad)
+            if pad["drill"] > 0:
+                holes.append((pad["x"], pad["y"], pad["drill"] / 2))
+        for ln in fp["lines"]:
+            if ln["layer"] in out:
+                paint_segment(out[ln["layer"]], cv, ln["start"], ln["end"], max(ln["width"], pixel))
+        for circ in fp["circles"]:
+            if circ["layer"] in out:
+                paint_ring(out[circ["layer"]], cv, *circ["center"], circ["radius"], max(circ["width"], pixel))
+
+    for g in board["graphics"] + board["edges"]:
+        arr = out.get(g["layer"] if "layer" in g else "Edge.Cuts")
+        if arr is None:
+            continue
+        width = max(g.get("width", 0.1), pixel)
+        if g["kind"] == "circle":
+            c = g["center"]
+            paint_ring(arr, cv, c[0], c[1], math.hypot(g["end"][0] - c[0], g["end"][1] - c[1]), width)
+        elif g["kind"] == "arc":
+            pts = arc_points(g["start"], g["mid"], g["end"])
+            for p, q in zip(pts, pts[1:]):
+                paint_segment(arr, cv, p, q, max(width, 0.1))
+        elif g["kind"] == "rect":
+            (x0, y0), (x1, y1) = g["start"], g["end"]
+            corners = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+            for p, q in zip(corners, corners[1:] + corners[:1]):
+                paint_segment(arr, cv, p, q, width)
+        else:
+            paint_segment(arr, cv, g["start"], g["end"], max(width, 0.1))
+
+    # Drill holes go through every copper layer
+    for x, y, r in holes + [(v["at"][0], v["at"][1], v["drill"] / 2) for v in board["vias"]]:
+        for layer in copper:
+            if layer in out:
+                paint_disc(out[layer], cv, x, y, r, value=False)
+    return out, cv
+
+
+# ---------------------------------------------------------------------------
+# PNG / SVG output
+# ---------------------------------------------------------------------------
+
+def png_bytes(img):
+    """PNG for a uint8 array: (h, w) grey, (h, w, 3) RGB or (h, w, 4) RGBA."""
+    img = np.ascontiguousarray(img, dtype=np.uint8)
+    h, w = img.shape[:2]
+    colour = {2: 0, 3: 2, 4: 6}[img.ndim if img.ndim == 2 else img.shape[2]]
+    raw = np.zeros((h, img[0].size + 1), dtype=np.uint8)
+    raw[:, 1:] = img.reshape(h, -1)
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, colour, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+            + chunk(b"IEND", b""))
+
+
+def write_png(path, img):
+    with open(path, "wb") as f:
+        f.write(png_bytes(img))
+
+
+def composite(rasters):
+    """Colour image of the copper, silk and outline layers, KiCad style."""
+    shape = next(iter(rasters.values())).shape
+    img = np.empty(shape + (3,), dtype=np.uint8)
+    img[:] = BACKGROUND
+    for layer in COMPOSITE_ORDER:
+        if layer in rasters:
+            img[rasters[layer]] = COLOURS[layer]
+    return img
+
+
+def layer_rgba(mask, colour):
+    img = np.zeros(mask.shape + (4,), dtype=np.uint8)
+    img[mask] = colour + (255,)
+    return img
+
+
+def svg_text(rasters, cv):
+    """Layered SVG: one Inkscape layer (embedded PNG) per board layer."""
+    x0, y0, x1, y1 = cv["bounds"]
+    w, h = x1 - x0, y1 - y0
+    out = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" '
+        f'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" '
+        f'width="{w:.3f}mm" height="{h:.3f}mm" viewBox="{x0:.3f} {y0:.3f} {w:.3f} {h:.3f}">',
+        f'  <rect x="{x0:.3f}" y="{y0:.3f}" width="{w:.3f}" height="{h:.3f}" '
+        f'fill="rgb{BACKGROUND}"/>',
+    ]
+    order = [l for l in COMPOSITE_ORDER if l in rasters] + \
+            [l for l in rasters if l not in COMPOSITE_ORDER]
+    for layer in order:
+        data = base64.b64encode(png_bytes(layer_rgba(rasters[layer], COLOURS.get(layer, (255, 255, 255)))))
+        hidden = ' style="display:none"' if layer in MASK_LAYERS else ""
+        out.append(f'  <g inkscape:groupmode="layer" inkscape:label="{layer}" id="{layer}"{hidden}>')
+        out.append(f'    <image x="{x0:.3f}" y="{y0:.3f}" width="{w:.3f}" height="{h:.3f}" '
+                   f'style="image-rendering:pixelated" href="data:image/png;base64,{data.decode()}"/>')
+        out.append("  </g>")
+    out.append("</svg>")
+    return "\n".join(out) + "\n"
+
+
+def write_review_images(rasters, cv, out_dir, basename):
+    """Per-layer PNGs, composite PNG and layered SVG. Returns paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for layer, mask in rasters.items():
+        path = os.path.join(out_dir, f"{basename}-{layer.replace('.', '_')}.png")
+        write_png(path, mask.astype(np.uint8) * 255)
+        paths.append(path)
+    path = os.path.join(out_dir, f"{basename}.png")
+    write_png(path, composite(rasters))
+    paths.append(path)
+    path = os.path.join(out_dir, f"{basename}.svg")
+    with open(path, "w") as f:
+        f.write(svg_text(rasters, cv))
+    paths.append(path)
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("boards", nargs="*", help="board keys, gen_pcb.py or .kicad_pcb (default: all)")
+    ap.add_argument("--dpi", type=int, default=DPI)
+    ap.add_argument("--layers", nargs="*", help="default: copper, silk, mask, Edge.Cuts")
+    ap.add_argument("-o", "--out-dir", default="review")
+    args = ap.parse_args()
+
+    total = 0.0
+    for spec in args.boards or list(GENERATORS):
+        board = resolve_board(spec)
+        t0 = time.perf_counter()
+        rasters, cv = rasterize(board, args.dpi, layers=args.layers)
+        total += time.perf_counter() - t0
+        name = os.path.splitext(os.path.basename(spec))[0]
+        paths = write_review_images(rasters, cv, args.out_dir, name)
+        h, w = cv["shape"]
+        print(f"{name}: {len(rasters)} layers, {w} x {h} px -> {len(paths)} files in {args.out_dir}")
+    print(f"Rasterized in {total:.2f} s")
@@ -0,0 +1,368 @@
+"""
+MIXTEE PCB tools - return-path and plane-split crossings
+
+Every signal track is checked against its reference plane: the nearest
+other copper layer in the stack that carries a zone (F.Cu -> In1.Cu GND,
+B.Cu -> In2.Cu V33_A on input-mother; layers without a STACKUP entry are
+spread evenly over the board thickness). Plane copper is the zone fill from
+zonefill.zone_mask(), so anti-pads of through-hole pins and vias, outline
+clearance and gaps between zones of different nets are all voids.
+
+  void      the track runs over a hole in its plane: return current detours
+            around the nearer end of the hole. Excess loop area is the
+            length over the void times that detour, measured across the
+            track from the middle of the crossing
+  split     the plane on either side of the void belongs to different nets,
+            or there is no way around it inside the board
+  via       the net changes layer and the two reference planes differ: the
+            return current needs a path between them within STITCH_MM of the
+            via, i.e. a via or through-hole pin of the plane net (same net)
+            or a capacitor between the two plane nets (different nets)
+  plane     the reference plane is missing, or fills to no copper at all
+            (e.g. an inner plane left as islands): the whole track has no
+            return path
+
+Each net's tracks are chained into polylines per layer and walked as a
+whole, so a void under a bend is one crossing. A void that holds one of the
+net's own vias or through-hole pins is that hole's anti-pad and is left to
+the via check; every other void is reported, including one under a whole
+segment. Supply nets (proximity.SUPPLY) are not signals.
+
+Per net, the report gives crossings, unstitched layer changes and the loop
+area estimate: track length times height over the reference, plus the
+detours. Generated boards are unrouted: nets without tracks get spanning-
+tree airwires between their pads (layer changes where two pads share no
+copper layer, stitching checked at both pads). Those are reported as
+estimates and only tracks fail the run (exit 1).
+
+Usage:
+  python returnpath.py                            # every board
+  python returnpath.py routed.kicad_pcb --stitch-mm 1.5
+  python returnpath.py input-mother --all         # every net, not just those with findings
+"""
+
+import argparse
+import math
+import sys
+
+import numpy as np
+
+import raster
+import zonefill
+from kicad_pcb import GENERATORS, load_board, pad_copper_layers, resolve_board_text, via_copper_layers
+from proximity import SUPPLY
+from thermal_vias import STACKUP
+from tour import spanning_tree
+
+GRID = 0.05         # mm per plane cell, as zonefill
+STITCH_MM = 2.0     # return via / stitching cap within this of a layer change
+
+
+# ---------------------------------------------------------------------------
+# Planes
+# ---------------------------------------------------------------------------
+
+def plane_maps(board, grid=GRID):
+    """(canvas, {layer: int16 map}) with each cell holding the net code of
+    the zone copper there, or 0 for no copper."""
+    cv = raster.make_canvas(raster.board_bounds(board, margin=2 * grid), 25.4 / grid)
+    maps = {}
+    for zone in board["zones"]:
+        for layer in zone["layers"]:
+            if layer not in board["layers"]:
+                continue
+            mask, _ = zonefill.zone_mask(board, zone, layer, cv, keep_islands=not zonefill.routed(board))
+            m = maps.setdefault(layer, np.zeros(cv["shape"], dtype=np.int16))
+            m[mask] = zone["net"]
+    return cv, maps
+
+
+def reference(board, layer, maps):
+    """(plane layer, height above it in mm) for tracks on `layer`, or None."""
+    layers = board["layers"]
+    depth = STACKUP.get(len(layers)) or {
+        l: board["thickness"] * i / max(len(layers) - 1, 1) for i, l in enumerate(layers)}
+    if layer not in depth:
+        return None
+    near = [(abs(depth[p] - depth[layer]), p) for p in maps if p != layer and p in depth]
+    if not near:
+        return None
+    h, plane = min(near)
+    return plane, h
+
+
+def _cell(cv, x, y):
+    return int((y - cv["y0"]) * cv["ppm"]), int((x - cv["x0"]) * cv["ppm"])
+
+
+def _lookup(m, cv, x, y):
+    i, j = _cell(cv, x, y)
+    h, w = m.shape
+    return int(m[i, j]) if 0 <= i < h and 0 <= j < w else None
+
+
+def crossings(m, cv, path, h=0.0, own=()):
+    """[{"kind", "at", "length", "detour", "area"}] for the voids under the
+    polyline `path` [(x, y), ...]. Notches the return current gets round
+    within `h` (it spreads about one height either side) are skipped, and so
+    are voids holding one of the `own` holes [(x, y, radius)]."""
+    step = 1 / cv["ppm"]
+    xs, ys, us = [], [], []
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        length = math.hypot(x1 - x0, y1 - y0)
+        if not length:
+            continue
+        n = max(2, int(length / step) + 1)
+        t = np.linspace(0.0, 1.0, n)[1 if xs else 0:]
+        xs.append(x0 + t * (x1 - x0))
+        ys.append(y0 + t * (y1 - y0))
+        us.append(np.repeat([[(x1 - x0) / length, (y1 - y0) / length]], len(t), axis=0))
+    if not xs:
+        return []
+    xs, ys, us = np.concatenate(xs), np.concatenate(ys), np.concatenate(us)
+    n = len(xs)
+    weight = np.gradient(np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(xs), np.diff(ys)))))) \
+        if n > 1 else np.zeros(1)
+    ii = ((ys - cv["y0"]) * cv["ppm"]).astype(int).clip(0, m.shape[0] - 1)
+    jj = ((xs - cv["x0"]) * cv["ppm"]).astype(int).clip(0, m.shape[1] - 1)
+    nets = m[ii, jj]
+    void = np.concatenate(([False], nets == 0, [False]))
+    starts = np.flatnonzero(~void[:-1] & void[1:])
+    ends = np.flatnonzero(void[:-1] & ~void[1:])
+    out = []
+    for a, b in zip(starts, ends):
+        if any(np.hypot(xs[a:b] - x, ys[a:b] - y).min() <= r for x, y, r in own):
+            continue
+        mid = (a + b - 1) // 2
+        ux, uy = us[mid]
+        detour = min(_edge(m, cv, xs[mid], ys[mid], -uy, ux), _edge(m, cv, xs[mid], ys[mid], uy, -ux))
+        if detour <= h:
+            continue
+        run = float(weight[a:b].sum())
+        sides = {int(nets[a - 1])} if a else set()
+        sides |= {int(nets[b])} if b < n else set()
+        split = len(sides) > 1 or math.isinf(detour)
+        out.append({"kind": "split" if split else "void", "at": (float(xs[mid]), float(ys[mid])),
+                    "length": run, "detour": detour, "area": run * detour})
+    return out
+
+
+def _edge(m, cv, x, y, dx, dy):
+    """Distance from (x, y) along (dx, dy) to the first plane copper cell,
+    inf when the walk leaves the canvas first."""
+    step = 1 / cv["ppm"]
+    h, w = m.shape
+    d = 0.0
+    while True:
+        d += step
+        i, j = _cell(cv, x + dx * d, y + dy * d)
+        if not (0 <= i < h and 0 <= j < w):
+            return math.inf
+        if m[i, j]:
+            return d
+
+
+# ---------------------------------------------------------------------------
+# Signals
+# ---------------------------------------------------------------------------
+
+def signal_nets(board):
+    plane_nets = {z["net"] for z in board["zones"]}
+    return {code for code, name in board["nets"].items()
+            if code and code not in plane_nets and not SUPPLY.match(name)}
+
+
+def tracks(board, nets):
+    """({net: [(x0, y0, x1, y1, layer)]}, {net: [(x, y, layers)]} layer
+    changes, set of nets estimated from airwires)."""
+    copper = board["layers"]
+    segs, changes, airwire = {}, {}, set()
+    for s in board["segments"]:
+        if s["net"] in nets:
+            segs.setdefault(s["net"], []).append((*s["start"], *s["end"], s["layer"]))
+    for v in board["vias"]:
+        if v["net"] in segs:
+            x, y = v["at"]
+            r = v["size"] / 2 + 1e-3
+            used = {l for *p, l in segs[v["net"]]
+                    if math.hypot(p[0] - x, p[1] - y) <= r or math.hypot(p[2] - x, p[3] - y) <= r}
+            changes.setdefault(v["net"], []).append((x, y, used & set(via_copper_layers(v, copper))))
+    pads = {}
+    for fp in board["footprints"]:
+        for p in fp["pads"]:
+            if p["net"] not in nets:
+                continue
+            pads.setdefault(p["net"], []).append(p)
+            if p["net"] in segs and p["type"] == "thru_hole":
+                used = {l for *q, l in segs[p["net"]]
+                        if math.hypot(q[0] - p["x"], q[1] - p["y"]) <= max(p["w"], p["h"]) / 2
+                        or math.hypot(q[2] - p["x"], q[3] - p["y"]) <= max(p["w"], p["h"]) / 2}
+                changes.setdefault(p["net"], []).append((p["x"], p["y"], used))
+    for net, ps in pads.items():
+        if net in segs or len(ps) < 2:
+            continue
+        airwire.add(net)
+        for i, j in spanning_tree([(p["x"], p["y"]) for p in ps]):
+            la = pad_copper_layers(ps[i], copper)
+            lb = pad_copper_layers(ps[j], copper)
+            common = [l for l in copper if l in la and l in lb]
+            if common:
+                segs.setdefault(net, []).append((ps[i]["x"], ps[i]["y"], ps[j]["x"], ps[j]["y"], common[0]))
+            else:
+                for p in (ps[i], ps[j]):
+                    changes.setdefault(net, []).append((p["x"], p["y"], set(la) | set(lb)))
+    return segs, changes, airwire
+
+
+def polylines(segs):
+    """[(layer, [(x, y), ...])] chaining one net's (x0, y0, x1, y1, layer)
+    segments at shared end points; chains break at branches."""
+    key = lambda x, y, l: (round(x, 3), round(y, 3), l)
+    adj = {}
+    for i, (x0, y0, x1, y1, layer) in enumerate(segs):
+        adj.setdefault(key(x0, y0, layer), []).append(i)
+        adj.setdefault(key(x1, y1, layer), []).append(i)
+    used = [False] * len(segs)
+    out = []
+
+    def walk(node, i):
+        layer = node[2]
+        pts = [node[:2]]
+        while True:
+            used[i] = True
+            x0, y0, x1, y1, _ = segs[i]
+            nxt = key(x1, y1, layer) if key(x0, y0, layer) == node else key(x0, y0, layer)
+            pts.append(nxt[:2])
+            node = nxt
+            more = [j for j in adj[node] if not used[j]]
+            if len(adj[node]) != 2 or not more:
+                return layer, pts
+            i = more[0]
+
+    for node in [n for n, e in adj.items() if len(e) != 2] + list(adj):
+        for i in adj[node]:
+            if not used[i]:
+                out.append(walk(node, i))
+    return out
+
+
+def own_holes(board, net):
+    """[(x, y, radius)] of the net's vias and through-hole pads."""
+    out = [(*v["at"], v["size"] / 2) for v in board["vias"] if v["net"] == net]
+    out += [(p["x"], p["y"], max(p["w"], p["h"]) / 2) for fp in board["footprints"] for p in fp["pads"]
+            if p["net"] == net and p["type"] in ("thru_hole", "np_thru_hole")]
+    return out
+
+
+def stitched(board, x, y, nets, radius):
+    """True if the return current can move between plane nets `nets` within
+    `radius` of (x, y)."""
+    if len(nets) == 1:
+        net = next(iter(nets))
+        near = [(*v["at"],) for v in board["vias"] if v["net"] == net]
+        near += [(p["x"], p["y"]) for fp in board["footprints"] for p in fp["pads"]
+                 if p["net"] == net and p["type"] == "thru_hole"]
+        return any(math.hypot(px - x, py - y) <= radius for px, py in near)
+    for fp in board["footprints"]:
+        if fp["ref"].startswith("C") and {p["net"] for p in fp["pads"]} >= nets:
+            if any(math.hypot(p["x"] - x, p["y"] - y) <= radius for p in fp["pads"]):
+                return True
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Check
+# ---------------------------------------------------------------------------
+
+def check_board(board, stitch_mm=STITCH_MM, grid=GRID):
+    """{net name: {"length", "loop", "excess", "crossings": [...],
+    "unstitched": [...], "noplane": [...], "estimate"}}."""
+    cv, maps = plane_maps(board, grid)
+    nets = signal_nets(board)
+    segs, changes, airwire = tracks(board, nets)
+    refs = {l: reference(board, l, maps) for l in board["layers"]}
+    out = {}
+    for net in sorted(set(segs) | set(changes)):
+        row = {"length": 0.0, "loop": 0.0, "excess": 0.0, "crossings": [], "unstitched": [],
+               "noplane": [], "estimate": net in airwire}
+        own = own_holes(board, net)
+        for layer, pts in polylines(segs.get(net, [])):
+            length = sum(math.hypot(q[0] - p[0], q[1] - p[1]) for p, q in zip(pts, pts[1:]))
+            row["length"] += length
+            ref = refs.get(layer)
+            if ref is None or not maps[ref[0]].any():
+                row["noplane"].append({"layer": layer, "plane": ref[0] if ref else None,
+                                       "at": pts[0], "length": length})
+                row["excess"] = math.inf
+                continue
+            plane, h = ref
+            row["loop"] += length * h
+            for c in crossings(maps[plane], cv, pts, h, own):
+                c["layer"] = layer
+                row["crossings"].append(c)
+                row["excess"] += c["area"]
+        for x, y, layers in changes.get(net, ()):
+            planes = {refs[l][0] for l in layers if refs.get(l)}
+            plane_nets = {_lookup(maps[p], cv, x, y) or _zone_net(board, p) for p in planes}
+            if len(planes) > 1 and not stitched(board, x, y, plane_nets, stitch_mm):
+                row["unstitched"].append({"at": (x, y), "planes": sorted(planes),
+                                          "nets": sorted(board["nets"][n] for n in plane_nets)})
+        out[board["nets"][net]] = row
+    return out
+
+
+def _zone_net(board, layer):
+    return next(z["net"] for z in board["zones"] if layer in z["layers"])
+
+
+def print_report(results, show_all=False, limit=5):
+    """Per-net table; returns the number of findings on routed nets."""
+    bad = {n: r for n, r in results.items() if r["crossings"] or r["unstitched"] or r["noplane"]}
+    est = sum(r["estimate"] for r in bad.values())
+    print(f"  {len(results)} signal nets, {len(bad)} with crossings, unstitched layer changes"
+          " or no reference plane"
+          + (f" ({est} from airwire estimates)" if est else ""))
+    rows = results if show_all else bad
+    if rows:
+        print(f"    {'net':<14} {'len mm':>7} {'void':>4} {'split':>5} {'via':>3} {'plane':>5}"
+              f" {'loop mm2':>8} {'excess':>8}")
+    for name, r in sorted(rows.items(), key=lambda kv: (-kv[1]["excess"], kv[0])):
+        kinds = [c["kind"] for c in r["crossings"]]
+        excess = f"{r['excess']:8.1f}" if math.isfinite(r["excess"]) else f"{'no path':>8}"
+        print(f"  {'~' if r['estimate'] else ' '} {name:<14} {r['length']:7.1f} {kinds.count('void'):4d}"
+              f" {kinds.count('split'):5d} {len(r['unstitched']):3d} {len(r['noplane']):5d} {r['loop']:8.1f} {excess}")
+        for c in sorted(r["crossings"], key=lambda c: -c["area"])[:limit]:
+            print(f"        {c['kind']:<5} {c['layer']} at ({c['at'][0]:.1f}, {c['at'][1]:.1f}):"
+                  f" {c['length']:.2f} mm over the void, detour {c['detour']:.2f} mm")
+        for p in r["noplane"][:limit]:
+            what = f"{p['plane']} has no copper" if p["plane"] else "no reference plane"
+            print(f"        plane {p['layer']} at ({p['at'][0]:.1f}, {p['at'][1]:.1f}):"
+                  f" {p['length']:.2f} mm of track, {what}")
+        for u in r["unstitched"][:limit]:
+            print(f"        via   at ({u['at'][0]:.1f}, {u['at'][1]:.1f}): {' -> '.join(u['planes'])}"
+                  f" ({'/'.join(u['nets'])}), no stitch")
+    return sum(not r["estimate"] for r in bad.values())
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("boards", nargs="*", default=list(GENERATORS), help="board keys, gen_pcb.py or .kicad_pcb")
+    ap.add_argument("--stitch-mm", type=float, default=STITCH_MM, help="max distance to a stitching via/cap")
+    ap.add_argument("--grid", type=float, default=GRID, help="plane raster cell (mm)")
+    ap.add_argument("--all", action="store_true", help="list every signal net")
+    args = ap.parse_args()
+
+    found = 0
+    for spec in args.boards:
+        text, _ = resolve_board_text(spec)
+        board = load_board(text)
+        print(f"{spec}:")
+        if not board["zones"]:
+            print("  no planes")
+            continue
+        found += print_report(check_board(board, args.stitch_mm, args.grid), args.all)
+    sys.exit(1 if found else 0)
@@ -0,0 +1,301 @@
+"""
+MIXTEE PCB tools - analog/digital spacing and coupling
+
+Sorts nets into analog (the Audio_Analog class: ANALOG name patterns) and
+digital clocks/data (DIGITAL). Every analog segment is then checked against
+the digital segments on the same copper layer and on the layers next to it:
+
+  gap       edge-to-edge distance between the two tracks (lateral distance
+            for tracks on adjacent layers; 0 when one runs over the other)
+  run       length over which the two tracks run parallel (within ANGLE_DEG)
+            and within COUPLE_MM of each other; coupling grows with it
+
+Each net pair is reported once per layer pair, with its smallest gap and
+total parallel run. Pairs closer than --spacing (pcb-design-rules.md:
+>= 0.5 mm analog to digital) are violations. Two tracks that cross without
+running parallel touch over zero length: they are counted as crossings
+instead of a 0 mm gap, and fail only on the same layer, where they short.
+
+Digital segments go into an R-tree (STR bulk-loaded, bounding boxes grown by
+COUPLE_MM); each analog segment only meets the handful it overlaps. Layer
+pairs are independent, so they run in parallel worker processes (--jobs).
+
+Generated boards are not routed yet (Stage 6 is FreeRouting). For a net
+with no tracks, a spanning tree of straight netclass-width airwires between
+its pads stands in, labelled as an estimate. Airwires converge on the
+codec pins and cross each other there; those crossings say nothing about
+the routed board and are dropped. Estimates are reported but only tracks
+fail the run (exit 1). Run it on the routed .kicad_pcb for the real
+answer.
+
+Usage:
+  python spacing.py                                # every board
+  python spacing.py routed.kicad_pcb --spacing 0.5 --jobs 4
+  python spacing.py input-mother --all             # every pair in range, not just violations
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from kicad_pcb import GENERATORS, load_board, pad_copper_layers, resolve_board_text
+from tour import spanning_tree
+
+ANALOG = r"^(AIN\w*|FN1_\w+|FOUT_\w+|DAIN_\w+|FILT_IN_\w+|JACK_\w+|HP_\w+)$"
+DIGITAL = r"^(MCLK|BCLK|LRCLK|SDA|SCL|SDIN\d*|SDOUT\d*)(_\d+)?$"
+SPACING_MM = 0.5        # pcb-design-rules.md, analog-to-digital signal spacing
+COUPLE_MM = 2.0         # parallel runs further apart than this are not counted
+ANGLE_DEG = 15.0
+LEAF = 16               # R-tree entries per node
+WIDTHS = {"analog": 0.3, "digital": 0.25}   # airwire estimate without a project
+
+
+# ---------------------------------------------------------------------------
+# R-tree
+# ---------------------------------------------------------------------------
+
+class RTree:
+    """Static R-tree over (box, item) entries, Sort-Tile-Recursive packed.
+    Boxes are (x0, y0, x1, y1)."""
+
+    def __init__(self, entries, leaf=LEAF):
+        level = [(box, item, None) for box, item in entries]
+        while len(level) > leaf:
+            level = self._pack(level, leaf)
+        self.root = (_union([e[0] for e in level]), None, level) if level else None
+
+    @staticmethod
+    def _pack(entries, leaf):
+        """One level up: tile by x centre, then y centre, `leaf` per node."""
+        nodes = math.ceil(len(entries) / leaf)
+        per_slice = leaf * math.ceil(math.sqrt(nodes))
+        entries = sorted(entries, key=lambda e: e[0][0] + e[0][2])
+        out = []
+        for s in range(0, len(entries), per_slice):
+            tile = sorted(entries[s:s + per_slice], key=lambda e: e[0][1] + e[0][3])
+            for k in range(0, len(tile), leaf):
+                kids = tile[k:k + leaf]
+                out.append((_union([e[0] for e in kids]), None, kids))
+        return out
+
+    def query(self, box):
+        """Items whose boxes intersect `box`."""
+        out = []
+        stack = [self.root] if self.root else []
+        while stack:
+            b, item, kids = stack.pop()
+            if b[0] > box[2] or b[2] < box[0] or b[1] > box[3] or b[3] < box[1]:
+                continue
+            if kids is None:
+                out.append(item)
+            else:
+                stack.extend(kids)
+        return out
+
+
+def _union(boxes):
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+# ---------------------------------------------------------------------------
+# Geometry
+# ---------------------------------------------------------------------------
+
+def _point_segment(px, py, x0, y0, x1, y1):
+    dx, dy = x1 - x0, y1 - y0
+    ll = dx * dx + dy * dy
+    t = 0.0 if ll == 0 else max(0.0, min(1.0, ((px - x0) * dx + (py - y0) * dy) / ll))
+    return math.hypot(px - x0 - t * dx, py - y0 - t * dy)
+
+
+def _cross(ax, ay, bx, by):
+    return ax * by - ay * bx
+
+
+def centre_distance(a, b):
+    """Distance between two centre-line segments (x0, y0, x1, y1, ...)."""
+    ax0, ay0, ax1, ay1 = a[:4]
+    bx0, by0, bx1, by1 = b[:4]
+    d1 = _cross(ax1 - ax0, ay1 - ay0, bx0 - ax0, by0 - ay0)
+    d2 = _cross(ax1 - ax0, ay1 - ay0, bx1 - ax0, by1 - ay0)
+    d3 = _cross(bx1 - bx0, by1 - by0, ax0 - bx0, ay0 - by0)
+    d4 = _cross(bx1 - bx0, by1 - by0, ax1 - bx0, ay1 - by0)
+    if d1 * d2 < 0 and d3 * d4 < 0:
+        return 0.0
+    return min(_point_segment(ax0, ay0, *b[:4]), _point_segment(ax1, ay1, *b[:4]),
+               _point_segment(bx0, by0, *a[:4]), _point_segment(bx1, by1, *a[:4]))
+
+
+def parallel_run(a, b, reach=COUPLE_MM, angle=ANGLE_DEG):
+    """Length of `a` alongside `b` when they are near-parallel and their
+    edges are within `reach`."""
+    ax, ay = a[2] - a[0], a[3] - a[1]
+    bx, by = b[2] - b[0], b[3] - b[1]
+    la, lb = math.hypot(ax, ay), math.hypot(bx, by)
+    if la == 0 or lb == 0:
+        return 0.0
+    sin = abs(_cross(ax, ay, bx, by)) / (la * lb)
+    if sin > math.sin(math.radians(angle)):
+        return 0.0
+    ux, uy = ax / la, ay / la
+    t0 = (b[0] - a[0]) * ux + (b[1] - a[1]) * uy
+    t1 = (b[2] - a[0]) * ux + (b[3] - a[1]) * uy
+    overlap = min(la, max(t0, t1)) - max(0.0, min(t0, t1))
+    if overlap <= 0:
+        return 0.0
+    side = abs(_cross(ux, uy, (b[0] + b[2]) / 2 - a[0], (b[1] + b[3]) / 2 - a[1]))
+    return overlap if side - (a[4] + b[4]) / 2 <= reach else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Check
+# ---------------------------------------------------------------------------
+
+def check_layers(task):
+    """Compare analog segments on one layer with digital ones on another.
+
+    `task` is (analog layer, digital layer, analog, digital, reach); segments are
+    (x0, y0, x1, y1, width, net, airwire). Returns {(analog net, digital
+    net): [min gap, parallel run, (x, y) of the min gap, crossings]}; a
+    pair that only crosses keeps an infinite gap.
+    """
+    la, lb, analog, digital, reach = task
+    grow = lambda s, r: (min(s[0], s[2]) - r, min(s[1], s[3]) - r, max(s[0], s[2]) + r, max(s[1], s[3]) + r)
+    tree = RTree((grow(d, d[4] / 2 + reach), d) for d in digital)
+    out = {}
+    for a in analog:
+        for d in tree.query(grow(a, a[4] / 2)):
+            gap = max(centre_distance(a, d) - (a[4] + d[4]) / 2, 0.0)
+            if gap > reach:
+                continue
+            run = parallel_run(a, d, reach)
+            crossing = run == 0 and gap == 0
+            if crossing and (a[6] or d[6]):
+                continue
+            hit = out.setdefault((a[5], d[5]), [math.inf, 0.0, None, 0])
+            if crossing:
+                hit[3] += 1
+                hit[2] = hit[2] or ((a[0] + a[2]) / 2, (a[1] + a[3]) / 2)
+                continue
+            if gap < hit[0]:
+                hit[0], hit[2] = gap, ((a[0] + a[2]) / 2, (a[1] + a[3]) / 2)
+            hit[1] += run
+    return out
+
+
+def classify(names, analog=ANALOG, digital=DIGITAL):
+    """{net code: "analog" | "digital"} for the nets that match."""
+    ra, rd = re.compile(analog), re.compile(digital)
+    return {code: "analog" if ra.match(n) else "digital" for code, n in names.items()
+            if n and (ra.match(n) or rd.match(n))}
+
+
+def _class_widths(gen):
+    if gen is None or not hasattr(gen, "generate_project"):
+        return dict(WIDTHS)
+    classes = {c["name"]: c["track_width"] for c in json.loads(gen.generate_project())["net_settings"]["classes"]}
+    return {"analog": classes.get("Audio_Analog", classes.get("Default", WIDTHS["analog"])),
+            "digital": classes.get("Default", WIDTHS["digital"])}
+
+
+def board_segments(board, kinds, widths):
+    """({layer: {"analog": [...], "digital": [...]}}, airwire count). Nets with
+    no tracks get spanning-tree airwires between their pads."""
+    names = board["nets"]
+    out = {layer: {"analog": [], "digital": []} for layer in board["layers"]}
+    routed = set()
+    for s in board["segments"]:
+        kind = kinds.get(s["net"])
+        if kind and s["layer"] in out:
+            out[s["layer"]][kind].append((*s["start"], *s["end"], s["width"], names[s["net"]], False))
+            routed.add(s["net"])
+    airwires = 0
+    pads = {}
+    for fp in board["footprints"]:
+        for p in fp["pads"]:
+            if p["net"] in kinds and p["net"] not in routed:
+                pads.setdefault(p["net"], []).append(p)
+    for net, ps in pads.items():
+        for i, j in spanning_tree([(p["x"], p["y"]) for p in ps]):
+            la = pad_copper_layers(ps[i], board["layers"])
+            lb = pad_copper_layers(ps[j], board["layers"])
+            layer = next((l for l in board["layers"] if l in la and l in lb), board["layers"][0])
+            out[layer][kinds[net]].append((ps[i]["x"], ps[i]["y"], ps[j]["x"], ps[j]["y"],
+                                           widths[kinds[net]], names[net], True))
+            airwires += 1
+    return out, airwires
+
+
+def check_board(board, gen=None, analog=ANALOG, digital=DIGITAL, reach=COUPLE_MM, jobs=None):
+    """[(gap, run, analog layer, digital layer, analog net, digital net, (x, y),
+    crossings)] sorted by gap, plus (segment count, airwires). The layers
+    keep that order: on adjacent layers, analog over digital and digital
+    over analog are separate rows."""
+    kinds = classify(board["nets"], analog, digital)
+    segs, airwires = board_segments(board, kinds, _class_widths(gen))
+    layers = board["layers"]
+    tasks = []
+    for i, la in enumerate(layers):
+        for lb in layers[i:i + 2]:
+            for x, y in ((la, lb), (lb, la)) if la != lb else ((la, la),):
+                if segs[x]["analog"] and segs[y]["digital"]:
+                    tasks.append((x, y, segs[x]["analog"], segs[y]["digital"], reach))
+    if jobs == 1 or len(tasks) < 2:
+        results = list(map(check_layers, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(check_layers, tasks))
+    merged = {}
+    for (la, lb, *_), res in zip(tasks, results):
+        for (an, dn), (gap, run, at, crossings) in res.items():
+            hit = merged.setdefault(((la, lb), an, dn), [math.inf, 0.0, None, 0])
+            if gap < hit[0] or hit[2] is None:
+                hit[0], hit[2] = min(gap, hit[0]), at
+            hit[1] += run
+            hit[3] += crossings
+    rows = sorted((g, r, ls[0], ls[1], an, dn, at, n) for (ls, an, dn), (g, r, at, n) in merged.items())
+    count = sum(len(v["analog"]) + len(v["digital"]) for v in segs.values())
+    return rows, count, airwires, len(tasks)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("boards", nargs="*", default=list(GENERATORS), help="board keys, gen_pcb.py or .kicad_pcb")
+    ap.add_argument("--spacing", type=float, default=SPACING_MM, help="minimum analog-digital gap (mm)")
+    ap.add_argument("--reach", type=float, default=COUPLE_MM, help="report pairs within this gap (mm)")
+    ap.add_argument("--analog", default=ANALOG, help="analog net regex")
+    ap.add_argument("--digital", default=DIGITAL, help="digital net regex")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    ap.add_argument("--all", action="store_true", help="list every pair within --reach")
+    args = ap.parse_args()
+
+    found = 0
+    for spec in args.boards:
+        t0 = time.perf_counter()
+        text, gen = resolve_board_text(spec)
+        board = load_board(text)
+        rows, count, airwires, tasks = check_board(board, gen, args.analog, args.digital, args.reach, args.jobs)
+        bad = [r for r in rows if r[0] < args.spacing or (r[7] and r[2] == r[3])]
+        dt = time.perf_counter() - t0
+        print(f"{spec}: {count} analog/digital segments"
+              + (f" ({airwires} airwire estimates, unrouted)" if airwires else "")
+              + f", {tasks} layer pairs in {dt:.2f} s - {len(bad)} pairs under {args.spacing:g} mm or crossing")
+        for row in rows if args.all else bad:
+            gap, run, la, lb, an, dn, at, crossings = row
+            layers = la if la == lb else f"{la}/{lb}"
+            span = f"gap {gap:5.2f} mm  run {run:6.2f} mm" if run or gap < math.inf else "crosses".ljust(26)
+            print(f"  {'!' if row in bad else ' '} {span}  {layers:<14} {an:<12} {dn:<8} at ({at[0]:.1f}, {at[1]:.1f})"
+                  + (f"  {crossings} crossing{'s' if crossings > 1 else ''}" if crossings else ""))
+        if count > airwires:
+            found += len(bad)
+    sys.exit(1 if found else 0)
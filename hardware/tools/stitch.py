@@ -0,0 +1,284 @@
+"""
+MIXTEE PCB tools - ground via stitching
+
+Places through vias on the GND pour: a row along the board outline (inset
+EDGE_INSET, every EDGE_PITCH mm) and a grid over the rest of the board
+(every PITCH mm). A candidate that lands in a keep-out is nudged a quarter
+pitch each way before it is dropped.
+
+Keep-outs live in a uniform-grid spatial index (bucket size ~ PITCH), so
+each candidate is only checked against nearby obstacles:
+
+  pads (any net)            via edge >= clearance from the pad edge
+  tracks of other nets      via edge >= clearance from the track edge
+  vias and placed vias      via edge >= clearance from the via edge
+  non-plated holes          via edge >= clearance from the hole
+  footprint courtyards      via outside the body bbox (kicad_pcb.footprint_bbox)
+  board outline             via edge >= EDGE_CLEARANCE from Edge.Cuts
+
+Via size and drill come from the net class in generate_project() (Default,
+as the generators assign no net classes); the clearance is the largest
+class clearance. Vias are inserted ahead of the zones; refill afterwards
+(--fill runs zonefill.py).
+
+Usage:
+  python stitch.py keys4x4 -o /tmp/keys4x4.kicad_pcb
+  python stitch.py input-mother --pitch 4 --netclass Power --fill -o /tmp/im.kicad_pcb
+  python stitch.py board.kicad_pcb            # in place
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+import uuid
+
+import zonefill
+from kicad_pcb import footprint_bbox, load_board, net_code, outline_bbox, resolve_board_text, rotate
+
+PITCH = 5.0         # mm, interior grid
+EDGE_PITCH = 3.0    # mm, along the outline
+EDGE_INSET = 1.2    # mm, via centre to board edge
+EDGE_CLEARANCE = 0.3
+VIA = {"via_diameter": 0.6, "via_drill": 0.3, "clearance": 0.2}
+
+_UUID_NS = uuid.UUID("6d1f0c3e-2b8e-4f57-9a3c-5e7f0b1d2a44")
+
+
+# ---------------------------------------------------------------------------
+# Geometry
+# ---------------------------------------------------------------------------
+
+def pad_distance(pad, x, y):
+    """Signed distance from (x, y) to a pad's copper (negative inside)."""
+    lx, ly = rotate(x - pad["x"], y - pad["y"], -pad["rot"])
+    hw, hh = pad["w"] / 2, pad["h"] / 2
+    if pad["shape"] in ("circle", "oval"):
+        r = min(hw, hh)
+    elif pad["shape"] == "roundrect":
+        r = pad["rratio"] * min(pad["w"], pad["h"])
+    else:
+        r = 0.0
+    qx, qy = abs(lx) - (hw - r), abs(ly) - (hh - r)
+    return math.hypot(max(qx, 0.0), max(qy, 0.0)) + min(max(qx, qy), 0.0) - r
+
+
+def segment_distance(p, q, x, y):
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    ll = dx * dx + dy * dy
+    t = 0.0 if ll == 0 else max(0.0, min(1.0, ((x - p[0]) * dx + (y - p[1]) * dy) / ll))
+    return math.hypot(x - p[0] - t * dx, y - p[1] - t * dy)
+
+
+def point_in_polygon(pts, x, y):
+    inside = False
+    for (x0, y0), (x1, y1) in zip(pts, pts[1:] + pts[:1]):
+        if (y0 <= y) != (y1 <= y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+            inside = not inside
+    return inside
+
+
+# ---------------------------------------------------------------------------
+# Spatial index
+# ---------------------------------------------------------------------------
+#
+# An obstacle is (bbox, kind, shape, keep): the via centre must stay at least
+# `keep` mm from `shape` (the via radius is already folded into `keep`).
+
+def make_index(cell):
+    return {"cell": cell, "buckets": {}}
+
+
+def index_insert(index, ob):
+    c = index["cell"]
+    x0, y0, x1, y1 = ob[0]
+    for i in range(math.floor(x0 / c), math.floor(x1 / c) + 1):
+        for j in range(math.floor(y0 / c), math.floor(y1 / c) + 1):
+            index["buckets"].setdefault((i, j), []).append(ob)
+
+
+def _obstacle(kind, shape, keep, box):
+    return ((box[0] - keep, box[1] - keep, box[2] + keep, box[3] + keep), kind, shape, keep)
+
+
+def blocked(index, x, y):
+    """First obstacle whose keep-out contains (x, y), or None."""
+    c = index["cell"]
+    for ob in index["buckets"].get((math.floor(x / c), math.floor(y / c)), ()):
+        (bx0, by0, bx1, by1), kind, shape, keep = ob
+        if not (bx0 <= x <= bx1 and by0 <= y <= by1):
+            continue
+        if kind == "pad":
+            d = pad_distance(shape, x, y)
+        elif kind == "disc":
+            d = math.hypot(x - shape[0], y - shape[1]) - shape[2]
+        elif kind == "seg":
+            d = segment_distance(shape[0], shape[1], x, y) - shape[2]
+        else:   # "box": the bbox itself is the keep-out
+            d = -1.0
+        if d < keep:
+            return ob
+    return None
+
+
+def keepout_index(board, net, via, cell=PITCH):
+    """Spatial index of everything a new via of `net` must stay clear of."""
+    index = make_index(cell)
+    rv, clr = via["via_diameter"] / 2, via["clearance"]
+    keep = rv + clr
+    for fp in board["footprints"]:
+        index_insert(index, _obstacle("box", None, rv, footprint_bbox(fp)))
+        for pad in fp["pads"]:
+            x0, y0 = pad["x"] - max(pad["w"], pad["h"]), pad["y"] - max(pad["w"], pad["h"])
+            box = (x0, y0, 2 * pad["x"] - x0, 2 * pad["y"] - y0)
+            if pad["type"] == "np_thru_hole":
+                index_insert(index, _obstacle("disc", (pad["x"], pad["y"], pad["drill"] / 2), keep, box))
+            else:
+                index_insert(index, _obstacle("pad", pad, keep, box))
+    for seg in board["segments"]:
+        if seg["net"] != net:
+            (ax, ay), (bx, by) = seg["start"], seg["end"]
+            hw = seg["width"] / 2
+            index_insert(index, _obstacle("seg", (seg["start"], seg["end"], hw), keep,
+                                          (min(ax, bx) - hw, min(ay, by) - hw, max(ax, bx) + hw, max(ay, by) + hw)))
+    for v in board["vias"]:
+        add_via(index, v["at"], v["size"] / 2, keep)
+    return index
+
+
+def add_via(index, at, radius, keep):
+    x, y = at
+    index_insert(index, _obstacle("disc", (x, y, radius), keep, (x - radius, y - radius, x + radius, y + radius)))
+
+
+# ---------------------------------------------------------------------------
+# Candidates and placement
+# ---------------------------------------------------------------------------
+
+def project_via(gen, netclass="Default"):
+    """Via size, drill and clearance from a generator's generate_project()."""
+    if gen is None or not hasattr(gen, "generate_project"):
+        return dict(VIA)
+    classes = json.loads(gen.generate_project())["net_settings"]["classes"]
+    chosen = next((c for c in classes if c["name"] == netclass), classes[0])
+    return {"via_diameter": chosen["via_diameter"], "via_drill": chosen["via_drill"],
+            "clearance": max(c["clearance"] for c in classes)}
+
+
+def edge_candidates(outline, pitch=EDGE_PITCH, inset=EDGE_INSET):
+    """Points every `pitch` mm along the outline, moved `inset` mm inwards."""
+    area = sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(outline, outline[1:] + outline[:1]))
+    sign = 1.0 if area > 0 else -1.0     # y down: positive area runs clockwise on screen
+    out, carry = [], 0.0
+    for (x0, y0), (x1, y1) in zip(outline, outline[1:] + outline[:1]):
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length == 0:
+            continue
+        ux, uy = (x1 - x0) / length, (y1 - y0) / length
+        nx, ny = -uy * sign, ux * sign    # inward normal
+        t = carry
+        while t < length:
+            out.append((x0 + ux * t + nx * inset, y0 + uy * t + ny * inset))
+            t += pitch
+        carry = t - length
+    return out
+
+
+def grid_candidates(bounds, pitch=PITCH, margin=EDGE_INSET + EDGE_PITCH / 2):
+    x0, y0, x1, y1 = bounds
+    nx = max(1, int((x1 - x0 - 2 * margin) / pitch) + 1)
+    ny = max(1, int((y1 - y0 - 2 * margin) / pitch) + 1)
+    ox = (x1 + x0 - (nx - 1) * pitch) / 2
+    oy = (y1 + y0 - (ny - 1) * pitch) / 2
+    return [(ox + i * pitch, oy + j * pitch) for j in range(ny) for i in range(nx)]
+
+
+def place_stitching(board, net_name="GND", via=None, pitch=PITCH, edge_pitch=EDGE_PITCH):
+    """[(x, y)] of new vias on `net_name`, and the number of candidates dropped."""
+    via = via or dict(VIA)
+    net = net_code(board, net_name)
+    rv, clr = via["via_diameter"] / 2, via["clearance"]
+    outline = zonefill.outline_polygon(board)
+    if outline is None:
+        x0, y0, x1, y1 = outline_bbox(board)
+        outline = [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+    zones = [z["polygon"] for z in board["zones"] if z["net"] == net]
+    index = keepout_index(board, net, via, cell=max(pitch, edge_pitch))
+
+    xs = [p[0] for p in outline]
+    ys = [p[1] for p in outline]
+    edge_keep = rv + EDGE_CLEARANCE
+    placed, dropped = [], 0
+    edge = edge_candidates(outline, edge_pitch)
+    candidates = edge + grid_candidates((min(xs), min(ys), max(xs), max(ys)), pitch)
+    for k, (cx, cy) in enumerate(candidates):
+        step = (edge_pitch if k < len(edge) else pitch) / 4
+        for dx, dy in ((0, 0), (step, 0), (-step, 0), (0, step), (0, -step)):
+            x, y = cx + dx, cy + dy
+            if not point_in_polygon(outline, x, y):
+                continue
+            if any(segment_distance(p, q, x, y) < edge_keep
+                   for p, q in zip(outline, outline[1:] + outline[:1])):
+                continue
+            if not any(point_in_polygon(z, x, y) for z in zones):
+                continue
+            if blocked(index, x, y) is None:
+                placed.append((round(x, 3), round(y, 3)))
+                add_via(index, (x, y), rv, rv + clr)
+                break
+        else:
+            dropped += 1
+    return placed, dropped
+
+
+def via_text(x, y, via, net, layers=("F.Cu", "B.Cu")):
+    uid = uuid.uuid5(_UUID_NS, f"stitch {x:.3f} {y:.3f}")
+    quoted = " ".join(f'"{layer}"' for layer in layers)
+    return (f"  (via (at {x:g} {y:g}) (size {via['via_diameter']:g}) (drill {via['via_drill']:g}) "
+            f'(layers {quoted}) (net {net}) (uuid "{uid}"))')
+
+
+def add_vias_to_text(text, board, vias, via, net):
+    """Insert via s-expressions before the first zone (or the closing paren)."""
+    copper = board["layers"]
+    block = "\n".join(via_text(x, y, via, net, (copper[0], copper[-1])) for x, y in vias) + "\n"
+    if board["zones"]:
+        at = min(z["span"][0] for z in board["zones"])
+        at = text.rfind("\n", 0, at) + 1
+    else:
+        at = text.rstrip().rfind(")")
+    return text[:at] + block + ("\n" if board["zones"] else "") + text[at:]
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", help="board key, gen_pcb.py or .kicad_pcb")
+    ap.add_argument("--net", default="GND")
+    ap.add_argument("--pitch", type=float, default=PITCH, help="interior grid pitch (mm)")
+    ap.add_argument("--edge-pitch", type=float, default=EDGE_PITCH, help="outline pitch (mm)")
+    ap.add_argument("--netclass", default="Default", help="net class for via size/drill")
+    ap.add_argument("--fill", action="store_true", help="refill zones afterwards (zonefill.py)")
+    ap.add_argument("-o", "--output", help="default: the .kicad_pcb itself, or <board>.kicad_pcb")
+    args = ap.parse_args()
+
+    text, gen = resolve_board_text(args.board)
+    board = load_board(text)
+    via = project_via(gen, args.netclass)
+    t0 = time.perf_counter()
+    vias, dropped = place_stitching(board, args.net, via, args.pitch, args.edge_pitch)
+    elapsed = time.perf_counter() - t0
+    text = add_vias_to_text(text, board, vias, via, net_code(board, args.net))
+    print(f"{len(vias)} {args.net} vias ({via['via_diameter']:g}/{via['via_drill']:g} mm) placed, "
+          f"{dropped} candidates in keep-outs, {elapsed * 1000:.1f} ms")
+    if args.fill:
+        text = zonefill.fill_board_text(text)[0]
+    out = args.output or (args.board if gen is None else
+                          os.path.splitext(os.path.basename(args.board))[0] + ".kicad_pcb")
+    with open(out, "w") as f:
+        f.write(text)
+    print(f"Board written to: {out}")
@@ -0,0 +1,173 @@
+"""
+MIXTEE PCB tools - exposed-pad thermal via sizing
+
+Quick 1D estimate of the thermal resistance from a QFN's exposed pad down to
+each ground plane, for every via array that fits the pad and every drill
+size, so the array in gen_pcb.py (EP_VIA_* in input-mother) can be sized
+rather than guessed.
+
+  R(EP -> plane) = R_solder + (R_vias || R_fr4)
+
+  R_solder   solder joint over the pasted part of the pad (PASTE_COVERAGE)
+  R_vias     n plated barrels in parallel, each L / (k_cu * ring area);
+             the hole itself is air, epoxy or copper (--fill)
+  R_fr4      FR4 under the rest of the pad
+  L          depth of the plane below F.Cu (STACKUP, or the board thickness)
+
+Lateral spreading in the planes is ignored, so absolute numbers are
+optimistic; use them to compare arrays. Add the package's junction-to-pad
+resistance (--rjc, from the datasheet) for a junction figure, and a
+dissipation (--power) for the temperature rise.
+
+Usage:
+  python thermal_vias.py                         # input-mother (AK4619 x 2)
+  python thermal_vias.py --drills 0.25 0.3 0.4 --fill epoxy
+  python thermal_vias.py --rjc 10 --power 0.1
+"""
+
+import argparse
+import math
+
+from kicad_pcb import resolve_board
+
+K_CU = 385.0        # W/(m K)
+K_FR4 = 0.3         # through-plane
+K_SOLDER = 58.0     # SAC305
+K_FILL = {"none": 0.0, "epoxy": 3.5, "copper": K_CU}
+PLATING = 0.020     # mm, IPC-6012 class 2 average barrel
+SOLDER = 0.05       # mm joint thickness under the pad
+PASTE_COVERAGE = 0.65   # pcb-design-rules.md: 60-70 % windowed stencil
+ANNULAR = 0.15      # mm
+SPACING = 0.2       # mm copper gap between via pads
+DRILLS = (0.2, 0.25, 0.3, 0.35, 0.4)
+
+# Depth of each copper layer below F.Cu, mm (JLCPCB 1.6 mm 4-layer, 7628 prepreg)
+STACKUP = {4: {"F.Cu": 0.0, "In1.Cu": 0.21, "In2.Cu": 1.39, "B.Cu": 1.6}}
+
+
+# ---------------------------------------------------------------------------
+# Model
+# ---------------------------------------------------------------------------
+
+def via_resistance(drill, length, plating=PLATING, fill="none"):
+    """K/W of one via barrel (plus its fill) over `length` mm."""
+    r_out = drill / 2
+    r_in = max(r_out - plating, 0.0)
+    g = K_CU * math.pi * (r_out ** 2 - r_in ** 2) + K_FILL[fill] * math.pi * r_in ** 2
+    return (length * 1e-3) / (g * 1e-6)
+
+
+def array_resistance(n, drill, pad_area, length, plating=PLATING, fill="none"):
+    """K/W from the exposed pad to a plane `length` mm down through n vias."""
+    r_solder = (SOLDER * 1e-3) / (K_SOLDER * pad_area * PASTE_COVERAGE * 1e-6)
+    fr4_area = max(pad_area - n * math.pi * (drill / 2) ** 2, 1e-9)
+    g = K_FR4 * fr4_area * 1e-6 / (length * 1e-3)
+    if n:
+        g += n / via_resistance(drill, length, plating, fill)
+    return r_solder + 1 / g
+
+
+def arrays(ep_w, ep_h, drill, annular=ANNULAR, spacing=SPACING):
+    """[(rows, cols, widest pitch)] of via grids that fit a pad, smallest first.
+    The generator may place the same grid tighter (EP_VIA_PITCH)."""
+    size = drill + 2 * annular
+    out = []
+    for rows in range(1, 8):
+        for cols in range(rows, rows + 2):
+            span = max(rows, cols) - 1
+            pitch = min(ep_w - size, ep_h - size) / span if span else 0.0
+            if span and pitch < size + spacing:
+                continue
+            if size > min(ep_w, ep_h):
+                continue
+            out.append((rows, cols, round(pitch, 3)))
+    return sorted(out, key=lambda a: a[0] * a[1])
+
+
+# ---------------------------------------------------------------------------
+# Board
+# ---------------------------------------------------------------------------
+
+def exposed_pads(board):
+    """[(ref, value, ep pad, [via pads])]: SMD pads holding same-named THT pads."""
+    out = []
+    for fp in board["footprints"]:
+        for ep in fp["pads"]:
+            if ep["type"] != "smd":
+                continue
+            vias = [p for p in fp["pads"] if p["type"] == "thru_hole" and p["name"] == ep["name"]]
+            if vias:
+                out.append((fp["ref"], fp["value"], ep, vias))
+    return out
+
+
+def via_grid(vias):
+    """(rows, cols, pitch) of a placed via array; pitch is the smallest
+    centre step along either axis, 0 for a single via."""
+    xs = sorted({round(v["x"], 3) for v in vias})
+    ys = sorted({round(v["y"], 3) for v in vias})
+    steps = [b - a for axis in (xs, ys) for a, b in zip(axis, axis[1:])]
+    return len(ys), len(xs), round(min(steps), 3) if steps else 0.0
+
+
+def plane_depths(board, net):
+    """{layer: depth mm} of the copper layers carrying a zone on `net`."""
+    depth = STACKUP.get(len(board["layers"]), {})
+    layers = {layer for z in board["zones"] if z["net"] == net for layer in z["layers"]}
+    return {layer: depth.get(layer, board["thickness"] if layer == "B.Cu" else 0.0)
+            for layer in board["layers"] if layer in layers and layer != "F.Cu"}
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", nargs="?", default="input-mother")
+    ap.add_argument("--drills", type=float, nargs="*", default=list(DRILLS))
+    ap.add_argument("--plating", type=float, default=PLATING, help="barrel plating (mm)")
+    ap.add_argument("--fill", choices=sorted(K_FILL), default="none")
+    ap.add_argument("--rjc", type=float, default=0.0, help="junction-to-pad K/W (datasheet)")
+    ap.add_argument("--power", type=float, help="dissipation per package (W)")
+    args = ap.parse_args()
+
+    board = resolve_board(args.board)
+    groups = {}     # identical pads + arrays are reported once
+    for ref, value, ep, vias in exposed_pads(board):
+        key = (value, ep["w"], ep["h"], len(vias), vias[0]["drill"])
+        groups.setdefault(key, [[], ep, vias])[0].append(ref)
+    for (value, *_), (refs, ep, vias) in groups.items():
+        planes = plane_depths(board, ep["net"])
+        if not planes:
+            continue
+        area = ep["w"] * ep["h"]
+        print(f"{value} ({', '.join(refs)}): {ep['w']:g} x {ep['h']:g} mm pad, "
+              f"{len(vias)} vias of {vias[0]['drill']:g} mm now; planes "
+              + ", ".join(f"{l} at {d:g} mm" for l, d in planes.items())
+              + f"; plating {args.plating * 1000:g} um, fill {args.fill}")
+        nearest = min(planes.values())
+        header = f"  {'array':>7} {'drill':>6} {'pitch':>6}" + "".join(f" {l + ' K/W':>12}" for l in planes)
+        if args.power:
+            header += f" {'dT ' + min(planes, key=planes.get):>12}"
+        print(header)
+        r0 = args.rjc + array_resistance(0, 0.3, area, nearest, args.plating, args.fill)
+        print(f"  {'none':>7} {'':>6} {'':>6}" + "".join(
+            f" {args.rjc + array_resistance(0, 0.3, area, d, args.plating, args.fill):12.1f}"
+            for d in planes.values()) + (f" {r0 * args.power:11.1f}C" if args.power else ""))
+
+        def row(rows, cols, drill, pitch, mark=""):
+            rs = [args.rjc + array_resistance(rows * cols, drill, area, d, args.plating, args.fill)
+                  for d in planes.values()]
+            line = f"  {f'{rows}x{cols}':>7} {drill:6.2f} {pitch:6.2f}" + "".join(f" {r:12.1f}" for r in rs)
+            if args.power:
+                line += f" {min(rs) * args.power:11.1f}C"
+            print(line + mark)
+
+        # The placed array at its real pitch; the sweep lists the widest pitch that fits
+        current = (*via_grid(vias), vias[0]["drill"])
+        row(current[0], current[1], current[3], current[2], " <- current (placed)")
+        for drill in args.drills:
+            for rows, cols, pitch in arrays(ep["w"], ep["h"], drill):
+                same = (rows, cols, drill) in ((current[0], current[1], current[3]), (current[1], current[0], current[3]))
+                row(rows, cols, drill, pitch, " <- current" if same and abs(pitch - current[2]) < 1e-3 else "")
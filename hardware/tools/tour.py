@@ -0,0 +1,311 @@
+"""
+MIXTEE PCB tools - open-path tour ordering
+
+Nearest-neighbour construction followed by 2-opt and Or-opt improvement for
+an open path over 2D points (drill hits, LED chains, ...). Pure Python so the board
+generators can use it without extra dependencies.
+
+The path may be anchored at a start point (the drill's home position, a
+connector pin) which is not itself part of the returned order.
+
+spanning_tree() joins points by a minimum spanning tree instead, the
+ratsnest the analysis tools use for boards that are not routed yet.
+"""
+
+import math
+
+
+def path_length(points, order, start=None):
+    """Total length of visiting `points` in `order`, optionally from `start`."""
+    if not order:
+        return 0.0
+    total = 0.0
+    prev = start if start is not None else points[order[0]]
+    for i in order:
+        p = points[i]
+        total += math.hypot(p[0] - prev[0], p[1] - prev[1])
+        prev = p
+    return total
+
+
+def nearest_neighbour(points, start=None):
+    """Greedy order: repeatedly hop to the closest unvisited point.
+
+    Uses a uniform grid so each hop only scans nearby cells; degrades to
+    a full scan only when the neighbourhood is exhausted.
+    """
+    n = len(points)
+    if n == 0:
+        return []
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    span = max(max(xs) - min(xs), max(ys) - min(ys), 1e-9)
+    cell = span / max(1, int(math.sqrt(n)))
+    x0, y0 = min(xs), min(ys)
+    grid = {}
+    for i, (x, y) in enumerate(points):
+        grid.setdefault((int((x - x0) / cell), int((y - y0) / cell)), set()).add(i)
+
+    if start is None:
+        cur = min(range(n), key=lambda i: (xs[i], ys[i]))
+    else:
+        cur = min(range(n), key=lambda i: math.hypot(xs[i] - start[0], ys[i] - start[1]))
+    order = [cur]
+    grid[(int((xs[cur] - x0) / cell), int((ys[cur] - y0) / cell))].discard(cur)
+    remaining = n - 1
+    max_ring = int(span / cell) + 2
+    while remaining:
+        cx = int((xs[cur] - x0) / cell)
+        cy = int((ys[cur] - y0) / cell)
+        best, best_d = None, float("inf")
+        ring = 0
+        while ring <= max_ring:
+            for gx in range(cx - ring, cx + ring + 1):
+                for gy in range(cy - ring, cy + ring + 1):
+                    if max(abs(gx - cx), abs(gy - cy)) != ring:
+                        continue
+                    for j in grid.get((gx, gy), ()):
+                        d = math.hypot(xs[j] - xs[cur], ys[j] - ys[cur])
+                        if d < best_d:
+                            best, best_d = j, d
+            # Anything in ring r+1 is at least r*cell away
+            if best is not None and best_d <= ring * cell:
+                break
+            ring += 1
+        grid[(int((xs[best] - x0) / cell), int((ys[best] - y0) / cell))].discard(best)
+        order.append(best)
+        cur = best
+        remaining -= 1
+    return order
+
+
+def _neighbour_lists(points, k):
+    """k nearest neighbours of every point (grid bucketed), closest first."""
+    n = len(points)
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    span = max(max(xs) - min(xs), max(ys) - min(ys), 1e-9)
+    cell = span / max(1, int(math.sqrt(n / 2)))
+    x0, y0 = min(xs), min(ys)
+    grid = {}
+    for i in range(n):
+        grid.setdefault((int((xs[i] - x0) / cell), int((ys[i] - y0) / cell)), []).append(i)
+    out = []
+    for i in range(n):
+        cx, cy = int((xs[i] - x0) / cell), int((ys[i] - y0) / cell)
+        ring = 1
+        while True:
+            cand = [j for gx in range(cx - ring, cx + ring + 1)
+                    for gy in range(cy - ring, cy + ring + 1)
+                    for j in grid.get((gx, gy), ()) if j != i]
+            if len(cand) >= k or len(cand) >= n - 1:
+                break
+            ring += 1
+        cand.sort(key=lambda j: math.hypot(xs[j] - xs[i], ys[j] - ys[i]))
+        out.append(cand[:k])
+    return out
+
+
+def two_opt(points, order, start=None, max_passes=50, neighbours=10):
+    """Improve an open path by reversing segments while it gets shorter.
+
+    With `start` given, the path is anchored there (the first edge runs
+    from `start` to order[0]); the far end is always free. Candidate moves
+    are limited to each point's `neighbours` nearest points, which keeps a
+    pass close to linear for panel-sized hole counts.
+    """
+    n = len(order)
+    if n < 3:
+        return list(order)
+
+    def dist(a, b):
+        return math.hypot(a[0] - b[0], a[1] - b[1])
+
+    # Work on [anchor] + order so the anchor is just a point that never moves
+    anchored = start is not None
+    pts = list(points) + ([start] if anchored else [])
+    tour = ([len(points)] if anchored else []) + list(order)
+    lo = 1 if anchored else 0          # first movable position
+    m = len(tour)
+    neigh = _neighbour_lists(pts, min(neighbours, len(pts) - 1))
+    pos = [0] * len(pts)
+    for k, city in enumerate(tour):
+        pos[city] = k
+
+    def reverse(i, j):
+        tour[i:j + 1] = reversed(tour[i:j + 1])
+        for k in range(i, j + 1):
+            pos[tour[k]] = k
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(m - 1):
+            # Edge (tour[i], tour[i+1]) seen from both ends: t1 keeps its
+            # place, t2 is its tour neighbour, t3 a geometric neighbour of t1.
+            for forward in (True, False):
+                t1 = tour[i] if forward else tour[i + 1]
+                t2 = tour[i + 1] if forward else tour[i]
+                d12 = dist(pts[t1], pts[t2])
+                for t3 in neigh[t1]:
+                    d13 = dist(pts[t1], pts[t3])
+                    if d13 >= d12:
+                        break
+                    j = pos[t3]
+                    if forward:
+                        # t4 follows t3; new edges (t1,t3) + (t2,t4)
+                        if j == i + 1 or j == i:
+                            continue
+                        if j + 1 < m:
+                            t4 = tour[j + 1]
+                            gain = d12 + dist(pts[t3], pts[t4]) - d13 - dist(pts[t2], pts[t4])
+                        elif j > i:
+                            gain = d12 - d13          # free tail end
+                        else:
+                            continue
+                        if gain > 1e-9:
+                            if j > i:
+                                reverse(i + 1, j)
+                            else:
+                                reverse(j + 1, i)
+                            improved = True
+                            break
+                    else:
+                        # t4 precedes t3; new edges (t1,t3) + (t2,t4)
+                        if j == i or j == i + 1:
+                            continue
+                        if j - 1 >= 0:
+                            t4 = tour[j - 1]
+                            gain = d12 + dist(pts[t3], pts[t4]) - d13 - dist(pts[t2], pts[t4])
+                        elif j < i and not anchored:
+                            gain = d12 - d13          # free head end
+                        else:
+                            continue
+                        lo_k = j if j < i else i + 1
+                        hi_k = i if j < i else j - 1
+                        if gain > 1e-9 and lo_k >= lo:
+                            reverse(lo_k, hi_k)
+                            improved = True
+                            break
+        if not improved:
+            break
+    return tour[lo:]
+
+
+def or_opt(points, order, start=None, max_passes=50, neighbours=10, max_run=3):
+    """Improve an open path by moving short runs of points elsewhere.
+
+    Runs of 1..`max_run` consecutive points are cut out and reinserted,
+    either way round, next to a geometric neighbour of one of their ends.
+    This catches the stragglers 2-opt leaves behind, since 2-opt can only
+    move a point by reversing everything in between. `start` anchors the
+    path as in two_opt.
+    """
+    if len(order) < 3:
+        return list(order)
+
+    def dist(a, b):
+        return math.hypot(a[0] - b[0], a[1] - b[1])
+
+    anchored = start is not None
+    pts = list(points) + ([start] if anchored else [])
+    tour = ([len(points)] if anchored else []) + list(order)
+    lo = 1 if anchored else 0
+    neigh = _neighbour_lists(pts, min(neighbours, len(pts) - 1))
+    pos = [0] * len(pts)
+    for k, city in enumerate(tour):
+        pos[city] = k
+
+    for _ in range(max_passes):
+        improved = False
+        i = lo
+        while i < len(tour):
+            moved = False
+            for run in range(1, max_run + 1):
+                m = len(tour)
+                if i + run > m or m - run <= lo:
+                    break
+                j = i + run                     # first position after the run
+                s0, s1 = pts[tour[i]], pts[tour[j - 1]]
+                prev = pts[tour[i - 1]] if i > 0 else None
+                nxt = pts[tour[j]] if j < m else None
+                cut = ((dist(prev, s0) if prev else 0.0) + (dist(s1, nxt) if nxt else 0.0)
+                       - (dist(prev, nxt) if prev and nxt else 0.0))
+                if cut <= 1e-9:
+                    continue
+                # Gaps are named by the tour position they follow (-1: head),
+                # skipping over the run itself. Only neighbours closer than
+                # the saving can anchor a profitable insertion.
+                gaps = set()
+                for end, s in ((tour[i], s0), (tour[j - 1], s1)):
+                    for c in neigh[end]:
+                        if dist(s, pts[c]) >= cut:
+                            break
+                        p = pos[c]
+                        if i <= p < j:
+                            continue
+                        gaps.add(p)
+                        gaps.add(i - 1 if p == j else p - 1)
+                best = None
+                for p in gaps:
+                    if p < lo - 1 or (p == -1 and anchored):
+                        continue
+                    q = j if p + 1 == i else p + 1
+                    a = pts[tour[p]] if p >= 0 else None
+                    b = pts[tour[q]] if q < m else None
+                    for first, last, flip in ((s0, s1, False), (s1, s0, True)):
+                        add = ((dist(a, first) if a else 0.0) + (dist(last, b) if b else 0.0)
+                               - (dist(a, b) if a and b else 0.0))
+                        if cut - add > 1e-9 and (best is None or cut - add > best[0]):
+                            best = (cut - add, p, flip)
+                if best:
+                    _, p, flip = best
+                    seg = tour[i:j][::-1] if flip else tour[i:j]
+                    rest = tour[:i] + tour[j:]
+                    k = p if p < i else p - run
+                    tour = rest[:k + 1] + seg + rest[k + 1:]
+                    for k, city in enumerate(tour):
+                        pos[city] = k
+                    improved = moved = True
+                    break
+            if not moved:
+                i += 1
+        if not improved:
+            break
+    return tour[lo:]
+
+
+def optimise_path(points, start=None, max_rounds=10, seed=None):
+    """Nearest-neighbour (or the `seed` order), then 2-opt and Or-opt in turn
+    until neither helps. Only strictly shorter tours replace the current
+    one, so a regular seed survives ties."""
+    order = list(seed) if seed is not None else nearest_neighbour(points, start)
+    length = path_length(points, order, start)
+    for _ in range(max_rounds):
+        new_order = or_opt(points, two_opt(points, order, start), start)
+        new = path_length(points, new_order, start)
+        if new >= length - 1e-9:
+            break
+        order, length = new_order, new
+    return order
+
+
+def spanning_tree(points):
+    """Prim's minimum spanning tree: [(i, j)] edges, n - 1 of them."""
+    n = len(points)
+    if n < 2:
+        return []
+    best = [math.dist(points[0], p) for p in points]
+    parent = [0] * n
+    done = [False] * n
+    done[0] = True
+    edges = []
+    for _ in range(n - 1):
+        i = min((k for k in range(n) if not done[k]), key=best.__getitem__)
+        edges.append((parent[i], i))
+        done[i] = True
+        for k in range(n):
+            if not done[k]:
+                d = math.dist(points[i], points[k])
+                if d < best[k]:
+                    best[k], parent[k] = d, i
+    return edges
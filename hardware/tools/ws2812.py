@@ -0,0 +1,193 @@
+"""
+MIXTEE PCB tools - WS2812 frame time and current budget
+
+Follows the NeoPixel chain through the generator's COMP_NETS (connector ->
+DIN, DOUT -> next DIN), then models what the chain costs:
+
+  frame     24 bits per LED at 800 kHz (30 us) plus the latch/reset gap;
+            the data line (and, with a bit-banged driver, the CPU) is busy
+            for all of it, which caps the refresh rate
+  current   per LED: quiescent draw + 20 mA per channel scaled by the
+            colour value and the global brightness cap
+
+Animation patterns are generated for many frames at once as a
+(frames, leds, rgb) array, so peak, average and the largest frame-to-frame
+current step come from one reduction. The report also gives the brightness
+cap that keeps the peak under --budget. It flags a brownout when the 5V at
+the chain, after --rail-ohms of cable and copper, drops below VDD_MIN.
+
+Usage:
+  python ws2812.py                                # keys4x4, all patterns
+  python ws2812.py --grids 8x8 16x16 --budget 2.0
+  python ws2812.py --patterns rainbow keys --brightness 0.3 --fps 120
+"""
+
+import argparse
+import math
+
+import numpy as np
+
+from kicad_pcb import GENERATORS, load_board, load_generator
+
+BIT_US = 1.25           # 800 kHz
+BITS_PER_LED = 24
+RESET_US = 280.0        # latch gap, WS2812B-2020 (V5) datasheet
+CHANNEL_MA = 20.0       # per colour at 255
+IDLE_MA = 1.0           # quiescent per LED, all channels off
+VDD_MIN = 3.7           # V, WS2812B-2020 minimum supply
+RAIL_V = 5.0
+RAIL_OHMS = 0.15        # JST-PH cable + connector + 5V copper to the chain
+BUDGET = 0.96           # A, docs/power.md NeoPixel worst case for 16 keys
+BRIGHTNESS = 0.3        # default firmware cap (docs/firmware.md)
+FPS = 60.0
+FRAMES = 600
+
+WS_DOUT, WS_GND, WS_VDD, WS_DIN = "1", "2", "3", "4"
+
+
+# ---------------------------------------------------------------------------
+# Chain
+# ---------------------------------------------------------------------------
+
+def led_chain(gen):
+    """(ordered LED refs, unchained LED refs) following DIN/DOUT nets in
+    COMP_NETS from the connector pin that feeds the first DIN."""
+    cn = gen.COMP_NETS
+    leds = {ref: pads for ref, pads in cn.items() if ref.startswith("LED")}
+    conn = {net for ref, pads in cn.items() if ref.startswith("J") for net in pads.values()}
+    by_din = {pads[WS_DIN]: ref for ref, pads in leds.items() if pads.get(WS_DIN)}
+    heads = [ref for net, ref in by_din.items() if net in conn]
+    chain, seen = [], set()
+    ref = heads[0] if heads else None
+    while ref and ref not in seen:
+        chain.append(ref)
+        seen.add(ref)
+        ref = by_din.get(leds[ref].get(WS_DOUT, 0))
+    return chain, sorted(set(leds) - seen)
+
+
+def frame_us(n):
+    """Microseconds to shift out n LEDs and latch."""
+    return n * BITS_PER_LED * BIT_US + RESET_US
+
+
+# ---------------------------------------------------------------------------
+# Patterns
+# ---------------------------------------------------------------------------
+
+def _hsv(h):
+    """Fully saturated, full value RGB in 0..1 for hue h in [0, 1)."""
+    k = (np.stack([h + 1 / 3, h, h - 1 / 3], -1) * 6) % 6
+    return np.clip(np.abs(k - 3) - 1, 0, 1)
+
+
+def pattern(name, xy, frames, fps, seed=1):
+    """(frames, leds, 3) float array in 0..1 for an animation.
+
+    `xy` is the (leds, 2) LED positions in chain order (mm).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(xy)
+    t = np.arange(frames)[:, None] / fps
+    span = max(np.ptp(xy[:, 0]), 1e-9)
+    if name == "white":
+        return np.ones((frames, n, 3))
+    if name == "rainbow":                   # hue wheel sweeping across the board
+        return _hsv((xy[None, :, 0] / span + 0.25 * t) % 1.0)
+    if name == "breathe":                   # all white, 4 s cycle
+        v = (1 - np.cos(2 * math.pi * t / 4.0)) / 2
+        return np.repeat(v[:, :, None], 3, 2) * np.ones((1, n, 3))
+    if name == "chase":                     # white head with a 4-LED tail along the chain
+        pos = (t * fps / 2) % n
+        d = (pos - np.arange(n)[None, :]) % n
+        v = np.where(d < 5, 1.0 - d / 5, 0.0)
+        return np.repeat(v[:, :, None], 3, 2)
+    if name == "random":
+        return rng.random((frames, n, 3))
+    if name == "keys":                      # 16 presses/s, each lights white, fades over ~0.3 s
+        hits = rng.random((frames, n)) < 16.0 / fps / max(n, 1)
+        decay = math.exp(-1 / (0.3 * fps))
+        v = np.zeros((frames, n))
+        level = np.zeros(n)
+        for f in range(frames):
+            level = np.maximum(hits[f], level * decay)
+            v[f] = level
+        return np.repeat(v[:, :, None], 3, 2)
+    raise ValueError(f"unknown pattern {name!r}")
+
+
+PATTERNS = ("white", "rainbow", "breathe", "chase", "random", "keys")
+
+
+# ---------------------------------------------------------------------------
+# Budget
+# ---------------------------------------------------------------------------
+
+def chain_current(rgb, brightness=1.0):
+    """Amps per frame for a (frames, leds, 3) 0..1 colour array."""
+    n = rgb.shape[1]
+    levels = np.floor(rgb * 255 * brightness) / 255     # 8-bit, as the driver sends it
+    return (n * IDLE_MA + CHANNEL_MA * levels.sum(axis=(1, 2))) * 1e-3
+
+
+def budget(rgb, brightness=BRIGHTNESS, limit=BUDGET, rail_ohms=RAIL_OHMS):
+    """Peak/average current at `brightness`, and the cap that fits `limit`.
+
+    Returns {"peak", "avg", "step" (A, largest frame-to-frame change),
+             "cap" (brightness, 1.0 when the full pattern fits),
+             "vdd" (V at the chain at peak), "brownout"}.
+    """
+    amps = chain_current(rgb, brightness)
+    n = rgb.shape[1]
+    full = chain_current(rgb, 1.0).max() - n * IDLE_MA * 1e-3
+    room = limit - n * IDLE_MA * 1e-3
+    cap = 1.0 if full <= room else max(room, 0.0) / full
+    vdd = RAIL_V - amps.max() * rail_ohms
+    return {"peak": float(amps.max()), "avg": float(amps.mean()),
+            "step": float(np.abs(np.diff(amps)).max()) if len(amps) > 1 else 0.0,
+            "cap": float(cap), "vdd": float(vdd), "brownout": vdd < VDD_MIN}
+
+
+def _grid(spec):
+    cols, rows = (int(v) for v in spec.lower().split("x"))
+    return cols, rows
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", nargs="?", default="keys4x4", help="board key or gen_pcb.py")
+    ap.add_argument("--grids", nargs="*", type=_grid, help="COLSxROWS via configure() (default: as generated)")
+    ap.add_argument("--patterns", nargs="*", choices=PATTERNS, default=list(PATTERNS))
+    ap.add_argument("--brightness", type=float, default=BRIGHTNESS, help="global cap, 0..1")
+    ap.add_argument("--budget", type=float, default=BUDGET, help="NeoPixel current budget (A)")
+    ap.add_argument("--rail-ohms", type=float, default=RAIL_OHMS, help="5V source to chain resistance")
+    ap.add_argument("--fps", type=float, default=FPS)
+    ap.add_argument("--frames", type=int, default=FRAMES)
+    args = ap.parse_args()
+
+    gen = load_generator(GENERATORS.get(args.board, args.board))
+    for grid in args.grids or [None]:
+        if grid:
+            gen.configure(*grid)
+        chain, loose = led_chain(gen)
+        n = len(chain)
+        at = {fp["ref"]: (fp["x"], fp["y"]) for fp in load_board(gen.generate_pcb())["footprints"]}
+        xy = np.array([at[ref] for ref in chain], dtype=float).reshape(-1, 2)
+        t = frame_us(n)
+        print(f"{n} LEDs in chain {chain[0] if chain else '-'} .. {chain[-1] if chain else '-'}"
+              + (f"; NOT CHAINED: {', '.join(loose)}" if loose else ""))
+        print(f"  frame {t:.0f} us ({n} x {BITS_PER_LED * BIT_US:g} us + {RESET_US:g} us latch): "
+              f"max {1e6 / t:.0f} fps; at {args.fps:g} fps the data line is busy {t * args.fps / 1e4:.1f} %"
+              + ("  OVER" if t * args.fps > 1e6 else ""))
+        print(f"  {'pattern':<8} {'peak A':>7} {'avg A':>7} {'step A':>7} {'VDD V':>6} "
+              f"{'cap for ' + format(args.budget, 'g') + ' A':>12}")
+        for name in args.patterns:
+            rgb = pattern(name, xy, args.frames, args.fps)
+            r = budget(rgb, args.brightness, args.budget, args.rail_ohms)
+            print(f"  {name:<8} {r['peak']:7.3f} {r['avg']:7.3f} {r['step']:7.3f} {r['vdd']:6.2f} "
+                  f"{100 * r['cap']:11.0f}%" + ("  BROWNOUT" if r["brownout"] else "")
+                  + ("  over budget" if r["peak"] > args.budget else ""))
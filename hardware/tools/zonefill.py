@@ -0,0 +1,591 @@
+"""
+MIXTEE PCB tools - copper zone fill
+
+Fills the zones declared in generate_pcb() and writes the result back into
+the board as (filled_polygon ...) entries, replacing the `refill_zones` MCP /
+pcbnew step (Stage 6e of docs/pcbs-workflow.md).
+
+Per zone and layer, on a fine grid (GRID mm):
+
+  1. the zone polygon, clipped to the board outline less the zone clearance
+  2. minus pads, tracks, vias and copper graphics of other nets, each grown
+     by the zone clearance; non-plated holes likewise
+  3. minus pads of the zone's own net grown by thermal_gap, plus four
+     thermal_bridge_width spokes per pad (45 degrees on round pads, like
+     KiCad); a spoke whose far end lands on no copper is left out.
+     connect_pads yes / no / thru_hole_only and per-pad zone_connect are
+     honoured
+  4. opened (eroded then dilated) by min_thickness / 2, so no sliver is
+     thinner than min_thickness
+  5. islands - regions touching no pad, via or track of the zone's net -
+     handled per the zone's island_removal_mode like KiCad: 0 (the default)
+     removes them, 1 keeps them, 2 removes those under island_area_min
+  6. traced back into polygons; holes are joined to their outline by
+     zero-width horizontal cuts, as KiCad fractures its fills
+
+Every clearance is grown by SLACK grid cells, so the staircase the grid
+leaves never eats into a clearance. Removed islands are listed per zone
+layer, so nothing disappears silently; a plane with nothing of its net on
+its layer yet is removed whole, as KiCad would.
+
+Usage:
+  python zonefill.py keys4x4 -o mixtee-key-pcb.kicad_pcb
+  python zonefill.py ../pcbs/io/designs/mixtee-io-board.kicad_pcb   # in place
+  python zonefill.py input-mother --grid 0.025 -o /tmp/im.kicad_pcb
+"""
+
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+
+import raster
+from kicad_pcb import load_board, pad_copper_layers, resolve_board_text, rotate, via_copper_layers
+
+GRID = 0.05     # mm per fill cell
+SLACK = 0.75    # extra clearance, in grid cells (> half a cell diagonal)
+
+# Step (dr, dc) for edge directions E, S, W, N; a right turn is d + 1
+_STEPS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+
+# ---------------------------------------------------------------------------
+# Outline
+# ---------------------------------------------------------------------------
+
+def outline_polygon(board, tol=1e-3):
+    """Edge.Cuts chained into one closed point list, or None if it is not a
+    single closed loop (arcs are flattened with raster.arc_points)."""
+    prims = []
+    for e in board["edges"]:
+        if e["kind"] == "arc":
+            prims.append(raster.arc_points(e["start"], e["mid"], e["end"]))
+        elif e["kind"] == "line":
+            prims.append([e["start"], e["end"]])
+    if not prims:
+        return None
+    pts = list(prims.pop(0))
+    while prims:
+        end = pts[-1]
+        for k, prim in enumerate(prims):
+            if math.dist(prim[0], end) < tol:
+                break
+            if math.dist(prim[-1], end) < tol:
+                prim = prim[::-1]
+                break
+        else:
+            return None
+        prims.pop(k)
+        pts.extend(prim[1:])
+    if math.dist(pts[0], pts[-1]) > tol:
+        return None
+    return pts[:-1]
+
+
+# ---------------------------------------------------------------------------
+# Morphology
+# ---------------------------------------------------------------------------
+
+def _disc_offsets(r):
+    n = int(r)
+    return [(i, j) for i in range(-n, n + 1) for j in range(-n, n + 1) if i * i + j * j <= r * r]
+
+
+def erode(mask, r):
+    """Cells whose whole disc of radius `r` cells is set."""
+    n = int(r)
+    if n < 1:
+        return mask.copy()
+    padded = np.pad(mask, n)
+    h, w = mask.shape
+    out = np.ones_like(mask)
+    for i, j in _disc_offsets(r):
+        out &= padded[n + i:n + i + h, n + j:n + j + w]
+    return out
+
+
+def dilate(mask, r):
+    n = int(r)
+    if n < 1:
+        return mask.copy()
+    padded = np.pad(mask, n)
+    h, w = mask.shape
+    out = np.zeros_like(mask)
+    for i, j in _disc_offsets(r):
+        out |= padded[n + i:n + i + h, n + j:n + j + w]
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Fill mask
+# ---------------------------------------------------------------------------
+
+# Pad-level (zone_connect N) overrides: 0 none, 1 thermal, 2 solid, 3 thermal on THT
+_PAD_CONNECT = {0: "no", 1: "thermal", 2: "yes", 3: "thru_hole_only"}
+
+
+def _connects(zone, pad):
+    """"solid", "thermal" or None for a pad on the zone's own net."""
+    mode = _PAD_CONNECT.get(pad.get("zone_connect", -1), zone["connect"])
+    if mode == "yes":
+        return "solid"
+    if mode == "no":
+        return None
+    if mode == "thru_hole_only":
+        return "thermal" if pad["type"] == "thru_hole" else "solid"
+    return "thermal"
+
+
+def _spokes(zone, pad):
+    """[(inner point, outer point)] for the four spokes of a pad."""
+    base = pad["rot"] + (45.0 if pad["shape"] == "circle" else 0.0)
+    reach = zone["thermal_gap"] + zone["min_thickness"]
+    out = []
+    for k in range(4):
+        a = math.radians(base + 90 * k)
+        ux, uy = math.cos(a), -math.sin(a)
+        # distance from the centre to the pad edge along (ux, uy), in the pad frame
+        lx, ly = rotate(ux, uy, -pad["rot"])
+        if pad["shape"] == "circle":
+            edge = pad["w"] / 2
+        else:
+            edge = min(pad["w"] / 2 / abs(lx) if abs(lx) > 1e-9 else math.inf,
+                       pad["h"] / 2 / abs(ly) if abs(ly) > 1e-9 else math.inf)
+        out.append(((pad["x"], pad["y"]),
+                    (pad["x"] + ux * (edge + reach), pad["y"] + uy * (edge + reach))))
+    return out
+
+
+def zone_mask(board, zone, layer, cv, keep_islands=False):
+    """Boolean fill of one zone layer on canvas `cv`, plus per-pad spoke counts.
+    Islands are removed per the zone's mode unless `keep_islands`."""
+    g = 1 / cv["ppm"]
+    slack = SLACK * g
+    clr = zone["clearance"] + slack
+    copper = board["layers"]
+    shape = cv["shape"]
+
+    fill = np.zeros(shape, dtype=bool)
+    raster.paint_polygon(fill, cv, zone["polygon"])
+    outline = outline_polygon(board)
+    if outline:
+        inside = np.zeros(shape, dtype=bool)
+        raster.paint_polygon(inside, cv, outline)
+        fill &= inside
+        for p, q in zip(outline, outline[1:] + outline[:1]):
+            raster.paint_segment(fill, cv, p, q, 2 * clr, value=False)
+
+    keep = np.zeros(shape, dtype=bool)      # other-net copper plus clearance
+    relief = np.zeros(shape, dtype=bool)    # own-net thermal gaps
+    thermal = []
+    for fp in board["footprints"]:
+        for pad in fp["pads"]:
+            if pad["type"] == "np_thru_hole":
+                raster.paint_disc(keep, cv, pad["x"], pad["y"], pad["drill"] / 2 + clr)
+                continue
+            if layer not in pad_copper_layers(pad, copper):
+                continue
+            how = _connects(zone, pad) if pad["net"] == zone["net"] else None
+            if how is None:
+                raster.paint_pad(keep, cv, pad, clr)
+            elif how == "thermal":
+                raster.paint_pad(relief, cv, pad, zone["thermal_gap"] + slack)
+                thermal.append(pad)
+        for ln in fp["lines"]:
+            if ln["layer"] == layer:
+                raster.paint_segment(keep, cv, ln["start"], ln["end"], ln["width"] + 2 * clr)
+    for seg in board["segments"]:
+        if seg["layer"] == layer and seg["net"] != zone["net"]:
+            raster.paint_segment(keep, cv, seg["start"], seg["end"], seg["width"] + 2 * clr)
+    for via in board["vias"]:
+        if via["net"] != zone["net"] and layer in via_copper_layers(via, copper):
+            raster.paint_disc(keep, cv, via["at"][0], via["at"][1], via["size"] / 2 + clr)
+    for gr in board["graphics"]:
+        if gr["layer"] == layer and gr["kind"] == "line":
+            raster.paint_segment(keep, cv, gr["start"], gr["end"], gr["width"] + 2 * clr)
+
+    fill &= ~keep
+    area = fill.copy()
+    fill &= ~relief
+
+    # Spokes: only those whose tip reaches copper outside the relief
+    spokes = np.zeros(shape, dtype=bool)
+    counts = {}
+    h, w = shape
+    for pad in thermal:
+        n = 0
+        for p, q in _spokes(zone, pad):
+            j = int((q[0] - cv["x0"]) * cv["ppm"])
+            i = int((q[1] - cv["y0"]) * cv["ppm"])
+            if 0 <= i < h and 0 <= j < w and fill[i, j]:
+                raster.paint_segment(spokes, cv, p, q, zone["thermal_bridge_width"])
+                n += 1
+        counts[(pad["x"], pad["y"])] = n
+    fill |= spokes & area
+
+    r = zone["min_thickness"] / 2 / g
+    fill = dilate(erode(fill, r), r) & area
+    if not keep_islands:
+        fill, _ = remove_islands(board, zone, layer, cv, fill)
+    return fill, counts
+
+
+# ---------------------------------------------------------------------------
+# Islands
+# ---------------------------------------------------------------------------
+
+def label_regions(mask):
+    """(labels, count): 4-connected regions of a boolean mask numbered 1..count.
+
+    Runs of set cells are found per row, runs overlapping a run in the row
+    above are unioned, and the labels are painted back run by run.
+    """
+    h, w = mask.shape
+    edges = np.diff(np.pad(mask, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    n = len(starts)
+    if n == 0:
+        return np.zeros(mask.shape, dtype=np.int32), 0
+
+    # runs of row r-1 overlapping run k of row r: start < ends[k] and end > starts[k]
+    k = w + 1
+    start_key, end_key = rows * k + starts, rows * k + ends
+    lo = np.searchsorted(end_key, (rows - 1) * k + starts, side="right")
+    hi = np.searchsorted(start_key, (rows - 1) * k + ends, side="left")
+    counts = np.maximum(hi - lo, 0)
+    below = np.repeat(np.arange(n), counts)
+    above = np.repeat(lo, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+
+    parent = list(range(n))
+
+    def find(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for a, b in zip(above.tolist(), below.tolist()):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+    roots = np.array([find(a) for a in range(n)])
+    _, run_label = np.unique(roots, return_inverse=True)
+    run_label = run_label.astype(np.int32) + 1
+
+    flat = np.zeros(h * w + 1, dtype=np.int32)
+    np.add.at(flat, rows * w + starts, run_label)
+    np.add.at(flat, rows * w + ends, -run_label)
+    return np.cumsum(flat[:-1]).reshape(h, w).astype(np.int32), int(run_label.max())
+
+
+def net_anchor(board, zone, layer, cv):
+    """Own-net pads, vias and tracks on `layer`, grown by a cell: fill that
+    touches this is connected to the net."""
+    g = 1 / cv["ppm"]
+    anchor = np.zeros(cv["shape"], dtype=bool)
+    copper = board["layers"]
+    for fp in board["footprints"]:
+        for pad in fp["pads"]:
+            if pad["net"] == zone["net"] and layer in pad_copper_layers(pad, copper):
+                raster.paint_pad(anchor, cv, pad, g)
+    for via in board["vias"]:
+        if via["net"] == zone["net"] and layer in via_copper_layers(via, copper):
+            raster.paint_disc(anchor, cv, via["at"][0], via["at"][1], via["size"] / 2 + g)
+    for seg in board["segments"]:
+        if seg["net"] == zone["net"] and seg["layer"] == layer:
+            raster.paint_segment(anchor, cv, seg["start"], seg["end"], seg["width"] + 2 * g)
+    return anchor
+
+
+def islands(labels, n, tied, cv):
+    """[(area mm^2, (x, y), label)] for regions not `tied`, largest first."""
+    if not n:
+        return []
+    g = 1 / cv["ppm"]
+    flat = labels.ravel()
+    area = np.bincount(flat, minlength=n + 1)
+    ii, jj = np.indices(labels.shape)
+    cy = np.bincount(flat, weights=ii.ravel(), minlength=n + 1)
+    cx = np.bincount(flat, weights=jj.ravel(), minlength=n + 1)
+    out = [(area[lab] * g * g, (cv["x0"] + (cx[lab] / area[lab] + 0.5) * g,
+                                cv["y0"] + (cy[lab] / area[lab] + 0.5) * g), int(lab))
+           for lab in np.flatnonzero(~tied[1:]) + 1]
+    return sorted(out, reverse=True)
+
+
+def routed(board):
+    """True once the board has tracks or vias. Before that nothing but pads
+    ties an inner plane to its net, so estimators that model the intended
+    planes pass keep_islands=not routed(board)."""
+    return bool(board["segments"] or board["vias"])
+
+
+def remove_islands(board, zone, layer, cv, fill):
+    """(fill, removed): drop unconnected regions as KiCad's
+    island_removal_mode says; removed = [(area mm^2, (x, y))]."""
+    mode = zone.get("island_removal_mode", 0)
+    if mode == 1 or not fill.any():
+        return fill, []
+    labels, n = label_regions(fill)
+    tied = np.zeros(n + 1, dtype=bool)
+    tied[np.unique(labels[net_anchor(board, zone, layer, cv) & fill])] = True
+    tied[0] = False
+    drop = [i for i in islands(labels, n, tied, cv) if mode == 0 or i[0] < zone.get("island_area_min", 0.0)]
+    if not drop:
+        return fill, []
+    gone = np.zeros(n + 1, dtype=bool)
+    gone[[lab for _, _, lab in drop]] = True
+    return fill & ~gone[labels], [(a, at) for a, at, _ in drop]
+
+
+# ---------------------------------------------------------------------------
+# Mask -> polygons
+# ---------------------------------------------------------------------------
+
+def trace_loops(mask):
+    """Boundary loops of a boolean mask, as vertex lists in cell-corner
+    coordinates (row, col) of the mask padded by one cell.
+
+    Copper is on the right of the direction of travel (y down), so outlines
+    run clockwise on screen and holes anticlockwise. At a corner where two
+    cells touch diagonally the walk turns right, keeping them separate
+    (4-connected regions). Only corners where the direction changes are kept.
+    """
+    p = np.pad(mask, 1)
+    hp, wp = p.shape
+    wv = wp + 1
+    out = np.zeros((hp + 1) * wv, dtype=np.uint8)
+    core = p[1:-1, 1:-1]
+    ii, jj = np.nonzero(core & ~p[:-2, 1:-1])       # top edges, heading E
+    out[(ii + 1) * wv + jj + 1] |= 1
+    ii, jj = np.nonzero(core & ~p[1:-1, 2:])        # right edges, heading S
+    out[(ii + 1) * wv + jj + 2] |= 2
+    ii, jj = np.nonzero(core & ~p[2:, 1:-1])        # bottom edges, heading W
+    out[(ii + 2) * wv + jj + 2] |= 4
+    ii, jj = np.nonzero(core & ~p[1:-1, :-2])       # left edges, heading N
+    out[(ii + 2) * wv + jj + 1] |= 8
+
+    starts = np.flatnonzero(out)
+    out = bytearray(out.tobytes())
+    delta = (1, wv, -1, -wv)
+    loops = []
+    for v0 in starts.tolist():
+        bits = out[v0]
+        # start on a plain corner: a loop may pass a diagonal corner twice
+        if bits & (bits - 1) == 0 and bits:
+            d = bits.bit_length() - 1
+            verts = []
+            v, prev = v0, -1
+            while True:
+                bits = out[v]
+                if not bits:
+                    break
+                if prev >= 0:
+                    for nd in ((prev + 1) % 4, prev, (prev + 3) % 4):
+                        if bits >> nd & 1:
+                            d = nd
+                            break
+                if d != prev:
+                    verts.append(divmod(v, wv))
+                out[v] &= ~(1 << d)
+                v += delta[d]
+                prev = d
+            # the start corner is redundant if the walk ends heading the same way
+            if len(verts) > 2 and prev == _heading(verts[0], verts[1]):
+                verts.pop(0)
+            loops.append(verts)
+    return loops
+
+
+def _heading(a, b):
+    dr, dc = b[0] - a[0], b[1] - a[1]
+    return _STEPS.index(((dr > 0) - (dr < 0), (dc > 0) - (dc < 0)))
+
+
+def _area2(verts):
+    s = 0
+    for (r0, c0), (r1, c1) in zip(verts, verts[1:] + verts[:1]):
+        s += c0 * r1 - c1 * r0
+    return s
+
+
+def fracture(mask, loops):
+    """Join every hole to the loop left of it by a zero-width horizontal cut
+    along a cell row; returns one point list (row, col) per outline."""
+    p = np.pad(mask, 1)
+    outers = [k for k, v in enumerate(loops) if _area2(v) > 0]
+    north = {}      # col -> [(top row, bottom row, loop, edge)] for N edges
+    for k, verts in enumerate(loops):
+        for e, (a, b) in enumerate(zip(verts, verts[1:] + verts[:1])):
+            if a[1] == b[1] and b[0] < a[0]:
+                north.setdefault(a[1], []).append((b[0], a[0], k, e))
+
+    attach = {}     # (loop, edge) -> [(row, child, child edge)]
+    for k, verts in enumerate(loops):
+        if _area2(verts) > 0:
+            continue
+        # leftmost S edge of the hole: copper is on its left
+        best = None
+        for e, (a, b) in enumerate(zip(verts, verts[1:] + verts[:1])):
+            if a[1] == b[1] and b[0] > a[0] and (best is None or a[1] < best[0]):
+                best = (a[1], a[0], e)
+        col, row, e = best
+        gaps = np.flatnonzero(~p[row, :col])
+        pc = gaps[-1] + 1
+        for top, bottom, owner, pe in north[pc]:
+            if top <= row < bottom:
+                attach.setdefault((owner, pe), []).append((row, k, e))
+                break
+
+    def emit(k, out, start=None):
+        verts = loops[k]
+        n = len(verts)
+        if start is None:
+            order = range(n)
+        else:
+            row, e = start
+            q = (row + 0.5, verts[e][1])
+            out.append(q)
+            order = [(e + 1 + j) % n for j in range(n)]
+        for e in order:
+            out.append(verts[e])
+            for row, child, ce in sorted(attach.get((k, e), ()), reverse=True):
+                pt = (row + 0.5, verts[e][1])
+                out.append(pt)
+                emit(child, out, (row, ce))
+                out.append(pt)
+        if start is not None:
+            out.append(q)
+
+    polys = []
+    for k in outers:
+        pts = []
+        emit(k, pts)
+        polys.append(pts)
+    return polys
+
+
+def mask_polygons(mask, cv):
+    """Fractured polygons (mm) covering a boolean mask on canvas `cv`."""
+    g = 1 / cv["ppm"]
+    x0, y0 = cv["x0"] - g, cv["y0"] - g      # trace_loops pads by one cell
+    return [[(x0 + c * g, y0 + r * g) for r, c in poly]
+            for poly in fracture(mask, trace_loops(mask))]
+
+
+# ---------------------------------------------------------------------------
+# Board fill
+# ---------------------------------------------------------------------------
+
+def zone_canvas(board, zone, grid=GRID):
+    xs = [p[0] for p in zone["polygon"]]
+    ys = [p[1] for p in zone["polygon"]]
+    bx0, by0, bx1, by1 = raster.board_bounds(board, margin=2 * grid)
+    bounds = (max(min(xs), bx0), max(min(ys), by0), min(max(xs), bx1), min(max(ys), by1))
+    return raster.make_canvas(bounds, 25.4 / grid)
+
+
+def fill_board(board, grid=GRID):
+    """[(zone, layer, polygons, mask, canvas, spoke counts, removed islands)]
+    for every zone layer."""
+    fills = []
+    for zone in board["zones"]:
+        cv = zone_canvas(board, zone, grid)
+        for layer in zone["layers"]:
+            if layer not in board["layers"]:
+                continue
+            mask, counts = zone_mask(board, zone, layer, cv, keep_islands=True)
+            mask, removed = remove_islands(board, zone, layer, cv, mask)
+            fills.append((zone, layer, mask_polygons(mask, cv), mask, cv, counts, removed))
+    return fills
+
+
+def _fmt(v):
+    s = f"{v:.4f}".rstrip("0").rstrip(".")
+    return "0" if s == "-0" else s
+
+
+def _strip_blocks(text, head):
+    """Remove every balanced "(head ...)" block (and the whitespace before it)."""
+    out, pos = [], 0
+    key = "(" + head
+    while True:
+        i = text.find(key, pos)
+        if i < 0:
+            out.append(text[pos:])
+            return "".join(out)
+        j, depth = i, 0
+        while True:
+            ch = text[j]
+            depth += ch == "("
+            depth -= ch == ")"
+            j += 1
+            if depth == 0:
+                break
+        out.append(text[pos:i].rstrip(" \t\n"))
+        pos = j
+
+
+def filled_polygon_text(layer, poly, indent="    "):
+    pts = [f"(xy {_fmt(x)} {_fmt(y)})" for x, y in poly]
+    rows = [" ".join(pts[i:i + 6]) for i in range(0, len(pts), 6)]
+    body = f"\n{indent}    ".join(rows)
+    return (f'{indent}(filled_polygon\n{indent}  (layer "{layer}")\n'
+            f"{indent}  (pts\n{indent}    {body}\n{indent}  )\n{indent})")
+
+
+def write_fills(text, board, fills):
+    """Board text with each zone's filled_polygon entries replaced."""
+    by_zone = {}
+    for zone, layer, polys, *_ in fills:
+        by_zone.setdefault(id(zone), []).extend(filled_polygon_text(layer, p) for p in polys)
+    out, pos = [], 0
+    for zone in sorted(board["zones"], key=lambda z: z["span"][0]):
+        s, e = zone["span"]
+        body = _strip_blocks(text[s:e], "filled_polygon")
+        head, tail = body[:body.rstrip().rfind(")")].rstrip(), body[body.rstrip().rfind(")"):]
+        blocks = by_zone.get(id(zone), [])
+        out.append(text[pos:s])
+        out.append(head + ("\n" + "\n".join(blocks) if blocks else "") + "\n  " + tail.lstrip())
+        pos = e
+    out.append(text[pos:])
+    return "".join(out)
+
+
+def fill_board_text(text, grid=GRID):
+    """Fill every zone of a .kicad_pcb text; returns (text, fills)."""
+    board = load_board(text)
+    fills = fill_board(board, grid)
+    return write_fills(text, board, fills), fills
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("board", help="board key, gen_pcb.py or .kicad_pcb")
+    ap.add_argument("--grid", type=float, default=GRID, help="fill cell size in mm")
+    ap.add_argument("-o", "--output", help="default: the .kicad_pcb itself, or <board>.kicad_pcb")
+    args = ap.parse_args()
+
+    text, gen = resolve_board_text(args.board)
+    t0 = time.perf_counter()
+    text, fills = fill_board_text(text, args.grid)
+    elapsed = time.perf_counter() - t0
+    for zone, layer, polys, mask, cv, counts, removed in fills:
+        area = np.count_nonzero(mask) / cv["ppm"] ** 2
+        npts = sum(len(p) for p in polys)
+        starved = sum(1 for n in counts.values() if n < 2)
+        print(f"  {zone['net_name']:<6} {layer:<7} {len(polys):>3} polygons, {npts:>6} points, "
+              f"{area:8.1f} mm^2, {len(counts)} thermal pads ({starved} with < 2 spokes)"
+              + (f", {len(removed)} islands removed ({sum(a for a, _ in removed):.2f} mm^2)" if removed else ""))
+    out = args.output or (args.board if gen is None else
+                          os.path.splitext(os.path.basename(args.board))[0] + ".kicad_pcb")
+    with open(out, "w") as f:
+        f.write(text)
+    print(f"Filled {len(fills)} zone layers in {elapsed:.2f} s -> {out}")